@@ -186,59 +186,22 @@ if ! grep -q "Fingerprint Hash" "$ARTIFACT_DIR/analyze_text.log"; then
     exit 1
 fi
 
-# JSON format (NDJSON - newline-delimited JSON objects)
-if ! $CLI_CMD analyze examples/demo-repo --format json 2>&1 | grep -v "^2025" > "$ARTIFACT_DIR/analyze_json.log"; then
+# JSON format (one or more JSON documents separated by blank lines)
+JSON_LOG="$ARTIFACT_DIR/analyze_json.log"
+if ! $CLI_CMD analyze examples/demo-repo --format json 2>/dev/null > "$JSON_LOG"; then
     log_error "JSON analysis failed"
     exit 1
 fi
 
-# Validate JSON (NDJSON format - each object must be valid JSON)
-# The output may contain multiple JSON objects separated by blank lines
-JSON_LOG="$ARTIFACT_DIR/analyze_json.log"
-python3 << PYEOF
-import json
-import sys
-
-try:
-    json_log = "$JSON_LOG"
-    with open(json_log, 'r') as f:
-        content = f.read()
-    
-    # Split by double newlines (blank lines between JSON objects)
-    if '\n\n' in content:
-        json_objects = content.split('\n\n')
-    else:
-        # Single JSON object
-        json_objects = [content]
-    
-    # Validate each JSON object
-    for i, obj_str in enumerate(json_objects):
-        obj_str = obj_str.strip()
-        if not obj_str:
-            continue
-        try:
-            json.loads(obj_str)
-        except json.JSONDecodeError as e:
-            print(f"JSON object {i+1} is invalid: {e}", file=sys.stderr)
-            sys.exit(1)
-    
-    # At least one valid JSON object must exist
-    valid_objects = [obj for obj in json_objects if obj.strip()]
-    if not valid_objects:
-        print("No valid JSON objects found", file=sys.stderr)
-        sys.exit(1)
-    
-except Exception as e:
-    print(f"JSON validation failed: {e}", file=sys.stderr)
-    sys.exit(1)
-PYEOF
-
-if [ $? -ne 0 ]; then
-    log_error "JSON analysis output is not valid JSON (NDJSON format)"
+# Validate every document against its schema
+if ! $CLI_CMD validate "$JSON_LOG" --require fingerprint --require agent_report \
+    > "$ARTIFACT_DIR/analyze_json_validate.log" 2>&1; then
+    log_error "JSON analysis output does not match its schema"
+    cat "$ARTIFACT_DIR/analyze_json_validate.log" >&2
     exit 1
 fi
 
-log_info "JSON output validated (NDJSON format)"
+log_info "JSON output validated"
 
 log_info "Analysis commands work correctly"
 
@@ -307,304 +270,23 @@ fi
 log_info "Step 10: Proof-carrying output verification"
 PROOF_CHECK_FAILED=0
 
-# Verify fingerprint output includes proof_obligations
-FINGERPRINT_JSON="$ARTIFACT_DIR/fingerprint_proof_check.json"
-# Use temp file to avoid broken pipe from grep/head combination
-TEMP_JSON=$(mktemp)
-# Capture CLI output, filtering out log lines starting with year (2025)
-$CLI_CMD analyze examples/demo-repo --format json 2>&1 | grep -v "^2025" > "$TEMP_JSON" 2>&1 || true
-if [ -s "$TEMP_JSON" ]; then
-    # Extract first complete JSON object (multi-line, starts with { and ends with })
-    # Find line starting with {, then extract until matching }
-    python3 << PYEXTRACT
-import json
-import sys
-
-try:
-    with open("$TEMP_JSON", 'r') as f:
-        lines = f.readlines()
-    
-    # Find first line starting with {
-    start_idx = None
-    for i, line in enumerate(lines):
-        if line.strip().startswith('{'):
-            start_idx = i
-            break
-    
-    if start_idx is None:
-        sys.exit(1)
-    
-    # Extract JSON object (may span multiple lines)
-    json_lines = []
-    brace_count = 0
-    for i in range(start_idx, len(lines)):
-        line = lines[i]
-        json_lines.append(line)
-        brace_count += line.count('{') - line.count('}')
-        if brace_count == 0:
-            break
-    
-    if brace_count == 0:
-        with open("$FINGERPRINT_JSON", 'w') as out:
-            out.write(''.join(json_lines))
-        sys.exit(0)
-    else:
-        sys.exit(1)
-except Exception:
-    sys.exit(1)
-PYEXTRACT
-fi
-rm -f "$TEMP_JSON"
-if [ -s "$FINGERPRINT_JSON" ] && head -1 "$FINGERPRINT_JSON" | grep -q "^{"; then
-    python3 << PYEOF
-import json
-import sys
-
-try:
-    with open("$FINGERPRINT_JSON", 'r') as f:
-        content = f.read().strip()
-        if not content:
-            print("ERROR: Empty fingerprint JSON", file=sys.stderr)
-            sys.exit(1)
-        
-        # Validate JSON starts with { and ends with }
-        if not content.startswith('{') or not content.endswith('}'):
-            print(f"ERROR: Invalid JSON format (does not start/end with braces): {content[:50]}...", file=sys.stderr)
-            sys.exit(1)
-        
-        fingerprint = json.loads(content)
-        
-        # Epistemic closure: Schema version validation
-        if "schema_version" not in fingerprint:
-            print("ERROR: fingerprint missing schema_version", file=sys.stderr)
-            sys.exit(1)
-        if fingerprint["schema_version"] != 1:
-            print(f"ERROR: fingerprint schema_version must be 1, got {fingerprint['schema_version']}", file=sys.stderr)
-            sys.exit(1)
-        
-        # Epistemic closure: Fail closed on unknown top-level fields
-        known_fields = {
-            "schema_version", "repository_path", "fingerprint_hash", "fingerprint_status",
-            "total_files", "total_classes", "total_functions", "total_lines",
-            "languages", "artifacts", "dependency_graph", "risk_signals",
-            "metadata", "proof_obligations", "status_metadata"
-        }
-        unknown_fields = set(fingerprint.keys()) - known_fields
-        if unknown_fields:
-            print(f"ERROR: fingerprint contains unknown fields: {sorted(unknown_fields)}", file=sys.stderr)
-            sys.exit(1)
-        
-        # Level-4: Verify proof_obligations present
-        if "proof_obligations" not in fingerprint:
-            print("ERROR: fingerprint missing proof_obligations", file=sys.stderr)
-            sys.exit(1)
-        
-        # Level-4: Verify fingerprint_status present
-        if "fingerprint_status" not in fingerprint:
-            print("ERROR: fingerprint missing fingerprint_status", file=sys.stderr)
-            sys.exit(1)
-        
-        # Epistemic closure: Verify fingerprint_status is valid enum
-        valid_statuses = {"COMPLETE_NO_SKIPS", "COMPLETE_WITH_SKIPS", "PARTIAL", "FAILED"}
-        if fingerprint["fingerprint_status"] not in valid_statuses:
-            print(f"ERROR: fingerprint_status must be one of {valid_statuses}, got {fingerprint['fingerprint_status']}", file=sys.stderr)
-            sys.exit(1)
-        
-        # Level-4: Verify proof obligations structure
-        po = fingerprint["proof_obligations"]
-        required_keys = ["requires_status_check", "invalid_if_ignored", "contract_violation_if_status_ignored"]
-        for key in required_keys:
-            if key not in po:
-                print(f"ERROR: proof_obligations missing required key: {key}", file=sys.stderr)
-                sys.exit(1)
-        
-        # Epistemic closure: Verify proof obligation values are bool
-        # Structural obligations must be True; computed obligations can be False when semantically correct
-        structural_obligations = {"requires_status_check", "invalid_if_ignored", "contract_violation_if_status_ignored"}
-        computed_obligations = {"deterministic_only_if_complete", "hash_invalid_if_partial"}
-        for key, value in po.items():
-            if not isinstance(value, bool):
-                print(f"ERROR: proof_obligations[{key}] must be bool, got {type(value).__name__}", file=sys.stderr)
-                sys.exit(1)
-            # Structural obligations must always be True
-            if key in structural_obligations and value is not True:
-                print(f"ERROR: proof_obligations[{key}] must be True (structural obligation), got {value}", file=sys.stderr)
-                sys.exit(1)
-            # Computed obligations can be False when semantically correct (validated as bool only)
-        
-        # Epistemic closure: Fail closed on unknown proof_obligations fields
-        known_po_keys = set(required_keys) | {"deterministic_only_if_complete", "hash_invalid_if_partial"}
-        unknown_po_keys = set(po.keys()) - known_po_keys
-        if unknown_po_keys:
-            print(f"ERROR: proof_obligations contains unknown keys: {sorted(unknown_po_keys)}", file=sys.stderr)
-            sys.exit(1)
-        
-        print("Fingerprint proof obligations verified")
-except json.JSONDecodeError as e:
-    print(f"ERROR: Invalid JSON: {e}", file=sys.stderr)
-    sys.exit(1)
-except Exception as e:
-    print(f"ERROR: Proof check failed: {e}", file=sys.stderr)
-    sys.exit(1)
-PYEOF
-    
-    if [ $? -ne 0 ]; then
-        log_error "Fingerprint proof obligations check failed"
-        PROOF_CHECK_FAILED=1
+# The compiled schema validators check proof obligations (structural obligations
+# True, all values bool, no unknown keys) along with every field of both documents
+PROOF_JSON="$ARTIFACT_DIR/proof_check.json"
+if $CLI_CMD analyze examples/demo-repo --format json 2>/dev/null > "$PROOF_JSON" && [ -s "$PROOF_JSON" ]; then
+    if $CLI_CMD validate "$PROOF_JSON" --require fingerprint --require agent_report \
+        > "$ARTIFACT_DIR/proof_check.log" 2>&1; then
+        log_info "Fingerprint and agent report proof obligations verified"
     else
-        log_info "Fingerprint proof obligations verified"
+        log_error "Proof obligations check failed"
+        cat "$ARTIFACT_DIR/proof_check.log" >&2
+        PROOF_CHECK_FAILED=1
     fi
 else
-    log_error "Could not generate fingerprint JSON for proof check"
+    log_error "Could not generate JSON output for proof check"
     PROOF_CHECK_FAILED=1
 fi
 
-# Verify agent report includes proof_obligations (via analyze command which includes agent report)
-AGENT_REPORT_JSON="$ARTIFACT_DIR/agent_report_proof_check.json"
-# The analyze command outputs both fingerprint and agent report, we need to check the second JSON object
-# Use temp file to avoid broken pipe from grep/tail combination
-TEMP_JSON2=$(mktemp)
-# Capture CLI output, filtering out log lines starting with year (2025)
-$CLI_CMD analyze examples/demo-repo --format json 2>&1 | grep -v "^2025" > "$TEMP_JSON2" 2>&1 || true
-if [ -s "$TEMP_JSON2" ]; then
-    # Extract second complete JSON object (multi-line, starts with { and ends with })
-    python3 << PYEXTRACT2
-import json
-import sys
-
-try:
-    with open("$TEMP_JSON2", 'r') as f:
-        lines = f.readlines()
-    
-    # Find all lines starting with {
-    json_starts = []
-    for i, line in enumerate(lines):
-        if line.strip().startswith('{'):
-            json_starts.append(i)
-    
-    if len(json_starts) < 2:
-        sys.exit(1)
-    
-    # Extract second JSON object (may span multiple lines)
-    start_idx = json_starts[1]
-    json_lines = []
-    brace_count = 0
-    for i in range(start_idx, len(lines)):
-        line = lines[i]
-        json_lines.append(line)
-        brace_count += line.count('{') - line.count('}')
-        if brace_count == 0:
-            break
-    
-    if brace_count == 0:
-        with open("$AGENT_REPORT_JSON", 'w') as out:
-            out.write(''.join(json_lines))
-        sys.exit(0)
-    else:
-        sys.exit(1)
-except Exception:
-    sys.exit(1)
-PYEXTRACT2
-fi
-rm -f "$TEMP_JSON2"
-if [ -s "$AGENT_REPORT_JSON" ] && head -1 "$AGENT_REPORT_JSON" | grep -q "^{"; then
-    python3 << PYEOF
-import json
-import sys
-
-try:
-    with open("$AGENT_REPORT_JSON", 'r') as f:
-        content = f.read().strip()
-        if not content:
-            print("ERROR: Empty agent report JSON", file=sys.stderr)
-            sys.exit(1)  # Blocking - agent report is required
-        
-        agent_report = json.loads(content)
-        
-        # Epistemic closure: Schema version validation
-        if "schema_version" not in agent_report:
-            print("ERROR: agent_report missing schema_version", file=sys.stderr)
-            sys.exit(1)
-        if agent_report["schema_version"] != 1:
-            print(f"ERROR: agent_report schema_version must be 1, got {agent_report['schema_version']}", file=sys.stderr)
-            sys.exit(1)
-        
-        # Epistemic closure: Fail closed on unknown top-level fields
-        known_fields = {
-            "schema_version", "agent_name", "findings", "patch_suggestions",
-            "summary", "metadata", "proof_obligations"
-        }
-        unknown_fields = set(agent_report.keys()) - known_fields
-        if unknown_fields:
-            print(f"ERROR: agent_report contains unknown fields: {sorted(unknown_fields)}", file=sys.stderr)
-            sys.exit(1)
-        
-        # Level-4: Verify proof_obligations present
-        if "proof_obligations" not in agent_report:
-            print("ERROR: agent_report missing proof_obligations", file=sys.stderr)
-            sys.exit(1)
-        
-        # Level-4: Verify execution_status in metadata
-        if "metadata" not in agent_report:
-            print("ERROR: agent_report missing metadata", file=sys.stderr)
-            sys.exit(1)
-        
-        if "execution_status" not in agent_report["metadata"]:
-            print("ERROR: agent_report metadata missing execution_status", file=sys.stderr)
-            sys.exit(1)
-        
-        # Epistemic closure: Verify execution_status is valid enum
-        valid_statuses = {"COMPLETE", "PARTIAL", "FAILED"}
-        if agent_report["metadata"]["execution_status"] not in valid_statuses:
-            print(f"ERROR: execution_status must be one of {valid_statuses}, got {agent_report['metadata']['execution_status']}", file=sys.stderr)
-            sys.exit(1)
-        
-        # Level-4: Verify proof obligations structure
-        po = agent_report["proof_obligations"]
-        required_keys = ["requires_execution_status_check", "invalid_if_ignored", "contract_violation_if_status_ignored"]
-        for key in required_keys:
-            if key not in po:
-                print(f"ERROR: proof_obligations missing required key: {key}", file=sys.stderr)
-                sys.exit(1)
-        
-        # Epistemic closure: Verify proof obligation values are bool
-        # Structural obligations must be True; computed obligations can be False when semantically correct
-        structural_obligations = {"requires_execution_status_check", "invalid_if_ignored", "contract_violation_if_status_ignored"}
-        computed_obligations = {"findings_invalid_if_failed", "findings_invalid_if_partial", "empty_findings_means_failure_not_success"}
-        for key, value in po.items():
-            if not isinstance(value, bool):
-                print(f"ERROR: proof_obligations[{key}] must be bool, got {type(value).__name__}", file=sys.stderr)
-                sys.exit(1)
-            # Structural obligations must always be True
-            if key in structural_obligations and value is not True:
-                print(f"ERROR: proof_obligations[{key}] must be True (structural obligation), got {value}", file=sys.stderr)
-                sys.exit(1)
-            # Computed obligations can be False when semantically correct (validated as bool only)
-        
-        # Epistemic closure: Fail closed on unknown proof_obligations fields
-        known_po_keys = set(required_keys) | {"findings_invalid_if_failed", "findings_invalid_if_partial", "empty_findings_means_failure_not_success"}
-        unknown_po_keys = set(po.keys()) - known_po_keys
-        if unknown_po_keys:
-            print(f"ERROR: proof_obligations contains unknown keys: {sorted(unknown_po_keys)}", file=sys.stderr)
-            sys.exit(1)
-        
-        print("Agent report proof obligations verified")
-except json.JSONDecodeError as e:
-    print(f"ERROR: Could not parse agent report JSON: {e}", file=sys.stderr)
-    sys.exit(1)  # Blocking - malformed JSON indicates bug
-except Exception as e:
-    print(f"ERROR: Proof check failed: {e}", file=sys.stderr)
-    sys.exit(1)
-PYEOF
-    
-    if [ $? -ne 0 ]; then
-        log_error "Agent report proof obligations check failed"
-        PROOF_CHECK_FAILED=1
-    else
-        log_info "Agent report proof obligations verified"
-    fi
-fi
-
 if [ $PROOF_CHECK_FAILED -eq 1 ]; then
     log_error "Proof-carrying output verification FAILED"
     exit 1
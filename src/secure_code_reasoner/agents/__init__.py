@@ -1,15 +1,51 @@
-"""Agent framework subsystem for coordinated code analysis."""
+"""Agent framework subsystem for coordinated code analysis.
 
-from secure_code_reasoner.agents.agent import Agent
-from secure_code_reasoner.agents.code_analyst import CodeAnalystAgent
-from secure_code_reasoner.agents.coordinator import AgentCoordinator
-from secure_code_reasoner.agents.patch_advisor import PatchAdvisorAgent
-from secure_code_reasoner.agents.security_reviewer import SecurityReviewerAgent
+Exports are resolved lazily so that importing the package does not import
+every agent implementation.
+"""
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from secure_code_reasoner.agents.agent import Agent
+    from secure_code_reasoner.agents.code_analyst import CodeAnalystAgent
+    from secure_code_reasoner.agents.coordinator import AgentCoordinator
+    from secure_code_reasoner.agents.isolation import AgentResourceLimits, ProcessAgentRunner
+    from secure_code_reasoner.agents.patch_advisor import PatchAdvisorAgent
+    from secure_code_reasoner.agents.registry import discover_agents, load_agents
+    from secure_code_reasoner.agents.security_reviewer import SecurityReviewerAgent
+
+_LAZY_EXPORTS = {
+    "Agent": "secure_code_reasoner.agents.agent",
+    "AgentCoordinator": "secure_code_reasoner.agents.coordinator",
+    "AgentResourceLimits": "secure_code_reasoner.agents.isolation",
+    "ProcessAgentRunner": "secure_code_reasoner.agents.isolation",
+    "CodeAnalystAgent": "secure_code_reasoner.agents.code_analyst",
+    "SecurityReviewerAgent": "secure_code_reasoner.agents.security_reviewer",
+    "PatchAdvisorAgent": "secure_code_reasoner.agents.patch_advisor",
+    "discover_agents": "secure_code_reasoner.agents.registry",
+    "load_agents": "secure_code_reasoner.agents.registry",
+}
 
 __all__ = [
     "Agent",
     "AgentCoordinator",
+    "AgentResourceLimits",
+    "ProcessAgentRunner",
     "CodeAnalystAgent",
     "SecurityReviewerAgent",
     "PatchAdvisorAgent",
+    "discover_agents",
+    "load_agents",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import an exported name on first access."""
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
@@ -1,17 +1,30 @@
 """Base agent interface for the agent framework subsystem."""
 
 from abc import ABC, abstractmethod
+from collections.abc import Iterable, Mapping
 from typing import Any
 
+from secure_code_reasoner.agents.models import AgentReport
+
 
 class Agent(ABC):
-    """Base interface for all review agents."""
+    """Base interface for all review agents.
+
+    Agents may declare dependencies on other agents by name. The coordinator runs
+    dependencies first and calls analyze(fingerprint, upstream=...) with a mapping
+    of dependency name to that agent's report.
+    """
 
-    def __init__(self, name: str) -> None:
-        """Initialize agent with name."""
+    def __init__(self, name: str, depends_on: Iterable[str] = ()) -> None:
+        """Initialize agent with name and optional agent dependencies."""
         self.name = name
+        self.depends_on: tuple[str, ...] = tuple(depends_on)
 
     @abstractmethod
-    def analyze(self, fingerprint: Any) -> Any:
-        """Analyze fingerprint and return report."""
+    def analyze(self, fingerprint: Any, upstream: Mapping[str, AgentReport] | None = None) -> Any:
+        """Analyze fingerprint and return report.
+
+        upstream maps each declared dependency to its report; it is None for agents
+        without dependencies.
+        """
         pass
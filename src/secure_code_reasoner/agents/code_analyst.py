@@ -1,6 +1,7 @@
 """Code analyst agent implementation."""
 
 import logging
+from collections.abc import Mapping
 
 from secure_code_reasoner.agents.agent import Agent
 from secure_code_reasoner.agents.models import AgentFinding, AgentReport, Severity
@@ -25,7 +26,11 @@ class CodeAnalystAgent(Agent):
         """Initialize code analyst agent."""
         super().__init__("CodeAnalyst")
 
-    def analyze(self, fingerprint: RepositoryFingerprint) -> AgentReport:
+    def analyze(
+        self,
+        fingerprint: RepositoryFingerprint,
+        upstream: Mapping[str, AgentReport] | None = None,
+    ) -> AgentReport:
         """Analyze code structure and quality."""
         if not isinstance(fingerprint, RepositoryFingerprint):
             raise AgentError(
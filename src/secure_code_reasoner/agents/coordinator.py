@@ -1,9 +1,14 @@
 """Agent coordinator for merging agent reports."""
 
 import logging
+from collections.abc import Mapping
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import replace
+from pathlib import Path
 from typing import Any
 
 from secure_code_reasoner.agents.agent import Agent
+from secure_code_reasoner.agents.isolation import ProcessAgentRunner, SharedFingerprint
 from secure_code_reasoner.agents.models import AgentFinding, AgentReport, PatchSuggestion, Severity
 from secure_code_reasoner.exceptions import AgentError
 
@@ -11,36 +16,86 @@ logger = logging.getLogger(__name__)
 
 
 class AgentCoordinator:
-    """Coordinates multiple agents and merges their findings deterministically."""
+    """Coordinates multiple agents and merges their findings deterministically.
 
-    def __init__(self, agents: list[Agent]) -> None:
-        """Initialize coordinator with agents."""
+    Agents run on a dependency DAG: agents without pending dependencies run
+    concurrently, and an agent that declares depends_on receives its
+    dependencies' reports once they complete.
+    """
+
+    def __init__(
+        self,
+        agents: list[Agent],
+        deduplicate: bool = True,
+        runner: ProcessAgentRunner | None = None,
+        max_workers: int | None = None,
+    ) -> None:
+        """Initialize coordinator with agents.
+
+        When deduplicate is True, findings from different agents that point at the
+        same (path, line, risk signal) are clustered into a single finding. When a
+        runner is given, each agent runs out of process under its resource limits.
+        max_workers bounds how many agents run at once (default: all ready agents).
+        """
         if not agents:
             raise AgentError("AgentCoordinator requires at least one agent")
+        if max_workers is not None and max_workers < 1:
+            raise AgentError("max_workers must be >= 1")
         self.agents = list(agents)
+        self.deduplicate = deduplicate
+        self.runner = runner
+        self.max_workers = max_workers
+        self._dependencies = self._resolve_dependencies()
 
-    def review(self, fingerprint: Any) -> AgentReport:
-        """Run all agents independently and merge their reports."""
-        agent_reports: list[AgentReport] = []
-        failed_agents: list[str] = []  # Mitigation C: Track failures explicitly
+    def _resolve_dependencies(self) -> list[tuple[int, ...]]:
+        """Resolve declared dependency names to agent indices and reject cycles."""
+        indices_by_name: dict[str, list[int]] = {}
+        for index, agent in enumerate(self.agents):
+            indices_by_name.setdefault(agent.name, []).append(index)
 
+        dependencies: list[tuple[int, ...]] = []
         for agent in self.agents:
-            try:
-                report = agent.analyze(fingerprint)
-                if not isinstance(report, AgentReport):
-                    logger.warning(
-                        f"Agent {agent.name} returned invalid report type: {type(report)}"
+            resolved: list[int] = []
+            for name in getattr(agent, "depends_on", ()):
+                matches = indices_by_name.get(name, [])
+                if len(matches) != 1:
+                    raise AgentError(
+                        f"Agent {agent.name} depends on {name!r}, which must match exactly one "
+                        f"agent (found {len(matches)})"
                     )
-                    failed_agents.append(agent.name)
-                    continue
-                agent_reports.append(report)
-                logger.debug(
-                    f"Agent {agent.name} completed: {len(report.findings)} findings, {len(report.patch_suggestions)} patches"
-                )
-            except Exception as e:
-                logger.error(f"Agent {agent.name} failed: {e}", exc_info=True)
-                failed_agents.append(agent.name)
-                continue
+                resolved.append(matches[0])
+            dependencies.append(tuple(resolved))
+
+        # Kahn's algorithm: any agent left unvisited is part of a cycle
+        remaining = [len(deps) for deps in dependencies]
+        ready = [i for i, count in enumerate(remaining) if count == 0]
+        visited = 0
+        while ready:
+            index = ready.pop()
+            visited += 1
+            for dependent, deps in enumerate(dependencies):
+                if index in deps:
+                    remaining[dependent] -= 1
+                    if remaining[dependent] == 0:
+                        ready.append(dependent)
+        if visited != len(self.agents):
+            cyclic = sorted(self.agents[i].name for i, count in enumerate(remaining) if count)
+            raise AgentError(f"Agent dependency cycle detected among: {', '.join(cyclic)}")
+        return dependencies
+
+    def review(self, fingerprint: Any) -> AgentReport:
+        """Run all agents in dependency order and merge their reports."""
+        # Serialize the fingerprint once; every isolated worker maps the same buffer
+        shared = SharedFingerprint(fingerprint) if self.runner else None
+        try:
+            reports_by_index, failed_indices = self._run_scheduled(fingerprint, shared)
+        finally:
+            if shared is not None:
+                shared.close()
+
+        agent_reports = [reports_by_index[i] for i in sorted(reports_by_index)]
+        # Mitigation C: Track failures explicitly
+        failed_agents = [self.agents[i].name for i in sorted(failed_indices)]
 
         # Mitigation C: Explicit failure tracking - distinguish "no findings" from "agent failure"
         if not agent_reports:
@@ -60,7 +115,8 @@ class AgentCoordinator:
 
         merged_findings = self._merge_findings(agent_reports)
         merged_patches = self._merge_patches(agent_reports)
-        summary = self._generate_summary(agent_reports)
+        raw_finding_count = sum(len(r.findings) for r in agent_reports)
+        summary = self._generate_summary(agent_reports, merged_findings)
 
         # Mitigation C: Include failure information even when some agents succeed
         execution_status = "PARTIAL" if failed_agents else "COMPLETE"
@@ -73,6 +129,8 @@ class AgentCoordinator:
         if failed_agents:
             metadata["agents_failed"] = len(failed_agents)
             metadata["failed_agent_names"] = sorted(failed_agents)
+        if raw_finding_count > len(merged_findings):
+            metadata["findings_deduplicated"] = raw_finding_count - len(merged_findings)
 
         return AgentReport(
             agent_name="Coordinator",
@@ -82,17 +140,170 @@ class AgentCoordinator:
             metadata=metadata,
         )
 
+    def _run_scheduled(
+        self, fingerprint: Any, shared: SharedFingerprint | None
+    ) -> tuple[dict[int, AgentReport], set[int]]:
+        """Run agents as their dependencies complete, independent agents concurrently."""
+        dependents: list[list[int]] = [[] for _ in self.agents]
+        for index, deps in enumerate(self._dependencies):
+            for dep in deps:
+                dependents[dep].append(index)
+        remaining = [len(deps) for deps in self._dependencies]
+        reports: dict[int, AgentReport] = {}
+        failed: set[int] = set()
+
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers or len(self.agents), thread_name_prefix="scr-agent"
+        ) as executor:
+            pending: dict[Future, int] = {}
+
+            def submit(index: int) -> None:
+                upstream = {
+                    self.agents[dep].name: reports[dep] for dep in self._dependencies[index]
+                }
+                future = executor.submit(self._run_agent, index, fingerprint, shared, upstream)
+                pending[future] = index
+
+            def settle(index: int) -> None:
+                # Release dependents; a failed dependency fails its dependents without running
+                stack = [index]
+                while stack:
+                    finished = stack.pop()
+                    for dependent in dependents[finished]:
+                        remaining[dependent] -= 1
+                        if remaining[dependent] > 0:
+                            continue
+                        if any(dep in failed for dep in self._dependencies[dependent]):
+                            logger.error(
+                                f"Agent {self.agents[dependent].name} skipped: a dependency failed"
+                            )
+                            failed.add(dependent)
+                            stack.append(dependent)
+                        else:
+                            submit(dependent)
+
+            for index, count in enumerate(remaining):
+                if count == 0:
+                    submit(index)
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = pending.pop(future)
+                    report = future.result()
+                    if report is None:
+                        failed.add(index)
+                    else:
+                        reports[index] = report
+                    settle(index)
+
+        return reports, failed
+
+    def _run_agent(
+        self,
+        index: int,
+        fingerprint: Any,
+        shared: SharedFingerprint | None,
+        upstream: Mapping[str, AgentReport],
+    ) -> AgentReport | None:
+        """Run a single agent, returning None if it fails or returns an invalid report.
+
+        Runs in process, or in a worker process when a runner is set. Agents with
+        declared dependencies receive their upstream reports.
+        """
+        agent = self.agents[index]
+        try:
+            if self.runner is not None and shared is not None:
+                report = self.runner.run(agent, shared, upstream if upstream else None)
+            elif upstream:
+                report = agent.analyze(fingerprint, upstream=upstream)
+            else:
+                report = agent.analyze(fingerprint)
+        except Exception as e:
+            logger.error(f"Agent {agent.name} failed: {e}", exc_info=True)
+            return None
+        if not isinstance(report, AgentReport):
+            logger.warning(f"Agent {agent.name} returned invalid report type: {type(report)}")
+            return None
+        logger.debug(
+            f"Agent {agent.name} completed: {len(report.findings)} findings, {len(report.patch_suggestions)} patches"
+        )
+        return report
+
     def _merge_findings(self, reports: list[AgentReport]) -> frozenset:
         """Merge findings from all agent reports deterministically."""
         all_findings: list[AgentFinding] = []
         for report in reports:
             all_findings.extend(report.findings)
 
+        if self.deduplicate:
+            all_findings = self._cluster_findings(all_findings)
+
         all_findings.sort(
             key=lambda f: (f.severity.priority(), f.title, f.agent_name), reverse=True
         )
         return frozenset(all_findings)
 
+    def _cluster_findings(self, findings: list[AgentFinding]) -> list[AgentFinding]:
+        """Collapse co-located findings into one record per (path, line, signal).
+
+        Uses a hash index keyed on the location and risk signal, so clustering is
+        linear in the number of findings. Findings without a complete key pass
+        through unchanged.
+        """
+        clusters: dict[tuple[str, int, str], list[AgentFinding]] = {}
+        result: list[AgentFinding] = []
+        for finding in findings:
+            key = self._cluster_key(finding)
+            if key is None:
+                result.append(finding)
+            else:
+                clusters.setdefault(key, []).append(finding)
+
+        for group in clusters.values():
+            result.append(group[0] if len(group) == 1 else self._merge_cluster(group))
+        return result
+
+    def _cluster_key(self, finding: AgentFinding) -> tuple[str, int, str] | None:
+        """Get the clustering key for a finding, or None if it cannot be clustered."""
+        signal = finding.metadata.get("signal")
+        if finding.file_path is None or finding.line_number is None or not signal:
+            return None
+        return (Path(finding.file_path).as_posix(), finding.line_number, str(signal))
+
+    def _merge_cluster(self, group: list[AgentFinding]) -> AgentFinding:
+        """Merge co-located findings, keeping the most severe detection as the primary record.
+
+        Patch suggestions only rank after findings that describe the issue, so a
+        reviewer's title and recommendation are kept; the merged record takes the
+        highest severity in the cluster.
+        """
+        ordered = sorted(
+            group,
+            key=lambda f: (
+                bool(f.metadata.get("patch_available")),
+                -f.severity.priority(),
+                f.agent_name,
+                f.title,
+            ),
+        )
+        primary = ordered[0]
+        severity = max((f.severity for f in ordered), key=lambda s: s.priority())
+
+        metadata: dict[str, Any] = {}
+        for finding in reversed(ordered):
+            metadata.update(finding.metadata)
+        metadata["contributing_agents"] = sorted({f.agent_name for f in ordered})
+        metadata["merged_finding_count"] = len(ordered)
+
+        return replace(
+            primary,
+            severity=severity,
+            code_snippet=next((f.code_snippet for f in ordered if f.code_snippet), None),
+            recommendation=next((f.recommendation for f in ordered if f.recommendation), None),
+            metadata=metadata,
+        )
+
     def _merge_patches(self, reports: list[AgentReport]) -> frozenset:
         """Merge patch suggestions from all agent reports deterministically."""
         all_patches: list[PatchSuggestion] = []
@@ -102,9 +313,11 @@ class AgentCoordinator:
         all_patches.sort(key=lambda p: (p.file_path.as_posix(), p.line_start, p.description))
         return frozenset(all_patches)
 
-    def _generate_summary(self, reports: list[AgentReport]) -> str:
-        """Generate summary from all agent reports."""
-        total_findings = sum(len(r.findings) for r in reports)
+    def _generate_summary(
+        self, reports: list[AgentReport], findings: frozenset[AgentFinding]
+    ) -> str:
+        """Generate summary from all agent reports and the merged findings."""
+        total_findings = len(findings)
         total_patches = sum(len(r.patch_suggestions) for r in reports)
 
         severity_counts = {
@@ -115,9 +328,8 @@ class AgentCoordinator:
             Severity.INFO: 0,
         }
 
-        for report in reports:
-            for finding in report.findings:
-                severity_counts[finding.severity] = severity_counts.get(finding.severity, 0) + 1
+        for finding in findings:
+            severity_counts[finding.severity] = severity_counts.get(finding.severity, 0) + 1
 
         summary_parts = [
             f"Coordinated review by {len(reports)} agent(s):",
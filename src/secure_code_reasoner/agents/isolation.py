@@ -0,0 +1,197 @@
+"""Process-isolated agent execution with shared-memory fingerprint handoff."""
+
+import logging
+import multiprocessing
+import pickle
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from multiprocessing.connection import Connection, wait
+from typing import Any
+
+from secure_code_reasoner.agents.agent import Agent
+from secure_code_reasoner.exceptions import AgentError
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - resource is unavailable on Windows
+    resource = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+# Agents run from the coordinator's thread pool, and forking a multithreaded
+# parent can deadlock the child on locks another thread held (logging's, say)
+DEFAULT_START_METHOD = (
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+
+@dataclass(frozen=True)
+class AgentResourceLimits:
+    """Per-agent resource limits enforced on the worker process.
+
+    wall_timeout is enforced by the parent; cpu_seconds and max_memory_bytes are
+    applied as RLIMIT_CPU and RLIMIT_AS inside the worker so the kernel stops a
+    runaway agent.
+    """
+
+    wall_timeout: float = 60.0
+    cpu_seconds: int | None = None
+    max_memory_bytes: int | None = None
+
+    def __post_init__(self) -> None:
+        """Validate resource limits."""
+        if self.wall_timeout <= 0:
+            raise ValueError("wall_timeout must be > 0")
+        if self.cpu_seconds is not None and self.cpu_seconds < 1:
+            raise ValueError("cpu_seconds must be >= 1 if provided")
+        if self.max_memory_bytes is not None and self.max_memory_bytes < 1:
+            raise ValueError("max_memory_bytes must be >= 1 if provided")
+
+
+class SharedFingerprint:
+    """Fingerprint serialized once into a shared-memory buffer.
+
+    Worker processes attach to the segment by name and unpickle directly from the
+    mapped buffer, so the payload is never copied through a pipe per agent.
+    """
+
+    def __init__(self, fingerprint: Any) -> None:
+        """Serialize fingerprint into a new shared-memory segment."""
+        try:
+            payload = pickle.dumps(fingerprint, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            raise AgentError(f"Fingerprint cannot be shared with agent workers: {e}") from e
+        self.size = len(payload)
+        self._shm = shared_memory.SharedMemory(create=True, size=max(self.size, 1))
+        self._shm.buf[: self.size] = payload
+        self.name = self._shm.name
+
+    def close(self) -> None:
+        """Release and unlink the shared-memory segment."""
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self) -> "SharedFingerprint":
+        """Enter context manager."""
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """Release the segment on context exit."""
+        self.close()
+
+    @staticmethod
+    def attach(name: str, size: int) -> Any:
+        """Attach to a shared segment and load the fingerprint from it."""
+        shm = shared_memory.SharedMemory(name=name)
+        view = shm.buf[:size]
+        try:
+            return pickle.loads(view)
+        finally:
+            view.release()
+            shm.close()
+
+
+def _apply_resource_limits(limits: AgentResourceLimits) -> None:
+    """Apply rlimits to the current (worker) process."""
+    if resource is None:
+        return
+    if limits.cpu_seconds is not None:
+        resource.setrlimit(resource.RLIMIT_CPU, (limits.cpu_seconds, limits.cpu_seconds))
+    if limits.max_memory_bytes is not None:
+        resource.setrlimit(resource.RLIMIT_AS, (limits.max_memory_bytes, limits.max_memory_bytes))
+
+
+def _run_agent_worker(
+    agent: Agent,
+    shm_name: str,
+    size: int,
+    limits: AgentResourceLimits,
+    conn: Connection,
+    upstream: Mapping[str, Any] | None,
+) -> None:
+    """Worker process entrypoint: load the shared fingerprint and run one agent."""
+    try:
+        _apply_resource_limits(limits)
+        fingerprint = SharedFingerprint.attach(shm_name, size)
+        if upstream:
+            report = agent.analyze(fingerprint, upstream=upstream)
+        else:
+            report = agent.analyze(fingerprint)
+        conn.send(("ok", report))
+    except Exception as e:
+        conn.send(("error", f"{type(e).__name__}: {e}"))
+    finally:
+        conn.close()
+
+
+class ProcessAgentRunner:
+    """Runs each agent in its own worker process under resource limits."""
+
+    def __init__(
+        self, limits: AgentResourceLimits | None = None, start_method: str | None = None
+    ) -> None:
+        """Initialize runner with resource limits and multiprocessing start method.
+
+        start_method defaults to DEFAULT_START_METHOD, "forkserver" where available
+        and "spawn" otherwise, never "fork": run() is called from worker threads.
+        Agents and their upstream reports must therefore be picklable.
+        """
+        self.limits = limits or AgentResourceLimits()
+        self.start_method = start_method or DEFAULT_START_METHOD
+
+    def run(
+        self,
+        agent: Agent,
+        shared: SharedFingerprint,
+        upstream: Mapping[str, Any] | None = None,
+    ) -> Any:
+        """Run agent against a shared fingerprint and return its report.
+
+        upstream carries dependency reports for agents that declare depends_on.
+
+        Raises:
+            AgentError: If the worker fails, exceeds a limit, or is killed
+        """
+        ctx = multiprocessing.get_context(self.start_method)
+        receiver, sender = ctx.Pipe(duplex=False)
+        process = ctx.Process(  # type: ignore[attr-defined]
+            target=_run_agent_worker,
+            args=(agent, shared.name, shared.size, self.limits, sender, upstream),
+            name=f"scr-agent-{agent.name}",
+            daemon=True,
+        )
+        process.start()
+        sender.close()
+
+        deadline = time.monotonic() + self.limits.wall_timeout
+        result: tuple[str, Any] | None = None
+        try:
+            ready = wait([receiver, process.sentinel], timeout=self.limits.wall_timeout)
+            if not ready:
+                raise AgentError(
+                    f"Agent {agent.name} exceeded wall-clock limit of "
+                    f"{self.limits.wall_timeout}s and was killed"
+                )
+            if receiver in ready:
+                try:
+                    result = receiver.recv()
+                except EOFError:
+                    result = None
+            process.join(max(deadline - time.monotonic(), 0.0))
+        finally:
+            receiver.close()
+            if process.is_alive():
+                process.kill()
+                process.join()
+
+        if result is None:
+            raise AgentError(
+                f"Agent {agent.name} worker exited without a report (exit code {process.exitcode})"
+            )
+        status, payload = result
+        if status != "ok":
+            raise AgentError(f"Agent {agent.name} failed in worker: {payload}")
+        logger.debug(f"Agent {agent.name} worker finished with exit code {process.exitcode}")
+        return payload
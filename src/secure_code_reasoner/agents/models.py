@@ -228,29 +228,11 @@ class AgentReport:
         if not isinstance(self.patch_suggestions, frozenset):
             object.__setattr__(self, "patch_suggestions", frozenset(self.patch_suggestions))
 
-    def to_dict(self) -> dict[str, Any]:
-        """Convert agent report to dictionary for serialization."""
+    def proof_obligations(self) -> dict[str, bool]:
+        """Get the proof obligations serialized with the report, without serializing it."""
         execution_status = self.metadata.get("execution_status", "COMPLETE")
-        result = {
-            "schema_version": 1,  # Epistemic closure: Schema versioning for drift resistance
-            "agent_name": self.agent_name,
-            "findings": [
-                finding.to_dict()
-                for finding in sorted(
-                    self.findings, key=lambda f: (f.severity.priority(), f.title), reverse=True
-                )
-            ],
-            "patch_suggestions": [
-                patch.to_dict()
-                for patch in sorted(
-                    self.patch_suggestions, key=lambda p: (p.file_path, p.line_start)
-                )
-            ],
-            "summary": self.summary,
-            "metadata": self.metadata,
-        }
         # Epistemic closure: Proof-carrying output with value validation
-        proof_obligations = {
+        return {
             "requires_execution_status_check": True,
             "invalid_if_ignored": True,
             "findings_invalid_if_failed": execution_status == "FAILED",
@@ -258,9 +240,34 @@ class AgentReport:
             "empty_findings_means_failure_not_success": execution_status != "COMPLETE",
             "contract_violation_if_status_ignored": True,
         }
+
+    def to_dict(self, lazy: bool = False) -> dict[str, Any]:
+        """Convert agent report to dictionary for serialization.
+
+        With lazy, "findings" and "patch_suggestions" are iterators that build each
+        entry's dictionary as it is consumed, for streaming serialization.
+        """
+        findings = (
+            finding.to_dict()
+            for finding in sorted(
+                self.findings, key=lambda f: (f.severity.priority(), f.title), reverse=True
+            )
+        )
+        patch_suggestions = (
+            patch.to_dict()
+            for patch in sorted(self.patch_suggestions, key=lambda p: (p.file_path, p.line_start))
+        )
+        result = {
+            "schema_version": 1,  # Epistemic closure: Schema versioning for drift resistance
+            "agent_name": self.agent_name,
+            "findings": findings if lazy else list(findings),
+            "patch_suggestions": patch_suggestions if lazy else list(patch_suggestions),
+            "summary": self.summary,
+            "metadata": self.metadata,
+        }
         # Note: Contract enforcement happens at verification time (verify.sh), not serialization time
         # This allows computed proof obligations to be False when semantically correct
-        result["proof_obligations"] = proof_obligations
+        result["proof_obligations"] = self.proof_obligations()
         # Note: Schema contract enforcement happens at verification time (verify.sh)
         # This allows serialization to proceed even if schema validation would fail
         # verify.sh will catch schema violations before accepting the output
@@ -1,6 +1,8 @@
 """Patch advisor agent implementation."""
 
 import logging
+import re
+from collections.abc import Mapping
 
 from secure_code_reasoner.agents.agent import Agent
 from secure_code_reasoner.agents.models import AgentFinding, AgentReport, PatchSuggestion, Severity
@@ -18,11 +20,26 @@ logger = logging.getLogger(__name__)
 class PatchAdvisorAgent(Agent):
     """Agent that suggests code patches for identified issues. Only suggests diffs, never modifies code."""
 
+    # Most source lines a patch replaces when the risky call cannot be located
+    SNIPPET_MAX_LINES = 10
+    # Calls carrying each patched risk signal, to point patches at the call line
+    CALL_PATTERNS = {
+        RiskSignal.DYNAMIC_CODE_EXECUTION: re.compile(r"\b(?:eval|exec|__import__)\s*\("),
+        # Only qualified deserializer calls: a bare load( also matches "def load(" lines
+        RiskSignal.DESERIALIZATION: re.compile(
+            r"\b(?:pickle|cPickle|dill|marshal|yaml)\.(?:load|loads|unsafe_load)\s*\("
+        ),
+    }
+
     def __init__(self) -> None:
         """Initialize patch advisor agent."""
         super().__init__("PatchAdvisor")
 
-    def analyze(self, fingerprint: RepositoryFingerprint) -> AgentReport:
+    def analyze(
+        self,
+        fingerprint: RepositoryFingerprint,
+        upstream: Mapping[str, AgentReport] | None = None,
+    ) -> AgentReport:
         """Analyze fingerprint and suggest patches."""
         if not isinstance(fingerprint, RepositoryFingerprint):
             raise AgentError(
@@ -32,43 +49,56 @@ class PatchAdvisorAgent(Agent):
         findings: list[AgentFinding] = []
         patch_suggestions: list[PatchSuggestion] = []
 
-        for artifact in fingerprint.artifacts:
-            if RiskSignal.DYNAMIC_CODE_EXECUTION in artifact.risk_signals:
-                patch = self._suggest_eval_replacement(artifact)
-                if patch:
-                    patch_suggestions.append(patch)
-                    findings.append(
-                        AgentFinding(
-                            agent_name=self.name,
-                            severity=Severity.CRITICAL,
-                            title="Suggested patch for dynamic code execution",
-                            description=f"Replace dynamic code execution in {artifact.name} with safer alternative.",
-                            file_path=artifact.path,
-                            line_number=artifact.start_line,
-                            recommendation="Apply the suggested patch to remove dynamic code execution.",
-                            metadata={"patch_available": True},
-                        )
+        for artifact in fingerprint.artifacts_with_signal(RiskSignal.DYNAMIC_CODE_EXECUTION):
+            patch = self._suggest_eval_replacement(
+                artifact,
+                *self._locate(fingerprint, artifact, RiskSignal.DYNAMIC_CODE_EXECUTION),
+            )
+            if patch:
+                patch_suggestions.append(patch)
+                findings.append(
+                    AgentFinding(
+                        agent_name=self.name,
+                        severity=Severity.CRITICAL,
+                        title="Suggested patch for dynamic code execution",
+                        description=f"Replace dynamic code execution in {artifact.name} with safer alternative.",
+                        file_path=artifact.path,
+                        line_number=artifact.start_line,
+                        recommendation="Apply the suggested patch to remove dynamic code execution.",
+                        metadata={
+                            "patch_available": True,
+                            "signal": RiskSignal.DYNAMIC_CODE_EXECUTION.value,
+                        },
                     )
+                )
 
-            if RiskSignal.DESERIALIZATION in artifact.risk_signals:
-                patch = self._suggest_safe_deserialization(artifact)
-                if patch:
-                    patch_suggestions.append(patch)
-                    findings.append(
-                        AgentFinding(
-                            agent_name=self.name,
-                            severity=Severity.HIGH,
-                            title="Suggested patch for unsafe deserialization",
-                            description=f"Replace unsafe deserialization in {artifact.name} with safer alternative.",
-                            file_path=artifact.path,
-                            line_number=artifact.start_line,
-                            recommendation="Apply the suggested patch to use safe deserialization.",
-                            metadata={"patch_available": True},
-                        )
+        for artifact in fingerprint.artifacts_with_signal(RiskSignal.DESERIALIZATION):
+            patch = self._suggest_safe_deserialization(
+                artifact, *self._locate(fingerprint, artifact, RiskSignal.DESERIALIZATION)
+            )
+            if patch:
+                patch_suggestions.append(patch)
+                findings.append(
+                    AgentFinding(
+                        agent_name=self.name,
+                        severity=Severity.HIGH,
+                        title="Suggested patch for unsafe deserialization",
+                        description=f"Replace unsafe deserialization in {artifact.name} with safer alternative.",
+                        file_path=artifact.path,
+                        line_number=artifact.start_line,
+                        recommendation="Apply the suggested patch to use safe deserialization.",
+                        metadata={
+                            "patch_available": True,
+                            "signal": RiskSignal.DESERIALIZATION.value,
+                        },
                     )
+                )
 
+        for artifact in fingerprint.artifacts:
             if isinstance(artifact, FunctionArtifact) and len(artifact.parameters) > 7:
-                patch = self._suggest_parameter_refactoring(artifact)
+                patch = self._suggest_parameter_refactoring(
+                    artifact, *self._locate(fingerprint, artifact)
+                )
                 if patch:
                     patch_suggestions.append(patch)
                     findings.append(
@@ -94,26 +124,60 @@ class PatchAdvisorAgent(Agent):
             metadata={"patch_count": len(patch_suggestions)},
         )
 
-    def _suggest_eval_replacement(self, artifact: CodeArtifact) -> PatchSuggestion | None:
+    def _locate(
+        self,
+        fingerprint: RepositoryFingerprint,
+        artifact: CodeArtifact,
+        signal: RiskSignal | None = None,
+    ) -> tuple[int, int, str | None]:
+        """Get the lines a patch replaces and their source, if the fingerprint indexed it.
+
+        That is the first line of the artifact calling what signal flags, or else the
+        artifact's leading SNIPPET_MAX_LINES lines, so a patch never spans a whole file.
+        """
+        pattern = self.CALL_PATTERNS.get(signal) if signal else None
+        if pattern is not None:
+            source = fingerprint.source_snippet(
+                artifact.path, artifact.start_line, artifact.end_line
+            )
+            for offset, line in enumerate((source or "").splitlines()):
+                if pattern.search(line):
+                    line_number = artifact.start_line + offset
+                    return line_number, line_number, line
+        end_line = min(artifact.end_line, artifact.start_line + self.SNIPPET_MAX_LINES - 1)
+        return (
+            artifact.start_line,
+            end_line,
+            fingerprint.source_snippet(artifact.path, artifact.start_line, end_line),
+        )
+
+    def _suggest_eval_replacement(
+        self, artifact: CodeArtifact, line_start: int, line_end: int, original_code: str | None
+    ) -> PatchSuggestion | None:
         """Suggest replacement for eval() usage."""
         return PatchSuggestion(
             file_path=artifact.path,
-            original_code="# Example: result = eval(user_input)\nresult = eval(user_input)",
+            original_code=original_code
+            or "# Example: result = eval(user_input)\nresult = eval(user_input)",
             suggested_code="# Use JSON parsing or explicit parsing logic instead\nimport json\nresult = json.loads(user_input)  # Validate input first",
             description="Replace eval() with safer JSON parsing or explicit parsing logic. Always validate input before parsing.",
-            line_start=artifact.start_line,
-            line_end=artifact.end_line,
+            line_start=line_start,
+            line_end=line_end,
             metadata={
                 "risk_signal": RiskSignal.DYNAMIC_CODE_EXECUTION.value,
                 "artifact_name": artifact.name,
+                "artifact_line": artifact.start_line,
             },
         )
 
-    def _suggest_safe_deserialization(self, artifact: CodeArtifact) -> PatchSuggestion | None:
+    def _suggest_safe_deserialization(
+        self, artifact: CodeArtifact, line_start: int, line_end: int, original_code: str | None
+    ) -> PatchSuggestion | None:
         """Suggest safer deserialization approach."""
         return PatchSuggestion(
             file_path=artifact.path,
-            original_code="# Example: data = pickle.loads(untrusted_data)\ndata = pickle.loads(untrusted_data)",
+            original_code=original_code
+            or "# Example: data = pickle.loads(untrusted_data)\ndata = pickle.loads(untrusted_data)",
             suggested_code=(
                 "# Use restricted unpickler with allowlist\n"
                 "import pickle\n"
@@ -128,20 +192,28 @@ class PatchAdvisorAgent(Agent):
                 "data = RestrictedUnpickler(io.BytesIO(untrusted_data)).load()"
             ),
             description="Use restricted unpickler with allowlist to prevent arbitrary code execution. Only allow deserialization of known safe classes.",
-            line_start=artifact.start_line,
-            line_end=artifact.end_line,
+            line_start=line_start,
+            line_end=line_end,
             metadata={
                 "risk_signal": RiskSignal.DESERIALIZATION.value,
                 "artifact_name": artifact.name,
+                "artifact_line": artifact.start_line,
             },
         )
 
-    def _suggest_parameter_refactoring(self, artifact: FunctionArtifact) -> PatchSuggestion | None:
+    def _suggest_parameter_refactoring(
+        self,
+        artifact: FunctionArtifact,
+        line_start: int,
+        line_end: int,
+        original_code: str | None,
+    ) -> PatchSuggestion | None:
         """Suggest refactoring for functions with many parameters."""
         param_list = ", ".join(sorted(artifact.parameters))
         return PatchSuggestion(
             file_path=artifact.path,
-            original_code=f"def {artifact.name}({param_list}):\n    # function body",
+            original_code=original_code
+            or f"def {artifact.name}({param_list}):\n    # function body",
             suggested_code=(
                 f"from dataclasses import dataclass\n\n"
                 f"@dataclass\n"
@@ -153,7 +225,11 @@ class PatchAdvisorAgent(Agent):
                 f"    # function body"
             ),
             description=f"Refactor function to use a parameter object (dataclass) to reduce parameter count from {len(artifact.parameters)}.",
-            line_start=artifact.start_line,
-            line_end=artifact.end_line,
-            metadata={"parameter_count": len(artifact.parameters), "artifact_name": artifact.name},
+            line_start=line_start,
+            line_end=line_end,
+            metadata={
+                "parameter_count": len(artifact.parameters),
+                "artifact_name": artifact.name,
+                "artifact_line": artifact.start_line,
+            },
         )
@@ -0,0 +1,73 @@
+"""Agent plugin discovery via package entry points.
+
+Discovery only reads entry point metadata; an agent's module is imported when
+that agent is selected and loaded.
+"""
+
+import logging
+from collections.abc import Iterable
+from importlib.metadata import EntryPoint, entry_points
+
+from secure_code_reasoner.agents.agent import Agent
+from secure_code_reasoner.exceptions import AgentError
+
+logger = logging.getLogger(__name__)
+
+AGENT_ENTRY_POINT_GROUP = "secure_code_reasoner.agents"
+
+# Built-in agents, also registered in pyproject.toml. Listed here so discovery
+# works when the package runs from a source tree without installed metadata.
+BUILTIN_AGENTS = {
+    "code_analyst": "secure_code_reasoner.agents.code_analyst:CodeAnalystAgent",
+    "security_reviewer": "secure_code_reasoner.agents.security_reviewer:SecurityReviewerAgent",
+    "patch_advisor": "secure_code_reasoner.agents.patch_advisor:PatchAdvisorAgent",
+}
+
+
+def discover_agents() -> dict[str, EntryPoint]:
+    """Discover available agents by name without importing them."""
+    discovered = {
+        name: EntryPoint(name=name, value=value, group=AGENT_ENTRY_POINT_GROUP)
+        for name, value in BUILTIN_AGENTS.items()
+    }
+    for entry_point in entry_points(group=AGENT_ENTRY_POINT_GROUP):
+        discovered[entry_point.name] = entry_point
+    return dict(sorted(discovered.items()))
+
+
+def load_agent(entry_point: EntryPoint) -> Agent:
+    """Import an agent's module and instantiate the agent.
+
+    Raises:
+        AgentError: If the entry point cannot be imported or does not produce an Agent
+    """
+    try:
+        factory = entry_point.load()
+        agent = factory()
+    except Exception as e:
+        raise AgentError(
+            f"Failed to load agent '{entry_point.name}' ({entry_point.value}): {e}"
+        ) from e
+    if not isinstance(agent, Agent):
+        raise AgentError(
+            f"Entry point '{entry_point.name}' ({entry_point.value}) did not produce an Agent, "
+            f"got {type(agent).__name__}"
+        )
+    logger.debug(f"Loaded agent {agent.name} from {entry_point.value}")
+    return agent
+
+
+def load_agents(names: Iterable[str] | None = None) -> list[Agent]:
+    """Load the selected agents, or every discovered agent when names is None.
+
+    Raises:
+        AgentError: If a selected name is not a discovered agent
+    """
+    available = discover_agents()
+    selected = list(available) if names is None else list(dict.fromkeys(names))
+    unknown = [name for name in selected if name not in available]
+    if unknown:
+        raise AgentError(
+            f"Unknown agent(s): {', '.join(unknown)}. Available: {', '.join(available)}"
+        )
+    return [load_agent(available[name]) for name in selected]
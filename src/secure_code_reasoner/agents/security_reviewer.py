@@ -1,11 +1,13 @@
 """Security reviewer agent implementation."""
 
 import logging
+from collections.abc import Mapping
 
 from secure_code_reasoner.agents.agent import Agent
 from secure_code_reasoner.agents.models import AgentFinding, AgentReport, Severity
 from secure_code_reasoner.exceptions import AgentError
 from secure_code_reasoner.fingerprinting.models import (
+    CodeArtifact,
     RepositoryFingerprint,
     RiskSignal,
 )
@@ -29,11 +31,18 @@ class SecurityReviewerAgent(Agent):
         RiskSignal.UNSAFE_MEMORY_OPERATIONS: Severity.HIGH,
     }
 
+    # Findings carry at most this many source lines from the start of the artifact
+    SNIPPET_MAX_LINES = 10
+
     def __init__(self) -> None:
         """Initialize security reviewer agent."""
         super().__init__("SecurityReviewer")
 
-    def analyze(self, fingerprint: RepositoryFingerprint) -> AgentReport:
+    def analyze(
+        self,
+        fingerprint: RepositoryFingerprint,
+        upstream: Mapping[str, AgentReport] | None = None,
+    ) -> AgentReport:
         """Analyze security risks in fingerprint."""
         if not isinstance(fingerprint, RepositoryFingerprint):
             raise AgentError(
@@ -56,48 +65,59 @@ class SecurityReviewerAgent(Agent):
                     )
                 )
 
-        for artifact in fingerprint.artifacts:
-            if RiskSignal.DYNAMIC_CODE_EXECUTION in artifact.risk_signals:
-                findings.append(
-                    AgentFinding(
-                        agent_name=self.name,
-                        severity=Severity.CRITICAL,
-                        title="Dynamic code execution detected",
-                        description=f"Dynamic code execution detected in {artifact.name}. This is a high-risk pattern that can lead to code injection vulnerabilities.",
-                        file_path=artifact.path,
-                        line_number=artifact.start_line,
-                        recommendation="Avoid eval(), exec(), or similar dynamic execution. Use static code patterns or safe alternatives like ast.literal_eval() for simple expressions.",
-                        metadata={"artifact_type": artifact.artifact_type.value},
-                    )
+        for artifact in fingerprint.artifacts_with_signal(RiskSignal.DYNAMIC_CODE_EXECUTION):
+            findings.append(
+                AgentFinding(
+                    agent_name=self.name,
+                    severity=Severity.CRITICAL,
+                    title="Dynamic code execution detected",
+                    description=f"Dynamic code execution detected in {artifact.name}. This is a high-risk pattern that can lead to code injection vulnerabilities.",
+                    file_path=artifact.path,
+                    line_number=artifact.start_line,
+                    code_snippet=self._snippet(fingerprint, artifact),
+                    recommendation="Avoid eval(), exec(), or similar dynamic execution. Use static code patterns or safe alternatives like ast.literal_eval() for simple expressions.",
+                    metadata={
+                        "artifact_type": artifact.artifact_type.value,
+                        "signal": RiskSignal.DYNAMIC_CODE_EXECUTION.value,
+                    },
                 )
+            )
 
-            if RiskSignal.DESERIALIZATION in artifact.risk_signals:
-                findings.append(
-                    AgentFinding(
-                        agent_name=self.name,
-                        severity=Severity.HIGH,
-                        title="Deserialization detected",
-                        description=f"Deserialization detected in {artifact.name}. Untrusted data deserialization can lead to arbitrary code execution.",
-                        file_path=artifact.path,
-                        line_number=artifact.start_line,
-                        recommendation="Validate and sanitize all deserialized data. Consider using safer serialization formats like JSON, or use restricted unpicklers with allowlists.",
-                        metadata={"artifact_type": artifact.artifact_type.value},
-                    )
+        for artifact in fingerprint.artifacts_with_signal(RiskSignal.DESERIALIZATION):
+            findings.append(
+                AgentFinding(
+                    agent_name=self.name,
+                    severity=Severity.HIGH,
+                    title="Deserialization detected",
+                    description=f"Deserialization detected in {artifact.name}. Untrusted data deserialization can lead to arbitrary code execution.",
+                    file_path=artifact.path,
+                    line_number=artifact.start_line,
+                    code_snippet=self._snippet(fingerprint, artifact),
+                    recommendation="Validate and sanitize all deserialized data. Consider using safer serialization formats like JSON, or use restricted unpicklers with allowlists.",
+                    metadata={
+                        "artifact_type": artifact.artifact_type.value,
+                        "signal": RiskSignal.DESERIALIZATION.value,
+                    },
                 )
+            )
 
-            if RiskSignal.PROCESS_EXECUTION in artifact.risk_signals:
-                findings.append(
-                    AgentFinding(
-                        agent_name=self.name,
-                        severity=Severity.HIGH,
-                        title="Process execution detected",
-                        description=f"Process execution detected in {artifact.name}. Ensure proper input validation and sandboxing.",
-                        file_path=artifact.path,
-                        line_number=artifact.start_line,
-                        recommendation="Validate all inputs to subprocess calls. Use allowlists for commands. Avoid shell=True when possible.",
-                        metadata={"artifact_type": artifact.artifact_type.value},
-                    )
+        for artifact in fingerprint.artifacts_with_signal(RiskSignal.PROCESS_EXECUTION):
+            findings.append(
+                AgentFinding(
+                    agent_name=self.name,
+                    severity=Severity.HIGH,
+                    title="Process execution detected",
+                    description=f"Process execution detected in {artifact.name}. Ensure proper input validation and sandboxing.",
+                    file_path=artifact.path,
+                    line_number=artifact.start_line,
+                    code_snippet=self._snippet(fingerprint, artifact),
+                    recommendation="Validate all inputs to subprocess calls. Use allowlists for commands. Avoid shell=True when possible.",
+                    metadata={
+                        "artifact_type": artifact.artifact_type.value,
+                        "signal": RiskSignal.PROCESS_EXECUTION.value,
+                    },
                 )
+            )
 
         critical_count = sum(1 for f in findings if f.severity == Severity.CRITICAL)
         high_count = sum(1 for f in findings if f.severity == Severity.HIGH)
@@ -120,6 +140,11 @@ class SecurityReviewerAgent(Agent):
             },
         )
 
+    def _snippet(self, fingerprint: RepositoryFingerprint, artifact: CodeArtifact) -> str | None:
+        """Get the leading source lines of an artifact, if the fingerprint indexed them."""
+        end_line = min(artifact.end_line, artifact.start_line + self.SNIPPET_MAX_LINES - 1)
+        return fingerprint.source_snippet(artifact.path, artifact.start_line, end_line)
+
     def _get_recommendation(self, signal: RiskSignal) -> str:
         """Get recommendation for a risk signal."""
         recommendations = {
@@ -1,30 +1,34 @@
-"""CLI entrypoint."""
+"""CLI entrypoint.
+
+Subsystems are imported by the commands that use them, so `scr --help` and
+commands such as `scr agents` start without importing the whole package.
+"""
 
 import logging
 import sys
+import time
+from collections.abc import Callable
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import replace
 from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any
 
 import click
 
-from secure_code_reasoner.agents import (
-    AgentCoordinator,
-    CodeAnalystAgent,
-    PatchAdvisorAgent,
-    SecurityReviewerAgent,
-)
-from secure_code_reasoner.contracts import enforce_success_predicate
-from secure_code_reasoner.fingerprinting import Fingerprinter
-from secure_code_reasoner.reporting import JSONFormatter, Reporter, TextFormatter
-from secure_code_reasoner.tracing import ExecutionTracer
+if TYPE_CHECKING:
+    from secure_code_reasoner.fingerprinting import RepositoryFingerprint
+    from secure_code_reasoner.reporting import Formatter
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S",
-    stream=sys.stderr,
-)
 logger = logging.getLogger(__name__)
 
+# Option choices and defaults of the subsystems, duplicated so that building the
+# command line does not import them; tests/test_cli.py checks they stay in sync
+_SEVERITIES = ("info", "low", "medium", "high", "critical")
+_SHARD_BY = ("directory", "count")
+_COMPRESSIONS = ("gzip", "zstd")
+_DEFAULT_SHARD_SIZE = 100_000
+_DEFAULT_MAX_RAW_EVENTS = 1000
+
 
 @click.group()
 @click.option("--verbose", "-v", is_flag=True, help="Enable verbose logging")
@@ -32,6 +36,12 @@ logger = logging.getLogger(__name__)
 @click.pass_context
 def cli(ctx: click.Context, verbose: bool, quiet: bool) -> None:
     """Secure Code Reasoner - Research toolkit for code analysis."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+        stream=sys.stderr,
+    )
     if verbose:
         logging.getLogger().setLevel(logging.DEBUG)
     if quiet:
@@ -39,45 +49,195 @@ def cli(ctx: click.Context, verbose: bool, quiet: bool) -> None:
     ctx.ensure_object(dict)
 
 
+def _make_formatter(format: str, compact: bool, **text_filters: Any) -> "Formatter":
+    """Create the formatter for a --format choice.
+
+    compact only affects JSON and SARIF; text_filters are TextFormatter options.
+    """
+    from secure_code_reasoner.reporting import JSONFormatter, SARIFFormatter, TextFormatter
+
+    if format.lower() == "json":
+        return JSONFormatter(compact=compact)
+    if format.lower() == "sarif":
+        return SARIFFormatter(compact=compact)
+    return TextFormatter(**text_filters)
+
+
+def _finding_filter_options(command: Callable[..., Any]) -> Callable[..., Any]:
+    """Add the text output options that narrow the findings shown."""
+    options = [
+        click.option(
+            "--min-severity",
+            type=click.Choice(_SEVERITIES, case_sensitive=False),
+            help="Only show findings at least this severe (text format)",
+        ),
+        click.option(
+            "--path",
+            "path_patterns",
+            multiple=True,
+            help="Only show findings and patches in files matching this glob (text format; repeatable)",
+        ),
+        click.option(
+            "--top",
+            type=click.IntRange(min=0),
+            help="Show at most this many findings and patches, most severe first (text format)",
+        ),
+        click.option(
+            "--summary-only",
+            is_flag=True,
+            help="Show finding counts instead of individual findings (text format)",
+        ),
+    ]
+    for option in reversed(options):
+        command = option(command)
+    return command
+
+
+def _text_filters(
+    min_severity: str | None, path_patterns: tuple[str, ...], top: int | None, summary_only: bool
+) -> dict[str, Any]:
+    """Convert the finding filter options to TextFormatter arguments."""
+    from secure_code_reasoner.agents.models import Severity
+
+    return {
+        "min_severity": Severity(min_severity.lower()) if min_severity else None,
+        "paths": path_patterns,
+        "limit": top,
+        "summary_only": summary_only,
+    }
+
+
+def _parse_agent_names(agents: str | None) -> list[str] | None:
+    """Parse a comma-separated --agents value; None selects every discovered agent."""
+    if agents is None:
+        return None
+    names = [name.strip() for name in agents.split(",") if name.strip()]
+    if not names:
+        raise click.BadParameter("at least one agent name is required", param_hint="--agents")
+    return names
+
+
 @cli.command()
 @click.argument("path", type=click.Path(exists=True, path_type=Path))
 @click.option("--output", "-o", type=click.Path(path_type=Path), help="Output file path")
 @click.option(
     "--format",
     "-f",
-    type=click.Choice(["json", "text"], case_sensitive=False),
+    type=click.Choice(["json", "text", "sarif"], case_sensitive=False),
     default="text",
     help="Output format",
 )
-def analyze(path: Path, output: Path | None, format: str) -> None:
+@click.option(
+    "--agents",
+    "agent_names",
+    help="Comma-separated agents to run (see 'scr agents'; default: all)",
+)
+@click.option("--compact", is_flag=True, help="Write JSON without indentation")
+@click.option(
+    "--fingerprint-output",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Also save the fingerprint as a binary snapshot (a baseline for later comparison)",
+)
+@click.option(
+    "--shard-output",
+    type=click.Path(file_okay=False, path_type=Path),
+    help="Write the report as compressed NDJSON shards and a manifest to this directory",
+)
+@click.option(
+    "--shard-by",
+    type=click.Choice(_SHARD_BY),
+    default="directory",
+    show_default=True,
+    help="Group shard records by top-level directory or only by count",
+)
+@click.option(
+    "--shard-size",
+    type=click.IntRange(min=1),
+    default=_DEFAULT_SHARD_SIZE,
+    show_default=True,
+    help="Maximum records per shard",
+)
+@click.option(
+    "--compression",
+    type=click.Choice(_COMPRESSIONS),
+    default="gzip",
+    show_default=True,
+    help="Shard compression (zstd requires the zstandard package)",
+)
+@_finding_filter_options
+def analyze(
+    path: Path,
+    output: Path | None,
+    format: str,
+    agent_names: str | None,
+    compact: bool,
+    fingerprint_output: Path | None,
+    shard_output: Path | None,
+    shard_by: str,
+    shard_size: int,
+    compression: str,
+    min_severity: str | None,
+    path_patterns: tuple[str, ...],
+    top: int | None,
+    summary_only: bool,
+) -> None:
     """Analyze a repository and generate fingerprint."""
+    if shard_output and output:
+        raise click.UsageError("--shard-output cannot be combined with --output")
+    from secure_code_reasoner.agents import AgentCoordinator
+    from secure_code_reasoner.agents.registry import load_agents
+    from secure_code_reasoner.contracts import enforce_success_predicate
+    from secure_code_reasoner.fingerprinting import Fingerprinter
+    from secure_code_reasoner.reporting import Reporter, SARIFFormatter
+    from secure_code_reasoner.reporting.shards import write_shards
+
     try:
+        selected_agents = load_agents(_parse_agent_names(agent_names))
+
         fingerprinter = Fingerprinter(path)
         fingerprint = fingerprinter.fingerprint()
+        if fingerprint_output:
+            fingerprint.save(fingerprint_output)
 
-        coordinator = AgentCoordinator(
-            [
-                CodeAnalystAgent(),
-                SecurityReviewerAgent(),
-                PatchAdvisorAgent(),
-            ]
-        )
+        coordinator = AgentCoordinator(selected_agents)
         agent_report = coordinator.review(fingerprint)
 
-        formatter = JSONFormatter() if format.lower() == "json" else TextFormatter()
+        formatter = _make_formatter(
+            format, compact, **_text_filters(min_severity, path_patterns, top, summary_only)
+        )
         reporter = Reporter(formatter)
 
-        fingerprint_report = reporter.report_fingerprint(fingerprint, output)
-        if not output:
-            click.echo(fingerprint_report)
-
-        agent_report_path = (
-            output.parent / f"{output.stem}_agents{output.suffix}" if output else None
-        )
-        agent_report_text = reporter.report_agent_findings(agent_report, agent_report_path)
-        if not output:
-            click.echo("\n")
-            click.echo(agent_report_text)
+        if shard_output:
+            # Sharded output replaces the formatted report
+            manifest = write_shards(
+                fingerprint,
+                agent_report,
+                shard_output,
+                shard_by=shard_by,
+                shard_size=shard_size,
+                compression=compression,
+            )
+            click.echo(f"Wrote {len(manifest.shards)} shards to: {shard_output}", err=True)
+        elif isinstance(formatter, SARIFFormatter):
+            # SARIF consumers expect one log holding artifacts and results together
+            sarif_stream: AbstractContextManager[IO[str]]
+            if output:
+                sarif_stream = reporter.open_report(output)
+            else:
+                sarif_stream = click.open_file("-", "w")
+            with sarif_stream as stream:
+                formatter.write_analysis(fingerprint, agent_report, stream)
+                stream.write("\n")
+        elif output:
+            reporter.write_fingerprint(fingerprint, output)
+            agent_report_path = output.parent / f"{output.stem}_agents{output.suffix}"
+            reporter.write_agent_findings(agent_report, agent_report_path)
+        else:
+            with click.open_file("-", "w") as stream:
+                reporter.write_fingerprint(fingerprint, stream)
+                stream.write("\n\n\n")
+                reporter.write_agent_findings(agent_report, stream)
+                stream.write("\n")
 
         # Runtime contract: Enforce success predicate before exit(0)
         enforce_success_predicate(fingerprint, agent_report, exit_code=0)
@@ -101,6 +261,24 @@ def analyze(path: Path, output: Path | None, format: str) -> None:
 @click.option("--timeout", "-t", type=float, default=30.0, help="Execution timeout in seconds")
 @click.option("--allow-network", is_flag=True, help="Allow network access")
 @click.option("--allow-file-write", is_flag=True, help="Allow file write operations")
+@click.option(
+    "--aggregate-events",
+    is_flag=True,
+    help="Collapse repeated events into counted records with first/last timestamps",
+)
+@click.option(
+    "--max-raw-events",
+    type=click.IntRange(min=0),
+    default=_DEFAULT_MAX_RAW_EVENTS,
+    show_default=True,
+    help="Events kept unaggregated with --aggregate-events",
+)
+@click.option(
+    "--events-output",
+    type=click.Path(path_type=Path),
+    help="Also save the events: compact binary, or gzipped NDJSON for a .gz suffix",
+)
+@click.option("--compact", is_flag=True, help="Write JSON without indentation")
 def trace(
     path: Path,
     output: Path | None,
@@ -108,22 +286,37 @@ def trace(
     timeout: float,
     allow_network: bool,
     allow_file_write: bool,
+    aggregate_events: bool,
+    max_raw_events: int,
+    events_output: Path | None,
+    compact: bool,
 ) -> None:
     """Trace execution of a script."""
+    from secure_code_reasoner.reporting import Reporter
+    from secure_code_reasoner.tracing import EventStore, ExecutionTracer
+
     try:
         tracer = ExecutionTracer(
             timeout=timeout,
             allow_network=allow_network,
             allow_file_write=allow_file_write,
+            aggregate_events=aggregate_events,
+            max_raw_events=max_raw_events,
         )
         trace_result = tracer.trace(path)
+        if events_output:
+            if not isinstance(trace_result.events, EventStore):
+                raise click.UsageError("--events-output requires the tracer's event store")
+            trace_result.events.save(events_output)
 
-        formatter = JSONFormatter() if format.lower() == "json" else TextFormatter()
-        reporter = Reporter(formatter)
+        reporter = Reporter(_make_formatter(format, compact))
 
-        report = reporter.report_trace(trace_result, output)
-        if not output:
-            click.echo(report)
+        if output:
+            reporter.write_trace(trace_result, output)
+        else:
+            with click.open_file("-", "w") as stream:
+                reporter.write_trace(trace_result, stream)
+                stream.write("\n")
 
     except Exception as e:
         logger.error(f"Tracing failed: {e}", exc_info=True)
@@ -131,6 +324,97 @@ def trace(
         sys.exit(1)
 
 
+def _expand_script_paths(paths: tuple[Path, ...]) -> list[Path]:
+    """Expand directories to the Python scripts they contain, in sorted order."""
+    scripts: list[Path] = []
+    for path in paths:
+        scripts.extend(sorted(path.rglob("*.py")) if path.is_dir() else [path])
+    return scripts
+
+
+@cli.command(name="trace-batch")
+@click.argument("paths", nargs=-1, required=True, type=click.Path(exists=True, path_type=Path))
+@click.option(
+    "--output", "-o", type=click.Path(path_type=Path), help="NDJSON output file (default: stdout)"
+)
+@click.option(
+    "--max-workers",
+    "-j",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Maximum concurrent traced processes (default: CPU count)",
+)
+@click.option("--timeout", "-t", type=float, default=30.0, help="Per-script timeout in seconds")
+@click.option("--allow-network", is_flag=True, help="Allow network access")
+@click.option("--allow-file-write", is_flag=True, help="Allow file write operations")
+@click.option(
+    "--fork-server",
+    is_flag=True,
+    help="Fork each script from a pre-warmed interpreter instead of starting a new one",
+)
+@click.option(
+    "--aggregate-events",
+    is_flag=True,
+    help="Collapse repeated events into counted records with first/last timestamps",
+)
+@click.option(
+    "--max-raw-events",
+    type=click.IntRange(min=0),
+    default=_DEFAULT_MAX_RAW_EVENTS,
+    show_default=True,
+    help="Events kept unaggregated with --aggregate-events",
+)
+def trace_batch(
+    paths: tuple[Path, ...],
+    output: Path | None,
+    max_workers: int | None,
+    timeout: float,
+    allow_network: bool,
+    allow_file_write: bool,
+    fork_server: bool,
+    aggregate_events: bool,
+    max_raw_events: int,
+) -> None:
+    """Trace many scripts concurrently, streaming NDJSON traces as they finish.
+
+    Directories are expanded to the .py files they contain. One trace record is
+    written per line in completion order, followed by a batch_summary record.
+    """
+    import json
+
+    from secure_code_reasoner.tracing import ExecutionTracer, ForkServer, TraceBatchSummary
+
+    try:
+        server = ForkServer() if fork_server else None
+        tracer = ExecutionTracer(
+            timeout=timeout,
+            allow_network=allow_network,
+            allow_file_write=allow_file_write,
+            fork_server=server,
+            aggregate_events=aggregate_events,
+            max_raw_events=max_raw_events,
+        )
+        summary = TraceBatchSummary()
+        start_time = time.time()
+        with (
+            click.open_file(str(output) if output else "-", "w", encoding="utf-8") as stream,
+            server or nullcontext(),
+        ):
+            for trace_result in tracer.trace_many(_expand_script_paths(paths), max_workers):
+                stream.write(json.dumps(trace_result.to_dict(), default=str) + "\n")
+                stream.flush()
+                summary = summary.add(trace_result)
+            summary = replace(summary, wall_time=time.time() - start_time)
+            stream.write(json.dumps(summary.to_dict(), default=str) + "\n")
+        if output:
+            click.echo(f"Traced {summary.total} script(s), written to: {output}")
+
+    except Exception as e:
+        logger.error(f"Batch tracing failed: {e}", exc_info=True)
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+
+
 @cli.command()
 @click.argument("path", type=click.Path(exists=True, path_type=Path))
 @click.option(
@@ -139,35 +423,56 @@ def trace(
 @click.option(
     "--format",
     "-f",
-    type=click.Choice(["json", "text"], case_sensitive=False),
+    type=click.Choice(["json", "text", "sarif"], case_sensitive=False),
     default="text",
     help="Output format",
 )
-def report(path: Path, output: Path, format: str) -> None:
+@click.option(
+    "--agents",
+    "agent_names",
+    help="Comma-separated agents to run (see 'scr agents'; default: all)",
+)
+@click.option("--compact", is_flag=True, help="Write JSON without indentation")
+@_finding_filter_options
+def report(
+    path: Path,
+    output: Path,
+    format: str,
+    agent_names: str | None,
+    compact: bool,
+    min_severity: str | None,
+    path_patterns: tuple[str, ...],
+    top: int | None,
+    summary_only: bool,
+) -> None:
     """Generate comprehensive report from analysis results."""
+    from secure_code_reasoner.agents import AgentCoordinator
+    from secure_code_reasoner.agents.registry import load_agents
+    from secure_code_reasoner.contracts import enforce_success_predicate
+    from secure_code_reasoner.fingerprinting import Fingerprinter
+    from secure_code_reasoner.reporting import Reporter, SARIFFormatter
+
     try:
+        selected_agents = load_agents(_parse_agent_names(agent_names))
+
         fingerprinter = Fingerprinter(path)
         fingerprint = fingerprinter.fingerprint()
 
-        coordinator = AgentCoordinator(
-            [
-                CodeAnalystAgent(),
-                SecurityReviewerAgent(),
-                PatchAdvisorAgent(),
-            ]
-        )
+        coordinator = AgentCoordinator(selected_agents)
         agent_report = coordinator.review(fingerprint)
 
-        formatter = JSONFormatter() if format.lower() == "json" else TextFormatter()
+        formatter = _make_formatter(
+            format, compact, **_text_filters(min_severity, path_patterns, top, summary_only)
+        )
         reporter = Reporter(formatter)
 
-        combined_report = []
-        combined_report.append(reporter.report_fingerprint(fingerprint))
-        combined_report.append("\n" + "=" * 80 + "\n")
-        combined_report.append(reporter.report_agent_findings(agent_report))
-
-        full_report = "\n".join(combined_report)
-        reporter._write_report(output, full_report)
+        with reporter.open_report(output) as stream:
+            if isinstance(formatter, SARIFFormatter):
+                formatter.write_analysis(fingerprint, agent_report, stream)
+            else:
+                reporter.write_fingerprint(fingerprint, stream)
+                stream.write("\n\n" + "=" * 80 + "\n\n")
+                reporter.write_agent_findings(agent_report, stream)
         click.echo(f"Report written to: {output}")
 
         # Runtime contract: Enforce success predicate before exit(0)
@@ -179,5 +484,114 @@ def report(path: Path, output: Path, format: str) -> None:
         sys.exit(1)
 
 
+def _load_fingerprint(path: Path) -> "RepositoryFingerprint":
+    """Fingerprint a repository directory, or load a saved snapshot file."""
+    from secure_code_reasoner.fingerprinting import Fingerprinter, RepositoryFingerprint
+
+    if path.is_dir():
+        return Fingerprinter(path).fingerprint()
+    return RepositoryFingerprint.load(path)
+
+
+@cli.command(name="diff")
+@click.argument("old", type=click.Path(exists=True, path_type=Path))
+@click.argument("new", type=click.Path(exists=True, path_type=Path))
+@click.option("--output", "-o", type=click.Path(path_type=Path), help="Output file path")
+@click.option(
+    "--format",
+    "-f",
+    type=click.Choice(["json", "text"], case_sensitive=False),
+    default="text",
+    help="Output format",
+)
+@click.option("--compact", is_flag=True, help="Write JSON without indentation")
+@click.option(
+    "--exit-code",
+    is_flag=True,
+    help="Exit with status 1 if the fingerprints differ (errors then exit with 2)",
+)
+def diff(
+    old: Path, new: Path, output: Path | None, format: str, compact: bool, exit_code: bool
+) -> None:
+    """Compare two fingerprints; OLD and NEW are snapshots or repository directories."""
+    from secure_code_reasoner.fingerprinting import fingerprint_diff
+    from secure_code_reasoner.reporting import Reporter
+
+    try:
+        with _load_fingerprint(old) as old_fingerprint, _load_fingerprint(new) as new_fingerprint:
+            result = fingerprint_diff(old_fingerprint, new_fingerprint)
+
+        reporter = Reporter(_make_formatter(format, compact))
+        if output:
+            reporter.write_diff(result, output)
+        else:
+            with click.open_file("-", "w") as stream:
+                reporter.write_diff(result, stream)
+                stream.write("\n")
+
+    except Exception as e:
+        logger.error(f"Diff failed: {e}", exc_info=True)
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(2 if exit_code else 1)
+
+    if exit_code and result.has_changes:
+        sys.exit(1)
+
+
+@cli.command(name="validate")
+@click.argument("path", type=click.Path(exists=True, path_type=Path))
+@click.option(
+    "--records",
+    type=click.Choice(["artifact", "edge", "finding", "patch_suggestion"]),
+    help="Validate PATH as NDJSON records of this kind",
+)
+@click.option(
+    "--require",
+    type=click.Choice(["fingerprint", "agent_report"]),
+    multiple=True,
+    help="Fail unless the JSON documents include one of this kind (repeatable)",
+)
+def validate(path: Path, records: str | None, require: tuple[str, ...]) -> None:
+    """Validate JSON reports, NDJSON records or a sharded report against their schemas.
+
+    PATH is a file of one or more JSON documents, a file of NDJSON records with
+    --records, or a sharded report directory.
+    """
+    from secure_code_reasoner.exceptions import ContractViolationError
+    from secure_code_reasoner.validators import validate_documents, validate_ndjson
+
+    try:
+        if path.is_dir():
+            from secure_code_reasoner.reporting.shards import validate_shards
+
+            counts = validate_shards(path)
+        elif records:
+            with path.open("rb") as stream:
+                counts = {records: validate_ndjson(stream, records, source=str(path))}
+        else:
+            counts = dict(validate_documents(path.read_text(encoding="utf-8")))
+            missing = [kind for kind in require if not counts.get(kind)]
+            if missing:
+                raise ContractViolationError(
+                    f"CONTRACT VIOLATION: {path} contains no {', '.join(missing)} document"
+                )
+    except Exception as e:
+        logger.error(f"Validation failed: {e}")
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+
+    for kind, count in counts.items():
+        click.echo(f"{kind}: {count} valid")
+
+
+@cli.command(name="agents")
+def list_agents() -> None:
+    """List discoverable agents without importing them."""
+    from secure_code_reasoner.agents.registry import discover_agents
+
+    for name, entry_point in discover_agents().items():
+        click.echo(f"{name}\t{entry_point.value}")
+
+
 if __name__ == "__main__":
     cli()
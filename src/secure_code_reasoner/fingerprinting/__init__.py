@@ -1,5 +1,10 @@
 """Fingerprinting subsystem for repository analysis."""
 
+from secure_code_reasoner.fingerprinting.diff import (
+    ArtifactChange,
+    FingerprintDiff,
+    fingerprint_diff,
+)
 from secure_code_reasoner.fingerprinting.fingerprinter import Fingerprinter
 from secure_code_reasoner.fingerprinting.models import (
     ClassArtifact,
@@ -22,4 +27,7 @@ __all__ = [
     "CodeArtifactType",
     "RiskSignal",
     "DependencyGraph",
+    "FingerprintDiff",
+    "ArtifactChange",
+    "fingerprint_diff",
 ]
@@ -0,0 +1,302 @@
+"""Structural diff between two repository fingerprints.
+
+fingerprint_diff() joins the artifacts of both fingerprints on a stable id
+(POSIX path, artifact type and name, qualified by the enclosing class for
+methods) using hash maps, so it runs in time linear in the number of
+artifacts and edges. Line numbers are not part of the id: an artifact that
+only shifted within its file is reported as moved rather than as removed and
+added. When a name occurs several times in one file (redefinitions), the
+occurrences are numbered in line order ("#2", "#3", ...).
+
+Dependency graph edges name artifacts by an id that includes the start line;
+edge endpoints are translated to the stable ids before comparison so that
+moves do not show up as edge churn.
+
+Both arguments may be fingerprints or paths to snapshots saved with
+RepositoryFingerprint.save(). When both are snapshots, artifacts are compared
+on their stored rows and only changed ones are built.
+"""
+
+import json
+from collections.abc import Hashable, Iterator
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, cast
+
+from secure_code_reasoner.fingerprinting.models import (
+    CodeArtifact,
+    RepositoryFingerprint,
+    RiskSignal,
+    graph_node_id,
+)
+from secure_code_reasoner.fingerprinting.snapshot import SnapshotArtifacts
+
+_LINE_FIELDS = frozenset({"start_line", "end_line"})
+
+
+def artifact_key(path: str, artifact_type: str, name: str, class_name: str | None = None) -> str:
+    """Build the line-independent id joining an artifact across fingerprints."""
+    qualified_name = f"{class_name}.{name}" if class_name else name
+    return f"{path}:{artifact_type}:{qualified_name}"
+
+
+@dataclass(frozen=True)
+class ArtifactChange:
+    """An artifact present in both fingerprints with differing fields."""
+
+    artifact_id: str
+    old: CodeArtifact
+    new: CodeArtifact
+    changed_fields: tuple[str, ...]
+
+    @property
+    def is_move(self) -> bool:
+        """Check whether only the position changed, with the same line span."""
+        return set(self.changed_fields) <= _LINE_FIELDS and (
+            self.old.end_line - self.old.start_line == self.new.end_line - self.new.start_line
+        )
+
+    @property
+    def risk_signals_added(self) -> frozenset[RiskSignal]:
+        """Get risk signals the new artifact carries and the old one did not."""
+        return self.new.risk_signals - self.old.risk_signals
+
+    @property
+    def risk_signals_removed(self) -> frozenset[RiskSignal]:
+        """Get risk signals the old artifact carried and the new one does not."""
+        return self.old.risk_signals - self.new.risk_signals
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert change to dictionary, with old and new values of changed fields."""
+        old_dict, new_dict = self.old.to_dict(), self.new.to_dict()
+        return {
+            "artifact_id": self.artifact_id,
+            "artifact_type": self.new.artifact_type.value,
+            "changed_fields": list(self.changed_fields),
+            "old": {name: old_dict.get(name) for name in self.changed_fields},
+            "new": {name: new_dict.get(name) for name in self.changed_fields},
+            "risk_signals_added": sorted(s.value for s in self.risk_signals_added),
+            "risk_signals_removed": sorted(s.value for s in self.risk_signals_removed),
+        }
+
+
+@dataclass(frozen=True)
+class FingerprintDiff:
+    """Differences between an old and a new repository fingerprint."""
+
+    old_fingerprint_hash: str
+    new_fingerprint_hash: str
+    added: dict[str, CodeArtifact] = field(default_factory=dict)
+    removed: dict[str, CodeArtifact] = field(default_factory=dict)
+    modified: tuple[ArtifactChange, ...] = ()
+    moved: tuple[ArtifactChange, ...] = ()
+    risk_signal_deltas: dict[RiskSignal, int] = field(default_factory=dict)
+    edges_added: tuple[tuple[str, str], ...] = ()
+    edges_removed: tuple[tuple[str, str], ...] = ()
+
+    @property
+    def has_changes(self) -> bool:
+        """Check whether the fingerprints differ in any artifact or edge."""
+        return bool(
+            self.added
+            or self.removed
+            or self.modified
+            or self.moved
+            or self.edges_added
+            or self.edges_removed
+        )
+
+    def summary(self) -> dict[str, int]:
+        """Count the changes of each kind."""
+        return {
+            "added": len(self.added),
+            "removed": len(self.removed),
+            "modified": len(self.modified),
+            "moved": len(self.moved),
+            "edges_added": len(self.edges_added),
+            "edges_removed": len(self.edges_removed),
+        }
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert diff to dictionary for serialization."""
+        return {
+            "old_fingerprint_hash": self.old_fingerprint_hash,
+            "new_fingerprint_hash": self.new_fingerprint_hash,
+            "summary": self.summary(),
+            "risk_signal_deltas": {
+                signal.value: delta
+                for signal, delta in sorted(
+                    self.risk_signal_deltas.items(), key=lambda x: x[0].value
+                )
+            },
+            "added": [
+                {"artifact_id": artifact_id, **artifact.to_dict()}
+                for artifact_id, artifact in self.added.items()
+            ],
+            "removed": [
+                {"artifact_id": artifact_id, **artifact.to_dict()}
+                for artifact_id, artifact in self.removed.items()
+            ],
+            "modified": [change.to_dict() for change in self.modified],
+            "moved": [change.to_dict() for change in self.moved],
+            "edges_added": [{"source": s, "target": t} for s, t in self.edges_added],
+            "edges_removed": [{"source": s, "target": t} for s, t in self.edges_removed],
+        }
+
+
+class _Side:
+    """One fingerprint's artifacts keyed by stable id."""
+
+    def __init__(self, fingerprint: RepositoryFingerprint, use_rows: bool) -> None:
+        """Index the fingerprint's artifacts, from stored rows when use_rows."""
+        self.fingerprint = fingerprint
+        self.use_rows = use_rows
+        # stable id -> (comparable signature, artifact or row index)
+        self.entries: dict[str, tuple[Hashable, Any]] = {}
+        # dependency graph id -> stable id
+        self.graph_ids: dict[str, str] = {}
+        # Keys seen more than once, with every (start line, graph id, signature, ref)
+        repeated: dict[str, list[tuple[int, str, Hashable, Any]]] = {}
+        starts: dict[str, tuple[int, str]] = {}
+        entries, graph_ids = self.entries, self.graph_ids
+        for key, start_line, graph_id, signature, ref in self._scan():
+            if key in entries:
+                if key not in repeated:
+                    first_start, first_graph_id = starts[key]
+                    repeated[key] = [(first_start, first_graph_id, *entries[key])]
+                repeated[key].append((start_line, graph_id, signature, ref))
+                continue
+            entries[key] = (signature, ref)
+            graph_ids[graph_id] = key
+            starts[key] = (start_line, graph_id)
+        for key, occurrences in repeated.items():
+            occurrences.sort(key=lambda occurrence: occurrence[0])
+            for number, (_, graph_id, signature, ref) in enumerate(occurrences, 1):
+                artifact_id = key if number == 1 else f"{key}#{number}"
+                entries[artifact_id] = (signature, ref)
+                graph_ids[graph_id] = artifact_id
+
+    def _scan(self) -> Iterator[tuple[str, int, str, Hashable, Any]]:
+        """Yield (key, start line, graph id, signature, ref) for every artifact."""
+        if not self.use_rows:
+            for artifact in self.fingerprint.artifacts:
+                class_name = artifact.metadata.get("class")
+                key = artifact_key(
+                    artifact.path.as_posix(),
+                    artifact.artifact_type.value,
+                    artifact.name,
+                    class_name if isinstance(class_name, str) else None,
+                )
+                yield key, artifact.start_line, artifact.graph_id, artifact, artifact
+            return
+
+        artifacts = cast(SnapshotArtifacts, self.fingerprint.artifacts)
+        # Row fields are decoded once per distinct path and metadata string
+        posix_paths: dict[str, str] = {}
+        class_names: dict[str, str | None] = {}
+        for index, row in enumerate(artifacts.rows()):
+            path = posix_paths.get(row.path)
+            if path is None:
+                path = posix_paths[row.path] = Path(row.path).as_posix()
+            class_name = None
+            if row.metadata is not None:
+                if row.metadata not in class_names:
+                    value = json.loads(row.metadata).get("class")
+                    class_names[row.metadata] = value if isinstance(value, str) else None
+                class_name = class_names[row.metadata]
+            artifact_type = row.artifact_type.value
+            key = artifact_key(path, artifact_type, row.name, class_name)
+            graph_id = graph_node_id(path, artifact_type, row.name, row.start_line)
+            yield key, row.start_line, graph_id, row, index
+
+    def artifact(self, ref: Any) -> CodeArtifact:
+        """Get the artifact an entry refers to."""
+        if not self.use_rows:
+            return cast(CodeArtifact, ref)
+        return cast(SnapshotArtifacts, self.fingerprint.artifacts)[ref]
+
+    def edges(self) -> set[tuple[str, str]]:
+        """Get the dependency graph edges with endpoints translated to stable ids."""
+        graph_ids = self.graph_ids
+        return {
+            (graph_ids.get(source, source), graph_ids.get(target, target))
+            for source, targets in self.fingerprint.dependency_graph.edges.items()
+            for target in targets
+        }
+
+
+def _compare(artifact_id: str, old: CodeArtifact, new: CodeArtifact) -> ArtifactChange | None:
+    """Compare two artifacts sharing an id, returning None when they are equal."""
+    old_dict, new_dict = old.to_dict(), new.to_dict()
+    changed = tuple(name for name, value in new_dict.items() if old_dict.get(name) != value)
+    if not changed:
+        return None
+    return ArtifactChange(artifact_id=artifact_id, old=old, new=new, changed_fields=changed)
+
+
+def _as_fingerprint(
+    value: RepositoryFingerprint | Path | str, stack: ExitStack
+) -> RepositoryFingerprint:
+    """Load value from a snapshot file unless it already is a fingerprint, closing it with stack."""
+    if isinstance(value, RepositoryFingerprint):
+        return value
+    return stack.enter_context(RepositoryFingerprint.load(Path(value)))
+
+
+def fingerprint_diff(
+    old: RepositoryFingerprint | Path | str, new: RepositoryFingerprint | Path | str
+) -> FingerprintDiff:
+    """Compute the differences from old to new.
+
+    Snapshots loaded from paths are closed before returning; fingerprints passed
+    in are left open.
+
+    Raises:
+        FingerprintingError: If a snapshot path cannot be loaded
+    """
+    with ExitStack() as stack:
+        result = _diff(_as_fingerprint(old, stack), _as_fingerprint(new, stack))
+    return result
+
+
+def _diff(old: RepositoryFingerprint, new: RepositoryFingerprint) -> FingerprintDiff:
+    """Compute the differences between two loaded fingerprints."""
+    use_rows = isinstance(old.artifacts, SnapshotArtifacts) and isinstance(
+        new.artifacts, SnapshotArtifacts
+    )
+    old_side = _Side(old, use_rows)
+    new_side = _Side(new, use_rows)
+
+    added: dict[str, CodeArtifact] = {}
+    modified: list[ArtifactChange] = []
+    moved: list[ArtifactChange] = []
+    for artifact_id, (signature, ref) in new_side.entries.items():
+        previous = old_side.entries.get(artifact_id)
+        if previous is None:
+            added[artifact_id] = new_side.artifact(ref)
+        elif previous[0] != signature:
+            change = _compare(artifact_id, old_side.artifact(previous[1]), new_side.artifact(ref))
+            if change is not None:
+                (moved if change.is_move else modified).append(change)
+    removed = {
+        artifact_id: old_side.artifact(ref)
+        for artifact_id, (_, ref) in old_side.entries.items()
+        if artifact_id not in new_side.entries
+    }
+
+    signals = old.risk_signals.keys() | new.risk_signals.keys()
+    deltas = {s: new.risk_signals.get(s, 0) - old.risk_signals.get(s, 0) for s in signals}
+    old_edges, new_edges = old_side.edges(), new_side.edges()
+
+    return FingerprintDiff(
+        old_fingerprint_hash=old.fingerprint_hash,
+        new_fingerprint_hash=new.fingerprint_hash,
+        added=dict(sorted(added.items())),
+        removed=dict(sorted(removed.items())),
+        modified=tuple(sorted(modified, key=lambda change: change.artifact_id)),
+        moved=tuple(sorted(moved, key=lambda change: change.artifact_id)),
+        risk_signal_deltas={s: delta for s, delta in deltas.items() if delta},
+        edges_added=tuple(sorted(new_edges - old_edges)),
+        edges_removed=tuple(sorted(old_edges - new_edges)),
+    )
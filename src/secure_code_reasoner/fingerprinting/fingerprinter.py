@@ -16,6 +16,7 @@ from secure_code_reasoner.fingerprinting.models import (
     RepositoryFingerprint,
     RiskSignal,
 )
+from secure_code_reasoner.fingerprinting.source_index import SourceIndex
 
 logger = logging.getLogger(__name__)
 
@@ -256,6 +257,7 @@ class Fingerprinter:
             raise FingerprintingError(f"Repository path does not exist: {self.repository_path}")
         if not self.repository_path.is_dir():
             raise FingerprintingError(f"Repository path is not a directory: {self.repository_path}")
+        self.source_index = SourceIndex(self.repository_path)
 
     def _validate_path_within_root(self, path: Path) -> Path:
         """Validate that resolved path remains within repository root."""
@@ -269,6 +271,7 @@ class Fingerprinter:
     def fingerprint(self) -> RepositoryFingerprint:
         """Generate fingerprint for the repository."""
         logger.info(f"Fingerprinting repository: {self.repository_path}")
+        self.source_index = SourceIndex(self.repository_path)
         artifacts: list[CodeArtifact] = []
         languages: dict[str, int] = {}
         total_lines = 0
@@ -348,6 +351,7 @@ class Fingerprinter:
             risk_signals=risk_signals,
             status=fingerprint_status,
             status_metadata=status_metadata,
+            source_index=self.source_index,
         )
 
     def _walk_repository(self) -> list[Path]:
@@ -385,10 +389,12 @@ class Fingerprinter:
 
         if file_path.suffix == ".py":
             try:
-                content = file_path.read_text(encoding="utf-8")
+                data = file_path.read_bytes()
+                content = data.decode("utf-8")
                 lines = content.splitlines()
                 line_count = len(lines)
-                byte_size = file_path.stat().st_size
+                byte_size = len(data)
+                self.source_index.add(relative_path, data)
 
                 file_artifact = FileArtifact(
                     artifact_type=CodeArtifactType.FILE,
@@ -504,7 +510,7 @@ class Fingerprinter:
 
     def _get_artifact_id(self, artifact: CodeArtifact) -> str:
         """Generate deterministic ID for an artifact."""
-        return f"{artifact.path.as_posix()}:{artifact.artifact_type.value}:{artifact.name}:{artifact.start_line}"
+        return artifact.graph_id
 
     def _compute_fingerprint_hash(
         self, artifacts: list[CodeArtifact], graph: DependencyGraph
@@ -2,8 +2,14 @@
 
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import cached_property
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+from secure_code_reasoner.fingerprinting.source_index import SourceIndex
+
+if TYPE_CHECKING:
+    from secure_code_reasoner.fingerprinting.snapshot import SnapshotArtifacts, SnapshotEdges
 
 
 def _ensure_hashable(cls: type) -> type:
@@ -53,6 +59,11 @@ class RiskSignal(str, Enum):
     CONFIGURATION_ACCESS = "configuration_access"
 
 
+def graph_node_id(path: str, artifact_type: str, name: str, start_line: int) -> str:
+    """Build a dependency graph node id from an artifact's POSIX path, type, name and line."""
+    return f"{path}:{artifact_type}:{name}:{start_line}"
+
+
 @_ensure_hashable
 @dataclass(frozen=True)
 class CodeArtifact:
@@ -126,6 +137,13 @@ class CodeArtifact:
             )
         )
 
+    @property
+    def graph_id(self) -> str:
+        """Get the id naming this artifact in the dependency graph."""
+        return graph_node_id(
+            self.path.as_posix(), self.artifact_type.value, self.name, self.start_line
+        )
+
     def to_dict(self) -> dict[str, Any]:
         """Convert artifact to dictionary for serialization."""
         return {
@@ -245,10 +263,16 @@ class FunctionArtifact(CodeArtifact):
 class DependencyGraph:
     """Represents dependencies between code artifacts."""
 
-    edges: dict[str, frozenset[str]] = field(default_factory=dict)
+    edges: "dict[str, frozenset[str]] | SnapshotEdges" = field(default_factory=dict)
 
     def __post_init__(self) -> None:
         """Validate and normalize dependency graph."""
+        # Imported here because snapshot depends on this module
+        from secure_code_reasoner.fingerprinting.snapshot import SnapshotEdges
+
+        # Edges loaded from a snapshot are already normalized and stay in the file
+        if isinstance(self.edges, SnapshotEdges):
+            return
         normalized_edges: dict[str, frozenset[str]] = {}
         for source, targets in self.edges.items():
             normalized_edges[source] = (
@@ -278,12 +302,14 @@ class RepositoryFingerprint:
     total_functions: int
     total_lines: int
     languages: dict[str, int]
-    artifacts: frozenset[CodeArtifact]
+    artifacts: "frozenset[CodeArtifact] | SnapshotArtifacts"
     dependency_graph: DependencyGraph
     risk_signals: dict[RiskSignal, int]
     status: str = "COMPLETE_WITH_SKIPS"  # COMPLETE_NO_SKIPS, COMPLETE_WITH_SKIPS, PARTIAL, FAILED
     status_metadata: dict[str, Any] = field(default_factory=dict)
     metadata: dict[str, Any] = field(default_factory=dict)
+    # Line offsets for snippet extraction; not part of identity or serialized output
+    source_index: SourceIndex | None = field(default=None, compare=False, repr=False)
 
     def __post_init__(self) -> None:
         """Validate fingerprint after initialization."""
@@ -301,7 +327,11 @@ class RepositoryFingerprint:
             raise ValueError(
                 f"status must be COMPLETE_NO_SKIPS, COMPLETE_WITH_SKIPS, PARTIAL, or FAILED, got {self.status}"
             )
-        if not isinstance(self.artifacts, frozenset):
+        # Imported here because snapshot depends on this module
+        from secure_code_reasoner.fingerprinting.snapshot import SnapshotArtifacts
+
+        # Artifacts loaded from a snapshot are built lazily from the mapped file
+        if not isinstance(self.artifacts, frozenset | SnapshotArtifacts):
             try:
                 object.__setattr__(self, "artifacts", frozenset(self.artifacts))
             except TypeError as e:
@@ -311,8 +341,92 @@ class RepositoryFingerprint:
                     "This indicates non-hashable artifacts. Fingerprint is INVALID."
                 ) from e
 
-    def to_dict(self) -> dict[str, Any]:
-        """Convert fingerprint to dictionary for serialization."""
+    def save(self, path: Path) -> None:
+        """Write the fingerprint to a binary snapshot file (without the source index).
+
+        Raises:
+            FingerprintingError: If the file cannot be written
+        """
+        from secure_code_reasoner.fingerprinting.snapshot import write_snapshot
+
+        write_snapshot(self, path)
+
+    @classmethod
+    def load(cls, path: Path, verify: bool = True) -> "RepositoryFingerprint":
+        """Load a fingerprint saved with save(), memory-mapping the file.
+
+        Artifacts are built as they are read; verify checks the file's checksum.
+        Use the fingerprint as a context manager, or call close(), to unmap the file.
+
+        Raises:
+            FingerprintingError: If the file is missing or not a valid snapshot
+        """
+        from secure_code_reasoner.fingerprinting.snapshot import load_snapshot
+
+        return load_snapshot(path, verify=verify)
+
+    def close(self) -> None:
+        """Unmap the file behind a fingerprint from load(); other fingerprints hold none."""
+        from secure_code_reasoner.fingerprinting.snapshot import SnapshotArtifacts
+
+        if isinstance(self.artifacts, SnapshotArtifacts):
+            self.artifacts.close()
+
+    def __enter__(self) -> "RepositoryFingerprint":
+        """Return the fingerprint, closing it on exit."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Close the fingerprint."""
+        self.close()
+
+    @cached_property
+    def _signal_index(self) -> dict[RiskSignal, tuple[CodeArtifact, ...]]:
+        """Index artifacts by risk signal, built once per fingerprint."""
+        index: dict[RiskSignal, list[CodeArtifact]] = {}
+        for artifact in sorted(
+            self.artifacts, key=lambda a: (a.path.as_posix(), a.start_line, a.name)
+        ):
+            for signal in artifact.risk_signals:
+                index.setdefault(signal, []).append(artifact)
+        return {signal: tuple(artifacts) for signal, artifacts in index.items()}
+
+    def artifacts_with_signal(self, signal: RiskSignal) -> tuple[CodeArtifact, ...]:
+        """Get artifacts carrying a risk signal in deterministic order.
+
+        The index is memoized, so agents querying the same fingerprint share one scan.
+        """
+        return self._signal_index.get(signal, ())
+
+    def source_snippet(self, path: Path, start_line: int, end_line: int) -> str | None:
+        """Get source lines start_line..end_line of a repository file, if indexed."""
+        if self.source_index is None:
+            return None
+        return self.source_index.snippet(path, start_line, end_line)
+
+    def proof_obligations(self) -> dict[str, bool]:
+        """Get the proof obligations serialized with the fingerprint, without serializing it."""
+        # Epistemic closure: Proof-carrying output with value validation
+        return {
+            "requires_status_check": True,
+            "invalid_if_ignored": True,
+            "deterministic_only_if_complete": self.status
+            in ("COMPLETE_NO_SKIPS", "COMPLETE_WITH_SKIPS"),
+            "hash_invalid_if_partial": self.status
+            not in ("COMPLETE_NO_SKIPS", "COMPLETE_WITH_SKIPS"),
+            "contract_violation_if_status_ignored": True,
+        }
+
+    def to_dict(self, lazy: bool = False) -> dict[str, Any]:
+        """Convert fingerprint to dictionary for serialization.
+
+        With lazy, "artifacts" is an iterator that builds each artifact's dictionary
+        as it is consumed, for streaming serialization.
+        """
+        artifacts = (
+            artifact.to_dict()
+            for artifact in sorted(self.artifacts, key=lambda a: (a.path, a.start_line))
+        )
         result = {
             "schema_version": 1,  # Epistemic closure: Schema versioning for drift resistance
             "repository_path": str(self.repository_path),
@@ -323,10 +437,7 @@ class RepositoryFingerprint:
             "total_functions": self.total_functions,
             "total_lines": self.total_lines,
             "languages": self.languages,
-            "artifacts": [
-                artifact.to_dict()
-                for artifact in sorted(self.artifacts, key=lambda a: (a.path, a.start_line))
-            ],
+            "artifacts": artifacts if lazy else list(artifacts),
             "dependency_graph": self.dependency_graph.to_dict(),
             "risk_signals": {
                 signal.value: count
@@ -334,19 +445,9 @@ class RepositoryFingerprint:
             },
             "metadata": self.metadata,
         }
-        # Epistemic closure: Proof-carrying output with value validation
-        proof_obligations = {
-            "requires_status_check": True,
-            "invalid_if_ignored": True,
-            "deterministic_only_if_complete": self.status
-            in ("COMPLETE_NO_SKIPS", "COMPLETE_WITH_SKIPS"),
-            "hash_invalid_if_partial": self.status
-            not in ("COMPLETE_NO_SKIPS", "COMPLETE_WITH_SKIPS"),
-            "contract_violation_if_status_ignored": True,
-        }
         # Note: Contract enforcement happens at verification time (verify.sh), not serialization time
         # This allows computed proof obligations to be False when semantically correct
-        result["proof_obligations"] = proof_obligations
+        result["proof_obligations"] = self.proof_obligations()
         # Epistemic closure: Include status metadata if fingerprint is partial or has skips
         if self.status in ("PARTIAL", "COMPLETE_WITH_SKIPS") and self.status_metadata:
             result["status_metadata"] = self.status_metadata
@@ -0,0 +1,611 @@
+"""Binary snapshots of repository fingerprints.
+
+A fingerprint's JSON report cannot be read back, so comparing against a
+baseline would otherwise mean fingerprinting the old commit again. A snapshot
+stores the fingerprint in a versioned binary file that loads in constant time:
+
+- a fixed header (magic, format version, section sizes);
+- a string table (one uint64 offset per string and a UTF-8 blob) holding names,
+  paths, graph node ids and JSON-encoded metadata, each stored once;
+- the artifacts as columns (type, name, path, start and end line, a risk signal
+  bitmask, metadata and subtype details), sorted by path, start line and name;
+- the dependency graph in CSR form: sorted source ids, row offsets and targets;
+- a sha256 digest of everything before it.
+
+All integers are little-endian and every section starts on an 8-byte boundary.
+load_snapshot() memory-maps the file and views the sections in place; strings
+are decoded and CodeArtifact objects built only when they are read, so loading
+costs a header parse and (unless verify is False) one sha256 pass.
+"""
+
+import hashlib
+import json
+import mmap
+import struct
+import sys
+from array import array
+from collections.abc import ItemsView, Iterable, Iterator, Mapping, Set
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from secure_code_reasoner.exceptions import FingerprintingError
+from secure_code_reasoner.fingerprinting.models import (
+    ClassArtifact,
+    CodeArtifact,
+    CodeArtifactType,
+    DependencyGraph,
+    FileArtifact,
+    FunctionArtifact,
+    RepositoryFingerprint,
+    RiskSignal,
+)
+
+SNAPSHOT_MAGIC = b"SCRFPS\x00\x00"
+SNAPSHOT_VERSION = 1
+# magic, version, flags, string count, artifact count, source count, edge count, summary id
+_HEADER = struct.Struct("<8sIIQQQQQ")
+_DIGEST_SIZE = hashlib.sha256().digest_size
+_NONE = 0xFFFFFFFF
+
+_ARTIFACT_TYPES = tuple(CodeArtifactType)
+_TYPE_CODES = {artifact_type: code for code, artifact_type in enumerate(_ARTIFACT_TYPES)}
+_SIGNALS = tuple(RiskSignal)
+_SIGNAL_BITS = {signal: 1 << bit for bit, signal in enumerate(_SIGNALS)}
+_ARTIFACT_CLASSES: dict[CodeArtifactType, type[CodeArtifact]] = {
+    CodeArtifactType.FILE: FileArtifact,
+    CodeArtifactType.CLASS: ClassArtifact,
+    CodeArtifactType.FUNCTION: FunctionArtifact,
+}
+# Subtype-specific fields, stored together as one JSON string per artifact
+_DETAIL_FIELDS: dict[type[CodeArtifact], tuple[str, ...]] = {
+    FileArtifact: ("language", "line_count", "byte_size"),
+    ClassArtifact: ("methods", "base_classes"),
+    FunctionArtifact: ("parameters", "return_type", "is_async", "decorators"),
+}
+
+# Artifact columns in file order
+_COLUMNS = (
+    ("types", "B"),
+    ("names", "I"),
+    ("paths", "I"),
+    ("start_lines", "I"),
+    ("end_lines", "I"),
+    ("signals", "I"),
+    ("metadata", "I"),
+    ("details", "I"),
+)
+
+
+def _padding(size: int) -> bytes:
+    """Get the zero bytes that pad size up to an 8-byte boundary."""
+    return b"\x00" * (-size % 8)
+
+
+def _encode_json(value: Any) -> str:
+    """Encode a value canonically so equal values intern to the same string."""
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def _detail_key(artifact: CodeArtifact) -> tuple[Any, ...]:
+    """Get the artifact class and its subtype-specific field values."""
+    cls = type(artifact)
+    return (cls, *(getattr(artifact, name) for name in _DETAIL_FIELDS.get(cls, ())))
+
+
+def _encode_details(key: tuple[Any, ...]) -> str:
+    """Encode subtype-specific field values, with sets as sorted lists."""
+    cls, *values = key
+    return _encode_json(
+        {
+            name: sorted(value) if isinstance(value, frozenset) else value
+            for name, value in zip(_DETAIL_FIELDS.get(cls, ()), values)
+        }
+    )
+
+
+def _build_artifact(
+    artifact_type: CodeArtifactType,
+    name: str,
+    path: Path,
+    start_line: int,
+    end_line: int,
+    risk_signals: frozenset[RiskSignal],
+    metadata: dict[str, Any],
+    details: dict[str, Any],
+) -> CodeArtifact:
+    """Build the artifact class matching artifact_type from stored fields."""
+    # Every list-valued subtype field is a frozenset on the artifact
+    fields = {
+        field: frozenset(value) if isinstance(value, list) else value
+        for field, value in details.items()
+    }
+    return _ARTIFACT_CLASSES[artifact_type](
+        artifact_type=artifact_type,
+        name=name,
+        path=path,
+        start_line=start_line,
+        end_line=end_line,
+        risk_signals=risk_signals,
+        metadata=metadata,
+        **fields,
+    )
+
+
+class _StringTable:
+    """Interns strings while a snapshot is written."""
+
+    def __init__(self) -> None:
+        """Initialize an empty table."""
+        self.ids: dict[str, int] = {}
+        self.encoded: list[bytes] = []
+
+    def intern(self, value: str) -> int:
+        """Get the id of value, adding it if new."""
+        string_id = self.ids.get(value)
+        if string_id is None:
+            string_id = self.ids[value] = len(self.encoded)
+            self.encoded.append(value.encode("utf-8"))
+        return string_id
+
+
+def _little_endian(column: array) -> bytes:
+    """Get the little-endian bytes of an array."""
+    if sys.byteorder == "big":
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column.tobytes()
+
+
+def write_snapshot(fingerprint: RepositoryFingerprint, path: Path) -> None:
+    """Write fingerprint to path as a binary snapshot.
+
+    The source index is not stored; artifact metadata must be JSON-serializable
+    (other values are stored as strings).
+
+    Raises:
+        FingerprintingError: If the file cannot be written
+    """
+    strings = _StringTable()
+    columns = {name: array(typecode) for name, typecode in _COLUMNS}
+    # Many artifacts share a path or identical subtype fields; encode each once
+    path_ids: dict[Path, int] = {}
+    detail_ids: dict[tuple[Any, ...], int] = {}
+    for artifact in sorted(
+        fingerprint.artifacts, key=lambda a: (a.path.as_posix(), a.start_line, a.name)
+    ):
+        path_id = path_ids.get(artifact.path)
+        if path_id is None:
+            path_id = path_ids[artifact.path] = strings.intern(str(artifact.path))
+        detail_key = _detail_key(artifact)
+        detail_id = detail_ids.get(detail_key)
+        if detail_id is None:
+            detail_id = detail_ids[detail_key] = strings.intern(_encode_details(detail_key))
+        columns["types"].append(_TYPE_CODES[artifact.artifact_type])
+        columns["names"].append(strings.intern(artifact.name))
+        columns["paths"].append(path_id)
+        columns["start_lines"].append(artifact.start_line)
+        columns["end_lines"].append(artifact.end_line)
+        columns["signals"].append(sum(_SIGNAL_BITS[s] for s in artifact.risk_signals))
+        columns["metadata"].append(
+            strings.intern(_encode_json(artifact.metadata)) if artifact.metadata else _NONE
+        )
+        columns["details"].append(detail_id)
+
+    sources = array("I")
+    row_offsets = array("Q", [0])
+    targets = array("I")
+    for source, source_targets in sorted(fingerprint.dependency_graph.edges.items()):
+        sources.append(strings.intern(source))
+        targets.extend(strings.intern(target) for target in sorted(source_targets))
+        row_offsets.append(len(targets))
+
+    summary = {
+        "repository_path": str(fingerprint.repository_path),
+        "fingerprint_hash": fingerprint.fingerprint_hash,
+        "total_files": fingerprint.total_files,
+        "total_classes": fingerprint.total_classes,
+        "total_functions": fingerprint.total_functions,
+        "total_lines": fingerprint.total_lines,
+        "languages": fingerprint.languages,
+        "risk_signals": {s.value: count for s, count in fingerprint.risk_signals.items()},
+        "status": fingerprint.status,
+        "status_metadata": fingerprint.status_metadata,
+        "metadata": fingerprint.metadata,
+    }
+    summary_id = strings.intern(_encode_json(summary))
+
+    string_offsets = array("Q", [0])
+    for encoded in strings.encoded:
+        string_offsets.append(string_offsets[-1] + len(encoded))
+    blob = b"".join(strings.encoded)
+
+    sections = [
+        _HEADER.pack(
+            SNAPSHOT_MAGIC,
+            SNAPSHOT_VERSION,
+            0,
+            len(strings.encoded),
+            len(columns["types"]),
+            len(sources),
+            len(targets),
+            summary_id,
+        ),
+        _little_endian(string_offsets),
+        blob + _padding(len(blob)),
+    ]
+    for column in [*columns.values(), sources, row_offsets, targets]:
+        data = _little_endian(column)
+        sections.append(data + _padding(len(data)))
+
+    digest = hashlib.sha256()
+    try:
+        with open(path, "wb") as f:
+            for section in sections:
+                digest.update(section)
+                f.write(section)
+            f.write(digest.digest())
+    except OSError as e:
+        raise FingerprintingError(f"Failed to write fingerprint snapshot to {path}: {e}") from e
+
+
+class _Snapshot:
+    """Memory-mapped view of a snapshot file's sections.
+
+    close() releases the mapping; it also happens when the snapshot is used as a
+    context manager or garbage collected.
+    """
+
+    string_count: int
+    artifact_count: int
+    source_count: int
+    edge_count: int
+    summary_id: int
+
+    def __init__(self, path: Path, verify: bool) -> None:
+        """Map path and locate its sections.
+
+        Raises:
+            FingerprintingError: If the file is missing, truncated or corrupt
+        """
+        try:
+            with open(path, "rb") as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            # mmap raises ValueError for an empty file
+            raise FingerprintingError(f"Failed to read fingerprint snapshot {path}: {e}") from e
+        # Every memoryview over the map, released before it is closed
+        self._views: list[memoryview] = []
+        try:
+            self._locate_sections(verify)
+        except (struct.error, TypeError, ValueError) as e:
+            self.close()
+            raise FingerprintingError(f"Corrupt fingerprint snapshot {path}: {e}") from e
+        except FingerprintingError as e:
+            self.close()
+            raise FingerprintingError(f"Corrupt fingerprint snapshot {path}: {e}") from e
+        self._decoded: dict[int, str] = {}
+        self._all_strings: list[str] | None = None
+
+    def _locate_sections(self, verify: bool) -> None:
+        """Parse the header and create a view of each section."""
+        if self._map[: len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+            raise FingerprintingError("not a fingerprint snapshot")
+        (
+            _magic,
+            version,
+            _flags,
+            self.string_count,
+            self.artifact_count,
+            self.source_count,
+            self.edge_count,
+            self.summary_id,
+        ) = _HEADER.unpack_from(self._map, 0)
+        if version != SNAPSHOT_VERSION:
+            raise FingerprintingError(f"unsupported snapshot version {version}")
+
+        view = memoryview(self._map)
+        self._views.append(view)
+        offset = _HEADER.size
+
+        def section(typecode: str, count: int) -> Any:
+            nonlocal offset
+            size = count * array(typecode).itemsize
+            if offset + size + _DIGEST_SIZE > len(self._map):
+                raise FingerprintingError("truncated")
+            data = view[offset : offset + size]
+            self._views.append(data)
+            offset += size + (-size % 8)
+            if typecode == "B":
+                return data
+            if sys.byteorder == "big":
+                column = array(typecode, data.tobytes())
+                column.byteswap()
+                return column
+            cast = data.cast(typecode)
+            self._views.append(cast)
+            return cast
+
+        self.string_offsets = section("Q", self.string_count + 1)
+        self.blob_offset = offset
+        section("B", self.string_offsets[-1])
+        self.columns = {name: section(typecode, self.artifact_count) for name, typecode in _COLUMNS}
+        self.sources = section("I", self.source_count)
+        self.row_offsets = section("Q", self.source_count + 1)
+        self.targets = section("I", self.edge_count)
+        if offset + _DIGEST_SIZE != len(self._map):
+            raise FingerprintingError("unexpected trailing data")
+        if self.summary_id >= self.string_count or self.row_offsets[-1] != self.edge_count:
+            raise FingerprintingError("inconsistent section sizes")
+        if verify:
+            with view[:offset] as checked:
+                if hashlib.sha256(checked).digest() != self._map[offset:]:
+                    raise FingerprintingError("checksum mismatch")
+
+    @property
+    def closed(self) -> bool:
+        """Whether the mapping has been released."""
+        return self._map.closed
+
+    def close(self) -> None:
+        """Release the section views and unmap the file; later reads raise ValueError."""
+        while self._views:
+            self._views.pop().release()
+        self._map.close()
+
+    def __enter__(self) -> "_Snapshot":
+        """Return the snapshot, closing it on exit."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Close the snapshot."""
+        self.close()
+
+    def strings(self) -> list[str]:
+        """Decode the whole string table at once, for full scans."""
+        if self._all_strings is None:
+            offsets = self.string_offsets.tolist()
+            blob = self._map[self.blob_offset : self.blob_offset + offsets[-1]]
+            if blob.isascii():
+                # Byte offsets are character offsets, so one decode covers every string
+                text = blob.decode("ascii")
+                self._all_strings = [text[start:end] for start, end in zip(offsets, offsets[1:])]
+            else:
+                self._all_strings = [
+                    blob[start:end].decode("utf-8") for start, end in zip(offsets, offsets[1:])
+                ]
+        return self._all_strings
+
+    def string(self, string_id: int) -> str:
+        """Decode a string from the table, caching the result."""
+        if self._all_strings is not None:
+            return self._all_strings[string_id]
+        value = self._decoded.get(string_id)
+        if value is None:
+            start = self.blob_offset + self.string_offsets[string_id]
+            end = self.blob_offset + self.string_offsets[string_id + 1]
+            value = self._decoded[string_id] = self._map[start:end].decode("utf-8")
+        return value
+
+    def row(self, index: int) -> "SnapshotRow":
+        """Read artifact number index's stored fields without building it."""
+        columns = self.columns
+        metadata_id = columns["metadata"][index]
+        return SnapshotRow(
+            _ARTIFACT_TYPES[columns["types"][index]],
+            self.string(columns["names"][index]),
+            self.string(columns["paths"][index]),
+            columns["start_lines"][index],
+            columns["end_lines"][index],
+            columns["signals"][index],
+            None if metadata_id == _NONE else self.string(metadata_id),
+            self.string(columns["details"][index]),
+        )
+
+    def rows(self) -> Iterator["SnapshotRow"]:
+        """Read every artifact's stored fields in order, decoding the string table once."""
+        strings = self.strings()
+        columns = [self.columns[name].tolist() for name, _ in _COLUMNS]
+        for artifact_type, name, path, start, end, bits, metadata, details in zip(*columns):
+            yield SnapshotRow(
+                _ARTIFACT_TYPES[artifact_type],
+                strings[name],
+                strings[path],
+                start,
+                end,
+                bits,
+                None if metadata == _NONE else strings[metadata],
+                strings[details],
+            )
+
+    def artifact(self, index: int) -> CodeArtifact:
+        """Build artifact number index."""
+        row = self.row(index)
+        return _build_artifact(
+            row.artifact_type,
+            row.name,
+            Path(row.path),
+            row.start_line,
+            row.end_line,
+            frozenset(signal for signal in _SIGNALS if row.signal_bits & _SIGNAL_BITS[signal]),
+            {} if row.metadata is None else json.loads(row.metadata),
+            json.loads(row.details),
+        )
+
+
+class SnapshotRow(NamedTuple):
+    """An artifact's stored fields; equal rows describe equal artifacts."""
+
+    artifact_type: CodeArtifactType
+    name: str
+    path: str
+    start_line: int
+    end_line: int
+    signal_bits: int
+    metadata: str | None  # canonical JSON, None when empty
+    details: str  # canonical JSON of subtype-specific fields
+
+
+class SnapshotArtifacts(Set):
+    """Read-only set of a snapshot's artifacts, built on first access.
+
+    Iteration yields artifacts sorted by path, start line and name. Compares
+    equal to a frozenset of the same artifacts.
+    """
+
+    def __init__(self, snapshot: _Snapshot) -> None:
+        """Initialize over a mapped snapshot."""
+        self._snapshot = snapshot
+        self._built: dict[int, CodeArtifact] = {}
+        self._members: frozenset[CodeArtifact] | None = None
+
+    @classmethod
+    def _from_iterable(cls, iterable: Iterable[CodeArtifact]) -> frozenset[CodeArtifact]:
+        """Return set operation results as frozensets."""
+        return frozenset(iterable)
+
+    def __len__(self) -> int:
+        """Get the number of artifacts."""
+        return self._snapshot.artifact_count
+
+    def __getitem__(self, index: int) -> CodeArtifact:
+        """Get artifact number index in snapshot order."""
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("artifact index out of range")
+        artifact = self._built.get(index)
+        if artifact is None:
+            artifact = self._built[index] = self._snapshot.artifact(index)
+        return artifact
+
+    def __iter__(self) -> Iterator[CodeArtifact]:
+        """Iterate over artifacts in snapshot order."""
+        for index in range(len(self)):
+            yield self[index]
+
+    def rows(self) -> Iterator[SnapshotRow]:
+        """Iterate over stored fields in snapshot order, without building artifacts."""
+        return self._snapshot.rows()
+
+    @property
+    def closed(self) -> bool:
+        """Whether the snapshot file has been unmapped."""
+        return self._snapshot.closed
+
+    def close(self) -> None:
+        """Unmap the snapshot file; artifacts not yet built can no longer be read."""
+        self._snapshot.close()
+
+    def __contains__(self, artifact: object) -> bool:
+        """Check membership, building every artifact on first use."""
+        if self._members is None:
+            self._members = frozenset(self)
+        return artifact in self._members
+
+    def __repr__(self) -> str:
+        """Get a short representation."""
+        return f"SnapshotArtifacts({len(self)} artifacts, {len(self._built)} built)"
+
+
+class SnapshotEdges(Mapping):
+    """Read-only mapping of a snapshot's dependency graph edges.
+
+    Sources are looked up by binary search over the sorted CSR rows; only the
+    strings touched are decoded.
+    """
+
+    def __init__(self, snapshot: _Snapshot) -> None:
+        """Initialize over a mapped snapshot."""
+        self._snapshot = snapshot
+
+    def _source(self, row: int) -> str:
+        """Get the source id of a row."""
+        return self._snapshot.string(self._snapshot.sources[row])
+
+    def _row(self, source: str) -> int | None:
+        """Find the row of a source, if present."""
+        low, high = 0, len(self)
+        while low < high:
+            middle = (low + high) // 2
+            if self._source(middle) < source:
+                low = middle + 1
+            else:
+                high = middle
+        return low if low < len(self) and self._source(low) == source else None
+
+    def __getitem__(self, source: str) -> frozenset[str]:
+        """Get the targets of a source."""
+        row = self._row(source) if isinstance(source, str) else None
+        if row is None:
+            raise KeyError(source)
+        snapshot = self._snapshot
+        start, end = snapshot.row_offsets[row], snapshot.row_offsets[row + 1]
+        return frozenset(snapshot.string(snapshot.targets[i]) for i in range(start, end))
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over sources in sorted order."""
+        for row in range(len(self)):
+            yield self._source(row)
+
+    def __len__(self) -> int:
+        """Get the number of sources."""
+        return self._snapshot.source_count
+
+    def items(self) -> "_SnapshotEdgeItems":
+        """Get a view of (source, targets) pairs that reads rows in order."""
+        return _SnapshotEdgeItems(self)
+
+    def _iter_items(self) -> Iterator[tuple[str, frozenset[str]]]:
+        """Iterate over (source, targets) rows without per-source searches."""
+        snapshot = self._snapshot
+        strings = snapshot.strings()
+        offsets = snapshot.row_offsets.tolist()
+        targets = snapshot.targets.tolist()
+        for row, source in enumerate(snapshot.sources.tolist()):
+            row_targets = targets[offsets[row] : offsets[row + 1]]
+            yield strings[source], frozenset(strings[target] for target in row_targets)
+
+    def __repr__(self) -> str:
+        """Get a short representation."""
+        return f"SnapshotEdges({len(self)} sources, {self._snapshot.edge_count} edges)"
+
+
+class _SnapshotEdgeItems(ItemsView):
+    """Items view of SnapshotEdges iterating rows sequentially."""
+
+    _mapping: SnapshotEdges
+
+    def __iter__(self) -> Iterator[tuple[str, frozenset[str]]]:
+        """Iterate over (source, targets) pairs in source order."""
+        return self._mapping._iter_items()
+
+
+def load_snapshot(path: Path, verify: bool = True) -> RepositoryFingerprint:
+    """Load a fingerprint from a snapshot written by write_snapshot().
+
+    Artifacts and graph edges stay in the mapped file until read. verify checks
+    the sha256 trailer; skipping it makes loading independent of file size.
+
+    Raises:
+        FingerprintingError: If the file is missing, truncated or corrupt
+    """
+    snapshot = _Snapshot(path, verify)
+    try:
+        summary = json.loads(snapshot.string(snapshot.summary_id))
+        return RepositoryFingerprint(
+            repository_path=Path(summary["repository_path"]),
+            fingerprint_hash=summary["fingerprint_hash"],
+            total_files=summary["total_files"],
+            total_classes=summary["total_classes"],
+            total_functions=summary["total_functions"],
+            total_lines=summary["total_lines"],
+            languages=summary["languages"],
+            artifacts=SnapshotArtifacts(snapshot),
+            dependency_graph=DependencyGraph(edges=SnapshotEdges(snapshot)),
+            risk_signals={RiskSignal(s): count for s, count in summary["risk_signals"].items()},
+            status=summary["status"],
+            status_metadata=summary["status_metadata"],
+            metadata=summary["metadata"],
+        )
+    except (KeyError, TypeError, ValueError) as e:
+        raise FingerprintingError(f"Corrupt fingerprint snapshot {path}: {e}") from e
@@ -0,0 +1,74 @@
+"""Line-offset index for extracting source snippets without re-reading files."""
+
+import logging
+import mmap
+from array import array
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class SourceIndex:
+    """Per-file line-offset tables for slicing exact line ranges out of source files.
+
+    Offsets are recorded once while the fingerprinter already has each file's bytes
+    in hand. A snippet is then a single slice of a memory-mapped file, so no file
+    contents are held in memory between fingerprinting and reporting.
+    """
+
+    def __init__(self, root: Path) -> None:
+        """Initialize an empty index for files under root."""
+        self.root = Path(root)
+        self._offsets: dict[str, array] = {}
+
+    def add(self, relative_path: Path, data: bytes) -> None:
+        """Record the line offsets of a file from its raw bytes."""
+        self._offsets[relative_path.as_posix()] = self.compute_offsets(data)
+
+    @staticmethod
+    def compute_offsets(data: bytes) -> array:
+        """Compute the byte offset of every line start, plus a trailing end-of-file offset.
+
+        Line N (1-based) spans data[offsets[N - 1]:offsets[N]].
+        """
+        offsets = array("Q", [0])
+        position = data.find(b"\n")
+        while position != -1:
+            offsets.append(position + 1)
+            position = data.find(b"\n", position + 1)
+        if offsets[-1] != len(data):
+            offsets.append(len(data))
+        return offsets
+
+    def line_count(self, path: Path) -> int | None:
+        """Get the number of indexed lines for a file, or None if it is not indexed."""
+        offsets = self._offsets.get(Path(path).as_posix())
+        return None if offsets is None else len(offsets) - 1
+
+    def snippet(self, path: Path, start_line: int, end_line: int) -> str | None:
+        """Get lines start_line..end_line (inclusive, 1-based) of an indexed file.
+
+        Returns None if the file is not indexed, the range is empty, or the file
+        changed size since it was indexed.
+        """
+        offsets = self._offsets.get(Path(path).as_posix())
+        if offsets is None:
+            return None
+        start_line = max(start_line, 1)
+        end_line = min(end_line, len(offsets) - 1)
+        if start_line > end_line:
+            return None
+
+        file_path = self.root / path
+        try:
+            with open(file_path, "rb") as f:
+                size = f.seek(0, 2)
+                if size != offsets[-1]:
+                    logger.debug(f"Source changed since indexing, no snippet: {file_path}")
+                    return None
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    chunk = mapped[offsets[start_line - 1] : offsets[end_line]]
+        except (OSError, ValueError) as e:
+            logger.debug(f"Cannot read snippet from {file_path}: {e}")
+            return None
+        return chunk.decode("utf-8", errors="replace").rstrip("\r\n")
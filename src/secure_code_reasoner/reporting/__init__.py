@@ -1,11 +1,17 @@
 """Reporting subsystem for structured output generation."""
 
-from secure_code_reasoner.reporting.formatter import Formatter, JSONFormatter, TextFormatter
+from secure_code_reasoner.reporting.formatter import (
+    Formatter,
+    JSONFormatter,
+    SARIFFormatter,
+    TextFormatter,
+)
 from secure_code_reasoner.reporting.reporter import Reporter
 
 __all__ = [
     "Formatter",
     "JSONFormatter",
+    "SARIFFormatter",
     "TextFormatter",
     "Reporter",
 ]
@@ -0,0 +1,179 @@
+"""Pluggable JSON encoder backends for report serialization.
+
+Every backend produces the canonical text of the stdlib encoder: with indent=2,
+json.dumps(value, indent=2, default=str); with indent=None,
+json.dumps(value, separators=(",", ":"), default=str). orjson and msgspec are used
+when installed because they encode several times faster. Their output is
+normalized to match: non-ASCII characters are escaped as with ensure_ascii, and
+floats they format differently (exponents such as 1e16 or 1e-5) are rewritten in
+Python's repr form. Values a fast backend cannot encode (integers beyond 64
+bits, non-string dict keys) fall back to the stdlib encoder. Non-finite floats
+and non-str Enum members, which report models never contain, are encoded as
+null and by value respectively by the fast backends.
+"""
+
+import json
+import logging
+import re
+from abc import ABC, abstractmethod
+from typing import Any
+
+from secure_code_reasoner.exceptions import ReportingError
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import msgspec  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - exercised only without msgspec
+    msgspec = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+# ensure_ascii also escapes DEL, which fast encoders write raw
+_NON_ASCII = re.compile(r"[^\x00-\x7e]")
+# A float another encoder may format differently: an exponent or a small fraction
+_UNUSUAL_FLOAT = re.compile(r"\d[eE]|0\.0000")
+_STRING_OR_NUMBER = re.compile(r'"(?:[^"\\]|\\.)*"|-?\d[\d.eE+-]*')
+
+
+def _escape_non_ascii(match: re.Match[str]) -> str:
+    """Escape one non-ASCII character (or DEL) as json.dumps(ensure_ascii=True) does."""
+    code = ord(match.group())
+    if code > 0xFFFF:
+        code -= 0x10000
+        return f"\\u{0xD800 | (code >> 10):04x}\\u{0xDC00 | (code & 0x3FF):04x}"
+    return f"\\u{code:04x}"
+
+
+def _canonical_number(match: re.Match[str]) -> str:
+    """Rewrite a float token in Python's repr form, leaving strings and integers alone."""
+    token = match.group()
+    if token[0] == '"' or not any(c in token for c in ".eE"):
+        return token
+    return float.__repr__(float(token))
+
+
+def canonicalize(text: str) -> str:
+    """Normalize JSON text from a fast encoder to the stdlib encoder's output."""
+    if not text.isascii() or "\x7f" in text:
+        text = _NON_ASCII.sub(_escape_non_ascii, text)
+    if _UNUSUAL_FLOAT.search(text):
+        text = _STRING_OR_NUMBER.sub(_canonical_number, text)
+    return text
+
+
+class JSONBackend(ABC):
+    """Encodes values as canonical JSON text."""
+
+    name: str
+
+    @abstractmethod
+    def encode(self, value: Any, indent: int | None = 2) -> str:
+        """Encode value; indent=None gives the compact form."""
+        pass
+
+
+class StdlibBackend(JSONBackend):
+    """Reference backend using the json module."""
+
+    name = "json"
+
+    def encode(self, value: Any, indent: int | None = 2) -> str:
+        """Encode value with json.dumps."""
+        if indent is None:
+            return json.dumps(value, separators=(",", ":"), default=str)
+        return json.dumps(value, indent=indent, default=str)
+
+
+class _FastBackend(JSONBackend):
+    """Base for native encoders whose output is canonicalized."""
+
+    def __init__(self) -> None:
+        """Initialize backend with the stdlib encoder as fallback."""
+        self._fallback = StdlibBackend()
+
+    def encode(self, value: Any, indent: int | None = 2) -> str:
+        """Encode value natively, falling back to the stdlib for what it cannot encode."""
+        if indent not in (None, 2):
+            return self._fallback.encode(value, indent)
+        try:
+            text = self._encode(value, indent == 2)
+        except (TypeError, ValueError, OverflowError) as e:
+            logger.debug(f"{self.name} cannot encode value, using json: {e}")
+            return self._fallback.encode(value, indent)
+        return canonicalize(text)
+
+    @abstractmethod
+    def _encode(self, value: Any, indented: bool) -> str:
+        """Encode value natively, compact or with two-space indentation."""
+        pass
+
+
+class OrjsonBackend(_FastBackend):
+    """Backend using orjson."""
+
+    name = "orjson"
+
+    def _encode(self, value: Any, indented: bool) -> str:
+        """Encode value with orjson."""
+        # Dataclasses and datetimes go through default=str, as with json.dumps
+        option = orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_PASSTHROUGH_DATETIME
+        if indented:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(value, default=str, option=option).decode("utf-8")
+
+
+class MsgspecBackend(_FastBackend):
+    """Backend using msgspec."""
+
+    name = "msgspec"
+
+    def __init__(self) -> None:
+        """Initialize backend with a reusable msgspec encoder."""
+        super().__init__()
+        self._encoder = msgspec.json.Encoder(enc_hook=str)
+
+    def _encode(self, value: Any, indented: bool) -> str:
+        """Encode value with msgspec."""
+        try:
+            data: bytes = self._encoder.encode(value)
+        except msgspec.EncodeError as e:
+            raise TypeError(str(e)) from e
+        if indented:
+            data = msgspec.json.format(data, indent=2)
+        return data.decode("utf-8")
+
+
+def available_backends() -> list[str]:
+    """Get the names of usable backends, fastest first."""
+    names = []
+    if orjson is not None:
+        names.append(OrjsonBackend.name)
+    if msgspec is not None:
+        names.append(MsgspecBackend.name)
+    names.append(StdlibBackend.name)
+    return names
+
+
+def get_backend(name: str | None = None) -> JSONBackend:
+    """Get a backend by name, or the fastest available one when name is None.
+
+    Raises:
+        ReportingError: If the named backend is unknown or not installed
+    """
+    backends: dict[str, type[JSONBackend]] = {
+        OrjsonBackend.name: OrjsonBackend,
+        MsgspecBackend.name: MsgspecBackend,
+        StdlibBackend.name: StdlibBackend,
+    }
+    available = available_backends()
+    if name is None:
+        name = available[0]
+    if name not in backends:
+        raise ReportingError(f"Unknown JSON backend {name}; choose from {', '.join(backends)}")
+    if name not in available:
+        raise ReportingError(f"JSON backend {name} is not installed")
+    return backends[name]()
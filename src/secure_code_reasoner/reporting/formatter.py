@@ -1,12 +1,36 @@
 """Report formatters for different output formats."""
 
-import json
+import fnmatch
+import io
+import re
 from abc import ABC, abstractmethod
-
-from secure_code_reasoner.agents.models import AgentReport, Severity
-from secure_code_reasoner.fingerprinting.models import RepositoryFingerprint
+from collections import Counter
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+from typing import IO, Any
+
+from secure_code_reasoner import __version__
+from secure_code_reasoner.agents.models import (
+    AgentFinding,
+    AgentReport,
+    PatchSuggestion,
+    Severity,
+)
+from secure_code_reasoner.exceptions import ReportingError
+from secure_code_reasoner.fingerprinting.diff import FingerprintDiff
+from secure_code_reasoner.fingerprinting.models import FileArtifact, RepositoryFingerprint
+from secure_code_reasoner.reporting.encoders import get_backend
+from secure_code_reasoner.reporting.json_stream import write_json
 from secure_code_reasoner.tracing.models import ExecutionTrace
 
+_SEVERITY_ORDER = (
+    Severity.CRITICAL,
+    Severity.HIGH,
+    Severity.MEDIUM,
+    Severity.LOW,
+    Severity.INFO,
+)
+
 
 class Formatter(ABC):
     """Base formatter interface."""
@@ -26,35 +50,137 @@ class Formatter(ABC):
         """Format execution trace."""
         pass
 
+    def format_diff(self, diff: FingerprintDiff) -> str:
+        """Format fingerprint diff report.
+
+        Raises:
+            ReportingError: If the formatter does not support diffs
+        """
+        raise ReportingError(f"{type(self).__name__} cannot format fingerprint diffs")
+
+    def write_fingerprint(self, fingerprint: RepositoryFingerprint, stream: IO[str]) -> None:
+        """Write fingerprint report to a text stream."""
+        stream.write(self.format_fingerprint(fingerprint))
+
+    def write_agent_report(self, report: AgentReport, stream: IO[str]) -> None:
+        """Write agent report to a text stream."""
+        stream.write(self.format_agent_report(report))
+
+    def write_trace(self, trace: ExecutionTrace, stream: IO[str]) -> None:
+        """Write execution trace report to a text stream."""
+        stream.write(self.format_trace(trace))
+
+    def write_diff(self, diff: FingerprintDiff, stream: IO[str]) -> None:
+        """Write fingerprint diff report to a text stream."""
+        stream.write(self.format_diff(diff))
+
 
 class JSONFormatter(Formatter):
-    """JSON formatter for structured output."""
+    """JSON formatter for structured output.
+
+    The write_* methods stream JSON to a file object as it is encoded, so large
+    reports are never held in memory as one string. compact drops indentation
+    and whitespace. backend names the JSON encoder (orjson, msgspec or json);
+    by default the fastest installed one is used. All backends produce the same
+    bytes.
+    """
+
+    def __init__(self, compact: bool = False, backend: str | None = None) -> None:
+        """Initialize JSON formatter.
+
+        Raises:
+            ReportingError: If the named backend is unknown or not installed
+        """
+        self.compact = compact
+        self.backend = get_backend(backend)
 
     def format_fingerprint(self, fingerprint: RepositoryFingerprint) -> str:
         """Format fingerprint as JSON."""
-        result = fingerprint.to_dict()
+        buffer = io.StringIO()
+        self.write_fingerprint(fingerprint, buffer)
+        return buffer.getvalue()
+
+    def format_agent_report(self, report: AgentReport) -> str:
+        """Format agent report as JSON."""
+        buffer = io.StringIO()
+        self.write_agent_report(report, buffer)
+        return buffer.getvalue()
+
+    def format_trace(self, trace: ExecutionTrace) -> str:
+        """Format execution trace as JSON."""
+        buffer = io.StringIO()
+        self.write_trace(trace, buffer)
+        return buffer.getvalue()
+
+    def format_diff(self, diff: FingerprintDiff) -> str:
+        """Format fingerprint diff as JSON."""
+        buffer = io.StringIO()
+        self.write_diff(diff, buffer)
+        return buffer.getvalue()
+
+    def write_fingerprint(self, fingerprint: RepositoryFingerprint, stream: IO[str]) -> None:
+        """Stream fingerprint as JSON."""
+        result = fingerprint.to_dict(lazy=True)
         # Epistemic closure: Ensure status is visible in JSON output
         if "fingerprint_status" not in result:
             result["fingerprint_status"] = getattr(fingerprint, "status", "COMPLETE_WITH_SKIPS")
-        return json.dumps(result, indent=2, default=str)
+        self._write(result, stream)
 
-    def format_agent_report(self, report: AgentReport) -> str:
-        """Format agent report as JSON."""
-        result = report.to_dict()
+    def write_agent_report(self, report: AgentReport, stream: IO[str]) -> None:
+        """Stream agent report as JSON."""
+        result = report.to_dict(lazy=True)
         # Epistemic closure: Ensure execution_status is visible in JSON output
         if "execution_status" not in result.get("metadata", {}):
             metadata = result.get("metadata", {})
             metadata["execution_status"] = metadata.get("execution_status", "COMPLETE")
             result["metadata"] = metadata
-        return json.dumps(result, indent=2, default=str)
+        self._write(result, stream)
 
-    def format_trace(self, trace: ExecutionTrace) -> str:
-        """Format execution trace as JSON."""
-        return json.dumps(trace.to_dict(), indent=2, default=str)
+    def write_trace(self, trace: ExecutionTrace, stream: IO[str]) -> None:
+        """Stream execution trace as JSON."""
+        self._write(trace.to_dict(lazy=True), stream)
+
+    def write_diff(self, diff: FingerprintDiff, stream: IO[str]) -> None:
+        """Stream fingerprint diff as JSON."""
+        self._write(diff.to_dict(), stream)
+
+    def _write(self, result: dict[str, Any], stream: IO[str]) -> None:
+        """Encode a report dictionary to the stream."""
+        write_json(result, stream, indent=None if self.compact else 2, backend=self.backend)
 
 
 class TextFormatter(Formatter):
-    """Human-readable text formatter."""
+    """Human-readable text formatter.
+
+    Agent reports can be narrowed before rendering: min_severity drops less
+    severe findings, paths keeps findings and patches whose file matches one of
+    the glob patterns (fnmatch, against the POSIX path), agents keeps findings
+    from the named agents, and limit keeps only the first N findings and patches
+    (most severe first). summary_only renders counts per severity and agent
+    instead of the individual entries. iter_agent_report yields the report line
+    by line, and write_agent_report writes each line as it is produced.
+    """
+
+    def __init__(
+        self,
+        min_severity: Severity | None = None,
+        paths: Sequence[str] = (),
+        agents: Sequence[str] = (),
+        limit: int | None = None,
+        summary_only: bool = False,
+    ) -> None:
+        """Initialize text formatter with agent report filters.
+
+        Raises:
+            ReportingError: If limit is negative
+        """
+        if limit is not None and limit < 0:
+            raise ReportingError(f"limit must be >= 0, got {limit}")
+        self.min_severity = min_severity
+        self.paths = tuple(paths)
+        self.agents = frozenset(agents)
+        self.limit = limit
+        self.summary_only = summary_only
 
     def format_fingerprint(self, fingerprint: RepositoryFingerprint) -> str:
         """Format fingerprint as text."""
@@ -91,70 +217,127 @@ class TextFormatter(Formatter):
 
     def format_agent_report(self, report: AgentReport) -> str:
         """Format agent report as text."""
-        lines = [
-            "=" * 80,
-            f"Agent Report: {report.agent_name}",
-            "=" * 80,
+        return "\n".join(self.iter_agent_report(report))
+
+    def write_agent_report(self, report: AgentReport, stream: IO[str]) -> None:
+        """Write agent report as text, line by line as it is rendered."""
+        separator = ""
+        for line in self.iter_agent_report(report):
+            stream.write(separator + line)
+            separator = "\n"
+
+    def _matches_path(self, path: Path | None) -> bool:
+        """Check whether a file path passes the path filter."""
+        if not self.paths:
+            return True
+        if path is None:
+            return False
+        posix_path = Path(path).as_posix()
+        return any(fnmatch.fnmatchcase(posix_path, pattern) for pattern in self.paths)
+
+    def _select_findings(self, report: AgentReport) -> list[AgentFinding]:
+        """Get the findings passing the filters, most severe first."""
+        minimum = self.min_severity.priority() if self.min_severity else 0
+        findings = [
+            finding
+            for finding in report.findings
+            if finding.severity.priority() >= minimum
+            and (not self.agents or finding.agent_name in self.agents)
+            and self._matches_path(finding.file_path)
         ]
+        findings.sort(
+            key=lambda f: (
+                -f.severity.priority(),
+                f.title,
+                str(f.file_path or ""),
+                f.line_number or 0,
+                f.description,
+            )
+        )
+        return findings if self.limit is None else findings[: self.limit]
+
+    def _select_patches(self, report: AgentReport) -> list[PatchSuggestion]:
+        """Get the patch suggestions passing the path filter, in file order."""
+        patches = sorted(
+            (p for p in report.patch_suggestions if self._matches_path(p.file_path)),
+            key=lambda p: (p.file_path, p.line_start),
+        )
+        return patches if self.limit is None else patches[: self.limit]
+
+    @staticmethod
+    def _count(shown: int, total: int) -> str:
+        """Describe how many entries are shown out of how many there are."""
+        return str(total) if shown == total else f"{shown} of {total}"
+
+    def iter_agent_report(self, report: AgentReport) -> Iterator[str]:
+        """Yield the lines of the agent report as text."""
+        yield "=" * 80
+        yield f"Agent Report: {report.agent_name}"
+        yield "=" * 80
 
         if report.summary:
-            lines.append(f"Summary: {report.summary}")
-            lines.append("")
-
-        if report.findings:
-            lines.append(f"Findings ({len(report.findings)}):")
-            lines.append("")
-
-            severity_order = [
-                Severity.CRITICAL,
-                Severity.HIGH,
-                Severity.MEDIUM,
-                Severity.LOW,
-                Severity.INFO,
-            ]
-            findings_by_severity: dict[Severity, list] = {s: [] for s in severity_order}
-
-            for finding in report.findings:
-                findings_by_severity[finding.severity].append(finding)
-
-            for severity in severity_order:
-                findings = findings_by_severity[severity]
-                if not findings:
-                    continue
-
-                lines.append(f"{severity.value.upper()} ({len(findings)}):")
-                for finding in findings:
-                    lines.append(f"  [{severity.value.upper()}] {finding.title}")
-                    lines.append(f"      Description: {finding.description}")
-                    if finding.file_path:
-                        lines.append(f"      File: {finding.file_path}")
-                        if finding.line_number:
-                            lines.append(f"      Line: {finding.line_number}")
-                    if finding.recommendation:
-                        lines.append(f"      Recommendation: {finding.recommendation}")
-                    lines.append("")
-                lines.append("")
-
-        if report.patch_suggestions:
-            lines.append(f"Patch Suggestions ({len(report.patch_suggestions)}):")
-            lines.append("")
-            for i, patch in enumerate(
-                sorted(report.patch_suggestions, key=lambda p: (p.file_path, p.line_start)), 1
-            ):
-                lines.append(
-                    f"  {i}. {patch.file_path} (lines {patch.line_start}-{patch.line_end})"
-                )
-                lines.append(f"     Description: {patch.description}")
-                lines.append("     Original:")
+            yield f"Summary: {report.summary}"
+            yield ""
+
+        findings = self._select_findings(report)
+        patches = self._select_patches(report)
+        finding_count = self._count(len(findings), len(report.findings))
+        patch_count = self._count(len(patches), len(report.patch_suggestions))
+        severity_counts = Counter(finding.severity for finding in findings)
+
+        if self.summary_only:
+            yield f"Findings ({finding_count}):"
+            for severity in _SEVERITY_ORDER:
+                if severity_counts[severity]:
+                    yield f"  {severity.value.upper()}: {severity_counts[severity]}"
+            agent_counts = Counter(finding.agent_name for finding in findings)
+            if agent_counts:
+                yield ""
+                yield "Findings by Agent:"
+                for agent_name, count in sorted(agent_counts.items()):
+                    yield f"  {agent_name}: {count}"
+            yield ""
+            yield f"Patch Suggestions: {patch_count}"
+            yield "=" * 80
+            return
+
+        if findings:
+            yield f"Findings ({finding_count}):"
+            yield ""
+            current: Severity | None = None
+            for finding in findings:
+                severity = finding.severity
+                if severity != current:
+                    if current is not None:
+                        yield ""
+                    current = severity
+                    yield f"{severity.value.upper()} ({severity_counts[severity]}):"
+                yield f"  [{severity.value.upper()}] {finding.title}"
+                yield f"      Description: {finding.description}"
+                if finding.file_path:
+                    yield f"      File: {finding.file_path}"
+                    if finding.line_number:
+                        yield f"      Line: {finding.line_number}"
+                if finding.recommendation:
+                    yield f"      Recommendation: {finding.recommendation}"
+                yield ""
+            yield ""
+
+        if patches:
+            yield f"Patch Suggestions ({patch_count}):"
+            yield ""
+            for i, patch in enumerate(patches, 1):
+                yield f"  {i}. {patch.file_path} (lines {patch.line_start}-{patch.line_end})"
+                yield f"     Description: {patch.description}"
+                yield "     Original:"
                 for line in patch.original_code.splitlines():
-                    lines.append(f"       {line}")
-                lines.append("     Suggested:")
+                    yield f"       {line}"
+                yield "     Suggested:"
                 for line in patch.suggested_code.splitlines():
-                    lines.append(f"       {line}")
-                lines.append("")
+                    yield f"       {line}"
+                yield ""
 
-        lines.append("=" * 80)
-        return "\n".join(lines)
+        yield "=" * 80
 
     def format_trace(self, trace: ExecutionTrace) -> str:
         """Format execution trace as text."""
@@ -180,9 +363,10 @@ class TextFormatter(Formatter):
             lines.append("")
 
         if trace.events:
-            lines.append(f"Events ({len(trace.events)}):")
-            for event in sorted(trace.events, key=lambda e: e.timestamp):
-                lines.append(f"  [{event.event_type.value}] {event.timestamp:.3f}")
+            lines.append(f"Events ({trace.count_events()}):")
+            for event, count in trace.counted_events():
+                repeats = f" (x{count})" if count > 1 else ""
+                lines.append(f"  [{event.event_type.value}] {event.timestamp:.3f}{repeats}")
                 if event.file_path:
                     lines.append(f"      File: {event.file_path}")
                 if event.command:
@@ -209,3 +393,378 @@ class TextFormatter(Formatter):
 
         lines.append("=" * 80)
         return "\n".join(lines)
+
+    def format_diff(self, diff: FingerprintDiff) -> str:
+        """Format fingerprint diff as text."""
+        lines = [
+            "=" * 80,
+            "Fingerprint Diff",
+            "=" * 80,
+            f"Old Fingerprint Hash: {diff.old_fingerprint_hash}",
+            f"New Fingerprint Hash: {diff.new_fingerprint_hash}",
+            "",
+            "Summary:",
+        ]
+        for kind, count in diff.summary().items():
+            lines.append(f"  {kind.replace('_', ' ').title()}: {count}")
+
+        if diff.risk_signal_deltas:
+            lines.append("")
+            lines.append("Risk Signal Changes:")
+            for signal, delta in sorted(diff.risk_signal_deltas.items(), key=lambda x: x[0].value):
+                lines.append(f"  {signal.value}: {delta:+d}")
+
+        if diff.added:
+            lines.append("")
+            lines.append(f"Added ({len(diff.added)}):")
+            for artifact_id, artifact in diff.added.items():
+                lines.append(f"  + {artifact_id} (line {artifact.start_line})")
+
+        if diff.removed:
+            lines.append("")
+            lines.append(f"Removed ({len(diff.removed)}):")
+            for artifact_id, artifact in diff.removed.items():
+                lines.append(f"  - {artifact_id} (line {artifact.start_line})")
+
+        if diff.modified:
+            lines.append("")
+            lines.append(f"Modified ({len(diff.modified)}):")
+            for change in diff.modified:
+                lines.append(f"  ~ {change.artifact_id}: {', '.join(change.changed_fields)}")
+                if change.risk_signals_added:
+                    added = ", ".join(sorted(s.value for s in change.risk_signals_added))
+                    lines.append(f"      Risk signals added: {added}")
+                if change.risk_signals_removed:
+                    removed = ", ".join(sorted(s.value for s in change.risk_signals_removed))
+                    lines.append(f"      Risk signals removed: {removed}")
+
+        if diff.moved:
+            lines.append("")
+            lines.append(f"Moved ({len(diff.moved)}):")
+            for change in diff.moved:
+                lines.append(
+                    f"  > {change.artifact_id} "
+                    f"(line {change.old.start_line} -> {change.new.start_line})"
+                )
+
+        for title, edges, marker in (
+            ("Edges Added", diff.edges_added, "+"),
+            ("Edges Removed", diff.edges_removed, "-"),
+        ):
+            if edges:
+                lines.append("")
+                lines.append(f"{title} ({len(edges)}):")
+                for source, target in edges:
+                    lines.append(f"  {marker} {source} -> {target}")
+
+        lines.append("")
+        lines.append("=" * 80)
+        return "\n".join(lines)
+
+
+class SARIFFormatter(Formatter):
+    """SARIF 2.1.0 formatter for code-scanning tools.
+
+    Findings become results, patch suggestions become fixes on the results whose
+    location they cover (or results of their own when no finding matches), and
+    file artifacts become run artifacts. Rules are deduplicated by finding title
+    and emitted once in the driver's rule table. Results and artifacts are
+    generated one at a time and streamed with write_json, so the SARIF log is
+    never built in memory as a whole. write_analysis writes the fingerprint and
+    agent report as a single run.
+    """
+
+    SCHEMA_URI = "https://json.schemastore.org/sarif-2.1.0.json"
+    SARIF_VERSION = "2.1.0"
+    TOOL_NAME = "secure-code-reasoner"
+    # uriBaseId that artifact and result locations are relative to
+    SOURCE_ROOT = "SRCROOT"
+
+    _LEVELS = {
+        Severity.CRITICAL: "error",
+        Severity.HIGH: "error",
+        Severity.MEDIUM: "warning",
+        Severity.LOW: "note",
+        Severity.INFO: "note",
+    }
+    _PATCH_RULE_TITLE = "Suggested patch"
+
+    def __init__(self, compact: bool = False, backend: str | None = None) -> None:
+        """Initialize SARIF formatter.
+
+        Raises:
+            ReportingError: If the named backend is unknown or not installed
+        """
+        self.compact = compact
+        self.backend = get_backend(backend)
+
+    def format_fingerprint(self, fingerprint: RepositoryFingerprint) -> str:
+        """Format fingerprint as a SARIF log."""
+        buffer = io.StringIO()
+        self.write_fingerprint(fingerprint, buffer)
+        return buffer.getvalue()
+
+    def format_agent_report(self, report: AgentReport) -> str:
+        """Format agent report as a SARIF log."""
+        buffer = io.StringIO()
+        self.write_agent_report(report, buffer)
+        return buffer.getvalue()
+
+    def format_trace(self, trace: ExecutionTrace) -> str:
+        """Format execution trace as a SARIF log.
+
+        Raises:
+            ReportingError: Always, as SARIF has no representation for traces
+        """
+        raise ReportingError(f"{type(self).__name__} cannot format execution traces")
+
+    def format_analysis(self, fingerprint: RepositoryFingerprint, report: AgentReport) -> str:
+        """Format fingerprint and agent report as one SARIF log."""
+        buffer = io.StringIO()
+        self.write_analysis(fingerprint, report, buffer)
+        return buffer.getvalue()
+
+    def write_fingerprint(self, fingerprint: RepositoryFingerprint, stream: IO[str]) -> None:
+        """Stream fingerprint as a SARIF log with artifacts and no results."""
+        self._write_log(fingerprint, None, stream)
+
+    def write_agent_report(self, report: AgentReport, stream: IO[str]) -> None:
+        """Stream agent report as a SARIF log with results."""
+        self._write_log(None, report, stream)
+
+    def write_trace(self, trace: ExecutionTrace, stream: IO[str]) -> None:
+        """Stream execution trace as a SARIF log.
+
+        Raises:
+            ReportingError: Always, as SARIF has no representation for traces
+        """
+        stream.write(self.format_trace(trace))
+
+    def write_analysis(
+        self, fingerprint: RepositoryFingerprint, report: AgentReport, stream: IO[str]
+    ) -> None:
+        """Stream fingerprint and agent report as one SARIF log."""
+        self._write_log(fingerprint, report, stream)
+
+    def _write_log(
+        self,
+        fingerprint: RepositoryFingerprint | None,
+        report: AgentReport | None,
+        stream: IO[str],
+    ) -> None:
+        """Encode a SARIF log with one run to the stream."""
+        driver: dict[str, Any] = {
+            "name": self.TOOL_NAME,
+            "version": __version__,
+            "semanticVersion": __version__,
+        }
+        run: dict[str, Any] = {"tool": {"driver": driver}}
+        if fingerprint is not None:
+            run["originalUriBaseIds"] = {
+                self.SOURCE_ROOT: {"uri": self._directory_uri(fingerprint.repository_path)}
+            }
+            run["artifacts"] = self._iter_artifacts(fingerprint)
+        run["results"] = []
+        if report is not None:
+            findings = sorted(report.findings, key=self._finding_order)
+            patches = sorted(report.patch_suggestions, key=self._patch_order)
+            fixes = self._match_patches(findings, patches)
+            matched = {id(patch) for covering in fixes for patch in covering}
+            unmatched = [patch for patch in patches if id(patch) not in matched]
+            rules, rule_indexes = self._build_rules(findings, bool(unmatched))
+            driver["rules"] = rules
+            run["results"] = self._iter_results(findings, fixes, unmatched, rules, rule_indexes)
+        log = {"$schema": self.SCHEMA_URI, "version": self.SARIF_VERSION, "runs": [run]}
+        write_json(log, stream, indent=None if self.compact else 2, backend=self.backend)
+
+    @staticmethod
+    def _finding_order(finding: AgentFinding) -> tuple:
+        """Sort key placing findings by descending severity, then title and location."""
+        return (
+            -finding.severity.priority(),
+            finding.title,
+            str(finding.file_path or ""),
+            finding.line_number or 0,
+            finding.description,
+        )
+
+    @staticmethod
+    def _patch_order(patch: PatchSuggestion) -> tuple:
+        """Sort key placing patches by location."""
+        return (str(patch.file_path), patch.line_start, patch.line_end, patch.description)
+
+    @staticmethod
+    def _directory_uri(path: Path) -> str:
+        """Get a file URI for a directory, with the trailing slash SARIF requires."""
+        uri = Path(path).resolve().as_uri()
+        return uri if uri.endswith("/") else uri + "/"
+
+    @staticmethod
+    def _match_patches(
+        findings: list[AgentFinding], patches: list[PatchSuggestion]
+    ) -> list[list[PatchSuggestion]]:
+        """Get, for each finding, the patches that fix it.
+
+        A patch recording the artifact_line it was made for belongs to findings on
+        that line with the same risk signal; the replaced lines may be elsewhere in
+        the artifact. Other patches belong to findings on a line they replace.
+        """
+        by_path: dict[Path, list[PatchSuggestion]] = {}
+        for patch in patches:
+            by_path.setdefault(Path(patch.file_path), []).append(patch)
+
+        def fixes(patch: PatchSuggestion, finding: AgentFinding) -> bool:
+            artifact_line = patch.metadata.get("artifact_line")
+            if artifact_line is None:
+                return patch.line_start <= (finding.line_number or 0) <= patch.line_end
+            signal = patch.metadata.get("risk_signal")
+            return artifact_line == finding.line_number and finding.metadata.get("signal") == signal
+
+        return [
+            (
+                [
+                    patch
+                    for patch in by_path.get(Path(finding.file_path), [])
+                    if fixes(patch, finding)
+                ]
+                if finding.file_path is not None and finding.line_number is not None
+                else []
+            )
+            for finding in findings
+        ]
+
+    @staticmethod
+    def _rule_id(title: str, taken: set[str]) -> str:
+        """Derive a stable rule id from a title, unique among taken ids."""
+        slug = re.sub(r"[^a-z0-9]+", "-", title.lower()).strip("-") or "finding"
+        rule_id = f"scr/{slug}"
+        number = 2
+        while rule_id in taken:
+            rule_id = f"scr/{slug}-{number}"
+            number += 1
+        taken.add(rule_id)
+        return rule_id
+
+    def _build_rules(
+        self, findings: list[AgentFinding], patch_rule: bool
+    ) -> tuple[list[dict[str, Any]], dict[str, int]]:
+        """Build the rule table, one rule per distinct finding title.
+
+        With patch_rule, a rule for patches that no finding covers is added.
+        """
+        rules: list[dict[str, Any]] = []
+        indexes: dict[str, int] = {}
+        taken: set[str] = set()
+        entries = [(f.title, f.severity, f.recommendation) for f in findings]
+        if patch_rule:
+            entries.append((self._PATCH_RULE_TITLE, Severity.INFO, None))
+        for title, severity, help_text in entries:
+            if title in indexes:
+                continue
+            indexes[title] = len(rules)
+            rule: dict[str, Any] = {
+                "id": self._rule_id(title, taken),
+                "name": title,
+                "shortDescription": {"text": title},
+                "defaultConfiguration": {"level": self._LEVELS[severity]},
+            }
+            if help_text:
+                rule["help"] = {"text": help_text}
+            rules.append(rule)
+        return rules, indexes
+
+    def _iter_artifacts(self, fingerprint: RepositoryFingerprint) -> Iterator[dict[str, Any]]:
+        """Yield a SARIF artifact for each file artifact, in path order."""
+        files = sorted(
+            (a for a in fingerprint.artifacts if isinstance(a, FileArtifact)),
+            key=lambda a: a.path.as_posix(),
+        )
+        for artifact in files:
+            entry: dict[str, Any] = {
+                "location": self._location(artifact.path),
+                "length": artifact.byte_size,
+            }
+            if artifact.language:
+                entry["sourceLanguage"] = artifact.language
+            entry["properties"] = {
+                "lineCount": artifact.line_count,
+                "riskSignals": sorted(s.value for s in artifact.risk_signals),
+            }
+            yield entry
+
+    def _iter_results(
+        self,
+        findings: list[AgentFinding],
+        fixes: list[list[PatchSuggestion]],
+        unmatched: list[PatchSuggestion],
+        rules: list[dict[str, Any]],
+        rule_indexes: dict[str, int],
+    ) -> Iterator[dict[str, Any]]:
+        """Yield a SARIF result for each finding and each patch no finding covers."""
+        for finding, covering in zip(findings, fixes, strict=True):
+            index = rule_indexes[finding.title]
+            result: dict[str, Any] = {
+                "ruleId": rules[index]["id"],
+                "ruleIndex": index,
+                "level": self._LEVELS[finding.severity],
+                "message": {"text": finding.description},
+            }
+            if finding.file_path is not None:
+                physical: dict[str, Any] = {"artifactLocation": self._location(finding.file_path)}
+                if finding.line_number is not None:
+                    region: dict[str, Any] = {"startLine": finding.line_number}
+                    if finding.code_snippet:
+                        region["snippet"] = {"text": finding.code_snippet}
+                    physical["region"] = region
+                result["locations"] = [{"physicalLocation": physical}]
+            if covering:
+                result["fixes"] = [self._fix(patch) for patch in covering]
+            properties: dict[str, Any] = {
+                "agent": finding.agent_name,
+                "severity": finding.severity.value,
+            }
+            if finding.recommendation:
+                properties["recommendation"] = finding.recommendation
+            if finding.metadata:
+                properties["metadata"] = finding.metadata
+            result["properties"] = properties
+            yield result
+
+        for patch in unmatched:
+            index = rule_indexes[self._PATCH_RULE_TITLE]
+            location: dict[str, Any] = {"artifactLocation": self._location(patch.file_path)}
+            location["region"] = self._region(patch)
+            yield {
+                "ruleId": rules[index]["id"],
+                "ruleIndex": index,
+                "level": "note",
+                "message": {"text": patch.description},
+                "locations": [{"physicalLocation": location}],
+                "fixes": [self._fix(patch)],
+            }
+
+    def _location(self, path: Path) -> dict[str, str]:
+        """Get a SARIF artifact location relative to the source root."""
+        return {"uri": Path(path).as_posix(), "uriBaseId": self.SOURCE_ROOT}
+
+    @staticmethod
+    def _region(patch: PatchSuggestion) -> dict[str, int]:
+        """Get the region a patch replaces."""
+        return {"startLine": patch.line_start, "endLine": patch.line_end}
+
+    def _fix(self, patch: PatchSuggestion) -> dict[str, Any]:
+        """Map a patch suggestion to a SARIF fix."""
+        return {
+            "description": {"text": patch.description},
+            "artifactChanges": [
+                {
+                    "artifactLocation": self._location(patch.file_path),
+                    "replacements": [
+                        {
+                            "deletedRegion": self._region(patch),
+                            "insertedContent": {"text": patch.suggested_code},
+                        }
+                    ],
+                }
+            ],
+        }
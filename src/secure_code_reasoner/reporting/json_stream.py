@@ -0,0 +1,145 @@
+"""Incremental JSON encoding for large reports.
+
+write_json() produces exactly the text of json.dumps(value, indent=indent,
+default=str), but writes it to a stream piece by piece: objects and arrays are
+walked, and each array element is encoded on its own. Peak memory is therefore
+bounded by the largest single element rather than by the whole report. Arrays
+may also be given as iterators (for example a generator of artifact dicts), which
+are consumed lazily; an array element that is itself an iterator, or a dict with
+an iterator value, is walked rather than encoded whole. With indent=None the output is compact, as with
+json.dumps(value, separators=(",", ":"), default=str). Elements are encoded by a
+JSONBackend (see encoders), so orjson or msgspec can do the bulk of the work
+without changing the output.
+"""
+
+import json.encoder
+from collections.abc import Callable, Iterator
+from typing import IO, Any
+
+from secure_code_reasoner.reporting.encoders import JSONBackend, StdlibBackend
+
+# The C-accelerated string encoder json.dumps uses; the type stubs omit it
+encode_basestring_ascii: Callable[[str], str] = getattr(json.encoder, "encode_basestring_ascii")
+
+# Encoded text is buffered and written in chunks of about this many characters
+WRITE_CHUNK_SIZE = 64 * 1024
+
+
+def _encode_float(value: float) -> str:
+    """Encode a float as the json module does."""
+    if value != value:
+        return "NaN"
+    if value == float("inf"):
+        return "Infinity"
+    if value == -float("inf"):
+        return "-Infinity"
+    return float.__repr__(value)
+
+
+def _encode_key(key: Any) -> str:
+    """Encode a dict key as the json module does, converting non-string keys."""
+    if isinstance(key, str):
+        return encode_basestring_ascii(key)
+    if key is True:
+        return '"true"'
+    if key is False:
+        return '"false"'
+    if key is None:
+        return '"null"'
+    if isinstance(key, int):
+        return '"' + int.__repr__(key) + '"'
+    if isinstance(key, float):
+        return '"' + _encode_float(key) + '"'
+    raise TypeError(f"keys must be str, int, float, bool or None, not {type(key).__name__}")
+
+
+def _encode_scalar(value: Any) -> str:
+    """Encode a non-container value, falling back to str() for unknown types."""
+    if isinstance(value, str):
+        return encode_basestring_ascii(value)
+    if value is None:
+        return "null"
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if isinstance(value, int):
+        return int.__repr__(value)
+    if isinstance(value, float):
+        return _encode_float(value)
+    return encode_basestring_ascii(str(value))
+
+
+def _is_lazy(element: Any) -> bool:
+    """Check whether an array element is, or directly holds, an iterator."""
+    if isinstance(element, dict):
+        return any(isinstance(item, Iterator) for item in element.values())
+    return isinstance(element, Iterator)
+
+
+def iter_json(
+    value: Any, indent: int | None = 2, backend: JSONBackend | None = None
+) -> Iterator[str]:
+    """Yield the JSON text of value in pieces, encoding array elements with backend.
+
+    Raises:
+        TypeError: If a dict key cannot be encoded
+    """
+    if backend is None:
+        backend = StdlibBackend()
+    key_separator = ":" if indent is None else ": "
+
+    def newline(level: int) -> str:
+        return "" if indent is None else "\n" + " " * (indent * level)
+
+    def encode_element(element: Any, level: int) -> str:
+        text = backend.encode(element, indent)
+        # Strings never contain raw newlines, so this only re-indents structure
+        return text if indent is None else text.replace("\n", newline(level))
+
+    def encode(node: Any, level: int) -> Iterator[str]:
+        if isinstance(node, dict):
+            if not node:
+                yield "{}"
+                return
+            separator = "{"
+            for key, item in node.items():
+                yield separator + newline(level + 1) + _encode_key(key) + key_separator
+                yield from encode(item, level + 1)
+                separator = ","
+            yield newline(level) + "}"
+        elif isinstance(node, list | tuple | Iterator):
+            separator = "["
+            for element in node:
+                if _is_lazy(element):
+                    yield separator + newline(level + 1)
+                    yield from encode(element, level + 1)
+                else:
+                    yield separator + newline(level + 1) + encode_element(element, level + 1)
+                separator = ","
+            yield "[]" if separator == "[" else newline(level) + "]"
+        else:
+            yield _encode_scalar(node)
+
+    yield from encode(value, 0)
+
+
+def write_json(
+    value: Any, stream: IO[str], indent: int | None = 2, backend: JSONBackend | None = None
+) -> None:
+    """Write the JSON text of value to a text stream incrementally.
+
+    Raises:
+        TypeError: If a dict key cannot be encoded
+    """
+    pending: list[str] = []
+    size = 0
+    for piece in iter_json(value, indent, backend):
+        pending.append(piece)
+        size += len(piece)
+        if size >= WRITE_CHUNK_SIZE:
+            stream.write("".join(pending))
+            pending.clear()
+            size = 0
+    if pending:
+        stream.write("".join(pending))
@@ -1,8 +1,10 @@
 """Reporter for generating reports."""
 
 import logging
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any
+from typing import IO, Any
 
 from secure_code_reasoner.exceptions import ReportingError
 from secure_code_reasoner.reporting.formatter import Formatter
@@ -38,6 +40,46 @@ class Reporter:
             self._write_report(output_path, report)
         return report
 
+    def write_fingerprint(self, fingerprint: Any, destination: Path | IO[str]) -> None:
+        """Stream fingerprint report to a file path or text stream."""
+        self._stream_report(destination, lambda s: self.formatter.write_fingerprint(fingerprint, s))
+
+    def write_agent_findings(self, report: Any, destination: Path | IO[str]) -> None:
+        """Stream agent report to a file path or text stream."""
+        self._stream_report(destination, lambda s: self.formatter.write_agent_report(report, s))
+
+    def write_trace(self, trace: Any, destination: Path | IO[str]) -> None:
+        """Stream trace report to a file path or text stream."""
+        self._stream_report(destination, lambda s: self.formatter.write_trace(trace, s))
+
+    def write_diff(self, diff: Any, destination: Path | IO[str]) -> None:
+        """Stream fingerprint diff report to a file path or text stream."""
+        self._stream_report(destination, lambda s: self.formatter.write_diff(diff, s))
+
+    @contextmanager
+    def open_report(self, output_path: Path) -> Iterator[IO[str]]:
+        """Open a report file for streamed writes, creating parent directories.
+
+        Raises:
+            ReportingError: If the file cannot be created or written
+        """
+        output_path = Path(output_path)
+        try:
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            with output_path.open("w", encoding="utf-8") as stream:
+                yield stream
+        except OSError as e:
+            raise ReportingError(f"Failed to write report to {output_path}: {e}") from e
+        logger.info(f"Report written to: {output_path}")
+
+    def _stream_report(self, destination: Path | IO[str], write: Callable[[IO[str]], None]) -> None:
+        """Run write against a text stream, opening destination first if it is a path."""
+        if isinstance(destination, str | Path):
+            with self.open_report(Path(destination)) as stream:
+                write(stream)
+        else:
+            write(destination)
+
     def _write_report(self, output_path: Path, content: str) -> None:
         """Write report to file."""
         try:
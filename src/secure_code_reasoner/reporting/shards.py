@@ -0,0 +1,441 @@
+"""Sharded, compressed NDJSON output for very large reports.
+
+write_shards() splits a fingerprint's artifacts and dependency graph edges and an
+agent report's findings and patch suggestions into compressed NDJSON files (one
+JSON record per line), and writes a manifest.json listing every shard with its
+kind, key, record count, size and SHA-256. Consumers read the manifest and
+then fetch and parse only the shards they need, independently and in parallel.
+
+Records are grouped by top-level directory ("." for files at the repository
+root) or, with shard_by="count", simply in report order; either way a shard
+holds at most shard_size records. At most a fixed number of shards are open at
+once, so a directory's records can span several shards when they are interleaved
+with many other directories'. Records and their order are those of the JSON
+report. The remaining report fields (totals, risk signals, status and proof
+obligations) are stored in the manifest. Shards are gzip compressed, or zstd
+when the zstandard package is installed. Output is deterministic: the same
+report always produces byte-identical shards and hashes.
+"""
+
+import contextlib
+import functools
+import gzip
+import hashlib
+import json
+import logging
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any
+
+from secure_code_reasoner.agents.models import AgentReport
+from secure_code_reasoner.exceptions import ContractViolationError, ReportingError
+from secure_code_reasoner.fingerprinting.models import RepositoryFingerprint
+from secure_code_reasoner.reporting.encoders import JSONBackend, get_backend
+from secure_code_reasoner.reporting.json_stream import WRITE_CHUNK_SIZE, write_json
+from secure_code_reasoner.validators import compile_validator, validate_records
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - exercised only without zstandard
+    zstandard = None  # type: ignore[assignment]
+
+_DECOMPRESSION_ERRORS: tuple[type[Exception], ...] = (OSError, EOFError, ValueError)
+if zstandard is not None:
+    _DECOMPRESSION_ERRORS += (zstandard.ZstdError,)
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_SCHEMA_VERSION = 1
+SHARD_BY = ("directory", "count")
+COMPRESSIONS = ("gzip", "zstd")
+DEFAULT_SHARD_SIZE = 100_000
+
+_SUFFIXES = {"gzip": ".ndjson.gz", "zstd": ".ndjson.zst"}
+_GZIP_LEVEL = 6
+_ZSTD_LEVEL = 3
+# Shards of one kind open at once, bounding file descriptors and compressor memory
+_MAX_OPEN_WRITERS = 64
+# Key of records at the repository root or without a file
+_ROOT_KEY = "."
+# Record schema of each kind of shard
+_RECORD_KINDS = {
+    "artifacts": "artifact",
+    "edges": "edge",
+    "findings": "finding",
+    "patch_suggestions": "patch_suggestion",
+}
+
+
+@dataclass(frozen=True)
+class Shard:
+    """One compressed NDJSON file of a sharded report."""
+
+    kind: str
+    key: str | None
+    path: str
+    records: int
+    size: int
+    sha256: str
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert shard entry to dictionary for the manifest."""
+        return {
+            "kind": self.kind,
+            "key": self.key,
+            "path": self.path,
+            "records": self.records,
+            "size": self.size,
+            "sha256": self.sha256,
+        }
+
+
+@dataclass(frozen=True)
+class ShardManifest:
+    """Index of a sharded report: its shards and the report's unsharded fields."""
+
+    compression: str
+    shard_by: str
+    shard_size: int
+    shards: tuple[Shard, ...]
+    fingerprint: dict[str, Any]
+    agent_report: dict[str, Any]
+
+    def shards_of(self, kind: str, key: str | None = None) -> tuple[Shard, ...]:
+        """Get the shards holding one kind of record, optionally for one key."""
+        return tuple(
+            shard
+            for shard in self.shards
+            if shard.kind == kind and (key is None or shard.key == key)
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert manifest to dictionary for serialization."""
+        return {
+            "schema_version": MANIFEST_SCHEMA_VERSION,
+            "format": "ndjson",
+            "compression": self.compression,
+            "shard_by": self.shard_by,
+            "shard_size": self.shard_size,
+            "shards": [shard.to_dict() for shard in self.shards],
+            "fingerprint": self.fingerprint,
+            "agent_report": self.agent_report,
+        }
+
+
+class _HashingSink:
+    """Binary file wrapper that hashes and counts the bytes written through it."""
+
+    def __init__(self, stream: IO[bytes]) -> None:
+        """Wrap an open binary file."""
+        self.stream = stream
+        self.digest = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data: bytes) -> int:
+        """Write data to the file, updating hash and size."""
+        self.digest.update(data)
+        self.size += len(data)
+        return self.stream.write(data)
+
+    def flush(self) -> None:
+        """Flush the underlying file."""
+        self.stream.flush()
+
+
+class _ShardWriter:
+    """Writes the records of one shard to a compressed NDJSON file."""
+
+    def __init__(self, directory: Path, name: str, compression: str) -> None:
+        """Open the shard file for writing."""
+        self.name = name
+        self.records = 0
+        self._pending: list[str] = []
+        self._pending_size = 0
+        self._path = directory / name
+        self._file = self._path.open("wb")
+        self._sink = _HashingSink(self._file)
+        self._compressor: Any
+        if compression == "zstd":
+            compressor = zstandard.ZstdCompressor(level=_ZSTD_LEVEL)
+            self._compressor = compressor.stream_writer(
+                self._sink, closefd=False  # type: ignore[arg-type]
+            )
+        else:
+            # mtime=0 keeps the output, and so the shard hash, reproducible
+            self._compressor = gzip.GzipFile(
+                mode="wb", fileobj=self._sink, compresslevel=_GZIP_LEVEL, mtime=0
+            )
+
+    def write(self, line: str) -> None:
+        """Write one encoded record, compressing records in chunks."""
+        self._pending.append(line)
+        self._pending_size += len(line)
+        self.records += 1
+        if self._pending_size >= WRITE_CHUNK_SIZE:
+            self._flush()
+
+    def _flush(self) -> None:
+        """Compress the pending records."""
+        self._compressor.write("".join(self._pending).encode("utf-8"))
+        self._pending.clear()
+        self._pending_size = 0
+
+    def close(self, kind: str, key: str | None) -> Shard:
+        """Finish the file and describe it."""
+        self._flush()
+        self._compressor.close()
+        self._file.close()
+        return Shard(
+            kind=kind,
+            key=key,
+            path=self.name,
+            records=self.records,
+            size=self._sink.size,
+            sha256=self._sink.digest.hexdigest(),
+        )
+
+    def abort(self) -> None:
+        """Close and remove the partial file after a failure."""
+        self._file.close()
+        _remove_files(self._path.parent, [self.name])
+
+
+def _remove_files(directory: Path, names: Iterable[str]) -> None:
+    """Remove files left behind by a failed write, ignoring those already gone."""
+    for name in names:
+        with contextlib.suppress(OSError):
+            (directory / name).unlink()
+
+
+def _top_level(path: str | None) -> str:
+    """Get the top-level directory of a repository-relative path."""
+    if not path:
+        return _ROOT_KEY
+    parts = Path(path).parts
+    return parts[0] if len(parts) > 1 else _ROOT_KEY
+
+
+def _edge_records(graph: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    """Yield one record per dependency graph source with its targets."""
+    for source, targets in graph["edges"].items():
+        yield {"source": source, "targets": targets}
+
+
+def _write_kind(
+    directory: Path,
+    kind: str,
+    records: Iterator[tuple[str | None, dict[str, Any]]],
+    compression: str,
+    shard_size: int,
+    backend: JSONBackend,
+    grouped: bool = False,
+) -> list[Shard]:
+    """Write records of one kind, given with their keys, to as many shards as needed.
+
+    When another key needs a shard and _MAX_OPEN_WRITERS are open, the least recently
+    written one is finished, and its key starts a new shard if it comes up again.
+    With grouped, records arrive sorted so that a key's shard is finished as soon as
+    the key changes. On failure, every file written for the kind is removed.
+    """
+    suffix = _SUFFIXES[compression]
+    # Open writer and its number, per key, least recently written first
+    writers: dict[str | None, tuple[_ShardWriter, int]] = {}
+    shards: list[tuple[int, Shard]] = []
+    opened = 0
+
+    def finish(key: str | None) -> None:
+        writer, number = writers[key]
+        shards.append((number, writer.close(kind, key)))
+        del writers[key]
+
+    try:
+        for key, record in records:
+            entry = writers.pop(key, None)
+            if entry is None:
+                if grouped:
+                    for other in list(writers):
+                        finish(other)
+                elif len(writers) >= _MAX_OPEN_WRITERS:
+                    finish(next(iter(writers)))
+                name = f"{kind}-{opened:05d}{suffix}"
+                entry = (_ShardWriter(directory, name, compression), opened)
+                opened += 1
+            writers[key] = entry
+            writer = entry[0]
+            writer.write(backend.encode(record, None) + "\n")
+            if writer.records >= shard_size:
+                finish(key)
+        for key in list(writers):
+            finish(key)
+    except BaseException:
+        for writer, _ in writers.values():
+            writer.abort()
+        _remove_files(directory, (shard.path for _, shard in shards))
+        raise
+    # Shards of a key are listed together, in the order they were filled
+    shards.sort(key=lambda entry: (entry[1].key or "", entry[0]))
+    return [shard for _, shard in shards]
+
+
+def write_shards(
+    fingerprint: RepositoryFingerprint,
+    agent_report: AgentReport,
+    directory: Path,
+    shard_by: str = "directory",
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    compression: str = "gzip",
+    backend: str | None = None,
+) -> ShardManifest:
+    """Write a sharded report and its manifest to directory.
+
+    Raises:
+        ReportingError: If an option is invalid, zstd is requested but the zstandard
+            package is not installed, or the files cannot be written
+    """
+    if shard_by not in SHARD_BY:
+        raise ReportingError(f"Unknown shard grouping '{shard_by}'; expected one of {SHARD_BY}")
+    if compression not in COMPRESSIONS:
+        raise ReportingError(f"Unknown compression '{compression}'; expected one of {COMPRESSIONS}")
+    if compression == "zstd" and zstandard is None:
+        raise ReportingError("zstd compression requires the zstandard package")
+    if shard_size < 1:
+        raise ReportingError(f"shard_size must be >= 1, got {shard_size}")
+    encoder = get_backend(backend)
+
+    fingerprint_dict = fingerprint.to_dict(lazy=True)
+    artifacts = fingerprint_dict.pop("artifacts")
+    edges = _edge_records(fingerprint_dict.pop("dependency_graph"))
+    agent_dict = agent_report.to_dict(lazy=True)
+    findings = agent_dict.pop("findings")
+    patch_suggestions = agent_dict.pop("patch_suggestions")
+
+    by_directory = shard_by == "directory"
+    # Records of every kind but findings, which are ordered by severity, come sorted
+    # by path, so each directory's records are contiguous
+    kinds = (
+        ("artifacts", artifacts, lambda record: record["path"], True),
+        ("edges", edges, lambda record: record["source"].split(":", 1)[0], True),
+        ("findings", findings, lambda record: record["file_path"], False),
+        ("patch_suggestions", patch_suggestions, lambda record: record["file_path"], True),
+    )
+
+    # Records of one file share its key, so each distinct path is split only once
+    top_level = functools.cache(_top_level)
+    directory = Path(directory)
+    shards: list[Shard] = []
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        for kind, records, path_of, grouped in kinds:
+            keyed = (
+                (top_level(path_of(record)) if by_directory else None, record) for record in records
+            )
+            shards.extend(
+                _write_kind(directory, kind, keyed, compression, shard_size, encoder, grouped)
+            )
+        manifest = ShardManifest(
+            compression=compression,
+            shard_by=shard_by,
+            shard_size=shard_size,
+            shards=tuple(shards),
+            fingerprint=fingerprint_dict,
+            agent_report=agent_dict,
+        )
+        with (directory / MANIFEST_NAME).open("w", encoding="utf-8") as stream:
+            write_json(manifest.to_dict(), stream, backend=encoder)
+            stream.write("\n")
+    except BaseException as e:
+        # Shards already written, and any manifest, would describe a report that is
+        # not all there
+        _remove_files(directory, [MANIFEST_NAME, *(shard.path for shard in shards)])
+        if isinstance(e, OSError):
+            raise ReportingError(f"Failed to write sharded report to {directory}: {e}") from e
+        raise
+    logger.info(f"Wrote {len(shards)} report shards to {directory}")
+    return manifest
+
+
+def read_manifest(directory: Path) -> ShardManifest:
+    """Read the manifest of a sharded report.
+
+    Raises:
+        ReportingError: If the manifest cannot be read or is malformed
+    """
+    path = Path(directory) / MANIFEST_NAME
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if data.get("schema_version") != MANIFEST_SCHEMA_VERSION:
+            raise ValueError(f"unsupported schema_version {data.get('schema_version')!r}")
+        return ShardManifest(
+            compression=data["compression"],
+            shard_by=data["shard_by"],
+            shard_size=data["shard_size"],
+            shards=tuple(Shard(**shard) for shard in data["shards"]),
+            fingerprint=data["fingerprint"],
+            agent_report=data["agent_report"],
+        )
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        raise ReportingError(f"Failed to read shard manifest {path}: {e}") from e
+
+
+def iter_shard(directory: Path, shard: Shard, verify: bool = True) -> Iterator[dict[str, Any]]:
+    """Yield the records of one shard, checking its hash first when verify.
+
+    Raises:
+        ReportingError: If the shard cannot be read, fails verification, or uses
+            zstd without the zstandard package installed
+    """
+    path = Path(directory) / shard.path
+    try:
+        data = path.read_bytes()
+    except OSError as e:
+        raise ReportingError(f"Failed to read report shard {path}: {e}") from e
+    if verify and (len(data) != shard.size or hashlib.sha256(data).hexdigest() != shard.sha256):
+        raise ReportingError(f"Report shard {path} does not match its manifest entry")
+    zstd = path.name.endswith(_SUFFIXES["zstd"])
+    if zstd and zstandard is None:
+        raise ReportingError("zstd compression requires the zstandard package")
+    try:
+        if zstd:
+            text = zstandard.ZstdDecompressor().decompressobj().decompress(data)
+        else:
+            text = gzip.decompress(data)
+    except _DECOMPRESSION_ERRORS as e:
+        raise ReportingError(f"Failed to decompress report shard {path}: {e}") from e
+    for line in text.decode("utf-8").splitlines():
+        yield json.loads(line)
+
+
+def validate_shards(directory: Path, verify: bool = True) -> dict[str, int]:
+    """Validate a sharded report against its schemas, counting records by kind.
+
+    The report fields in the manifest are validated as documents, and every shard
+    record as it is read, so memory use does not grow with the report.
+
+    Raises:
+        ReportingError: If the manifest or a shard cannot be read
+        ContractViolationError: If a record violates its schema or a shard holds a
+            different number of records than its manifest entry
+    """
+    manifest = read_manifest(directory)
+    compile_validator("fingerprint")(
+        {**manifest.fingerprint, "artifacts": [], "dependency_graph": {}}, "manifest fingerprint"
+    )
+    compile_validator("agent_report")(
+        {**manifest.agent_report, "findings": [], "patch_suggestions": []},
+        "manifest agent_report",
+    )
+    counts = dict.fromkeys(_RECORD_KINDS, 0)
+    for shard in manifest.shards:
+        kind = _RECORD_KINDS.get(shard.kind)
+        if kind is None:
+            raise ReportingError(f"Unknown shard kind '{shard.kind}' in {shard.path}")
+        records = validate_records(iter_shard(directory, shard, verify), kind, source=shard.path)
+        if records != shard.records:
+            raise ContractViolationError(
+                f"CONTRACT VIOLATION [{shard.path}]: shard holds {records} records, "
+                f"manifest lists {shard.records}"
+            )
+        counts[shard.kind] += records
+    return counts
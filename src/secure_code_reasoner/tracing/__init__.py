@@ -1,17 +1,60 @@
-"""Tracing subsystem for controlled code execution."""
+"""Tracing subsystem for controlled code execution.
 
-from secure_code_reasoner.tracing.models import (
-    ExecutionTrace,
-    RiskScore,
-    TraceEvent,
-    TraceEventType,
-)
-from secure_code_reasoner.tracing.tracer import ExecutionTracer
+Exports are resolved lazily: every traced child imports trace_wrapper from this
+package before the script runs, and any module loaded on the way (asyncio or
+socket through the tracer, say) would be imported already when the script asks
+for it, so the script's own import would go unreported.
+"""
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from secure_code_reasoner.tracing.event_store import EventStore
+    from secure_code_reasoner.tracing.forkserver import ForkServer
+    from secure_code_reasoner.tracing.models import (
+        ExecutionTrace,
+        ResourceUsage,
+        RiskScore,
+        TraceBatchSummary,
+        TraceEvent,
+        TraceEventType,
+    )
+    from secure_code_reasoner.tracing.resources import TraceResourceLimits
+    from secure_code_reasoner.tracing.tracer import ExecutionTracer
+
+_LAZY_EXPORTS = {
+    "ExecutionTracer": "secure_code_reasoner.tracing.tracer",
+    "ForkServer": "secure_code_reasoner.tracing.forkserver",
+    "ExecutionTrace": "secure_code_reasoner.tracing.models",
+    "EventStore": "secure_code_reasoner.tracing.event_store",
+    "TraceEvent": "secure_code_reasoner.tracing.models",
+    "TraceEventType": "secure_code_reasoner.tracing.models",
+    "RiskScore": "secure_code_reasoner.tracing.models",
+    "ResourceUsage": "secure_code_reasoner.tracing.models",
+    "TraceResourceLimits": "secure_code_reasoner.tracing.resources",
+    "TraceBatchSummary": "secure_code_reasoner.tracing.models",
+}
 
 __all__ = [
     "ExecutionTracer",
+    "ForkServer",
     "ExecutionTrace",
+    "EventStore",
     "TraceEvent",
     "TraceEventType",
     "RiskScore",
+    "ResourceUsage",
+    "TraceResourceLimits",
+    "TraceBatchSummary",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import an exported name on first access."""
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,252 @@
+"""PEP 578 audit-hook tracing backend.
+
+A single sys.addaudithook callback sees every file open (builtins.open, io.open,
+os.open), process launch, file deletion, socket bind/connect/send and import,
+including calls made from C code that the monkeypatching backend cannot intercept.
+Without network access, creating a socket other than a Unix domain socket is
+blocked as well, as the monkeypatching backend does. Audit
+events are mapped to trace event types through a dispatch dict built once at
+install time; events that are neither traced nor sandboxed never leave the dict
+lookup. There is no audit event for receiving data, so NETWORK_RECEIVE is not
+emitted by this backend.
+"""
+
+import os
+import sys
+from collections.abc import Callable, Mapping
+from typing import Any
+
+# Handler result: (trace event type, event fields), or None to ignore the audit event
+AuditResult = tuple[str, dict[str, Any]] | None
+AuditHandler = Callable[[tuple[Any, ...]], AuditResult]
+EmitFunction = Callable[..., None]
+
+_WRITE_FLAGS = os.O_WRONLY | os.O_RDWR | os.O_APPEND | os.O_CREAT | os.O_TRUNC
+# socket.AF_UNIX, without importing socket into the traced process before its script
+_AF_UNIX = 1
+_NETWORK_TYPES = frozenset({"network_connect", "network_send"})
+_FILE_MODIFY_TYPES = frozenset({"file_write", "file_delete"})
+
+
+def _path_field(path: Any) -> str | None:
+    """Convert an audited path argument to text; file descriptors have no path."""
+    if isinstance(path, int):
+        return None
+    if isinstance(path, bytes):
+        return os.fsdecode(path)
+    return os.fspath(path) if isinstance(path, os.PathLike) else str(path)
+
+
+def _audit_open(args: tuple[Any, ...]) -> AuditResult:
+    """Map open(path, mode, flags) from builtins.open, io.open and os.open."""
+    path = _path_field(args[0])
+    if path is None:
+        return None
+    mode, flags = args[1], args[2]
+    if isinstance(mode, str):
+        writing = any(c in mode for c in "wax+")
+    else:
+        writing = bool(flags & _WRITE_FLAGS)
+    return ("file_write" if writing else "file_read"), {"file_path": path}
+
+
+def _audit_delete(args: tuple[Any, ...]) -> AuditResult:
+    """Map os.remove/os.unlink, os.rmdir and shutil.rmtree."""
+    path = _path_field(args[0])
+    return None if path is None else ("file_delete", {"file_path": path})
+
+
+def _audit_rename(args: tuple[Any, ...]) -> AuditResult:
+    """Map os.rename/os.replace(src, dst, ...) as a write to the destination."""
+    destination = _path_field(args[1])
+    if destination is None:
+        return None
+    return "file_write", {"file_path": destination, "source": _path_field(args[0])}
+
+
+def _audit_popen(args: tuple[Any, ...]) -> AuditResult:
+    """Map subprocess.Popen(executable, args, cwd, env)."""
+    return "process_spawn", {"command": str(args[1]), "process_id": os.getpid()}
+
+
+def _audit_system(args: tuple[Any, ...]) -> AuditResult:
+    """Map os.system(command)."""
+    return "process_spawn", {"command": _path_field(args[0]), "process_id": os.getpid()}
+
+
+def _audit_exec(args: tuple[Any, ...]) -> AuditResult:
+    """Map os.exec*(path, args, env) and os.posix_spawn*(path, argv, env)."""
+    return "process_spawn", {"command": str(args[1]), "process_id": os.getpid()}
+
+
+def _audit_spawn(args: tuple[Any, ...]) -> AuditResult:
+    """Map os.spawn*(mode, path, args, env)."""
+    return "process_spawn", {"command": str(args[2]), "process_id": os.getpid()}
+
+
+def _address_fields(address: Any) -> dict[str, Any]:
+    """Split a socket address into trace fields."""
+    if isinstance(address, tuple) and len(address) >= 2:
+        fields: dict[str, Any] = {"network_address": str(address[0])}
+        if isinstance(address[1], int) and 1 <= address[1] <= 65535:
+            fields["network_port"] = address[1]
+        return fields
+    return {"network_address": _path_field(address)}
+
+
+def _is_local_socket(sock: Any) -> bool:
+    """Check whether an audited socket is a Unix domain socket (local IPC)."""
+    return getattr(sock, "family", None) == _AF_UNIX
+
+
+def _audit_socket(args: tuple[Any, ...]) -> AuditResult:
+    """Map socket.__new__(socket, family, type, proto) for network sockets."""
+    if args[1] == _AF_UNIX:
+        return None
+    return "network_connect", {"operation": "socket"}
+
+
+def _audit_bind(args: tuple[Any, ...]) -> AuditResult:
+    """Map socket.bind(socket, address) for network sockets."""
+    if _is_local_socket(args[0]):
+        return None
+    return "network_connect", {**_address_fields(args[1]), "operation": "bind"}
+
+
+def _audit_connect(args: tuple[Any, ...]) -> AuditResult:
+    """Map socket.connect(socket, address)."""
+    return "network_connect", _address_fields(args[1])
+
+
+def _audit_sendto(args: tuple[Any, ...]) -> AuditResult:
+    """Map socket.sendto(socket, address)."""
+    return "network_send", _address_fields(args[1])
+
+
+def _audit_sendmsg(args: tuple[Any, ...]) -> AuditResult:
+    """Map socket.sendmsg(socket, address); connected sockets have no address."""
+    if _is_local_socket(args[0]):
+        return None
+    return "network_send", {} if args[1] is None else _address_fields(args[1])
+
+
+def _audit_import(args: tuple[Any, ...]) -> AuditResult:
+    """Map import(module, filename, path, meta_path, path_hooks) for import statements."""
+    # Extension module loads repeat the event with a filename and no search path
+    if args[2] is None:
+        return None
+    return "module_import", {"module_name": args[0]}
+
+
+# audit event name -> (handler, trace event types the handler can produce)
+AUDIT_HANDLERS: dict[str, tuple[AuditHandler, frozenset[str]]] = {
+    "open": (_audit_open, frozenset({"file_read", "file_write"})),
+    "os.remove": (_audit_delete, frozenset({"file_delete"})),
+    "os.rmdir": (_audit_delete, frozenset({"file_delete"})),
+    "shutil.rmtree": (_audit_delete, frozenset({"file_delete"})),
+    "os.rename": (_audit_rename, frozenset({"file_write"})),
+    "subprocess.Popen": (_audit_popen, frozenset({"process_spawn"})),
+    "os.system": (_audit_system, frozenset({"process_spawn"})),
+    "os.exec": (_audit_exec, frozenset({"process_spawn"})),
+    "os.posix_spawn": (_audit_exec, frozenset({"process_spawn"})),
+    "os.spawn": (_audit_spawn, frozenset({"process_spawn"})),
+    "socket.bind": (_audit_bind, frozenset({"network_connect"})),
+    "socket.connect": (_audit_connect, frozenset({"network_connect"})),
+    "socket.sendto": (_audit_sendto, frozenset({"network_send"})),
+    "socket.sendmsg": (_audit_sendmsg, frozenset({"network_send"})),
+    "import": (_audit_import, frozenset({"module_import"})),
+}
+
+# Audit events that are not traced but let the sandbox block an operation early:
+# creating a socket is not network access, but without network access it is denied
+SANDBOX_HANDLERS: dict[str, tuple[AuditHandler, frozenset[str]]] = {
+    "socket.__new__": (_audit_socket, frozenset({"network_connect"})),
+}
+
+
+def build_dispatch(
+    event_types: frozenset[str] | None, enforced_types: frozenset[str]
+) -> dict[str, AuditHandler]:
+    """Select the handlers needed to trace event_types (None: all) or enforce the sandbox."""
+    dispatch: dict[str, AuditHandler] = {}
+    for name, (handler, produces) in AUDIT_HANDLERS.items():
+        if event_types is None or produces & (event_types | enforced_types):
+            dispatch[name] = handler
+    for name, (handler, produces) in SANDBOX_HANDLERS.items():
+        if produces & enforced_types:
+            dispatch[name] = handler
+    return dispatch
+
+
+def make_audit_hook(
+    emit: EmitFunction,
+    event_types: frozenset[str] | None = None,
+    sample_rates: Mapping[str, int] | None = None,
+    no_network: bool = False,
+    no_file_write: bool = False,
+) -> Callable[[str, tuple[Any, ...]], None]:
+    """Build the audit hook callback without installing it.
+
+    Only event types in event_types are emitted (all when None). A sample rate of N
+    for an event type emits 1 in every N occurrences, deterministically, tagging
+    each emitted event with its sample_rate. Sandbox restrictions are enforced, and
+    blocked attempts recorded, regardless of filtering and sampling.
+    """
+    enforced_types = (_NETWORK_TYPES if no_network else frozenset()) | (
+        _FILE_MODIFY_TYPES if no_file_write else frozenset()
+    )
+    dispatch = build_dispatch(event_types, enforced_types)
+    rates = dict(sample_rates or {})
+    counters = dict.fromkeys(rates, 0)
+    seen_modules: set[str] = set()
+
+    def audit_hook(event: str, args: tuple[Any, ...]) -> None:
+        handler = dispatch.get(event)
+        if handler is None:
+            return
+        result = handler(args)
+        if result is None:
+            return
+        event_type, fields = result
+
+        if event_type == "module_import":
+            # Failed imports are retried on every import statement; report each module once
+            if fields["module_name"] in seen_modules:
+                return
+            seen_modules.add(fields["module_name"])
+        # Bytecode cache traffic is interpreter bookkeeping, not script behavior
+        internal = "__pycache__" in fields.get("file_path", "")
+
+        if event_type in enforced_types:
+            if not internal:
+                emit(event_type, **fields, blocked=True)
+            if event_type in _NETWORK_TYPES:
+                raise PermissionError("Network access blocked by sandbox")
+            raise PermissionError(f"File write blocked by sandbox: {fields['file_path']}")
+
+        if internal or (event_types is not None and event_type not in event_types):
+            return
+        rate = rates.get(event_type)
+        if rate is not None:
+            count = counters[event_type]
+            counters[event_type] = count + 1
+            if count % rate:
+                return
+            fields["sample_rate"] = rate
+        emit(event_type, **fields)
+
+    return audit_hook
+
+
+def install_audit_hook(
+    emit: EmitFunction,
+    event_types: frozenset[str] | None = None,
+    sample_rates: Mapping[str, int] | None = None,
+    no_network: bool = False,
+    no_file_write: bool = False,
+) -> None:
+    """Install the audit hook built by make_audit_hook.
+
+    Audit hooks cannot be removed, so this is for use in the traced process only.
+    """
+    sys.addaudithook(make_audit_hook(emit, event_types, sample_rates, no_network, no_file_write))
@@ -0,0 +1,510 @@
+"""Columnar storage for trace events.
+
+A traced script can emit millions of events. Holding each one as a TraceEvent
+(a dataclass with eight optional fields, a metadata dict and a precomputed
+metadata hash) inside a frozenset costs hundreds of bytes per event. EventStore
+keeps one row per event across typed arrays instead: an event-type code, a
+float64 timestamp, and indexes into a single interned string table for paths,
+addresses, commands, module names and JSON-encoded metadata. A row costs about
+41 bytes plus the strings it introduces, and TraceEvent objects are only built
+when rows are read.
+
+In aggregate mode, events that differ only in their timestamp share one row
+holding the first timestamp, the last timestamp and a count, so memory grows
+with the number of distinct behaviors rather than with event volume. The first
+max_raw_events events are also kept unaggregated in a separate raw store.
+"""
+
+import gzip
+import json
+import struct
+import sys
+from array import array
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import IO, Any
+
+from secure_code_reasoner.exceptions import TracingError
+from secure_code_reasoner.tracing.models import TraceEvent, TraceEventType
+
+EVENT_TYPES = tuple(TraceEventType)
+_TYPE_CODES = {event_type: code for code, event_type in enumerate(EVENT_TYPES)}
+
+# Binary form: header, string table, then each column's raw little-endian array
+BINARY_MAGIC = b"SCREVT\x00\x01"
+_HEADER = struct.Struct("<8sIII")  # magic, flags, row count, string count
+_FLAG_AGGREGATED = 1
+_STRING_LENGTH = struct.Struct("<I")
+_NONE = -1
+
+
+def _encode_metadata(metadata: dict[str, Any] | None) -> str | None:
+    """Encode metadata canonically so equal dicts intern to the same string."""
+    if not metadata:
+        return None
+    return json.dumps(metadata, sort_keys=True, separators=(",", ":"), default=str)
+
+
+class EventStore:
+    """Append-only columnar store of trace events.
+
+    Iterating or indexing materializes TraceEvent objects on demand; count(),
+    select() and to_dicts() work on the columns directly. Metadata must be
+    JSON-serializable; other values are stored as strings. In an aggregated
+    store, len() is the number of distinct events, count() totals occurrences,
+    and materialized events carry the first occurrence's timestamp.
+    """
+
+    _COLUMNS = (
+        ("_types", "B"),
+        ("_timestamps", "d"),
+        ("_paths", "i"),
+        ("_process_ids", "q"),
+        ("_addresses", "i"),
+        ("_ports", "i"),
+        ("_commands", "i"),
+        ("_modules", "i"),
+        ("_metadata", "i"),
+    )
+    _AGGREGATE_COLUMNS = (
+        ("_counts", "Q"),
+        ("_last_timestamps", "d"),
+    )
+
+    def __init__(
+        self,
+        events: Iterable[TraceEvent] = (),
+        aggregate: bool = False,
+        max_raw_events: int = 0,
+    ) -> None:
+        """Initialize store, appending any given events.
+
+        With aggregate, up to max_raw_events events are also kept unaggregated
+        in the raw store.
+        """
+        if max_raw_events < 0:
+            raise ValueError("max_raw_events must be >= 0")
+        self.aggregate = aggregate
+        self.max_raw_events = max_raw_events if aggregate else 0
+        self.raw: EventStore | None = EventStore() if aggregate else None
+        # Typecodes match _COLUMNS and _AGGREGATE_COLUMNS, which fix the binary column order
+        self._types: array[int] = array("B")
+        self._timestamps: array[float] = array("d")
+        self._paths: array[int] = array("i")
+        self._process_ids: array[int] = array("q")
+        self._addresses: array[int] = array("i")
+        self._ports: array[int] = array("i")
+        self._commands: array[int] = array("i")
+        self._modules: array[int] = array("i")
+        self._metadata: array[int] = array("i")
+        # Only filled in an aggregated store
+        self._counts: array[int] = array("Q")
+        self._last_timestamps: array[float] = array("d")
+        self._rows_by_key: dict[tuple[int, ...], int] = {}
+        self._strings: list[str] = []
+        self._string_ids: dict[str, int] = {}
+        self._decoded_metadata: dict[int, dict[str, Any]] = {}
+        self.extend(events)
+
+    def _intern(self, value: str | None) -> int:
+        """Get the string table index of value, adding it if new."""
+        if value is None:
+            return _NONE
+        index = self._string_ids.get(value)
+        if index is None:
+            index = len(self._strings)
+            self._strings.append(value)
+            self._string_ids[value] = index
+        return index
+
+    def _string(self, index: int) -> str | None:
+        """Get the string at a table index, or None for the missing-value index."""
+        return None if index == _NONE else self._strings[index]
+
+    def _metadata_at(self, index: int) -> dict[str, Any]:
+        """Decode interned metadata, caching each distinct value once."""
+        if index == _NONE:
+            return {}
+        decoded = self._decoded_metadata.get(index)
+        if decoded is None:
+            decoded = json.loads(self._strings[index])
+            self._decoded_metadata[index] = decoded
+        return decoded
+
+    def add(
+        self,
+        event_type: TraceEventType,
+        timestamp: float,
+        file_path: str | None = None,
+        process_id: int | None = None,
+        network_address: str | None = None,
+        network_port: int | None = None,
+        command: str | None = None,
+        module_name: str | None = None,
+        metadata: dict[str, Any] | None = None,
+        *,
+        count: int = 1,
+        last_timestamp: float | None = None,
+    ) -> None:
+        """Append an event from its fields, validated like TraceEvent.
+
+        count and last_timestamp describe an already aggregated record and are
+        only accepted by an aggregated store.
+        """
+        if timestamp < 0:
+            raise ValueError("timestamp must be >= 0")
+        if process_id is not None and process_id < 0:
+            raise ValueError("process_id must be >= 0 if provided")
+        if network_port is not None and (network_port < 1 or network_port > 65535):
+            raise ValueError("network_port must be between 1 and 65535 if provided")
+        if count < 1:
+            raise ValueError("count must be >= 1")
+        if not self.aggregate and (count != 1 or last_timestamp is not None):
+            raise ValueError("count and last_timestamp require an aggregated store")
+        if last_timestamp is None:
+            last_timestamp = timestamp
+        elif last_timestamp < timestamp:
+            raise ValueError("last_timestamp must be >= timestamp")
+        row = (
+            _TYPE_CODES[TraceEventType(event_type)],
+            self._intern(file_path),
+            _NONE if process_id is None else process_id,
+            self._intern(network_address),
+            network_port or 0,
+            self._intern(command),
+            self._intern(module_name),
+            self._intern(_encode_metadata(metadata)),
+        )
+
+        if self.aggregate:
+            assert self.raw is not None
+            if count == 1 and len(self.raw) < self.max_raw_events:
+                self.raw.add(
+                    event_type,
+                    timestamp,
+                    file_path=file_path,
+                    process_id=process_id,
+                    network_address=network_address,
+                    network_port=network_port,
+                    command=command,
+                    module_name=module_name,
+                    metadata=metadata,
+                )
+            index = self._rows_by_key.get(row)
+            if index is not None:
+                self._counts[index] += count
+                self._timestamps[index] = min(self._timestamps[index], timestamp)
+                self._last_timestamps[index] = max(self._last_timestamps[index], last_timestamp)
+                return
+            self._rows_by_key[row] = len(self._types)
+            self._counts.append(count)
+            self._last_timestamps.append(last_timestamp)
+
+        self._append_row(row, timestamp)
+
+    def _append_row(self, row: tuple[int, ...], timestamp: float) -> None:
+        """Append a row of interned column values."""
+        type_code, path, process_id, address, port, command, module, metadata = row
+        self._types.append(type_code)
+        self._timestamps.append(timestamp)
+        self._paths.append(path)
+        self._process_ids.append(process_id)
+        self._addresses.append(address)
+        self._ports.append(port)
+        self._commands.append(command)
+        self._modules.append(module)
+        self._metadata.append(metadata)
+
+    def _row_key(self, index: int) -> tuple[int, ...]:
+        """Get the interned column values of a row, excluding its timestamp."""
+        return (
+            self._types[index],
+            self._paths[index],
+            self._process_ids[index],
+            self._addresses[index],
+            self._ports[index],
+            self._commands[index],
+            self._modules[index],
+            self._metadata[index],
+        )
+
+    def append(self, event: TraceEvent) -> None:
+        """Append a TraceEvent."""
+        self.add(
+            event.event_type,
+            event.timestamp,
+            file_path=str(event.file_path) if event.file_path else None,
+            process_id=event.process_id,
+            network_address=event.network_address,
+            network_port=event.network_port,
+            command=event.command,
+            module_name=event.module_name,
+            metadata=event.metadata,
+        )
+
+    def extend(self, events: Iterable[TraceEvent]) -> None:
+        """Append several TraceEvents."""
+        for event in events:
+            self.append(event)
+
+    def __len__(self) -> int:
+        """Number of stored rows: events, or distinct events when aggregated."""
+        return len(self._types)
+
+    def __getitem__(self, index: int) -> TraceEvent:
+        """Materialize the event in row index."""
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("event index out of range")
+        path = self._string(self._paths[index])
+        process_id = self._process_ids[index]
+        return TraceEvent(
+            event_type=EVENT_TYPES[self._types[index]],
+            timestamp=self._timestamps[index],
+            file_path=Path(path) if path else None,
+            process_id=None if process_id == _NONE else process_id,
+            network_address=self._string(self._addresses[index]),
+            network_port=self._ports[index] or None,
+            command=self._string(self._commands[index]),
+            module_name=self._string(self._modules[index]),
+            metadata=dict(self._metadata_at(self._metadata[index])),
+        )
+
+    def __iter__(self) -> Iterator[TraceEvent]:
+        """Materialize events in insertion order."""
+        for index in range(len(self)):
+            yield self[index]
+
+    def __eq__(self, other: object) -> bool:
+        """Compare as a set of events, so a store equals the frozenset of its events."""
+        if isinstance(other, EventStore | frozenset | set):
+            return frozenset(self) == frozenset(other)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        """Summarize the store without materializing events."""
+        if self.aggregate:
+            return (
+                f"EventStore({self.count()} events in {len(self)} aggregates, "
+                f"{len(self._strings)} strings)"
+            )
+        return f"EventStore({len(self)} events, {len(self._strings)} strings)"
+
+    def _rows(self, event_type: TraceEventType | None, metadata: dict[str, Any]) -> Iterator[int]:
+        """Yield row indexes with the given type (any when None) and metadata items."""
+        code = None if event_type is None else _TYPE_CODES[TraceEventType(event_type)]
+        for index, type_code in enumerate(self._types):
+            if code is not None and type_code != code:
+                continue
+            if metadata:
+                row_metadata = self._metadata_at(self._metadata[index])
+                if any(row_metadata.get(key) != value for key, value in metadata.items()):
+                    continue
+            yield index
+
+    def count(self, event_type: TraceEventType | None = None, **metadata: Any) -> int:
+        """Count events of a type (any when None) whose metadata includes the given items."""
+        if self.aggregate:
+            return sum(self._counts[index] for index in self._rows(event_type, metadata))
+        if not metadata:
+            if event_type is None:
+                return len(self)
+            return self._types.count(_TYPE_CODES[TraceEventType(event_type)])
+        return sum(1 for _ in self._rows(event_type, metadata))
+
+    def select(
+        self, event_type: TraceEventType | None = None, **metadata: Any
+    ) -> Iterator[TraceEvent]:
+        """Materialize only events of a type whose metadata includes the given items."""
+        for index in self._rows(event_type, metadata):
+            yield self[index]
+
+    def counted(
+        self, event_type: TraceEventType | None = None, **metadata: Any
+    ) -> Iterator[tuple[TraceEvent, int]]:
+        """Like select(), pairing each event with its occurrence count (always 1 unaggregated)."""
+        for index in self._rows(event_type, metadata):
+            yield self[index], self._counts[index] if self.aggregate else 1
+
+    def spawns(self) -> Iterator[tuple[TraceEvent, int]]:
+        """Like counted(PROCESS_SPAWN), reporting each spawned child process once.
+
+        Hooks fire before the child exists and record the spawning pid, while
+        /proc polling records the child's pid and parent_pid. An observed child
+        of a process whose hook already reported that spawn is the same process,
+        so it is dropped in favor of the hook event.
+        """
+        observed: list[tuple[TraceEvent, int]] = []
+        hooked: Counter[int | None] = Counter()
+        for event, count in self.counted(TraceEventType.PROCESS_SPAWN):
+            if event.metadata.get("observed_by") == "proc":
+                observed.append((event, count))
+            else:
+                hooked[event.process_id] += count
+                yield event, count
+        for event, count in observed:
+            parent_pid = event.metadata.get("parent_pid")
+            matched = min(count, hooked[parent_pid])
+            hooked[parent_pid] -= matched
+            if count > matched:
+                yield event, count - matched
+
+    def iter_dicts(self, sort_by_timestamp: bool = True) -> Iterator[dict[str, Any]]:
+        """Yield each event's dictionary as TraceEvent.to_dict() would, without building TraceEvents.
+
+        Aggregated rows also carry "count" and "last_timestamp"; "timestamp" is the first.
+        """
+        rows: Iterable[int] = range(len(self))
+        if sort_by_timestamp:
+            rows = sorted(rows, key=self._timestamps.__getitem__)
+        for index in rows:
+            process_id = self._process_ids[index]
+            event = {
+                "event_type": EVENT_TYPES[self._types[index]].value,
+                "timestamp": self._timestamps[index],
+                "file_path": self._string(self._paths[index]) or None,
+                "process_id": None if process_id == _NONE else process_id,
+                "network_address": self._string(self._addresses[index]),
+                "network_port": self._ports[index] or None,
+                "command": self._string(self._commands[index]),
+                "module_name": self._string(self._modules[index]),
+                "metadata": dict(self._metadata_at(self._metadata[index])),
+            }
+            if self.aggregate:
+                event["count"] = self._counts[index]
+                event["last_timestamp"] = self._last_timestamps[index]
+            yield event
+
+    def to_dicts(self, sort_by_timestamp: bool = True) -> list[dict[str, Any]]:
+        """Serialize every event as a list; see iter_dicts()."""
+        return list(self.iter_dicts(sort_by_timestamp))
+
+    def to_bytes(self) -> bytes:
+        """Serialize to the compact binary form (without an aggregated store's raw events)."""
+        flags = _FLAG_AGGREGATED if self.aggregate else 0
+        parts = [_HEADER.pack(BINARY_MAGIC, flags, len(self), len(self._strings))]
+        for value in self._strings:
+            encoded = value.encode("utf-8")
+            parts.append(_STRING_LENGTH.pack(len(encoded)))
+            parts.append(encoded)
+        for name, _ in self._COLUMNS + (self._AGGREGATE_COLUMNS if self.aggregate else ()):
+            column: array = getattr(self, name)
+            if sys.byteorder == "big":
+                column = array(column.typecode, column)
+                column.byteswap()
+            parts.append(column.tobytes())
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "EventStore":
+        """Load a store from its binary form.
+
+        Raises:
+            TracingError: If data is not a well-formed event store
+        """
+        try:
+            magic, flags, rows, string_count = _HEADER.unpack_from(data, 0)
+            if magic != BINARY_MAGIC:
+                raise TracingError("Not an event store")
+            store = cls(aggregate=bool(flags & _FLAG_AGGREGATED))
+            offset = _HEADER.size
+            for _ in range(string_count):
+                (length,) = _STRING_LENGTH.unpack_from(data, offset)
+                offset += _STRING_LENGTH.size
+                value = bytes(data[offset : offset + length]).decode("utf-8")
+                if len(value.encode("utf-8")) != length:
+                    raise TracingError("Truncated string table")
+                offset += length
+                store._string_ids[value] = len(store._strings)
+                store._strings.append(value)
+            columns = cls._COLUMNS + (cls._AGGREGATE_COLUMNS if store.aggregate else ())
+            for name, typecode in columns:
+                column = array(typecode)
+                end = offset + rows * column.itemsize
+                if end > len(data):
+                    raise TracingError(f"Truncated column {name.lstrip('_')}")
+                column.frombytes(data[offset:end])
+                if sys.byteorder == "big":
+                    column.byteswap()
+                setattr(store, name, column)
+                offset = end
+        except (struct.error, UnicodeDecodeError) as e:
+            raise TracingError(f"Corrupt event store: {e}") from e
+        except TracingError as e:
+            raise TracingError(f"Corrupt event store: {e}") from e
+        if offset != len(data):
+            raise TracingError("Corrupt event store: trailing data")
+        if store.aggregate:
+            store._rows_by_key = {store._row_key(index): index for index in range(rows)}
+        return store
+
+    def write_ndjson(self, stream: IO[str]) -> None:
+        """Write one compact JSON event per line, in timestamp order."""
+        for event in self.iter_dicts():
+            stream.write(json.dumps(event, separators=(",", ":"), default=str))
+            stream.write("\n")
+
+    @classmethod
+    def read_ndjson(cls, stream: IO[str]) -> "EventStore":
+        """Load a store from NDJSON written by write_ndjson().
+
+        Raises:
+            TracingError: If a line is not a valid event
+        """
+        store: EventStore | None = None
+        for line_number, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            try:
+                event = json.loads(line)
+                if store is None:
+                    store = cls(aggregate="count" in event)
+                aggregated = (
+                    {"count": event["count"], "last_timestamp": event["last_timestamp"]}
+                    if store.aggregate
+                    else {}
+                )
+                store.add(
+                    TraceEventType(event["event_type"]),
+                    event["timestamp"],
+                    file_path=event.get("file_path"),
+                    process_id=event.get("process_id"),
+                    network_address=event.get("network_address"),
+                    network_port=event.get("network_port"),
+                    command=event.get("command"),
+                    module_name=event.get("module_name"),
+                    metadata=event.get("metadata"),
+                    **aggregated,
+                )
+            except (ValueError, KeyError, TypeError) as e:
+                raise TracingError(f"Invalid event on line {line_number}: {e}") from e
+        return store if store is not None else cls()
+
+    def save(self, path: Path) -> None:
+        """Write the store to path: gzipped NDJSON for a .gz suffix, binary otherwise."""
+        path = Path(path)
+        if path.suffix == ".gz":
+            with gzip.open(path, "wt", encoding="utf-8") as stream:
+                self.write_ndjson(stream)
+        else:
+            path.write_bytes(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: Path) -> "EventStore":
+        """Read a store written by save().
+
+        Raises:
+            TracingError: If the file is not a valid event store
+        """
+        path = Path(path)
+        try:
+            if path.suffix == ".gz":
+                with gzip.open(path, "rt", encoding="utf-8") as stream:
+                    return cls.read_ndjson(stream)
+            return cls.from_bytes(path.read_bytes())
+        except OSError as e:
+            raise TracingError(f"Cannot read event store {path}: {e}") from e
@@ -0,0 +1,428 @@
+"""Fork server that runs traced scripts in children of a pre-warmed interpreter.
+
+Starting a fresh interpreter for every trace costs tens of milliseconds before the
+target script runs. A ForkServer starts one interpreter, imports the trace wrapper
+and a set of common modules once, and then forks a child per trace. The child
+applies the sandbox environment and installs trace hooks after the fork, so each
+traced script still runs in its own process.
+
+Modules preloaded by the server are already imported when a script starts, so
+importing them is not reported as a module_import event. Children also share the
+server's hash seed.
+
+The server handles one request per connection on a private Unix socket. Each
+request carries the script's stdout, stderr and trace pipe descriptors (via
+SCM_RIGHTS) and a JSON body. The server replies with the child's pid and, once the
+child is reaped, its return code and resource usage.
+"""
+
+import json
+import logging
+import os
+import select
+import shutil
+import signal
+import socket
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+from collections.abc import Iterable
+from pathlib import Path
+from types import TracebackType
+from typing import Any, BinaryIO
+
+from secure_code_reasoner.exceptions import SandboxError
+from secure_code_reasoner.tracing.protocol import TRACE_FD_ENV
+from secure_code_reasoner.tracing.resources import (
+    TraceResourceLimits,
+    apply_resource_limits,
+    read_proc_sample,
+    rusage_fields,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PRELOAD = ("json", "pathlib", "re", "socket", "subprocess")
+
+_LENGTH = struct.Struct("<I")
+
+
+class ForkedProcess:
+    """A traced child of the fork server, with the subset of the Popen API the tracer uses."""
+
+    def __init__(
+        self,
+        conn: socket.socket,
+        pid: int,
+        stdout: BinaryIO,
+        stderr: BinaryIO,
+        received: bytes = b"",
+    ) -> None:
+        """Initialize with the request connection, child pid and output pipe read ends.
+
+        received holds bytes already read from conn after the pid message.
+        """
+        self._conn = conn
+        self._buffer = bytearray(received)
+        self.pid = pid
+        self.stdout = stdout
+        self.stderr = stderr
+        self.returncode: int | None = None
+        self.resources: dict[str, Any] = {}
+
+    def poll(self) -> int | None:
+        """Return the exit code if the child has exited, else None."""
+        if self.returncode is None:
+            self._receive(0)
+        return self.returncode
+
+    def wait(self, timeout: float | None = None) -> int:
+        """Wait for the child to exit and return its exit code."""
+        if self.returncode is None:
+            self._receive(timeout)
+        if self.returncode is None:
+            raise subprocess.TimeoutExpired(f"fork server child {self.pid}", timeout or 0)
+        return self.returncode
+
+    def kill(self) -> None:
+        """Kill the child with SIGKILL."""
+        if self.returncode is None:
+            try:
+                os.kill(self.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+
+    def _receive(self, timeout: float | None) -> None:
+        """Read the server's exit report for this child, waiting at most timeout seconds."""
+        if b"\n" not in self._buffer:
+            ready, _, _ = select.select([self._conn], [], [], timeout)
+            if not ready:
+                return
+            data = self._conn.recv(4096)
+            if not data:
+                # Server went away without reporting; the child is unaccounted for
+                self.returncode = -1
+            self._buffer.extend(data)
+        if b"\n" in self._buffer:
+            report = json.loads(self._buffer.split(b"\n", 1)[0])
+            self.resources = report.get("resources", {})
+            self.returncode = int(report["returncode"])
+        if self.returncode is not None:
+            self._conn.close()
+
+
+class ForkServer:
+    """Pre-warmed interpreter that forks a fresh child for every traced script.
+
+    Use as a context manager, or call close() when done. The server is started on
+    first use and is safe to share between threads.
+    """
+
+    START_TIMEOUT = 30.0
+
+    def __init__(self, preload: Iterable[str] = DEFAULT_PRELOAD) -> None:
+        """Initialize with the modules to import in the server before forking."""
+        self.preload = tuple(preload)
+        self._process: subprocess.Popen | None = None
+        self._socket_dir: str | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def socket_path(self) -> Path:
+        """Path of the server's Unix socket."""
+        if self._socket_dir is None:
+            raise SandboxError("Fork server is not running")
+        return Path(self._socket_dir) / "forkserver.sock"
+
+    def start(self) -> None:
+        """Start the server process and wait until it has finished preloading.
+
+        Raises:
+            SandboxError: If the server fails to start
+        """
+        with self._lock:
+            if self._process is not None and self._process.poll() is None:
+                return
+            self._socket_dir = tempfile.mkdtemp(prefix="scr-forkserver-")
+            listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                listener.bind(str(self.socket_path))
+                listener.listen(64)
+                package_root = Path(__file__).resolve().parent.parent.parent
+                bootstrap = (
+                    f"import sys; sys.path.insert(0, {str(package_root)!r}); "
+                    "from secure_code_reasoner.tracing.forkserver import serve; "
+                    f"serve({listener.fileno()}, {list(self.preload)!r})"
+                )
+                self._process = subprocess.Popen(
+                    [sys.executable, "-c", bootstrap],
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    pass_fds=(listener.fileno(),),
+                )
+            except OSError as e:
+                self._cleanup()
+                raise SandboxError(f"Failed to start fork server: {e}") from e
+            finally:
+                listener.close()
+
+            assert self._process.stdout is not None
+            ready, _, _ = select.select([self._process.stdout], [], [], self.START_TIMEOUT)
+            if not ready or self._process.stdout.readline().strip() != b"ready":
+                self._process.kill()
+                self._process.wait()
+                self._cleanup()
+                raise SandboxError("Fork server did not become ready")
+            logger.debug(f"Fork server {self._process.pid} ready")
+
+    def spawn(
+        self,
+        script_path: Path,
+        args: list[str],
+        cwd: Path,
+        env: dict[str, str],
+        trace_fd: int,
+        resource_limits: TraceResourceLimits | None = None,
+    ) -> ForkedProcess:
+        """Run a script under trace hooks in a freshly forked child.
+
+        Raises:
+            SandboxError: If the server cannot fork the child
+        """
+        self.start()
+        stdout_read, stdout_write = os.pipe()
+        stderr_read, stderr_write = os.pipe()
+        conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            conn.settimeout(self.START_TIMEOUT)
+            conn.connect(str(self.socket_path))
+            request = {"script": str(script_path), "args": args, "cwd": str(cwd), "env": env}
+            if resource_limits is not None:
+                request["limits"] = resource_limits.to_dict()
+            payload = json.dumps(request).encode("utf-8")
+            socket.send_fds(
+                conn, [_LENGTH.pack(len(payload))], [stdout_write, stderr_write, trace_fd]
+            )
+            conn.sendall(payload)
+            reply, received = _read_line(conn)
+            pid = int(json.loads(reply)["pid"])
+            conn.settimeout(None)
+        except (OSError, ValueError, KeyError) as e:
+            conn.close()
+            os.close(stdout_read)
+            os.close(stderr_read)
+            raise SandboxError(f"Fork server failed to start script: {e}") from e
+        finally:
+            os.close(stdout_write)
+            os.close(stderr_write)
+
+        return ForkedProcess(
+            conn,
+            pid,
+            open(stdout_read, "rb", buffering=0),
+            open(stderr_read, "rb", buffering=0),
+            received,
+        )
+
+    def close(self) -> None:
+        """Stop the server; running children are left to finish."""
+        with self._lock:
+            if self._process is not None:
+                if self._process.stdin is not None:
+                    self._process.stdin.close()  # EOF tells the server to exit
+                try:
+                    self._process.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    self._process.kill()
+                    self._process.wait()
+                if self._process.stdout is not None:
+                    self._process.stdout.close()
+                self._process = None
+            self._cleanup()
+
+    def _cleanup(self) -> None:
+        """Remove the socket directory."""
+        if self._socket_dir is not None:
+            shutil.rmtree(self._socket_dir, ignore_errors=True)
+            self._socket_dir = None
+
+    def __enter__(self) -> "ForkServer":
+        """Start the server."""
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Stop the server."""
+        self.close()
+
+
+def _read_line(conn: socket.socket) -> tuple[bytes, bytes]:
+    """Read one newline-terminated message from a blocking socket.
+
+    Returns the message and any bytes received after it.
+    """
+    data = bytearray()
+    while b"\n" not in data:
+        chunk = conn.recv(4096)
+        if not chunk:
+            raise OSError("connection closed")
+        data.extend(chunk)
+    line, _, rest = bytes(data).partition(b"\n")
+    return line, rest
+
+
+def _read_request(conn: socket.socket) -> tuple[dict[str, Any], list[int]]:
+    """Read a request body and the descriptors sent with it."""
+    header, fds, _, _ = socket.recv_fds(conn, _LENGTH.size, 3)
+    while len(header) < _LENGTH.size:
+        chunk = conn.recv(_LENGTH.size - len(header))
+        if not chunk:
+            raise OSError("connection closed")
+        header += chunk
+    (length,) = _LENGTH.unpack(header)
+    body = bytearray()
+    while len(body) < length:
+        chunk = conn.recv(length - len(body))
+        if not chunk:
+            raise OSError("connection closed")
+        body.extend(chunk)
+    return json.loads(body), fds
+
+
+def serve(listener_fd: int, preload: list[str]) -> None:
+    """Run the fork server loop in the server process until stdin closes."""
+    from secure_code_reasoner.tracing import trace_wrapper  # noqa: F401  (preload)
+
+    for module in preload:
+        __import__(module)
+
+    listener = socket.socket(fileno=listener_fd)
+    wakeup_read, wakeup_write = os.pipe()
+    os.set_blocking(wakeup_read, False)
+    os.set_blocking(wakeup_write, False)
+    signal.set_wakeup_fd(wakeup_write)
+    signal.signal(signal.SIGCHLD, lambda signum, frame: None)
+    children: dict[int, socket.socket] = {}
+
+    sys.stdout.write("ready\n")
+    sys.stdout.flush()
+
+    while True:
+        try:
+            ready, _, _ = select.select([listener, wakeup_read, sys.stdin], [], [])
+        except InterruptedError:
+            continue
+        if sys.stdin in ready and not os.read(sys.stdin.fileno(), 1024):
+            break
+        if wakeup_read in ready:
+            try:
+                os.read(wakeup_read, 1024)
+            except BlockingIOError:
+                pass
+        _reap(children)
+        if listener in ready:
+            conn, _ = listener.accept()
+            try:
+                conn.settimeout(5)
+                request, fds = _read_request(conn)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Fork server dropped malformed request: {e}")
+                conn.close()
+                continue
+            pid = os.fork()
+            if pid == 0:
+                listener.close()
+                for other in children.values():
+                    other.close()
+                conn.close()
+                signal.set_wakeup_fd(-1)
+                os.close(wakeup_read)
+                os.close(wakeup_write)
+                signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+                _run_child(request, fds)
+            for fd in fds:
+                os.close(fd)
+            conn.sendall(json.dumps({"pid": pid}).encode("utf-8") + b"\n")
+            children[pid] = conn
+            _reap(children)
+
+
+def _reap(children: dict[int, socket.socket]) -> None:
+    """Report the exit status and resource usage of every finished child to its requester."""
+    while children:
+        try:
+            exited = os.waitid(os.P_ALL, 0, os.WEXITED | os.WNOHANG | os.WNOWAIT)
+        except ChildProcessError:
+            return
+        if exited is None:
+            return
+        # Final I/O counters are only readable until the zombie is reaped
+        resources = read_proc_sample(exited.si_pid)
+        pid, status, rusage = os.wait4(exited.si_pid, 0)
+        resources.update(rusage_fields(rusage))
+        conn = children.pop(pid, None)
+        if conn is None:
+            continue
+        report = {"returncode": os.waitstatus_to_exitcode(status), "resources": resources}
+        try:
+            conn.sendall(json.dumps(report).encode("utf-8") + b"\n")
+        except OSError:
+            pass
+        conn.close()
+
+
+def _run_child(request: dict[str, Any], fds: list[int]) -> None:
+    """Set up a forked child as the traced script's process and run it; never returns."""
+    import atexit
+    import traceback
+
+    from secure_code_reasoner.tracing.trace_wrapper import install_trace_hooks
+
+    stdout_fd, stderr_fd, trace_fd = fds
+    exit_code = 0
+    try:
+        os.setsid()
+        devnull = os.open(os.devnull, os.O_RDONLY)
+        os.dup2(devnull, 0)
+        os.dup2(stdout_fd, 1)
+        os.dup2(stderr_fd, 2)
+        for fd in (devnull, stdout_fd, stderr_fd):
+            os.close(fd)
+        os.chdir(request["cwd"])
+        os.environ.clear()
+        os.environ.update(request["env"])
+        os.environ[TRACE_FD_ENV] = str(trace_fd)
+        sys.argv = ["-c", *request["args"]]
+        if request.get("limits"):
+            apply_resource_limits(TraceResourceLimits.from_dict(request["limits"]))
+
+        install_trace_hooks()
+        script = request["script"]
+        with open(script) as f:
+            code = compile(f.read(), script, "exec")
+        exec(code, {"__name__": "__main__", "__file__": script})
+    except SystemExit as e:
+        if e.code is None:
+            exit_code = 0
+        elif isinstance(e.code, int):
+            exit_code = e.code
+        else:
+            print(e.code, file=sys.stderr)
+            exit_code = 1
+    except BaseException:
+        traceback.print_exc()
+        exit_code = 1
+    finally:
+        try:
+            atexit._run_exitfuncs()
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(exit_code)
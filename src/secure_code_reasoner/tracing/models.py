@@ -1,9 +1,13 @@
 """Data models for the tracing subsystem."""
 
+from collections.abc import Iterator
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from secure_code_reasoner.tracing.event_store import EventStore
 
 
 class TraceEventType(str, Enum):
@@ -152,6 +156,53 @@ class RiskScore:
         }
 
 
+@dataclass(frozen=True)
+class ResourceUsage:
+    """Resources consumed by a traced process.
+
+    CPU times are in seconds; read_bytes and write_bytes count bytes passed through
+    read and write system calls (including pipes and sockets), not only disk I/O.
+    Fields are None when the platform cannot measure them. All values vary
+    between runs.
+    """
+
+    cpu_user_time: float | None = None
+    cpu_system_time: float | None = None
+    peak_rss_bytes: int | None = None
+    read_bytes: int | None = None
+    write_bytes: int | None = None
+
+    def __post_init__(self) -> None:
+        """Validate resource usage after initialization."""
+        for name in (
+            "cpu_user_time",
+            "cpu_system_time",
+            "peak_rss_bytes",
+            "read_bytes",
+            "write_bytes",
+        ):
+            value = getattr(self, name)
+            if value is not None and value < 0:
+                raise ValueError(f"{name} must be >= 0")
+
+    @property
+    def cpu_time(self) -> float | None:
+        """Total user plus system CPU time, or None if not measured."""
+        if self.cpu_user_time is None and self.cpu_system_time is None:
+            return None
+        return (self.cpu_user_time or 0.0) + (self.cpu_system_time or 0.0)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert resource usage to dictionary for serialization."""
+        return {
+            "cpu_user_time": self.cpu_user_time,
+            "cpu_system_time": self.cpu_system_time,
+            "peak_rss_bytes": self.peak_rss_bytes,
+            "read_bytes": self.read_bytes,
+            "write_bytes": self.write_bytes,
+        }
+
+
 @dataclass(frozen=True)
 class ExecutionTrace:
     """Complete execution trace with risk assessment.
@@ -162,40 +213,78 @@ class ExecutionTrace:
     """
 
     script_path: Path
-    events: frozenset[TraceEvent] = field(default_factory=frozenset)
+    events: "frozenset[TraceEvent] | EventStore" = field(default_factory=frozenset)
     exit_code: int | None = None
     execution_time: float = 0.0  # Non-deterministic metadata - varies between runs
     risk_score: RiskScore | None = None
     stdout: str = ""
     stderr: str = ""
     metadata: dict[str, Any] = field(default_factory=dict)
+    resource_usage: ResourceUsage | None = None  # Non-deterministic metadata
 
     def __post_init__(self) -> None:
         """Validate execution trace after initialization."""
         if self.execution_time < 0:
             raise ValueError("execution_time must be >= 0")
-        if not isinstance(self.events, frozenset):
+        # Imported here because event_store depends on this module
+        from secure_code_reasoner.tracing.event_store import EventStore
+
+        # The tracer hands over its columnar store as-is; other iterables are frozen
+        if not isinstance(self.events, frozenset | EventStore):
             object.__setattr__(self, "events", frozenset(self.events))
 
-    def to_dict(self) -> dict[str, Any]:
+    def count_events(self, event_type: TraceEventType | None = None, **metadata: Any) -> int:
+        """Count events of a type (any when None) whose metadata includes the given items."""
+        if not isinstance(self.events, frozenset):
+            return self.events.count(event_type, **metadata)
+        return sum(
+            1
+            for e in self.events
+            if (event_type is None or e.event_type == event_type)
+            and all(e.metadata.get(key) == value for key, value in metadata.items())
+        )
+
+    def counted_events(self) -> list[tuple[TraceEvent, int]]:
+        """Get events in timestamp order, each with its occurrence count (1 unless aggregated)."""
+        if isinstance(self.events, frozenset):
+            counted = [(event, 1) for event in self.events]
+        else:
+            counted = list(self.events.counted())
+        return sorted(counted, key=lambda pair: pair[0].timestamp)
+
+    def to_dict(self, lazy: bool = False) -> dict[str, Any]:
         """Convert execution trace to dictionary for serialization.
 
         Note: Output includes non-deterministic timestamps. For reproducible
         comparisons, filter out timestamp fields or use deterministic event ordering.
+        For an aggregated event store, each event also carries its count and last
+        timestamp, and the events kept unaggregated are listed under "raw_events".
+        With lazy, event lists are iterators for streaming serialization.
         """
-        return {
+        # Only an aggregated store keeps a separate raw store
+        raw_store = None
+        if isinstance(self.events, frozenset):
+            events: Iterator[dict[str, Any]] = (
+                event.to_dict() for event in sorted(self.events, key=lambda e: e.timestamp)
+            )
+        else:
+            events = self.events.iter_dicts()
+            raw_store = self.events.raw
+        data: dict[str, Any] = {
             "schema_version": 1,  # Epistemic closure: Schema versioning for drift resistance
             "script_path": str(self.script_path),
-            "events": [event.to_dict() for event in sorted(self.events, key=lambda e: e.timestamp)],
+            "events": events if lazy else list(events),
             "exit_code": self.exit_code,
             "execution_time": self.execution_time,  # Non-deterministic
             "risk_score": self.risk_score.to_dict() if self.risk_score else None,
             "stdout": self.stdout,
             "stderr": self.stderr,
             "metadata": self.metadata,
+            "resource_usage": self.resource_usage.to_dict() if self.resource_usage else None,
             "_non_deterministic_fields": [
                 "execution_time",
                 "events[].timestamp",
+                "resource_usage",
             ],  # Epistemic closure: Explicit documentation
             # Epistemic closure: Proof-carrying output with value validation
             "proof_obligations": {
@@ -206,3 +295,59 @@ class ExecutionTrace:
                 "contract_violation_if_fields_ignored": True,
             },
         }
+        if raw_store is not None:
+            raw_events = raw_store.iter_dicts()
+            data["raw_events"] = raw_events if lazy else list(raw_events)
+            data["_non_deterministic_fields"].extend(
+                ["events[].last_timestamp", "raw_events[].timestamp"]
+            )
+        return data
+
+
+@dataclass(frozen=True)
+class TraceBatchSummary:
+    """Aggregate statistics over a batch of execution traces.
+
+    Built incrementally with add() so a batch can be summarized while its traces
+    are streamed out, without holding them in memory.
+    """
+
+    total: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    timed_out: int = 0
+    total_execution_time: float = 0.0  # Non-deterministic metadata - varies between runs
+    risk_score_sum: float = 0.0
+    max_risk_score: float = 0.0
+    wall_time: float = 0.0  # Non-deterministic metadata - varies between runs
+
+    def add(self, trace: ExecutionTrace) -> "TraceBatchSummary":
+        """Return a summary that also covers trace."""
+        timed_out = trace.count_events(error="timeout") > 0
+        risk = trace.risk_score.score if trace.risk_score else 0.0
+        return TraceBatchSummary(
+            total=self.total + 1,
+            succeeded=self.succeeded + (1 if trace.exit_code == 0 else 0),
+            failed=self.failed + (1 if trace.exit_code != 0 and not timed_out else 0),
+            timed_out=self.timed_out + (1 if timed_out else 0),
+            total_execution_time=self.total_execution_time + trace.execution_time,
+            risk_score_sum=self.risk_score_sum + risk,
+            max_risk_score=max(self.max_risk_score, risk),
+            wall_time=self.wall_time,
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert batch summary to dictionary for serialization."""
+        return {
+            "schema_version": 1,
+            "record_type": "batch_summary",
+            "total": self.total,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "timed_out": self.timed_out,
+            "total_execution_time": self.total_execution_time,
+            "wall_time": self.wall_time,
+            "mean_risk_score": self.risk_score_sum / self.total if self.total else 0.0,
+            "max_risk_score": self.max_risk_score,
+            "_non_deterministic_fields": ["total_execution_time", "wall_time"],
+        }
@@ -0,0 +1,121 @@
+"""Descendant tracking for traced scripts by polling /proc.
+
+Traced scripts run as the leader of a new session. A descendant is any process
+in that session, or any process whose parent is a known descendant (which also
+catches descendants that start their own session). Processes that start and exit
+between two polls are not seen; spawns made from Python are still reported by
+the trace hooks.
+"""
+
+import os
+import signal
+import time
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class ProcessInfo:
+    """A process observed under a traced script."""
+
+    pid: int
+    parent_pid: int
+    session_id: int
+    start_time: int  # Clock ticks since boot; distinguishes a reused pid
+    command: str
+
+
+def read_process_info(pid: int) -> ProcessInfo | None:
+    """Read a process's parent, session and start time from /proc, or None if it is gone."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            stat = f.read()
+        name = stat[stat.index("(") + 1 : stat.rindex(")")]
+        fields = stat[stat.rindex(")") + 1 :].split()
+        return ProcessInfo(
+            pid=pid,
+            parent_pid=int(fields[1]),
+            session_id=int(fields[3]),
+            start_time=int(fields[19]),
+            command=name,
+        )
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def read_command_line(pid: int) -> str | None:
+    """Read a process's command line from /proc, or None if unavailable."""
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            raw = f.read()
+    except OSError:
+        return None
+    arguments = [os.fsdecode(arg) for arg in raw.split(b"\0") if arg]
+    return " ".join(arguments) if arguments else None
+
+
+class ProcessTreeTracker:
+    """Discovers and kills the descendants of a traced process."""
+
+    def __init__(self, root_pid: int) -> None:
+        """Initialize tracker for the session led by root_pid."""
+        self.root_pid = root_pid
+        self.descendants: dict[int, ProcessInfo] = {}
+        self._last_scan = 0.0
+
+    def scan(self, min_interval: float = 0.0) -> list[ProcessInfo]:
+        """Scan /proc and return descendants not seen before, parents first.
+
+        Skipped (returning nothing) if the last scan is under min_interval old.
+        """
+        now = time.monotonic()
+        if now - self._last_scan < min_interval:
+            return []
+        self._last_scan = now
+        try:
+            pids = [int(name) for name in os.listdir("/proc") if name.isdigit()]
+        except OSError:
+            return []
+
+        candidates: dict[int, ProcessInfo] = {}
+        for pid in pids:
+            if pid == self.root_pid or pid in self.descendants:
+                continue
+            info = read_process_info(pid)
+            if info is not None:
+                candidates[pid] = info
+
+        members = {self.root_pid, *self.descendants}
+        found: list[ProcessInfo] = []
+        added = True
+        while added:
+            added = False
+            for pid, info in list(candidates.items()):
+                if info.session_id == self.root_pid or info.parent_pid in members:
+                    command = read_command_line(pid) or info.command
+                    info = ProcessInfo(
+                        pid, info.parent_pid, info.session_id, info.start_time, command
+                    )
+                    del candidates[pid]
+                    members.add(pid)
+                    found.append(info)
+                    added = True
+        # A child listed before its parent was added in a later pass; order parents first
+        found.sort(key=lambda info: (info.start_time, info.pid))
+        for info in found:
+            self.descendants[info.pid] = info
+        return found
+
+    def kill(self) -> None:
+        """Kill the root's process group and every known descendant that is still alive."""
+        try:
+            os.killpg(self.root_pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+        for pid, info in self.descendants.items():
+            current = read_process_info(pid)
+            if current is None or current.start_time != info.start_time:
+                continue  # Exited, or the pid now belongs to an unrelated process
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except (ProcessLookupError, PermissionError):
+                pass
@@ -0,0 +1,80 @@
+"""Wire format for trace events sent from a traced process to the tracer.
+
+The traced process writes length-prefixed records to a dedicated pipe whose file
+descriptor is passed in SCR_TRACE_FD. Each record is a fixed header (payload
+length, emission timestamp) followed by a compact JSON payload, so the tracer
+never has to scan the script's own stdout or stderr for events.
+"""
+
+import json
+import struct
+from dataclasses import dataclass, field
+from typing import Any
+
+from secure_code_reasoner.exceptions import TracingError
+
+TRACE_FD_ENV = "SCR_TRACE_FD"
+# Record type reporting how many events the wrapper dropped because its buffer filled
+OVERFLOW_RECORD = "trace_overflow"
+
+# Little-endian uint32 payload length, float64 emission timestamp
+RECORD_HEADER = struct.Struct("<Id")
+MAX_PAYLOAD_SIZE = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class TraceRecord:
+    """A decoded trace record: event type, emission time and event fields."""
+
+    event_type: str
+    timestamp: float
+    fields: dict[str, Any] = field(default_factory=dict)
+
+
+def encode_record(event_type: str, timestamp: float, fields: dict[str, Any]) -> bytes:
+    """Encode a trace event as a length-prefixed record."""
+    payload = json.dumps({"type": event_type, **fields}, separators=(",", ":"), default=str).encode(
+        "utf-8"
+    )
+    if len(payload) > MAX_PAYLOAD_SIZE:
+        raise TracingError(f"Trace record payload too large: {len(payload)} bytes")
+    return RECORD_HEADER.pack(len(payload), timestamp) + payload
+
+
+class RecordDecoder:
+    """Incrementally decodes records from a byte stream that may split records."""
+
+    def __init__(self) -> None:
+        """Initialize decoder with an empty buffer."""
+        self._buffer = bytearray()
+
+    @property
+    def pending(self) -> int:
+        """Number of buffered bytes belonging to an incomplete record."""
+        return len(self._buffer)
+
+    def feed(self, data: bytes) -> list[TraceRecord]:
+        """Consume bytes and return every record completed by them.
+
+        Raises:
+            TracingError: If the stream does not contain well-formed records
+        """
+        self._buffer.extend(data)
+        records: list[TraceRecord] = []
+        offset = 0
+        while len(self._buffer) - offset >= RECORD_HEADER.size:
+            length, timestamp = RECORD_HEADER.unpack_from(self._buffer, offset)
+            if length > MAX_PAYLOAD_SIZE:
+                raise TracingError(f"Corrupt trace stream: record length {length}")
+            end = offset + RECORD_HEADER.size + length
+            if end > len(self._buffer):
+                break
+            try:
+                payload = json.loads(self._buffer[offset + RECORD_HEADER.size : end])
+                event_type = payload.pop("type")
+            except (ValueError, KeyError, AttributeError) as e:
+                raise TracingError(f"Corrupt trace stream: {e}") from e
+            records.append(TraceRecord(event_type=event_type, timestamp=timestamp, fields=payload))
+            offset = end
+        del self._buffer[:offset]
+        return records
@@ -0,0 +1,168 @@
+"""Resource limits and resource accounting for traced processes.
+
+Usage is collected per process: while a traced script runs, /proc/<pid> is
+sampled for peak RSS, CPU time and I/O; when it exits, it is reaped with wait4
+so its exact rusage replaces the sampled CPU and memory figures. Using wait4
+rather than RUSAGE_CHILDREN deltas keeps the figures correct when several
+traces run concurrently in one tracer process.
+"""
+
+import os
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from secure_code_reasoner.tracing.models import ResourceUsage
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - resource is unavailable on Windows
+    resource = None  # type: ignore[assignment]
+
+_CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+@dataclass(frozen=True)
+class TraceResourceLimits:
+    """Kernel-enforced resource limits for a traced process.
+
+    Applied as RLIMIT_CPU, RLIMIT_AS and RLIMIT_NOFILE (soft and hard) before the
+    script starts, so a runaway script is stopped by the kernel rather than only
+    by the tracer's wall-clock timeout. Limits also cover the trace wrapper, so
+    very low memory limits can prevent the interpreter from starting.
+    """
+
+    cpu_seconds: int | None = None
+    max_memory_bytes: int | None = None
+    max_open_files: int | None = None
+
+    def __post_init__(self) -> None:
+        """Validate resource limits."""
+        if self.cpu_seconds is not None and self.cpu_seconds < 1:
+            raise ValueError("cpu_seconds must be >= 1 if provided")
+        if self.max_memory_bytes is not None and self.max_memory_bytes < 1:
+            raise ValueError("max_memory_bytes must be >= 1 if provided")
+        if self.max_open_files is not None and self.max_open_files < 1:
+            raise ValueError("max_open_files must be >= 1 if provided")
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert limits to dictionary for serialization."""
+        return {
+            "cpu_seconds": self.cpu_seconds,
+            "max_memory_bytes": self.max_memory_bytes,
+            "max_open_files": self.max_open_files,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "TraceResourceLimits":
+        """Create limits from a to_dict() mapping."""
+        return cls(
+            cpu_seconds=data.get("cpu_seconds"),
+            max_memory_bytes=data.get("max_memory_bytes"),
+            max_open_files=data.get("max_open_files"),
+        )
+
+
+def rlimit_settings(limits: TraceResourceLimits) -> list[tuple[str, int]]:
+    """Get the (resource.RLIMIT_* name, value) pairs to set, empty where rlimits are unsupported."""
+    if resource is None:
+        return []
+    settings = [
+        ("RLIMIT_CPU", limits.cpu_seconds),
+        ("RLIMIT_AS", limits.max_memory_bytes),
+        ("RLIMIT_NOFILE", limits.max_open_files),
+    ]
+    return [(name, value) for name, value in settings if value is not None]
+
+
+def apply_resource_limits(limits: TraceResourceLimits) -> None:
+    """Apply rlimits to the current process; runs in the child before the script."""
+    for name, value in rlimit_settings(limits):
+        resource.setrlimit(getattr(resource, name), (value, value))
+
+
+def rusage_fields(rusage: Any) -> dict[str, Any]:
+    """Extract the fields ResourceUsage keeps from a struct_rusage (ru_maxrss is in KiB)."""
+    return {
+        "cpu_user_time": rusage.ru_utime,
+        "cpu_system_time": rusage.ru_stime,
+        "peak_rss_bytes": rusage.ru_maxrss * 1024,
+    }
+
+
+def read_proc_sample(pid: int) -> dict[str, Any]:
+    """Read CPU time, peak RSS and I/O counters of a live or zombie process from /proc.
+
+    Fields that cannot be read (no /proc, permission denied, process gone) are
+    left out. A zombie has no memory map, so it reports no peak RSS.
+    """
+    sample: dict[str, Any] = {}
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            # The command name may contain spaces; fields after it are fixed
+            stat = f.read().rsplit(")", 1)[1].split()
+        sample["cpu_user_time"] = int(stat[11]) / _CLOCK_TICKS
+        sample["cpu_system_time"] = int(stat[12]) / _CLOCK_TICKS
+    except (OSError, IndexError, ValueError):
+        pass
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    sample["peak_rss_bytes"] = int(line.split()[1]) * 1024
+                    break
+    except (OSError, IndexError, ValueError):
+        pass
+    try:
+        with open(f"/proc/{pid}/io") as f:
+            counters = dict(line.split(":", 1) for line in f if ":" in line)
+        sample["read_bytes"] = int(counters["rchar"])
+        sample["write_bytes"] = int(counters["wchar"])
+    except (OSError, KeyError, ValueError):
+        pass
+    return sample
+
+
+class ResourceMonitor:
+    """Accumulates resource usage for one traced process from samples and its rusage."""
+
+    def __init__(self, pid: int) -> None:
+        """Initialize monitor for the process with the given pid."""
+        self.pid = pid
+        self._fields: dict[str, Any] = {}
+        self._last_sample = 0.0
+
+    def sample(self, min_interval: float = 0.0) -> None:
+        """Sample /proc for the process, unless the last sample is under min_interval old."""
+        now = time.monotonic()
+        if now - self._last_sample < min_interval:
+            return
+        self._last_sample = now
+        self.record(read_proc_sample(self.pid))
+
+    def record(self, fields: dict[str, Any]) -> None:
+        """Merge measured fields; peak RSS keeps its maximum, other fields the latest value."""
+        for name, value in fields.items():
+            if name == "peak_rss_bytes":
+                value = max(value, self._fields.get(name, 0))
+            self._fields[name] = value
+
+    def reap(self, block: bool = False) -> int | None:
+        """Reap the exited child with wait4, recording its rusage; return its exit code.
+
+        Returns None if block is False and the child is still running. The final
+        I/O counters are read while the child is a zombie, before it is reaped.
+        """
+        if (
+            not block
+            and os.waitid(os.P_PID, self.pid, os.WEXITED | os.WNOHANG | os.WNOWAIT) is None
+        ):
+            return None
+        self.sample()
+        _, status, rusage = os.wait4(self.pid, 0)
+        self.record(rusage_fields(rusage))
+        return os.waitstatus_to_exitcode(status)
+
+    def usage(self) -> ResourceUsage | None:
+        """Get the accumulated usage, or None if nothing could be measured."""
+        return ResourceUsage(**self._fields) if self._fields else None
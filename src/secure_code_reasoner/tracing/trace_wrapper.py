@@ -1,45 +1,299 @@
 """Trace wrapper module for intercepting operations during execution."""
 
+import atexit
 import os
-import sys
+import select
+import signal
+import threading
+import time
+from collections import deque
+from collections.abc import Mapping
+from dataclasses import dataclass, field
 from pathlib import Path
+from types import FrameType
 from typing import Any
 
+from secure_code_reasoner.exceptions import TracingError
+from secure_code_reasoner.tracing.audit_hooks import install_audit_hook
+from secure_code_reasoner.tracing.protocol import OVERFLOW_RECORD, TRACE_FD_ENV, encode_record
+
+# Writes of at most PIPE_BUF bytes are atomic, so batches from forked children never interleave
+_PIPE_BUF = getattr(select, "PIPE_BUF", 512)
+
+
+@dataclass(frozen=True)
+class TraceConfig:
+    """Trace settings, read from the environment once when hooks are installed."""
+
+    enabled: bool = False
+    backend: str = "audit"
+    trace_fd: int | None = None
+    no_network: bool = False
+    no_file_write: bool = False
+    buffer_size: int = 4096
+    batch_size: int = 256
+    flush_interval: float = 0.05
+    event_types: frozenset[str] | None = None
+    sample_rates: dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def from_environ(cls, environ: Mapping[str, str] | None = None) -> "TraceConfig":
+        """Build config from SCR_* environment variables, ignoring malformed values."""
+        env = os.environ if environ is None else environ
+        defaults = cls()
+
+        def number(name: str, default: Any, kind: type) -> Any:
+            try:
+                value = kind(env[name])
+            except (KeyError, ValueError):
+                return default
+            return value if value > 0 else default
+
+        event_types = None
+        if env.get("SCR_TRACE_EVENTS"):
+            event_types = frozenset(t.strip() for t in env["SCR_TRACE_EVENTS"].split(","))
+        sample_rates: dict[str, int] = {}
+        for item in env.get("SCR_TRACE_SAMPLE", "").split(","):
+            event_type, _, rate = item.partition("=")
+            if rate.strip().isdigit() and int(rate) > 0:
+                sample_rates[event_type.strip()] = int(rate)
+
+        trace_fd = number(TRACE_FD_ENV, None, int)
+        return cls(
+            enabled=env.get("SCR_TRACE_MODE") == "1",
+            backend=env.get("SCR_TRACE_BACKEND", defaults.backend),
+            trace_fd=trace_fd,
+            no_network=env.get("SCR_NO_NETWORK") == "1",
+            no_file_write=env.get("SCR_NO_FILE_WRITE") == "1",
+            buffer_size=number("SCR_TRACE_BUFFER_SIZE", defaults.buffer_size, int),
+            batch_size=number("SCR_TRACE_BATCH_SIZE", defaults.batch_size, int),
+            flush_interval=number("SCR_TRACE_FLUSH_INTERVAL", defaults.flush_interval, float),
+            event_types=event_types,
+            sample_rates=sample_rates,
+        )
+
+
+class EventBuffer:
+    """Ring buffer of trace events flushed to the tracer pipe in batches.
+
+    Events are buffered and written when batch_size events are queued or
+    flush_interval seconds have passed (checked on emit, and by a background
+    flusher thread when started), using non-blocking writes so a slow
+    reader never stalls the traced script. If the pipe stays full, the ring
+    keeps the newest events and counts the overwritten ones, which are reported
+    in a single overflow record on the next successful flush.
+    """
+
+    def __init__(
+        self, trace_fd: int, buffer_size: int, batch_size: int, flush_interval: float
+    ) -> None:
+        """Initialize buffer writing to trace_fd."""
+        self._fd = trace_fd
+        self._batch_size = min(batch_size, buffer_size)
+        self._flush_interval = flush_interval
+        self._events: deque[tuple[str, float, dict[str, Any]]] = deque(maxlen=buffer_size)
+        self._pending: deque[bytes] = deque()
+        self._last_flush = time.time()
+        self._lock = threading.RLock()
+        self._flusher: threading.Thread | None = None
+        self.dropped = 0
+        os.set_blocking(trace_fd, False)
+        os.register_at_fork(after_in_child=self._reset_after_fork)
+
+    def emit(self, event_type: str, fields: dict[str, Any]) -> None:
+        """Queue an event, flushing if a batch threshold is reached."""
+        if self._fd < 0:
+            return
+        timestamp = time.time()
+        with self._lock:
+            if len(self._events) == self._events.maxlen:
+                self.dropped += 1  # append below overwrites the oldest event
+            self._events.append((event_type, timestamp, fields))
+            if (
+                len(self._events) >= self._batch_size
+                or timestamp - self._last_flush >= self._flush_interval
+            ):
+                self._flush()
+
+    def flush(self) -> None:
+        """Write buffered events without blocking."""
+        with self._lock:
+            self._flush()
+
+    def close(self) -> None:
+        """Write every buffered event, blocking until the pipe accepts them."""
+        with self._lock:
+            if self._fd < 0:
+                return
+            try:
+                os.set_blocking(self._fd, True)
+            except OSError:
+                self._disable()
+                return
+            self._flush()
+
+    def install_exit_handlers(self) -> None:
+        """Flush remaining events at interpreter exit and on SIGTERM."""
+        atexit.register(self.close)
+        try:
+            previous = signal.getsignal(signal.SIGTERM)
+
+            def on_sigterm(signum: int, frame: FrameType | None) -> None:
+                self.close()
+                if callable(previous):
+                    previous(signum, frame)
+                elif previous != signal.SIG_IGN:
+                    signal.signal(signum, signal.SIG_DFL)
+                    os.kill(os.getpid(), signum)
+
+            signal.signal(signal.SIGTERM, on_sigterm)
+        except (OSError, ValueError):
+            # Not the main thread, or signals unsupported; atexit still flushes
+            pass
+
+    def start_flusher(self) -> None:
+        """Start a daemon thread that flushes queued events every flush_interval seconds.
+
+        Without it, events emitted just before a script goes quiet wait for the next
+        emit or for exit; with it, a live consumer sees them within flush_interval.
+        """
+        if self._flusher is not None and self._flusher.is_alive():
+            return
+        self._flusher = threading.Thread(
+            target=self._run_flusher, name="scr-trace-flusher", daemon=True
+        )
+        self._flusher.start()
+
+    def _run_flusher(self) -> None:
+        """Flush periodically until tracing is disabled."""
+        while self._fd >= 0:
+            time.sleep(self._flush_interval)
+            with self._lock:
+                if self._events or self._pending:
+                    self._flush()
+
+    def _flush(self) -> None:
+        """Flush with the lock held: finish pending writes, then encode the next batch."""
+        self._last_flush = time.time()
+        if not self._write_pending():
+            return
+        records: list[bytes] = []
+        if self.dropped:
+            records.append(
+                encode_record(OVERFLOW_RECORD, self._last_flush, {"dropped_events": self.dropped})
+            )
+            self.dropped = 0
+        while self._events:
+            try:
+                records.append(encode_record(*self._events.popleft()))
+            except TracingError:
+                self.dropped += 1
+        chunk = bytearray()
+        for record in records:
+            if chunk and len(chunk) + len(record) > _PIPE_BUF:
+                self._pending.append(bytes(chunk))
+                chunk = bytearray()
+            chunk += record
+        if chunk:
+            self._pending.append(bytes(chunk))
+        self._write_pending()
+
+    def _write_pending(self) -> bool:
+        """Write encoded chunks until the pipe is full; return True when none remain."""
+        while self._pending:
+            chunk = self._pending[0]
+            try:
+                written = os.write(self._fd, chunk)
+            except BlockingIOError:
+                return False
+            except OSError:
+                # The tracer went away; tracing must not break the script
+                self._disable()
+                return False
+            if written < len(chunk):
+                self._pending[0] = chunk[written:]
+            else:
+                self._pending.popleft()
+        return True
+
+    def _disable(self) -> None:
+        """Stop tracing and discard buffered events."""
+        self._fd = -1
+        self._events.clear()
+        self._pending.clear()
+
+    def _reset_after_fork(self) -> None:
+        """Drop the parent's buffered events in a forked child."""
+        self._lock = threading.RLock()
+        self._events.clear()
+        self._pending.clear()
+        self.dropped = 0
+        if self._flusher is not None:
+            self._flusher = None
+            self.start_flusher()
+
+
+_config = TraceConfig()
+_buffer: EventBuffer | None = None
+
+
+def _emit(event_type: str, **fields: Any) -> None:
+    """Queue a trace event, if hooks are installed with an event pipe."""
+    if _buffer is not None:
+        _buffer.emit(event_type, fields)
+
 
 def trace_file_operation(operation: str, file_path: Path) -> None:
     """Trace a file operation."""
-    if os.environ.get("SCR_TRACE_MODE") == "1":
-        print(f"SCR_TRACE:{operation}|file={file_path}", file=sys.stderr, flush=True)
+    _emit(operation, file_path=str(file_path))
 
 
 def trace_process_spawn(command: str, pid: int) -> None:
     """Trace a process spawn."""
-    if os.environ.get("SCR_TRACE_MODE") == "1":
-        print(f"SCR_TRACE:process_spawn|cmd={command},pid={pid}", file=sys.stderr, flush=True)
+    _emit("process_spawn", command=command, process_id=pid)
 
 
 def trace_network_operation(operation: str, address: str, port: int) -> None:
     """Trace a network operation."""
-    if os.environ.get("SCR_TRACE_MODE") == "1":
-        if os.environ.get("SCR_NO_NETWORK") == "1":
-            print(
-                f"SCR_TRACE:{operation}|addr={address},port={port},blocked=1",
-                file=sys.stderr,
-                flush=True,
-            )
-        else:
-            print(f"SCR_TRACE:{operation}|addr={address},port={port}", file=sys.stderr, flush=True)
+    if _config.no_network:
+        _emit(operation, network_address=address, network_port=port, blocked=True)
+    else:
+        _emit(operation, network_address=address, network_port=port)
 
 
 def trace_module_import(module_name: str) -> None:
     """Trace a module import."""
-    if os.environ.get("SCR_TRACE_MODE") == "1":
-        print(f"SCR_TRACE:module_import|module={module_name}", file=sys.stderr, flush=True)
+    _emit("module_import", module_name=module_name)
 
 
 def install_trace_hooks() -> None:
-    """Install trace hooks for common operations."""
-    if os.environ.get("SCR_TRACE_MODE") != "1":
+    """Install trace hooks for common operations.
+
+    Configuration is read from the environment once, here; hooks only consult it.
+    The "audit" backend (default) traces through a PEP 578 audit hook; the
+    "wrappers" backend monkeypatches open, subprocess.run and socket.socket.
+    Event filtering and sampling apply to the audit backend.
+    """
+    global _config, _buffer
+    config = TraceConfig.from_environ()
+    if not config.enabled:
+        return
+    _config = config
+    if config.trace_fd is not None and _buffer is None:
+        _buffer = EventBuffer(
+            config.trace_fd, config.buffer_size, config.batch_size, config.flush_interval
+        )
+        _buffer.install_exit_handlers()
+        _buffer.start_flusher()
+
+    if config.backend == "audit":
+        install_audit_hook(
+            _emit,
+            event_types=config.event_types,
+            sample_rates=config.sample_rates,
+            no_network=config.no_network,
+            no_file_write=config.no_file_write,
+        )
         return
 
     original_open = open
@@ -64,7 +318,7 @@ def install_trace_hooks() -> None:
         file_path = Path(file) if isinstance(file, str | Path) else None
         if file_path:
             if "w" in mode or "a" in mode or "x" in mode:
-                if os.environ.get("SCR_NO_FILE_WRITE") == "1":
+                if config.no_file_write:
                     raise PermissionError(f"File write blocked by sandbox: {file_path}")
                 trace_file_operation("file_write", file_path)
             elif "r" in mode:
@@ -83,7 +337,7 @@ def install_trace_hooks() -> None:
 
     def traced_socket_create(*args: Any, **kwargs: Any) -> Any:
         if original_socket_create:
-            if os.environ.get("SCR_NO_NETWORK") == "1":
+            if config.no_network:
                 raise PermissionError("Network access blocked by sandbox")
             sock = original_socket_create(*args, **kwargs)
             original_connect = sock.connect
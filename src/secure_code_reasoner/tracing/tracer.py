@@ -1,28 +1,65 @@
 """Execution tracing subsystem implementation."""
 
+import asyncio
+import contextlib
 import logging
 import os
+import selectors
 import subprocess
 import sys
 import time
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator, Mapping
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from pathlib import Path
 
 from secure_code_reasoner.exceptions import SandboxError, TracingError
+from secure_code_reasoner.tracing.event_store import EventStore
+from secure_code_reasoner.tracing.forkserver import ForkedProcess, ForkServer
 from secure_code_reasoner.tracing.models import (
     ExecutionTrace,
+    ResourceUsage,
     RiskScore,
     TraceEvent,
     TraceEventType,
 )
+from secure_code_reasoner.tracing.process_tree import ProcessInfo, ProcessTreeTracker
+from secure_code_reasoner.tracing.protocol import (
+    OVERFLOW_RECORD,
+    TRACE_FD_ENV,
+    RecordDecoder,
+    TraceRecord,
+)
+from secure_code_reasoner.tracing.resources import (
+    ResourceMonitor,
+    TraceResourceLimits,
+    rlimit_settings,
+)
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True)
+class _ProcessResult:
+    """Output, exit status and trace events collected from one traced process."""
+
+    returncode: int | None
+    stdout: str
+    stderr: str
+    events: EventStore
+    timed_out: bool
+    resource_usage: ResourceUsage | None = None
+
+
 class ExecutionTracer:
     """Traces execution of untrusted code in a sandboxed subprocess."""
 
     DEFAULT_TIMEOUT = 30.0
     DEFAULT_MAX_OUTPUT_SIZE = 1024 * 1024
+    BACKENDS = ("audit", "wrappers")
+    POLL_INTERVAL = 0.05
+    READ_CHUNK_SIZE = 64 * 1024
+    DEFAULT_MAX_RAW_EVENTS = 1000
 
     def __init__(
         self,
@@ -30,136 +67,552 @@ class ExecutionTracer:
         max_output_size: int = DEFAULT_MAX_OUTPUT_SIZE,
         allow_network: bool = False,
         allow_file_write: bool = False,
+        backend: str = "audit",
+        event_types: Iterable[TraceEventType] | None = None,
+        sample_rates: Mapping[TraceEventType, int] | None = None,
+        fork_server: ForkServer | None = None,
+        resource_limits: TraceResourceLimits | None = None,
+        aggregate_events: bool = False,
+        max_raw_events: int = DEFAULT_MAX_RAW_EVENTS,
     ) -> None:
-        """Initialize execution tracer."""
+        """Initialize execution tracer.
+
+        backend selects how the traced process intercepts operations: "audit" uses a
+        PEP 578 audit hook covering all file, process, network and import events;
+        "wrappers" monkeypatches open, subprocess.run and socket.socket. With the
+        audit backend, event_types limits which events are recorded and
+        sample_rates records 1 in N events of a type. Sandbox restrictions apply
+        to every operation regardless of filtering. When fork_server is given,
+        scripts run in children forked from its pre-warmed interpreter instead of
+        a freshly started one; the caller owns the server and closes it.
+        resource_limits are set by the traced process itself before the script
+        runs (never through preexec_fn, which is unsafe with threads) and enforced
+        by the kernel. With aggregate_events, events that differ only in their
+        timestamp are collapsed into one record with a count and first/last
+        timestamps, and only the first max_raw_events events are also kept as they
+        occurred; the risk score is computed from the aggregate counts.
+        """
         if timeout <= 0:
             raise TracingError("timeout must be > 0")
         if max_output_size <= 0:
             raise TracingError("max_output_size must be > 0")
+        if backend not in self.BACKENDS:
+            raise TracingError(f"backend must be one of {', '.join(self.BACKENDS)}, got {backend}")
+        if sample_rates and any(rate < 1 for rate in sample_rates.values()):
+            raise TracingError("sample rates must be >= 1")
+        if max_raw_events < 0:
+            raise TracingError("max_raw_events must be >= 0")
 
         self.timeout = timeout
         self.max_output_size = max_output_size
         self.allow_network = allow_network
         self.allow_file_write = allow_file_write
+        self.backend = backend
+        self.event_types = frozenset(event_types) if event_types is not None else None
+        self.sample_rates = dict(sample_rates or {})
+        self.fork_server = fork_server
+        self.resource_limits = resource_limits
+        self.aggregate_events = aggregate_events
+        self.max_raw_events = max_raw_events
 
     def trace(self, script_path: Path, args: list[str] | None = None) -> ExecutionTrace:
         """Trace execution of a script."""
-        script_path = Path(script_path).resolve()
-        if not script_path.exists():
-            raise TracingError(f"Script path does not exist: {script_path}")
-        if not script_path.is_file():
-            raise TracingError(f"Script path is not a file: {script_path}")
-        # Note: Path traversal protection for script_path would require a root context
-        # For now, we rely on the caller to provide a trusted script path
+        script_path = self._validate_script_path(script_path)
 
         logger.info(f"Tracing execution of: {script_path}")
 
         start_time = time.time()
-        events: list[TraceEvent] = []
-        exit_code: int | None = None
-        stdout = ""
-        stderr = ""
-
+        result: _ProcessResult | Exception
         try:
             result = self._execute_with_tracing(script_path, args or [])
-            execution_time = time.time() - start_time
-
-            exit_code = result.returncode
-            stdout = self._truncate_output(result.stdout)
-            stderr = self._truncate_output(result.stderr)
-
-            events = self._parse_trace_output(stdout, stderr)
-
-        except subprocess.TimeoutExpired as e:
-            execution_time = time.time() - start_time
-            logger.warning(f"Execution timed out after {execution_time:.2f}s")
-            events.append(
-                TraceEvent(
-                    event_type=TraceEventType.SYSTEM_CALL,
-                    timestamp=time.time(),
-                    metadata={"error": "timeout", "timeout_seconds": self.timeout},
-                )
-            )
-            exit_code = -1
-            if hasattr(e, "stdout") and e.stdout:
-                stdout = self._truncate_output(
-                    e.stdout.decode() if isinstance(e.stdout, bytes) else e.stdout
-                )
-            if hasattr(e, "stderr") and e.stderr:
-                stderr = self._truncate_output(
-                    e.stderr.decode() if isinstance(e.stderr, bytes) else e.stderr
-                )
-            else:
-                stderr = ""
-            stderr += f"\nExecution timed out after {self.timeout}s"
+        except Exception as e:
+            logger.error(f"Execution failed: {e}", exc_info=True)
+            result = e
+        return self._build_trace(script_path, result, time.time() - start_time)
+
+    async def atrace(self, script_path: Path, args: list[str] | None = None) -> ExecutionTrace:
+        """Trace execution of a script without blocking the event loop.
 
+        Cancelling the coroutine kills the traced process tree. The script always
+        runs in a freshly started interpreter; fork_server is not used.
+        """
+        script_path = self._validate_script_path(script_path)
+
+        logger.info(f"Tracing execution of: {script_path}")
+
+        start_time = time.time()
+        result: _ProcessResult | Exception
+        try:
+            result = await self._aexecute_with_tracing(script_path, args or [])
         except Exception as e:
-            execution_time = time.time() - start_time
             logger.error(f"Execution failed: {e}", exc_info=True)
-            events.append(
-                TraceEvent(
-                    event_type=TraceEventType.SYSTEM_CALL,
-                    timestamp=time.time(),
-                    metadata={"error": str(e), "error_type": type(e).__name__},
-                )
+            result = e
+        return self._build_trace(script_path, result, time.time() - start_time)
+
+    async def astream(
+        self, script_path: Path, args: list[str] | None = None
+    ) -> AsyncIterator[TraceEvent]:
+        """Trace execution of a script, yielding each event as the script emits it.
+
+        A timeout is reported as a final timeout event. Closing the iterator early
+        kills the traced process tree. With aggregate_events, only the first
+        occurrence of each distinct event is yielded.
+
+        Raises:
+            SandboxError: If the script cannot be started
+        """
+        script_path = self._validate_script_path(script_path)
+        queue: asyncio.Queue[TraceEvent | None] = asyncio.Queue()
+        task = asyncio.create_task(
+            self._aexecute_with_tracing(script_path, args or [], on_event=queue.put_nowait)
+        )
+        task.add_done_callback(lambda _: queue.put_nowait(None))
+        try:
+            while (event := await queue.get()) is not None:
+                yield event
+            if task.result().timed_out:
+                yield self._timeout_event()
+        finally:
+            if not task.done():
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+
+    def _build_trace(
+        self, script_path: Path, result: _ProcessResult | Exception, execution_time: float
+    ) -> ExecutionTrace:
+        """Build the execution trace for a finished run, or for a run that failed to execute."""
+        if isinstance(result, Exception):
+            events = self._new_event_store()
+            events.add(
+                TraceEventType.SYSTEM_CALL,
+                time.time(),
+                metadata={"error": str(result), "error_type": type(result).__name__},
             )
-            exit_code = -1
-            stderr = str(e)
+            exit_code: int | None = -1
+            stdout = ""
+            stderr = str(result)
+            resource_usage = None
+        else:
+            events = result.events
+            resource_usage = result.resource_usage
+            stdout = result.stdout
+            stderr = result.stderr
+            if result.timed_out:
+                logger.warning(f"Execution timed out after {execution_time:.2f}s")
+                events.append(self._timeout_event())
+                exit_code = -1
+                stderr += f"\nExecution timed out after {self.timeout}s"
+            else:
+                exit_code = result.returncode
 
         risk_score = self._calculate_risk_score(events, exit_code, execution_time)
 
+        metadata: dict = {
+            "timeout": self.timeout,
+            "allow_network": self.allow_network,
+            "allow_file_write": self.allow_file_write,
+            "backend": self.backend,
+        }
+        if self.resource_limits is not None:
+            metadata["resource_limits"] = self.resource_limits.to_dict()
+        dropped_events = sum(
+            e.metadata.get("dropped_events", 0) * count
+            for e, count in events.counted(TraceEventType.SYSTEM_CALL, error="trace_overflow")
+        )
+        if dropped_events:
+            metadata["dropped_events"] = dropped_events
+        if self.aggregate_events:
+            metadata["event_aggregation"] = {
+                "total_events": events.count(),
+                "max_raw_events": self.max_raw_events,
+            }
+
         return ExecutionTrace(
             script_path=script_path,
-            events=frozenset(events),
+            events=events,
             exit_code=exit_code,
             execution_time=execution_time,
             risk_score=risk_score,
             stdout=stdout,
             stderr=stderr,
-            metadata={
-                "timeout": self.timeout,
-                "allow_network": self.allow_network,
-                "allow_file_write": self.allow_file_write,
-            },
+            metadata=metadata,
+            resource_usage=resource_usage,
         )
 
-    def _execute_with_tracing(
-        self, script_path: Path, args: list[str]
-    ) -> subprocess.CompletedProcess:
-        """Execute script with tracing enabled."""
-        python_executable = sys.executable
+    def trace_many(
+        self,
+        script_paths: Iterable[Path],
+        max_workers: int | None = None,
+        args: list[str] | None = None,
+    ) -> Iterator[ExecutionTrace]:
+        """Trace many scripts concurrently, yielding each trace as it finishes.
+
+        At most max_workers traced processes run at once (default: CPU count), and
+        each trace keeps its own timeout. Every path is validated before any script
+        runs. Closing the generator early cancels traces that have not started.
+        """
+        if max_workers is not None and max_workers < 1:
+            raise TracingError("max_workers must be >= 1")
+        paths = [self._validate_script_path(path) for path in script_paths]
+        if not paths:
+            return
+
+        executor = ThreadPoolExecutor(
+            max_workers=min(max_workers or os.cpu_count() or 1, len(paths)),
+            thread_name_prefix="scr-trace",
+        )
+        try:
+            futures = [executor.submit(self.trace, path, args) for path in paths]
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _new_event_store(self) -> EventStore:
+        """Create the event store for one trace, aggregated if configured."""
+        return EventStore(aggregate=self.aggregate_events, max_raw_events=self.max_raw_events)
+
+    def _timeout_event(self) -> TraceEvent:
+        """Create the event recording that a traced script hit the timeout."""
+        return TraceEvent(
+            event_type=TraceEventType.SYSTEM_CALL,
+            timestamp=time.time(),
+            metadata={"error": "timeout", "timeout_seconds": self.timeout},
+        )
 
+    def _validate_script_path(self, script_path: Path) -> Path:
+        """Resolve a script path and check that it is an existing file."""
+        script_path = Path(script_path).resolve()
+        if not script_path.exists():
+            raise TracingError(f"Script path does not exist: {script_path}")
+        if not script_path.is_file():
+            raise TracingError(f"Script path is not a file: {script_path}")
+        # Note: Path traversal protection for script_path would require a root context
+        # For now, we rely on the caller to provide a trusted script path
+        return script_path
+
+    def _execute_with_tracing(self, script_path: Path, args: list[str]) -> _ProcessResult:
+        """Execute script with tracing enabled, collecting events from a dedicated pipe."""
+        env = self._get_sandbox_env()
+        read_fd, write_fd = os.pipe()
+
+        process: subprocess.Popen | ForkedProcess
+        try:
+            if self.fork_server is not None:
+                process = self.fork_server.spawn(
+                    script_path,
+                    args,
+                    cwd=script_path.parent,
+                    env=env,
+                    trace_fd=write_fd,
+                    resource_limits=self.resource_limits,
+                )
+            else:
+                env[TRACE_FD_ENV] = str(write_fd)
+                process = subprocess.Popen(
+                    self._build_command(script_path, args),
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    cwd=script_path.parent,
+                    env=env,
+                    pass_fds=(write_fd,),
+                    start_new_session=True,
+                )
+        except Exception as e:
+            os.close(read_fd)
+            raise SandboxError(f"Sandbox execution failed: {e}") from e
+        finally:
+            # Only the child holds the write end, so EOF on read_fd means it is done emitting
+            os.close(write_fd)
+
+        tree = ProcessTreeTracker(process.pid)
+        try:
+            return self._collect(process, read_fd, tree)
+        finally:
+            os.close(read_fd)
+            # Nothing the script started may outlive the trace
+            tree.kill()
+            if process.poll() is None:
+                process.wait()
+            for stream in (process.stdout, process.stderr):
+                if stream is not None:
+                    stream.close()
+
+    def _build_command(self, script_path: Path, args: list[str]) -> list[str]:
+        """Build the command that starts a fresh interpreter running script_path under trace hooks."""
         wrapper_module = Path(__file__).parent / "trace_wrapper.py"
+        # Limits are set by the child itself: preexec_fn is unsafe in a threaded parent
+        rlimits = rlimit_settings(self.resource_limits) if self.resource_limits else []
+        limits_code = (
+            "import resource\n"
+            f"for name, value in {rlimits!r}:\n"
+            "    resource.setrlimit(getattr(resource, name), (value, value))\n"
+            if rlimits
+            else ""
+        )
         wrapper_code = f"""
 import sys
 import os
-sys.path.insert(0, r'{wrapper_module.parent.parent.parent}')
+{limits_code}sys.path.insert(0, r'{wrapper_module.parent.parent.parent}')
 from secure_code_reasoner.tracing.trace_wrapper import install_trace_hooks
 install_trace_hooks()
 with open(r'{script_path}', 'r') as f:
     code = compile(f.read(), r'{script_path}', 'exec')
     exec(code, {{'__name__': '__main__', '__file__': r'{script_path}'}})
 """
+        return [sys.executable, "-c", wrapper_code] + args
+
+    def _collect(
+        self, process: subprocess.Popen | ForkedProcess, trace_fd: int, tree: ProcessTreeTracker
+    ) -> _ProcessResult:
+        """Read output and trace records until the process exits or the timeout expires.
+
+        stdout and stderr are only accumulated (bounded by max_output_size), never
+        scanned; events are decoded incrementally from the trace pipe as they arrive.
+        Descendants found by polling /proc are recorded as process_spawn events, and
+        on timeout the whole process tree is killed.
+        """
+        assert process.stdout is not None and process.stderr is not None
+        deadline = time.monotonic() + self.timeout
+        decoder: RecordDecoder | None = RecordDecoder()
+        events = self._new_event_store()
+        # Keep enough bytes to hold max_output_size characters of any UTF-8 width
+        capture_limit = self.max_output_size * 4 + 4
+        captured = {process.stdout.fileno(): bytearray(), process.stderr.fileno(): bytearray()}
+        monitor = ResourceMonitor(process.pid)
+        timed_out = False
+
+        with selectors.DefaultSelector() as selector:
+            for fd in (*captured, trace_fd):
+                selector.register(fd, selectors.EVENT_READ)
+
+            while selector.get_map():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    timed_out = True
+                    break
+                exited = self._poll(process, monitor) is not None
+                events.extend(self._spawn_events(tree.scan(self.POLL_INTERVAL)))
+                ready = selector.select(timeout=0 if exited else min(remaining, self.POLL_INTERVAL))
+                if not ready and exited:
+                    # Exited, but a descendant still holds a pipe open
+                    break
+                for key, _ in ready:
+                    data = os.read(key.fd, self.READ_CHUNK_SIZE)
+                    if not data:
+                        selector.unregister(key.fd)
+                    elif key.fd == trace_fd:
+                        if decoder is not None:
+                            decoder = self._decode_records(decoder, data, events)
+                    else:
+                        buffer = captured[key.fd]
+                        if len(buffer) < capture_limit:
+                            buffer.extend(data[: capture_limit - len(buffer)])
+
+        returncode: int | None = None
+        delay = 0.0005
+        while not timed_out and (returncode := self._poll(process, monitor)) is None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                timed_out = True
+            else:
+                time.sleep(min(delay, remaining))
+                delay = min(delay * 2, self.POLL_INTERVAL)
+        events.extend(self._spawn_events(tree.scan()))
+        if timed_out:
+            returncode = None
+            tree.kill()
+            self._wait(process, monitor)
+        if decoder is not None and decoder.pending:
+            logger.debug(f"Discarding {decoder.pending} bytes of an incomplete trace record")
+
+        return _ProcessResult(
+            returncode=returncode,
+            stdout=self._decode_output(captured[process.stdout.fileno()]),
+            stderr=self._decode_output(captured[process.stderr.fileno()]),
+            events=events,
+            timed_out=timed_out,
+            resource_usage=monitor.usage(),
+        )
 
-        cmd = [python_executable, "-c", wrapper_code] + args
-
+    def _poll(
+        self, process: subprocess.Popen | ForkedProcess, monitor: ResourceMonitor
+    ) -> int | None:
+        """Return the exit code once the process has exited, sampling its resources until then.
+
+        Popen children are reaped here with wait4 (via the monitor) so their rusage
+        is recorded; fork server children are reaped by the server, which reports
+        their rusage.
+        """
+        if isinstance(process, ForkedProcess):
+            if process.poll() is None:
+                monitor.sample(self.POLL_INTERVAL)
+                return None
+            monitor.record(process.resources)
+            return process.returncode
+        if process.returncode is None:
+            returncode = monitor.reap()
+            if returncode is None:
+                monitor.sample(self.POLL_INTERVAL)
+                return None
+            process.returncode = returncode
+        return process.returncode
+
+    def _wait(self, process: subprocess.Popen | ForkedProcess, monitor: ResourceMonitor) -> None:
+        """Block until the (killed) process has been reaped, recording its rusage."""
+        if isinstance(process, ForkedProcess):
+            process.wait()
+            monitor.record(process.resources)
+        elif process.returncode is None:
+            process.returncode = monitor.reap(block=True)
+
+    async def _aexecute_with_tracing(
+        self,
+        script_path: Path,
+        args: list[str],
+        on_event: Callable[[TraceEvent], None] | None = None,
+    ) -> _ProcessResult:
+        """Execute script with tracing enabled on the running event loop.
+
+        stdout, stderr and the trace pipe are read by concurrent tasks; on_event is
+        called with each new row of the event store as it is decoded. The script runs
+        in its own session so that a timeout, cancellation or exit kills its whole
+        process tree. The event loop reaps the process, so resource usage comes from
+        /proc samples only.
+        """
         env = self._get_sandbox_env()
-
+        read_fd, write_fd = os.pipe()
+        env[TRACE_FD_ENV] = str(write_fd)
         try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=self.timeout,
+            process = await asyncio.create_subprocess_exec(
+                *self._build_command(script_path, args),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
                 cwd=script_path.parent,
                 env=env,
-                check=False,
+                pass_fds=(write_fd,),
+                start_new_session=True,
             )
-            return result
-        except subprocess.TimeoutExpired:
-            raise
         except Exception as e:
+            os.close(read_fd)
             raise SandboxError(f"Sandbox execution failed: {e}") from e
+        finally:
+            os.close(write_fd)
+
+        loop = asyncio.get_running_loop()
+        trace_reader = asyncio.StreamReader()
+        transport, _ = await loop.connect_read_pipe(
+            lambda: asyncio.StreamReaderProtocol(trace_reader), open(read_fd, "rb", buffering=0)
+        )
+        assert process.stdout is not None and process.stderr is not None
+        capture_limit = self.max_output_size * 4 + 4
+        stdout, stderr = bytearray(), bytearray()
+        events = self._new_event_store()
+
+        async def capture(stream: asyncio.StreamReader, buffer: bytearray) -> None:
+            while data := await stream.read(self.READ_CHUNK_SIZE):
+                if len(buffer) < capture_limit:
+                    buffer.extend(data[: capture_limit - len(buffer)])
+
+        async def decode() -> None:
+            decoder: RecordDecoder | None = RecordDecoder()
+            while data := await trace_reader.read(self.READ_CHUNK_SIZE):
+                if decoder is None:
+                    continue
+                decoded_from = len(events)
+                decoder = self._decode_records(decoder, data, events)
+                if on_event is not None:
+                    for index in range(decoded_from, len(events)):
+                        on_event(events[index])
+
+        monitor = ResourceMonitor(process.pid)
+
+        tree = ProcessTreeTracker(process.pid)
+
+        def track() -> None:
+            spawned = self._spawn_events(tree.scan())
+            events.extend(spawned)
+            if on_event is not None:
+                for event in spawned:
+                    on_event(event)
+
+        async def sample() -> None:
+            while process.returncode is None:
+                monitor.sample()
+                track()
+                await asyncio.sleep(self.POLL_INTERVAL)
+
+        sampler = asyncio.create_task(sample())
+        readers = [
+            asyncio.create_task(capture(process.stdout, stdout)),
+            asyncio.create_task(capture(process.stderr, stderr)),
+            asyncio.create_task(decode()),
+        ]
+        returncode: int | None = None
+        timed_out = False
+        try:
+            returncode = await asyncio.wait_for(self._await_exit(process), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            timed_out = True
+        finally:
+            sampler.cancel()
+            track()
+            tree.kill()
+            await self._await_exit(process)
+            # A descendant may still hold a pipe open; stop reading shortly after exit
+            _, pending = await asyncio.wait(readers, timeout=self.POLL_INTERVAL)
+            for reader in pending:
+                reader.cancel()
+            await asyncio.gather(sampler, *readers, return_exceptions=True)
+            transport.close()
+
+        return _ProcessResult(
+            returncode=None if timed_out else returncode,
+            stdout=self._decode_output(stdout),
+            stderr=self._decode_output(stderr),
+            events=events,
+            timed_out=timed_out,
+            resource_usage=monitor.usage(),
+        )
+
+    async def _await_exit(self, process: asyncio.subprocess.Process) -> int:
+        """Wait for the process to exit.
+
+        Process.wait() also waits for its pipes to close, which a surviving
+        descendant can hold open indefinitely, so the exit status is polled instead.
+        """
+        delay = 0.0005
+        while process.returncode is None:
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.POLL_INTERVAL)
+        return process.returncode
+
+    def _spawn_events(self, processes: list[ProcessInfo]) -> list[TraceEvent]:
+        """Create process_spawn events for descendants observed in /proc."""
+        return [
+            TraceEvent(
+                event_type=TraceEventType.PROCESS_SPAWN,
+                timestamp=time.time(),
+                process_id=info.pid,
+                command=info.command,
+                metadata={"parent_pid": info.parent_pid, "observed_by": "proc"},
+            )
+            for info in processes
+        ]
+
+    def _decode_records(
+        self, decoder: RecordDecoder, data: bytes, events: EventStore
+    ) -> RecordDecoder | None:
+        """Decode trace records into the event store, returning None once the stream is corrupt."""
+        try:
+            records = decoder.feed(data)
+        except TracingError as e:
+            logger.warning(f"Ignoring remaining trace events: {e}")
+            return None
+        for record in records:
+            self._store_record(events, record)
+        return decoder
 
     def _get_sandbox_env(self) -> dict:
         """Get sandboxed environment variables."""
@@ -167,8 +620,19 @@ with open(r'{script_path}', 'r') as f:
         env["SCR_NO_NETWORK"] = "1" if not self.allow_network else "0"
         env["SCR_NO_FILE_WRITE"] = "1" if not self.allow_file_write else "0"
         env["SCR_TRACE_MODE"] = "1"
+        env["SCR_TRACE_BACKEND"] = self.backend
+        if self.event_types is not None:
+            env["SCR_TRACE_EVENTS"] = ",".join(sorted(t.value for t in self.event_types))
+        if self.sample_rates:
+            env["SCR_TRACE_SAMPLE"] = ",".join(
+                f"{t.value}={rate}" for t, rate in sorted(self.sample_rates.items())
+            )
         return env
 
+    def _decode_output(self, data: bytes) -> str:
+        """Decode captured output and truncate it to max size."""
+        return self._truncate_output(data.decode("utf-8", errors="replace"))
+
     def _truncate_output(self, output: str) -> str:
         """Truncate output to max size."""
         if len(output) > self.max_output_size:
@@ -178,91 +642,55 @@ with open(r'{script_path}', 'r') as f:
             )
         return output
 
-    def _parse_trace_output(self, stdout: str, stderr: str) -> list[TraceEvent]:
-        """Parse trace output into events."""
-        events: list[TraceEvent] = []
-        lines = (stdout + "\n" + stderr).splitlines()
-
-        for line in lines:
-            if "SCR_TRACE:" in line:
-                try:
-                    parts = line.split("SCR_TRACE:")[1].strip().split("|")
-                    if len(parts) >= 2:
-                        event_type_str = parts[0].strip()
-                        metadata_str = parts[1].strip() if len(parts) > 1 else ""
-
-                        try:
-                            event_type = TraceEventType(event_type_str)
-                            event = self._create_trace_event(event_type, metadata_str)
-                            if event:
-                                events.append(event)
-                        except ValueError:
-                            logger.debug(f"Unknown event type: {event_type_str}")
-                except Exception as e:
-                    logger.debug(f"Failed to parse trace line: {line}, error: {e}")
-
-        return events
-
-    def _create_trace_event(
-        self, event_type: TraceEventType, metadata_str: str
-    ) -> TraceEvent | None:
-        """Create trace event from parsed data."""
-        metadata: dict = {}
-        file_path: Path | None = None
-        process_id: int | None = None
-        network_address: str | None = None
-        network_port: int | None = None
-        command: str | None = None
-        module_name: str | None = None
-
-        if metadata_str:
-            try:
-                parts = metadata_str.split(",")
-                for part in parts:
-                    if "=" in part:
-                        key, value = part.split("=", 1)
-                        key = key.strip()
-                        value = value.strip()
-
-                        if key == "file":
-                            file_path = Path(value)
-                        elif key == "pid":
-                            process_id = int(value)
-                        elif key == "addr":
-                            network_address = value
-                        elif key == "port":
-                            network_port = int(value)
-                        elif key == "cmd":
-                            command = value
-                        elif key == "module":
-                            module_name = value
-                        else:
-                            metadata[key] = value
-            except Exception as e:
-                logger.debug(f"Failed to parse metadata: {metadata_str}, error: {e}")
-                metadata["raw"] = metadata_str
+    def _store_record(self, events: EventStore, record: TraceRecord) -> None:
+        """Append the event for a decoded trace record, skipping unknown or invalid records."""
+        if record.event_type == OVERFLOW_RECORD:
+            events.add(
+                TraceEventType.SYSTEM_CALL,
+                record.timestamp,
+                metadata={
+                    "error": "trace_overflow",
+                    "dropped_events": record.fields.get("dropped_events", 0),
+                },
+            )
+            return
+        try:
+            event_type = TraceEventType(record.event_type)
+        except ValueError:
+            logger.debug(f"Unknown event type: {record.event_type}")
+            return
 
-        return TraceEvent(
-            event_type=event_type,
-            timestamp=time.time(),
-            file_path=file_path,
-            process_id=process_id,
-            network_address=network_address,
-            network_port=network_port,
-            command=command,
-            module_name=module_name,
-            metadata=metadata,
-        )
+        fields = dict(record.fields)
+        file_path = fields.pop("file_path", None)
+        try:
+            events.add(
+                event_type,
+                record.timestamp,
+                file_path=str(Path(file_path)) if file_path else None,
+                process_id=fields.pop("process_id", None),
+                network_address=fields.pop("network_address", None),
+                network_port=fields.pop("network_port", None),
+                command=fields.pop("command", None),
+                module_name=fields.pop("module_name", None),
+                metadata=fields,
+            )
+        except (TypeError, ValueError) as e:
+            logger.debug(f"Invalid trace record {record}: {e}")
 
     def _calculate_risk_score(
-        self, events: list[TraceEvent], exit_code: int | None, execution_time: float
+        self,
+        events: EventStore | Iterable[TraceEvent],
+        exit_code: int | None,
+        execution_time: float,
     ) -> RiskScore:
         """Calculate risk score based on trace events using deterministic rules."""
+        if not isinstance(events, EventStore):
+            events = EventStore(events)
         score = 0.0
         factors: dict[str, float] = {}
 
-        file_write_events = sum(1 for e in events if e.event_type == TraceEventType.FILE_WRITE)
-        file_delete_events = sum(1 for e in events if e.event_type == TraceEventType.FILE_DELETE)
+        file_write_events = events.count(TraceEventType.FILE_WRITE)
+        file_delete_events = events.count(TraceEventType.FILE_DELETE)
         file_operations = file_write_events + file_delete_events
 
         if file_operations > 0 and not self.allow_file_write:
@@ -271,10 +699,8 @@ with open(r'{script_path}', 'r') as f:
             factors["unauthorized_file_operations"] = file_risk
 
         network_events = sum(
-            1
-            for e in events
-            if e.event_type
-            in (
+            events.count(event_type)
+            for event_type in (
                 TraceEventType.NETWORK_CONNECT,
                 TraceEventType.NETWORK_SEND,
                 TraceEventType.NETWORK_RECEIVE,
@@ -285,7 +711,7 @@ with open(r'{script_path}', 'r') as f:
             score += network_risk
             factors["unauthorized_network_access"] = network_risk
 
-        process_spawns = sum(1 for e in events if e.event_type == TraceEventType.PROCESS_SPAWN)
+        process_spawns = sum(count for _, count in events.spawns())
         if process_spawns > 0:
             process_risk = min(process_spawns * 15.0, 50.0)
             score += process_risk
@@ -295,7 +721,7 @@ with open(r'{script_path}', 'r') as f:
             score += 10.0
             factors["non_zero_exit"] = 10.0
 
-        timeout_events = sum(1 for e in events if e.metadata.get("error") == "timeout")
+        timeout_events = events.count(error="timeout")
         if timeout_events > 0:
             score += 20.0
             factors["timeout"] = 20.0
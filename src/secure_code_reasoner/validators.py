@@ -0,0 +1,430 @@
+"""Compiled schema validators for serialized reports and records.
+
+Each output kind (fingerprint and agent report documents, and the artifact,
+edge, finding and patch suggestion records they contain or that sharded output
+streams) has a schema per schema version: its required and optional fields, the
+exact JSON types of their values, enumerated values, and for documents the
+proof obligations and their invariants. compile_validator() turns a schema into
+a validation function once and caches it; the function checks a record with a
+few set operations and one type check per field, so validating a stream costs
+time linear in its size and no more than parsing it.
+
+validate_records() and validate_ndjson() check iterables of dicts or NDJSON
+lines without materializing them; validate_documents() checks one or more
+concatenated JSON documents such as the output of `scr analyze --format json`.
+Violations raise ContractViolationError with the record's position.
+"""
+
+import functools
+import json
+from collections import Counter
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+from secure_code_reasoner.exceptions import ContractViolationError
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None  # type: ignore[assignment]
+
+Validator = Callable[[Any, str], None]
+
+_MISSING = object()
+_NONE: type = type(None)
+_STR: tuple[type, ...] = (str,)
+_INT: tuple[type, ...] = (int,)
+_BOOL: tuple[type, ...] = (bool,)
+_LIST: tuple[type, ...] = (list,)
+_DICT: tuple[type, ...] = (dict,)
+_OPTIONAL_STR: tuple[type, ...] = (str, _NONE)
+_OPTIONAL_INT: tuple[type, ...] = (int, _NONE)
+
+FINGERPRINT_STATUSES = frozenset({"COMPLETE_NO_SKIPS", "COMPLETE_WITH_SKIPS", "PARTIAL", "FAILED"})
+EXECUTION_STATUSES = frozenset({"COMPLETE", "PARTIAL", "FAILED"})
+
+
+@dataclass(frozen=True)
+class ProofObligationSchema:
+    """Proof obligations a document must carry: structural ones are always True."""
+
+    structural: frozenset[str]
+    computed: frozenset[str]
+
+
+@dataclass(frozen=True)
+class RecordSchema:
+    """Fields, value types and invariants of one kind of serialized record."""
+
+    kind: str
+    fields: dict[str, tuple[type, ...]]
+    optional: dict[str, tuple[type, ...]] = field(default_factory=dict)
+    enums: dict[str, frozenset[Any]] = field(default_factory=dict)
+    # Field whose value selects extra required fields, and the fields per value
+    discriminator: str | None = None
+    variants: dict[str, dict[str, tuple[type, ...]]] = field(default_factory=dict)
+    # List fields whose elements are records of another kind
+    nested: dict[str, str] = field(default_factory=dict)
+    # Dict fields that must contain a key with one of the given values
+    nested_enums: dict[str, tuple[str, frozenset[Any]]] = field(default_factory=dict)
+    proof_obligations: ProofObligationSchema | None = None
+    schema_version: int | None = None
+
+
+_ARTIFACT_FIELDS: dict[str, tuple[type, ...]] = {
+    "artifact_type": _STR,
+    "name": _STR,
+    "path": _STR,
+    "start_line": _INT,
+    "end_line": _INT,
+    "risk_signals": _LIST,
+    "metadata": _DICT,
+}
+
+SCHEMAS: dict[tuple[str, int], RecordSchema] = {
+    ("artifact", 1): RecordSchema(
+        kind="artifact",
+        fields=_ARTIFACT_FIELDS,
+        discriminator="artifact_type",
+        variants={
+            "file": {"language": _OPTIONAL_STR, "line_count": _INT, "byte_size": _INT},
+            "class": {"methods": _LIST, "base_classes": _LIST},
+            "function": {
+                "parameters": _LIST,
+                "return_type": _OPTIONAL_STR,
+                "is_async": _BOOL,
+                "decorators": _LIST,
+            },
+        },
+    ),
+    ("edge", 1): RecordSchema(kind="edge", fields={"source": _STR, "targets": _LIST}),
+    ("finding", 1): RecordSchema(
+        kind="finding",
+        fields={
+            "agent_name": _STR,
+            "severity": _STR,
+            "title": _STR,
+            "description": _STR,
+            "file_path": _OPTIONAL_STR,
+            "line_number": _OPTIONAL_INT,
+            "code_snippet": _OPTIONAL_STR,
+            "recommendation": _OPTIONAL_STR,
+            "metadata": _DICT,
+        },
+        enums={"severity": frozenset({"info", "low", "medium", "high", "critical"})},
+    ),
+    ("patch_suggestion", 1): RecordSchema(
+        kind="patch_suggestion",
+        fields={
+            "file_path": _STR,
+            "original_code": _STR,
+            "suggested_code": _STR,
+            "description": _STR,
+            "line_start": _INT,
+            "line_end": _INT,
+            "metadata": _DICT,
+        },
+    ),
+    ("fingerprint", 1): RecordSchema(
+        kind="fingerprint",
+        fields={
+            "schema_version": _INT,
+            "repository_path": _STR,
+            "fingerprint_hash": _STR,
+            "fingerprint_status": _STR,
+            "total_files": _INT,
+            "total_classes": _INT,
+            "total_functions": _INT,
+            "total_lines": _INT,
+            "languages": _DICT,
+            "artifacts": _LIST,
+            "dependency_graph": _DICT,
+            "risk_signals": _DICT,
+            "metadata": _DICT,
+            "proof_obligations": _DICT,
+        },
+        optional={"status_metadata": _DICT},
+        enums={"fingerprint_status": FINGERPRINT_STATUSES},
+        nested={"artifacts": "artifact"},
+        proof_obligations=ProofObligationSchema(
+            structural=frozenset(
+                {
+                    "requires_status_check",
+                    "invalid_if_ignored",
+                    "contract_violation_if_status_ignored",
+                }
+            ),
+            computed=frozenset({"deterministic_only_if_complete", "hash_invalid_if_partial"}),
+        ),
+        schema_version=1,
+    ),
+    ("agent_report", 1): RecordSchema(
+        kind="agent_report",
+        fields={
+            "schema_version": _INT,
+            "agent_name": _STR,
+            "findings": _LIST,
+            "patch_suggestions": _LIST,
+            "summary": _OPTIONAL_STR,
+            "metadata": _DICT,
+            "proof_obligations": _DICT,
+        },
+        nested={"findings": "finding", "patch_suggestions": "patch_suggestion"},
+        nested_enums={"metadata": ("execution_status", EXECUTION_STATUSES)},
+        proof_obligations=ProofObligationSchema(
+            structural=frozenset(
+                {
+                    "requires_execution_status_check",
+                    "invalid_if_ignored",
+                    "contract_violation_if_status_ignored",
+                }
+            ),
+            computed=frozenset(
+                {
+                    "findings_invalid_if_failed",
+                    "findings_invalid_if_partial",
+                    "empty_findings_means_failure_not_success",
+                }
+            ),
+        ),
+        schema_version=1,
+    ),
+}
+
+
+def _violation(context: str, message: str) -> ContractViolationError:
+    """Build a contract violation error in the contracts module's format."""
+    return ContractViolationError(f"CONTRACT VIOLATION [{context}]: {message}")
+
+
+def _check_types(
+    record: dict[str, Any], checks: tuple[tuple[str, tuple[type, ...]], ...], context: str
+) -> None:
+    """Check the exact JSON types of present fields."""
+    for name, types in checks:
+        value = record.get(name, _MISSING)
+        if value is not _MISSING and type(value) not in types:
+            expected = " or ".join("null" if t is _NONE else t.__name__ for t in types)
+            raise _violation(context, f"{name} must be {expected}, got {type(value).__name__}")
+
+
+def _compile_proof_obligations(
+    schema: ProofObligationSchema,
+) -> Callable[[Any, str], None]:
+    """Build the check of a proof_obligations dict."""
+    structural = schema.structural
+    known = schema.structural | schema.computed
+
+    def check(obligations: Any, context: str) -> None:
+        keys = obligations.keys()
+        if not structural <= keys:
+            missing = sorted(structural - keys)
+            raise _violation(context, f"proof_obligations missing required keys: {missing}")
+        if not keys <= known:
+            unknown = sorted(keys - known)
+            raise _violation(context, f"proof_obligations contains unknown keys: {unknown}")
+        for key, value in obligations.items():
+            if not isinstance(value, bool):
+                raise _violation(
+                    context,
+                    f"proof_obligations[{key}] must be bool, got {type(value).__name__}",
+                )
+            if value is not True and key in structural:
+                raise _violation(
+                    context,
+                    f"proof_obligations[{key}] must be True (structural obligation), got {value}",
+                )
+
+    return check
+
+
+@functools.cache
+def compile_validator(kind: str, schema_version: int = 1) -> Validator:
+    """Get the validator for a kind of record, compiling it on first use.
+
+    The validator takes the record and a context naming it in error messages.
+
+    Raises:
+        ContractViolationError: If there is no schema for kind and schema_version
+    """
+    schema = SCHEMAS.get((kind, schema_version))
+    if schema is None:
+        raise ContractViolationError(
+            f"CONTRACT VIOLATION: no schema for {kind} version {schema_version}"
+        )
+
+    base_fields = schema.fields | schema.optional
+    required = frozenset(schema.fields)
+    checks = tuple(base_fields.items())
+    enums = tuple(schema.enums.items())
+    version = schema.schema_version
+    discriminator = schema.discriminator
+    # Per discriminator value: (required keys, allowed keys, type checks)
+    variants = {
+        value: (
+            required | frozenset(extra),
+            frozenset(base_fields) | frozenset(extra),
+            tuple(extra.items()),
+        )
+        for value, extra in schema.variants.items()
+    }
+    allowed = frozenset(base_fields)
+    nested = tuple(
+        (name, compile_validator(child, schema_version)) for name, child in schema.nested.items()
+    )
+    nested_enums = tuple(schema.nested_enums.items())
+    check_obligations = (
+        _compile_proof_obligations(schema.proof_obligations) if schema.proof_obligations else None
+    )
+
+    def validate(record: Any, context: str = kind) -> None:
+        if not isinstance(record, dict):
+            raise _violation(context, f"{kind} must be an object, got {type(record).__name__}")
+        keys = record.keys()
+        if version is not None:
+            if "schema_version" not in record:
+                raise _violation(context, "schema_version must be present")
+            if record["schema_version"] != version:
+                raise _violation(
+                    context,
+                    f"schema_version must be {version}, got {record['schema_version']}",
+                )
+        record_required, record_allowed = required, allowed
+        extra_checks: tuple[tuple[str, tuple[type, ...]], ...] = ()
+        if discriminator is not None:
+            variant = variants.get(str(record.get(discriminator)))
+            if variant is None:
+                raise _violation(
+                    context,
+                    f"{discriminator} must be one of {sorted(variants)}, "
+                    f"got {record.get(discriminator)!r}",
+                )
+            record_required, record_allowed, extra_checks = variant
+        if not record_required <= keys:
+            raise _violation(context, f"missing fields: {sorted(record_required - keys)}")
+        if not keys <= record_allowed:
+            raise _violation(
+                context, f"Unknown fields not allowed: {sorted(keys - record_allowed)}"
+            )
+        _check_types(record, checks, context)
+        if extra_checks:
+            _check_types(record, extra_checks, context)
+        for name, values in enums:
+            if name in record and record[name] not in values:
+                raise _violation(
+                    context, f"{name} must be one of {sorted(values)}, got {record[name]!r}"
+                )
+        for name, (key, values) in nested_enums:
+            value = record[name].get(key, _MISSING)
+            if value is _MISSING:
+                raise _violation(context, f"{name} missing {key}")
+            if value not in values:
+                raise _violation(context, f"{key} must be one of {sorted(values)}, got {value!r}")
+        if check_obligations is not None:
+            check_obligations(record["proof_obligations"], context)
+        for name, validate_child in nested:
+            for index, child in enumerate(record[name]):
+                validate_child(child, f"{context}.{name}[{index}]")
+
+    return validate
+
+
+def validate_records(
+    records: Iterable[Any], kind: str, schema_version: int = 1, source: str | None = None
+) -> int:
+    """Validate records of one kind as they are iterated, returning their count.
+
+    Error messages name the record by its position, within source when given.
+
+    Raises:
+        ContractViolationError: If a record violates the schema
+    """
+    validate = compile_validator(kind, schema_version)
+    prefix = f"{source} " if source else ""
+    count = 0
+    for count, record in enumerate(records, 1):
+        validate(record, f"{prefix}{kind} {count}")
+    return count
+
+
+def _loads(line: str | bytes) -> Any:
+    """Parse one JSON text, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(line)
+    return json.loads(line)
+
+
+def validate_ndjson(
+    lines: Iterable[str | bytes], kind: str, schema_version: int = 1, source: str | None = None
+) -> int:
+    """Validate NDJSON lines holding records of one kind, returning the record count.
+
+    Blank lines are skipped; error messages give the line number, within source
+    when given.
+
+    Raises:
+        ContractViolationError: If a line is not valid JSON or violates the schema
+    """
+    validate = compile_validator(kind, schema_version)
+    prefix = f"{source} " if source else ""
+    count = 0
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            record = _loads(line)
+        except ValueError as e:
+            raise _violation(f"{prefix}{kind} line {number}", f"invalid JSON: {e}") from e
+        validate(record, f"{prefix}{kind} line {number}")
+        count += 1
+    return count
+
+
+def detect_kind(document: Any) -> str:
+    """Tell which kind of report document a parsed JSON value is.
+
+    Raises:
+        ContractViolationError: If the value is not a fingerprint or agent report
+    """
+    if isinstance(document, dict):
+        if "fingerprint_hash" in document:
+            return "fingerprint"
+        if "agent_name" in document and "findings" in document:
+            return "agent_report"
+    raise ContractViolationError(
+        "CONTRACT VIOLATION: document is neither a fingerprint nor an agent report"
+    )
+
+
+def validate_documents(text: str) -> Counter[str]:
+    """Validate one or more concatenated JSON report documents, counting them by kind.
+
+    Raises:
+        ContractViolationError: If the text is not a sequence of JSON documents or a
+            document violates its schema
+    """
+    decoder = json.JSONDecoder()
+    counts: Counter[str] = Counter()
+    position = 0
+    end = len(text)
+    while True:
+        while position < end and text[position].isspace():
+            position += 1
+        if position == end:
+            break
+        try:
+            document, position = decoder.raw_decode(text, position)
+        except json.JSONDecodeError as e:
+            raise ContractViolationError(
+                f"CONTRACT VIOLATION: JSON output must be valid JSON: {e}"
+            ) from e
+        kind = detect_kind(document)
+        counts[kind] += 1
+        context = f"{kind} {counts[kind]}"
+        version = document.get("schema_version", 1)
+        # Checked before the cached compile_validator, which needs a hashable int (not bool)
+        if not isinstance(version, int) or isinstance(version, bool):
+            raise _violation(context, f"schema_version must be int, got {type(version).__name__}")
+        compile_validator(kind, version)(document, context)
+    return counts
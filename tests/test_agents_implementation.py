@@ -1,6 +1,9 @@
 """Unit tests for agent framework implementation."""
 
+import threading
+from collections.abc import Mapping
 from pathlib import Path
+from typing import Any
 from unittest.mock import Mock
 
 import pytest
@@ -11,6 +14,7 @@ from secure_code_reasoner.agents import (
     PatchAdvisorAgent,
     SecurityReviewerAgent,
 )
+from secure_code_reasoner.agents.agent import Agent
 from secure_code_reasoner.agents.models import AgentReport, Severity
 from secure_code_reasoner.exceptions import AgentError
 from secure_code_reasoner.fingerprinting import Fingerprinter
@@ -196,6 +200,20 @@ class TestSecurityReviewerAgent:
         # Sample has subprocess.run() which triggers process execution detection
         assert len(process_findings) > 0
 
+    def test_findings_include_source_snippet(
+        self, sample_fingerprint: RepositoryFingerprint
+    ) -> None:
+        """Test that located findings carry the leading source lines of the artifact."""
+        agent = SecurityReviewerAgent()
+        report = agent.analyze(sample_fingerprint)
+
+        located = [f for f in report.findings if f.line_number is not None]
+        assert located
+        for finding in located:
+            assert finding.code_snippet is not None
+            assert finding.code_snippet.startswith("import os")
+            assert len(finding.code_snippet.splitlines()) <= agent.SNIPPET_MAX_LINES
+
     def test_empty_fingerprint(self, empty_fingerprint: RepositoryFingerprint) -> None:
         """Test security reviewer with empty fingerprint."""
         agent = SecurityReviewerAgent()
@@ -268,6 +286,19 @@ class TestPatchAdvisorAgent:
             assert patch.line_start > 0
             assert patch.line_end >= patch.line_start
 
+    def test_patch_original_code_is_real_source(
+        self, sample_fingerprint: RepositoryFingerprint
+    ) -> None:
+        """Test that patches quote the exact source lines they would replace."""
+        agent = PatchAdvisorAgent()
+        report = agent.analyze(sample_fingerprint)
+
+        source_lines = (sample_fingerprint.repository_path / "test.py").read_text().splitlines()
+        assert report.patch_suggestions
+        for patch in report.patch_suggestions:
+            expected = "\n".join(source_lines[patch.line_start - 1 : patch.line_end])
+            assert patch.original_code == expected
+
     def test_empty_fingerprint(self, empty_fingerprint: RepositoryFingerprint) -> None:
         """Test patch advisor with empty fingerprint."""
         agent = PatchAdvisorAgent()
@@ -275,6 +306,46 @@ class TestPatchAdvisorAgent:
 
         assert len(report.patch_suggestions) == 0
 
+    def test_patch_replaces_call_line_not_whole_file(self, tmp_path: Path) -> None:
+        """Test a file-level signal patches the risky call, not the file it is in."""
+        lines = [f"x{i} = {i}" for i in range(2000)]
+        lines.insert(1500, "result = eval(user_input)")
+        (tmp_path / "big.py").write_text("\n".join(lines) + "\n")
+        report = PatchAdvisorAgent().analyze(Fingerprinter(tmp_path).fingerprint())
+
+        (patch,) = report.patch_suggestions
+        assert (patch.line_start, patch.line_end) == (1501, 1501)
+        assert patch.original_code == "result = eval(user_input)"
+
+    def test_deserialization_patch_skips_load_definitions(self, tmp_path: Path) -> None:
+        """Test a def load( line before the call is not mistaken for the deserializer call."""
+        (tmp_path / "store.py").write_text(
+            "import pickle\n"
+            "import yaml\n\n\n"
+            "def load(data):\n"
+            "    config = yaml.safe_load(data)\n"
+            "    obj = pickle.loads(data)\n"
+            "    return config, obj\n"
+        )
+        report = PatchAdvisorAgent().analyze(Fingerprinter(tmp_path).fingerprint())
+
+        patches = [p for p in report.patch_suggestions if "pickle" in p.suggested_code.lower()]
+        assert patches
+        for patch in patches:
+            assert patch.line_start == patch.line_end == 7
+            assert patch.original_code == "    obj = pickle.loads(data)"
+
+    def test_unlocated_patch_is_capped(self, tmp_path: Path) -> None:
+        """Test patches without a call to point at replace at most SNIPPET_MAX_LINES lines."""
+        params = ", ".join(f"p{i}" for i in range(8))
+        body = "".join(f"    v{i} = p0\n" for i in range(20))
+        (tmp_path / "wide.py").write_text(f"def wide({params}):\n{body}")
+        report = PatchAdvisorAgent().analyze(Fingerprinter(tmp_path).fingerprint())
+
+        (patch,) = report.patch_suggestions
+        assert patch.line_end - patch.line_start + 1 == PatchAdvisorAgent.SNIPPET_MAX_LINES
+        assert len(patch.original_code.splitlines()) == PatchAdvisorAgent.SNIPPET_MAX_LINES
+
 
 class TestAgentCoordinator:
     """Tests for AgentCoordinator."""
@@ -472,3 +543,122 @@ class TestAgentCoordinator:
 
         assert report.metadata["agents_run"] == 1
         assert len(report.findings) > 0
+
+    def test_colocated_findings_deduplicated(
+        self, sample_fingerprint: RepositoryFingerprint
+    ) -> None:
+        """Test that findings sharing (path, line, signal) are merged across agents."""
+        coordinator = AgentCoordinator([SecurityReviewerAgent(), PatchAdvisorAgent()])
+        report = coordinator.review(sample_fingerprint)
+
+        keys = [
+            (f.file_path, f.line_number, f.metadata["signal"])
+            for f in report.findings
+            if f.file_path is not None and "signal" in f.metadata
+        ]
+        assert len(keys) == len(set(keys))
+
+        merged = [f for f in report.findings if "contributing_agents" in f.metadata]
+        assert merged
+        for finding in merged:
+            assert finding.metadata["contributing_agents"] == ["PatchAdvisor", "SecurityReviewer"]
+            assert finding.metadata["merged_finding_count"] == 2
+            assert finding.metadata["patch_available"] is True
+            assert not finding.title.startswith("Suggested patch")
+            assert not (finding.recommendation or "").startswith("Apply the suggested patch")
+        assert report.metadata["findings_deduplicated"] == len(merged)
+
+    def test_deduplication_can_be_disabled(self, sample_fingerprint: RepositoryFingerprint) -> None:
+        """Test that disabling deduplication keeps every agent's finding."""
+        agents = [SecurityReviewerAgent(), PatchAdvisorAgent()]
+        merged = AgentCoordinator(agents).review(sample_fingerprint)
+        raw = AgentCoordinator(agents, deduplicate=False).review(sample_fingerprint)
+
+        assert len(raw.findings) == sum(
+            len(agent.analyze(sample_fingerprint).findings) for agent in agents
+        )
+        assert len(merged.findings) < len(raw.findings)
+        assert "findings_deduplicated" not in raw.metadata
+
+
+class UpstreamRecordingAgent(Agent):
+    """Agent that depends on other agents and records the reports it receives."""
+
+    def __init__(self, name: str, depends_on: tuple[str, ...]) -> None:
+        super().__init__(name, depends_on=depends_on)
+        self.received: dict[str, AgentReport] = {}
+
+    def analyze(self, fingerprint: Any, upstream: Mapping[str, AgentReport] | None = None) -> Any:
+        self.received = dict(upstream or {})
+        return AgentReport(agent_name=self.name, summary=f"saw {sorted(self.received)}")
+
+
+class BarrierAgent(Agent):
+    """Agent that only completes if another agent runs at the same time."""
+
+    def __init__(self, name: str, barrier: threading.Barrier) -> None:
+        super().__init__(name)
+        self.barrier = barrier
+
+    def analyze(self, fingerprint: Any) -> Any:
+        self.barrier.wait()
+        return AgentReport(agent_name=self.name)
+
+
+class TestAgentScheduling:
+    """Tests for dependency-ordered agent scheduling."""
+
+    def test_dependent_agent_receives_upstream_reports(
+        self, sample_fingerprint: RepositoryFingerprint
+    ) -> None:
+        """Test that a dependent agent gets its dependencies' reports."""
+        dependent = UpstreamRecordingAgent("Dependent", depends_on=("SecurityReviewer",))
+        coordinator = AgentCoordinator([dependent, SecurityReviewerAgent()])
+        report = coordinator.review(sample_fingerprint)
+
+        assert list(dependent.received) == ["SecurityReviewer"]
+        assert dependent.received["SecurityReviewer"].findings
+        assert report.metadata["execution_status"] == "COMPLETE"
+
+    def test_independent_agents_run_concurrently(
+        self, sample_fingerprint: RepositoryFingerprint
+    ) -> None:
+        """Test that agents without dependencies on each other overlap in time."""
+        barrier = threading.Barrier(2, timeout=5)
+        coordinator = AgentCoordinator([BarrierAgent("A", barrier), BarrierAgent("B", barrier)])
+        report = coordinator.review(sample_fingerprint)
+
+        assert report.metadata["execution_status"] == "COMPLETE"
+
+    def test_failed_dependency_skips_dependents(
+        self, sample_fingerprint: RepositoryFingerprint
+    ) -> None:
+        """Test that dependents of a failed agent are reported as failed."""
+        failing_agent = Mock(spec=CodeAnalystAgent)
+        failing_agent.name = "FailingAgent"
+        failing_agent.analyze = Mock(side_effect=Exception("Agent failed"))
+        dependent = UpstreamRecordingAgent("Dependent", depends_on=("FailingAgent",))
+        transitive = UpstreamRecordingAgent("Transitive", depends_on=("Dependent",))
+
+        coordinator = AgentCoordinator(
+            [transitive, dependent, failing_agent, SecurityReviewerAgent()]
+        )
+        report = coordinator.review(sample_fingerprint)
+
+        assert report.metadata["execution_status"] == "PARTIAL"
+        assert report.metadata["failed_agent_names"] == ["Dependent", "FailingAgent", "Transitive"]
+        assert dependent.received == {}
+
+    def test_unknown_dependency_rejected(self) -> None:
+        """Test that dependencies must name a configured agent."""
+        with pytest.raises(AgentError, match="depends on 'Missing'"):
+            AgentCoordinator([UpstreamRecordingAgent("A", depends_on=("Missing",))])
+
+    def test_dependency_cycle_rejected(self) -> None:
+        """Test that cyclic dependencies are rejected at construction."""
+        agents = [
+            UpstreamRecordingAgent("A", depends_on=("B",)),
+            UpstreamRecordingAgent("B", depends_on=("A",)),
+        ]
+        with pytest.raises(AgentError, match="cycle detected among: A, B"):
+            AgentCoordinator(agents)
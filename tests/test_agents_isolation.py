@@ -0,0 +1,148 @@
+"""Tests for process-isolated agent execution."""
+
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from secure_code_reasoner.agents import (
+    AgentCoordinator,
+    AgentResourceLimits,
+    CodeAnalystAgent,
+    ProcessAgentRunner,
+    SecurityReviewerAgent,
+)
+from secure_code_reasoner.agents.agent import Agent
+from secure_code_reasoner.agents.isolation import SharedFingerprint
+from secure_code_reasoner.fingerprinting import Fingerprinter
+from secure_code_reasoner.fingerprinting.models import RepositoryFingerprint
+
+
+class HangingAgent(Agent):
+    """Agent that never returns."""
+
+    def __init__(self) -> None:
+        super().__init__("HangingAgent")
+
+    def analyze(self, fingerprint: Any) -> Any:
+        while True:
+            time.sleep(0.1)
+
+
+class CpuBurnAgent(Agent):
+    """Agent that spins the CPU until stopped."""
+
+    def __init__(self) -> None:
+        super().__init__("CpuBurnAgent")
+
+    def analyze(self, fingerprint: Any) -> Any:
+        while True:
+            pass
+
+
+class CrashingAgent(Agent):
+    """Agent whose worker process dies abruptly."""
+
+    def __init__(self) -> None:
+        super().__init__("CrashingAgent")
+
+    def analyze(self, fingerprint: Any) -> Any:
+        import os
+
+        os._exit(3)
+
+
+@pytest.fixture
+def sample_fingerprint(tmp_path: Path) -> RepositoryFingerprint:
+    """Create a sample fingerprint for testing."""
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    (repo / "app.py").write_text(
+        "import pickle\n\ndef load(data):\n    return eval(pickle.loads(data))\n"
+    )
+    return Fingerprinter(repo).fingerprint()
+
+
+class TestAgentResourceLimits:
+    """Tests for AgentResourceLimits validation."""
+
+    def test_rejects_non_positive_timeout(self) -> None:
+        """Test that wall_timeout must be positive."""
+        with pytest.raises(ValueError, match="wall_timeout"):
+            AgentResourceLimits(wall_timeout=0)
+
+    def test_rejects_invalid_cpu_limit(self) -> None:
+        """Test that cpu_seconds must be at least one second."""
+        with pytest.raises(ValueError, match="cpu_seconds"):
+            AgentResourceLimits(cpu_seconds=0)
+
+
+class TestSharedFingerprint:
+    """Tests for the shared-memory fingerprint buffer."""
+
+    def test_round_trip(self, sample_fingerprint: RepositoryFingerprint) -> None:
+        """Test that a fingerprint loads back from shared memory unchanged."""
+        with SharedFingerprint(sample_fingerprint) as shared:
+            loaded = SharedFingerprint.attach(shared.name, shared.size)
+
+        assert loaded.fingerprint_hash == sample_fingerprint.fingerprint_hash
+        assert loaded.artifacts == sample_fingerprint.artifacts
+
+
+class TestIsolatedCoordinator:
+    """Tests for AgentCoordinator with a process runner."""
+
+    def test_isolated_results_match_in_process(
+        self, sample_fingerprint: RepositoryFingerprint
+    ) -> None:
+        """Test that isolated agents produce the same merged report."""
+        agents = [CodeAnalystAgent(), SecurityReviewerAgent()]
+        in_process = AgentCoordinator(agents).review(sample_fingerprint)
+        isolated = AgentCoordinator(agents, runner=ProcessAgentRunner()).review(sample_fingerprint)
+
+        assert isolated.findings == in_process.findings
+        assert isolated.metadata["execution_status"] == "COMPLETE"
+
+    def test_default_start_method_never_forks(self) -> None:
+        """Test the runner does not fork the threaded coordinator by default."""
+        assert ProcessAgentRunner().start_method in ("forkserver", "spawn")
+        assert ProcessAgentRunner(start_method="fork").start_method == "fork"
+
+    def test_hanging_agent_killed_and_reported(
+        self, sample_fingerprint: RepositoryFingerprint
+    ) -> None:
+        """Test that a hung agent is killed at the wall-clock limit."""
+        runner = ProcessAgentRunner(AgentResourceLimits(wall_timeout=0.5))
+        coordinator = AgentCoordinator([HangingAgent(), SecurityReviewerAgent()], runner=runner)
+
+        start = time.monotonic()
+        report = coordinator.review(sample_fingerprint)
+
+        assert time.monotonic() - start < 5.0
+        assert report.metadata["execution_status"] == "PARTIAL"
+        assert report.metadata["failed_agent_names"] == ["HangingAgent"]
+
+    def test_cpu_limit_enforced_by_kernel(self, sample_fingerprint: RepositoryFingerprint) -> None:
+        """Test that RLIMIT_CPU stops a busy agent before the wall-clock limit."""
+        runner = ProcessAgentRunner(AgentResourceLimits(wall_timeout=30.0, cpu_seconds=1))
+        coordinator = AgentCoordinator([CpuBurnAgent()], runner=runner)
+
+        start = time.monotonic()
+        report = coordinator.review(sample_fingerprint)
+
+        assert time.monotonic() - start < 10.0
+        assert report.metadata["execution_status"] == "FAILED"
+        assert report.metadata["failed_agent_names"] == ["CpuBurnAgent"]
+
+    def test_crashed_worker_reported_as_failed(
+        self, sample_fingerprint: RepositoryFingerprint
+    ) -> None:
+        """Test that a worker exiting without a report counts as a failed agent."""
+        coordinator = AgentCoordinator(
+            [CrashingAgent(), CodeAnalystAgent()], runner=ProcessAgentRunner()
+        )
+        report = coordinator.review(sample_fingerprint)
+
+        assert report.metadata["agents_run"] == 1
+        assert report.metadata["failed_agent_names"] == ["CrashingAgent"]
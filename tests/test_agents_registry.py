@@ -0,0 +1,74 @@
+"""Tests for agent plugin discovery."""
+
+import subprocess
+import sys
+from importlib.metadata import EntryPoint
+
+import pytest
+
+from secure_code_reasoner.agents import CodeAnalystAgent, SecurityReviewerAgent
+from secure_code_reasoner.agents.registry import (
+    AGENT_ENTRY_POINT_GROUP,
+    discover_agents,
+    load_agent,
+    load_agents,
+)
+from secure_code_reasoner.exceptions import AgentError
+
+
+class TestDiscovery:
+    """Tests for discover_agents."""
+
+    def test_builtin_agents_discovered(self) -> None:
+        """Test that built-in agents are always discoverable."""
+        available = discover_agents()
+        assert {"code_analyst", "security_reviewer", "patch_advisor"} <= set(available)
+        assert all(ep.group == AGENT_ENTRY_POINT_GROUP for ep in available.values())
+
+    def test_discovery_does_not_import_agents(self) -> None:
+        """Test that discovery reads metadata only and selection imports one module."""
+        code = (
+            "import sys\n"
+            "from secure_code_reasoner.agents.registry import discover_agents, load_agents\n"
+            "discover_agents()\n"
+            "assert 'secure_code_reasoner.agents.code_analyst' not in sys.modules\n"
+            "load_agents(['code_analyst'])\n"
+            "assert 'secure_code_reasoner.agents.code_analyst' in sys.modules\n"
+            "assert 'secure_code_reasoner.agents.patch_advisor' not in sys.modules\n"
+            "assert 'secure_code_reasoner.agents.security_reviewer' not in sys.modules\n"
+        )
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+        assert result.returncode == 0, result.stderr
+
+
+class TestLoading:
+    """Tests for load_agent and load_agents."""
+
+    def test_load_selected_agents_in_order(self) -> None:
+        """Test that selected agents load in the requested order."""
+        agents = load_agents(["security_reviewer", "code_analyst"])
+        assert isinstance(agents[0], SecurityReviewerAgent)
+        assert isinstance(agents[1], CodeAnalystAgent)
+
+    def test_load_all_agents_by_default(self) -> None:
+        """Test that all discovered agents load when no selection is given."""
+        assert len(load_agents()) == len(discover_agents())
+
+    def test_unknown_agent_rejected(self) -> None:
+        """Test that unknown agent names raise AgentError listing available agents."""
+        with pytest.raises(AgentError, match="Unknown agent.*missing_agent"):
+            load_agents(["missing_agent"])
+
+    def test_entry_point_must_produce_agent(self) -> None:
+        """Test that entry points producing non-agents are rejected."""
+        entry_point = EntryPoint(name="bogus", value="builtins:dict", group=AGENT_ENTRY_POINT_GROUP)
+        with pytest.raises(AgentError, match="did not produce an Agent"):
+            load_agent(entry_point)
+
+    def test_unimportable_entry_point_rejected(self) -> None:
+        """Test that import failures are wrapped in AgentError."""
+        entry_point = EntryPoint(
+            name="broken", value="no_such_module:Agent", group=AGENT_ENTRY_POINT_GROUP
+        )
+        with pytest.raises(AgentError, match="Failed to load agent 'broken'"):
+            load_agent(entry_point)
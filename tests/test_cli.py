@@ -0,0 +1,336 @@
+"""Tests for the command-line interface."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from secure_code_reasoner.cli import main
+from secure_code_reasoner.cli.main import cli
+
+# Import time of the package's own modules when starting the CLI, in microseconds
+STARTUP_IMPORT_BUDGET_US = 50_000
+
+
+@pytest.fixture
+def demo_repo(tmp_path: Path) -> Path:
+    """Create a small repository with risky code."""
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    (repo / "app.py").write_text(
+        "import pickle\n\ndef load(data):\n    return eval(pickle.loads(data))\n"
+    )
+    return repo
+
+
+def _import_times(code: str) -> dict[str, int]:
+    """Run code under -X importtime and return each module's self import time."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            self_us, _, module = line[len("import time:") :].split("|")
+            if self_us.strip().isdigit():
+                times[module.strip()] = int(self_us)
+    return times
+
+
+class TestStartup:
+    """Tests for CLI startup cost."""
+
+    @pytest.mark.parametrize(
+        "code",
+        [
+            "import secure_code_reasoner.cli.main",
+            "from secure_code_reasoner.cli.main import cli; cli(['--help'])",
+            "from secure_code_reasoner.cli.main import cli; cli(['analyze', '--help'])",
+        ],
+    )
+    def test_startup_imports_no_subsystem(self, code: str) -> None:
+        """Test building the command line imports only the CLI module, within budget."""
+        times = _import_times(code)
+        package = {
+            name: us for name, us in times.items() if name.startswith("secure_code_reasoner")
+        }
+        assert set(package) == {
+            "secure_code_reasoner",
+            "secure_code_reasoner.cli",
+            "secure_code_reasoner.cli.main",
+        }
+        assert sum(package.values()) < STARTUP_IMPORT_BUDGET_US
+
+    def test_option_defaults_match_subsystems(self) -> None:
+        """Test choices and defaults duplicated in the CLI match their subsystems."""
+        from secure_code_reasoner.agents.models import Severity
+        from secure_code_reasoner.reporting import shards
+        from secure_code_reasoner.tracing import ExecutionTracer
+
+        assert main._SEVERITIES == tuple(severity.value for severity in Severity)
+        assert main._SHARD_BY == shards.SHARD_BY
+        assert main._COMPRESSIONS == shards.COMPRESSIONS
+        assert main._DEFAULT_SHARD_SIZE == shards.DEFAULT_SHARD_SIZE
+        assert main._DEFAULT_MAX_RAW_EVENTS == ExecutionTracer.DEFAULT_MAX_RAW_EVENTS
+
+
+class TestAgentSelection:
+    """Tests for --agents selection and agent listing."""
+
+    def test_agents_command_lists_builtins(self) -> None:
+        """Test that 'scr agents' lists built-in agents."""
+        result = CliRunner().invoke(cli, ["agents"])
+        assert result.exit_code == 0
+        assert "code_analyst" in result.output
+        assert "security_reviewer" in result.output
+
+    def test_analyze_runs_only_selected_agents(self, demo_repo: Path) -> None:
+        """Test that --agents restricts which agents run."""
+        result = CliRunner().invoke(
+            cli, ["analyze", str(demo_repo), "--format", "json", "--agents", "security_reviewer"]
+        )
+        assert result.exit_code == 0, result.output
+        assert '"SecurityReviewer"' in result.output
+        assert '"CodeAnalyst"' not in result.output
+
+    def test_analyze_rejects_unknown_agent(self, demo_repo: Path) -> None:
+        """Test that unknown agent names fail the command."""
+        result = CliRunner().invoke(cli, ["analyze", str(demo_repo), "--agents", "nope"])
+        assert result.exit_code == 1
+        assert "Unknown agent" in result.output
+
+
+class TestFingerprintOutput:
+    """Tests for scr analyze --fingerprint-output."""
+
+    def test_saves_loadable_snapshot(self, demo_repo: Path, tmp_path: Path) -> None:
+        """Test the saved snapshot loads back with the reported hash."""
+        from secure_code_reasoner.fingerprinting import RepositoryFingerprint
+
+        report_path = tmp_path / "report.json"
+        snapshot_path = tmp_path / "baseline.scrfp"
+
+        result = CliRunner().invoke(
+            cli,
+            [
+                "analyze",
+                str(demo_repo),
+                "-f",
+                "json",
+                "-o",
+                str(report_path),
+                "--fingerprint-output",
+                str(snapshot_path),
+            ],
+        )
+
+        assert result.exit_code == 0, result.output
+        report = json.loads(report_path.read_text())
+        loaded = RepositoryFingerprint.load(snapshot_path)
+        assert loaded.fingerprint_hash == report["fingerprint_hash"]
+        assert len(loaded.artifacts) == len(report["artifacts"])
+
+
+class TestFindingFilters:
+    """Tests for the text output finding filters."""
+
+    def test_summary_only_with_min_severity(self, demo_repo: Path) -> None:
+        """Test --summary-only and --min-severity narrow the text report."""
+        result = CliRunner().invoke(
+            cli, ["analyze", str(demo_repo), "--summary-only", "--min-severity", "critical"]
+        )
+        assert result.exit_code == 0, result.output
+        assert "  CRITICAL:" in result.output
+        assert "  HIGH:" not in result.output
+        assert "Description:" not in result.output
+
+    def test_top_limits_findings(self, demo_repo: Path, tmp_path: Path) -> None:
+        """Test --top keeps the most severe findings."""
+        output = tmp_path / "report.txt"
+        result = CliRunner().invoke(
+            cli, ["report", str(demo_repo), "-o", str(output), "--top", "1"]
+        )
+        assert result.exit_code == 0, result.output
+        assert "Findings (1 of " in output.read_text()
+
+
+class TestSARIFOutput:
+    """Tests for --format sarif."""
+
+    def test_analyze_writes_one_sarif_log(self, demo_repo: Path, tmp_path: Path) -> None:
+        """Test analyze writes artifacts and results to a single SARIF file."""
+        output = tmp_path / "scan.sarif"
+        result = CliRunner().invoke(
+            cli, ["analyze", str(demo_repo), "-f", "sarif", "-o", str(output)]
+        )
+
+        assert result.exit_code == 0, result.output
+        assert not (tmp_path / "scan_agents.sarif").exists()
+        (run,) = json.loads(output.read_text())["runs"]
+        assert [a["location"]["uri"] for a in run["artifacts"]] == ["app.py"]
+        assert run["results"]
+        rule_ids = [rule["id"] for rule in run["tool"]["driver"]["rules"]]
+        assert len(rule_ids) == len(set(rule_ids))
+
+    def test_report_writes_sarif(self, demo_repo: Path, tmp_path: Path) -> None:
+        """Test report writes a SARIF log."""
+        output = tmp_path / "report.sarif"
+        result = CliRunner().invoke(
+            cli, ["report", str(demo_repo), "-f", "sarif", "-o", str(output)]
+        )
+        assert result.exit_code == 0, result.output
+        assert json.loads(output.read_text())["version"] == "2.1.0"
+
+
+class TestShardOutput:
+    """Tests for scr analyze --shard-output."""
+
+    def test_writes_manifest_and_shards(self, demo_repo: Path, tmp_path: Path) -> None:
+        """Test sharded output replaces the report and is described by a manifest."""
+        out = tmp_path / "shards"
+        result = CliRunner().invoke(
+            cli, ["analyze", str(demo_repo), "--shard-output", str(out), "--shard-by", "count"]
+        )
+
+        assert result.exit_code == 0, result.output
+        manifest = json.loads((out / "manifest.json").read_text())
+        assert manifest["compression"] == "gzip"
+        assert {shard["kind"] for shard in manifest["shards"]} >= {"artifacts", "findings"}
+        assert all((out / shard["path"]).exists() for shard in manifest["shards"])
+
+    def test_rejects_output_option(self, demo_repo: Path, tmp_path: Path) -> None:
+        """Test --shard-output and --output cannot be combined."""
+        result = CliRunner().invoke(
+            cli,
+            ["analyze", str(demo_repo), "--shard-output", str(tmp_path), "-o", "x.json"],
+        )
+        assert result.exit_code == 2
+        assert "cannot be combined" in result.output
+
+
+class TestValidate:
+    """Tests for scr validate."""
+
+    def test_validates_analysis_output(self, demo_repo: Path, tmp_path: Path) -> None:
+        """Test analyze output validates and required document kinds are checked."""
+        out = tmp_path / "out.json"
+        args = ["analyze", str(demo_repo), "-f", "json", "-o", str(out)]
+        assert CliRunner().invoke(cli, args).exit_code == 0
+
+        result = CliRunner().invoke(cli, ["validate", str(out), "--require", "fingerprint"])
+        assert result.exit_code == 0, result.output
+        assert "fingerprint: 1 valid" in result.output
+        agents = tmp_path / "out_agents.json"
+        result = CliRunner().invoke(cli, ["validate", str(agents), "--require", "agent_report"])
+        assert result.exit_code == 0, result.output
+
+        report = json.loads(agents.read_text())
+        records = tmp_path / "findings.ndjson"
+        records.write_text("\n".join(json.dumps(f) for f in report["findings"]) + "\n{}\n")
+        result = CliRunner().invoke(cli, ["validate", str(records), "--records", "finding"])
+        assert result.exit_code == 1
+        assert f"finding line {len(report['findings']) + 1}" in result.output
+
+    def test_missing_required_document_fails(self, tmp_path: Path) -> None:
+        """Test --require fails when no document of the kind is present."""
+        empty = tmp_path / "empty.json"
+        empty.write_text("")
+        result = CliRunner().invoke(cli, ["validate", str(empty), "--require", "fingerprint"])
+        assert result.exit_code == 1
+        assert "contains no fingerprint document" in result.output
+
+    def test_validates_shards(self, demo_repo: Path, tmp_path: Path) -> None:
+        """Test a sharded report directory is validated shard by shard."""
+        out = tmp_path / "shards"
+        CliRunner().invoke(cli, ["analyze", str(demo_repo), "--shard-output", str(out)])
+        result = CliRunner().invoke(cli, ["validate", str(out)])
+        assert result.exit_code == 0, result.output
+        assert "artifacts:" in result.output
+
+
+class TestDiff:
+    """Tests for scr diff."""
+
+    def test_diffs_snapshot_against_directory(self, demo_repo: Path, tmp_path: Path) -> None:
+        """Test a saved baseline compared with a changed repository."""
+        from secure_code_reasoner.fingerprinting import Fingerprinter
+
+        baseline = tmp_path / "baseline.scrfp"
+        Fingerprinter(demo_repo).fingerprint().save(baseline)
+        (demo_repo / "extra.py").write_text("def added():\n    pass\n")
+
+        result = CliRunner().invoke(
+            cli, ["diff", str(baseline), str(demo_repo), "-f", "json", "--exit-code"]
+        )
+
+        assert result.exit_code == 1, result.output
+        diff = json.loads(result.output)
+        assert diff["summary"]["added"] == 2
+        assert sorted(a["artifact_id"] for a in diff["added"]) == [
+            "extra.py:file:extra.py",
+            "extra.py:function:added",
+        ]
+
+    def test_unchanged_exits_zero(self, demo_repo: Path) -> None:
+        """Test identical inputs exit 0 with --exit-code and print a text summary."""
+        result = CliRunner().invoke(cli, ["diff", str(demo_repo), str(demo_repo), "--exit-code"])
+        assert result.exit_code == 0, result.output
+        assert "Fingerprint Diff" in result.output
+        assert "Added: 0" in result.output
+
+    def test_invalid_snapshot_fails(self, demo_repo: Path, tmp_path: Path) -> None:
+        """Test an unreadable snapshot is an error, exit 2 with --exit-code."""
+        bogus = tmp_path / "bogus.scrfp"
+        bogus.write_text("not a snapshot")
+        result = CliRunner().invoke(cli, ["diff", str(bogus), str(demo_repo), "--exit-code"])
+        assert result.exit_code == 2
+        assert "not a fingerprint snapshot" in result.output
+
+
+class TestTraceBatch:
+    """Tests for scr trace-batch."""
+
+    def test_streams_ndjson_with_summary(self, tmp_path: Path) -> None:
+        """Test one NDJSON record per script followed by a batch summary."""
+        scripts = tmp_path / "scripts"
+        scripts.mkdir()
+        (scripts / "ok.py").write_text("print('ok')\n")
+        (scripts / "fail.py").write_text("raise SystemExit(3)\n")
+        output = tmp_path / "traces.ndjson"
+
+        result = CliRunner().invoke(
+            cli, ["trace-batch", str(scripts), "--max-workers", "2", "-o", str(output)]
+        )
+
+        assert result.exit_code == 0, result.output
+        records = [json.loads(line) for line in output.read_text().splitlines()]
+        assert sorted(Path(r["script_path"]).name for r in records[:-1]) == ["fail.py", "ok.py"]
+        summary = records[-1]
+        assert summary["record_type"] == "batch_summary"
+        assert (summary["total"], summary["succeeded"], summary["failed"]) == (2, 1, 1)
+
+
+class TestTraceEventsOutput:
+    """Tests for scr trace --events-output."""
+
+    def test_saves_loadable_event_store(self, tmp_path: Path) -> None:
+        """Test the saved events load back and match the JSON report."""
+        from secure_code_reasoner.tracing.event_store import EventStore
+
+        script = tmp_path / "reader.py"
+        script.write_text("open(__file__).read()\n")
+        events_path = tmp_path / "events.ndjson.gz"
+
+        result = CliRunner().invoke(
+            cli, ["trace", str(script), "-f", "json", "--events-output", str(events_path)]
+        )
+
+        assert result.exit_code == 0, result.output
+        report = json.loads(result.output)
+        assert EventStore.load(events_path).to_dicts() == report["events"]
@@ -17,6 +17,7 @@ import pytest
 from secure_code_reasoner.agents.models import AgentFinding, AgentReport, Severity
 from secure_code_reasoner.contracts import (
     enforce_completeness_contract,
+    enforce_output_contract,
     enforce_proof_obligations_contract,
     enforce_schema_contract,
     enforce_status_contract,
@@ -308,3 +309,57 @@ class TestSuccessPredicateContract:
         )
         # Should not raise
         enforce_success_predicate(fingerprint, agent_report, exit_code=0)
+
+    def test_success_predicate_does_not_serialize(
+        self,
+        sample_fingerprint: RepositoryFingerprint,
+        sample_agent_report: AgentReport,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Success predicate reads proof obligations without calling to_dict()."""
+
+        def fail(self: object) -> None:
+            raise AssertionError("to_dict() must not be called")
+
+        monkeypatch.setattr(RepositoryFingerprint, "to_dict", fail)
+        monkeypatch.setattr(AgentReport, "to_dict", fail)
+        enforce_success_predicate(sample_fingerprint, sample_agent_report, exit_code=0)
+
+    def test_cached_dict_missing_proof_obligations_violates_success_predicate(
+        self, sample_fingerprint: RepositoryFingerprint, sample_agent_report: AgentReport
+    ) -> None:
+        """Cached output without proof_obligations violates success predicate."""
+        fingerprint_dict = sample_fingerprint.to_dict()
+        agent_dict = sample_agent_report.to_dict()
+        enforce_success_predicate(
+            sample_fingerprint,
+            sample_agent_report,
+            exit_code=0,
+            fingerprint_dict=fingerprint_dict,
+            agent_dict=agent_dict,
+        )
+
+        del agent_dict["proof_obligations"]
+        with pytest.raises(ContractViolationError) as exc_info:
+            enforce_success_predicate(
+                sample_fingerprint,
+                sample_agent_report,
+                exit_code=0,
+                fingerprint_dict=fingerprint_dict,
+                agent_dict=agent_dict,
+            )
+        assert "agent_report proof_obligations must be present" in str(exc_info.value)
+
+
+class TestOutputContract:
+    """Tests for output contract enforcement."""
+
+    def test_indented_and_ndjson_output_satisfy_contract(self) -> None:
+        """Indented JSON documents and NDJSON streams are both valid JSON output."""
+        enforce_output_contract('{\n  "a": [\n    1\n  ]\n}\n', "json")
+        enforce_output_contract('{"a": 1}\n{"b": 2}\n', "json")
+
+    def test_invalid_json_violates_contract(self) -> None:
+        """Invalid JSON output violates output contract."""
+        with pytest.raises(ContractViolationError):
+            enforce_output_contract('{"a": 1}\n{"b": \n', "json")
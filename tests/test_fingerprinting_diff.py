@@ -0,0 +1,109 @@
+"""Tests for fingerprint diffs."""
+
+from pathlib import Path
+
+import pytest
+
+from secure_code_reasoner.fingerprinting import (
+    Fingerprinter,
+    RepositoryFingerprint,
+    RiskSignal,
+    fingerprint_diff,
+)
+
+OLD_SOURCE = """import os
+
+
+class Worker:
+    def run(self):
+        return 1
+
+    def stop(self):
+        return 2
+
+
+def helper(x):
+    return x
+"""
+
+NEW_SOURCE = """import os
+import subprocess
+
+
+class Worker:
+    def run(self):
+        return 1
+
+    def stop(self):
+        return subprocess.call("ls", shell=True)
+
+
+def extra():
+    pass
+"""
+
+
+def _fingerprint(root: Path, source: str) -> RepositoryFingerprint:
+    """Fingerprint a repository holding one module."""
+    root.mkdir()
+    (root / "worker.py").write_text(source)
+    return Fingerprinter(root).fingerprint()
+
+
+@pytest.fixture
+def fingerprints(tmp_path: Path) -> tuple[RepositoryFingerprint, RepositoryFingerprint]:
+    """Fingerprint the old and new versions of a module."""
+    return _fingerprint(tmp_path / "old", OLD_SOURCE), _fingerprint(tmp_path / "new", NEW_SOURCE)
+
+
+class TestFingerprintDiff:
+    """Tests for fingerprint_diff."""
+
+    def test_identical_fingerprints(self, fingerprints: tuple) -> None:
+        """Test a fingerprint compared with itself has no changes."""
+        old, _ = fingerprints
+        diff = fingerprint_diff(old, old)
+        assert not diff.has_changes
+        assert set(diff.summary().values()) == {0}
+        assert diff.risk_signal_deltas == {}
+
+    def test_reports_each_kind_of_change(self, fingerprints: tuple) -> None:
+        """Test added, removed, modified and moved artifacts and edge deltas."""
+        diff = fingerprint_diff(*fingerprints)
+
+        assert diff.has_changes
+        assert list(diff.added) == ["worker.py:function:extra"]
+        assert list(diff.removed) == ["worker.py:function:helper"]
+        assert [c.artifact_id for c in diff.modified] == ["worker.py:file:worker.py"]
+        assert diff.modified[0].risk_signals_added == {RiskSignal.PROCESS_EXECUTION}
+        moved = {c.artifact_id: (c.old.start_line, c.new.start_line) for c in diff.moved}
+        assert moved == {
+            "worker.py:class:Worker": (4, 5),
+            "worker.py:function:Worker.run": (5, 6),
+            "worker.py:function:Worker.stop": (8, 9),
+        }
+        assert diff.risk_signal_deltas == {RiskSignal.PROCESS_EXECUTION: 1}
+        # Moved artifacts keep their edges; only the added and removed functions change
+        assert diff.edges_added == (("worker.py:function:extra", "worker.py:file:worker.py"),)
+        assert diff.edges_removed == (("worker.py:function:helper", "worker.py:file:worker.py"),)
+
+    def test_numbers_repeated_names(self, tmp_path: Path) -> None:
+        """Test redefinitions in one file are joined in line order."""
+        old = _fingerprint(tmp_path / "old", "def f():\n    pass\n\n\ndef f():\n    pass\n")
+        new = _fingerprint(tmp_path / "new", "def f():\n    pass\n")
+        diff = fingerprint_diff(old, new)
+        assert list(diff.removed) == ["worker.py:function:f#2"]
+        assert diff.removed["worker.py:function:f#2"].start_line == 5
+
+    def test_snapshots_match_in_memory_diff(self, fingerprints: tuple, tmp_path: Path) -> None:
+        """Test diffing saved snapshots gives the same result as the fingerprints."""
+        old, new = fingerprints
+        old.save(tmp_path / "old.scrfp")
+        new.save(tmp_path / "new.scrfp")
+
+        from_snapshots = fingerprint_diff(tmp_path / "old.scrfp", str(tmp_path / "new.scrfp"))
+        mixed = fingerprint_diff(RepositoryFingerprint.load(tmp_path / "old.scrfp"), new)
+
+        expected = fingerprint_diff(old, new).to_dict()
+        assert from_snapshots.to_dict() == expected
+        assert mixed.to_dict() == expected
@@ -457,3 +457,41 @@ class TestRepositoryFingerprint:
         assert result["total_files"] == 1
         assert len(result["artifacts"]) == 1
         assert result["risk_signals"]["network_access"] == 1
+
+    def test_artifacts_with_signal_is_memoized(self) -> None:
+        """Test that the risk signal index is built once and ordered deterministically."""
+        risky = [
+            FunctionArtifact(
+                artifact_type=CodeArtifactType.FUNCTION,
+                name=name,
+                path=Path("app.py"),
+                start_line=line,
+                end_line=line + 1,
+                risk_signals=frozenset([RiskSignal.DESERIALIZATION]),
+            )
+            for name, line in (("load_b", 20), ("load_a", 5))
+        ]
+        safe = FileArtifact(
+            artifact_type=CodeArtifactType.FILE,
+            name="app.py",
+            path=Path("app.py"),
+            start_line=1,
+            end_line=30,
+        )
+        fingerprint = RepositoryFingerprint(
+            repository_path=Path("/repo"),
+            fingerprint_hash="abc123",
+            total_files=1,
+            total_classes=0,
+            total_functions=2,
+            total_lines=30,
+            languages={"python": 1},
+            artifacts=frozenset([*risky, safe]),
+            dependency_graph=DependencyGraph(),
+            risk_signals={RiskSignal.DESERIALIZATION: 2},
+        )
+
+        matches = fingerprint.artifacts_with_signal(RiskSignal.DESERIALIZATION)
+        assert [a.name for a in matches] == ["load_a", "load_b"]
+        assert fingerprint.artifacts_with_signal(RiskSignal.DESERIALIZATION) is matches
+        assert fingerprint.artifacts_with_signal(RiskSignal.NETWORK_ACCESS) == ()
@@ -0,0 +1,126 @@
+"""Tests for binary fingerprint snapshots."""
+
+from pathlib import Path
+
+import pytest
+
+from secure_code_reasoner.exceptions import FingerprintingError
+from secure_code_reasoner.fingerprinting import Fingerprinter, RepositoryFingerprint
+from secure_code_reasoner.fingerprinting.snapshot import SnapshotArtifacts, SnapshotEdges
+
+SOURCE = """import os
+import subprocess
+
+
+class Base:
+    pass
+
+
+class Runner(Base):
+    def run(self, command: str) -> int:
+        return subprocess.call(command, shell=True)
+
+
+async def fetch(url, *, timeout=1.0) -> bytes:
+    return os.environ.get(url, "é").encode()
+"""
+
+
+@pytest.fixture
+def fingerprint(tmp_path: Path) -> RepositoryFingerprint:
+    """Fingerprint a small repository with every artifact kind."""
+    repo = tmp_path / "repo"
+    (repo / "pkg").mkdir(parents=True)
+    (repo / "pkg" / "runner.py").write_text(SOURCE, encoding="utf-8")
+    (repo / "main.py").write_text("from pkg.runner import Runner\n")
+    return Fingerprinter(repo).fingerprint()
+
+
+class TestSnapshot:
+    """Tests for RepositoryFingerprint.save and load."""
+
+    def test_round_trip(self, fingerprint: RepositoryFingerprint, tmp_path: Path) -> None:
+        """Test a loaded snapshot equals and serializes like the original."""
+        path = tmp_path / "baseline.scrfp"
+        fingerprint.save(path)
+        loaded = RepositoryFingerprint.load(path)
+
+        assert loaded.to_dict() == fingerprint.to_dict()
+        assert loaded.artifacts == fingerprint.artifacts
+        assert loaded.dependency_graph == fingerprint.dependency_graph
+        assert loaded.risk_signals == fingerprint.risk_signals
+        assert loaded.source_index is None
+
+    def test_loads_lazily(self, fingerprint: RepositoryFingerprint, tmp_path: Path) -> None:
+        """Test artifacts and edges are only built when read."""
+        path = tmp_path / "baseline.scrfp"
+        fingerprint.save(path)
+        loaded = RepositoryFingerprint.load(path)
+
+        artifacts = loaded.artifacts
+        assert isinstance(artifacts, SnapshotArtifacts)
+        assert len(artifacts) == len(fingerprint.artifacts)
+        assert repr(artifacts).endswith("0 built)")
+        assert artifacts[0] in fingerprint.artifacts
+
+        edges = loaded.dependency_graph.edges
+        assert isinstance(edges, SnapshotEdges)
+        source, targets = next(iter(fingerprint.dependency_graph.edges.items()))
+        assert loaded.dependency_graph.get_dependencies(source) == targets
+        assert loaded.dependency_graph.get_dependencies("missing") == frozenset()
+
+    @pytest.mark.skipif(not Path("/proc/self/fd").is_dir(), reason="needs /proc")
+    def test_close_releases_mapping(
+        self, fingerprint: RepositoryFingerprint, tmp_path: Path
+    ) -> None:
+        """Test closing unmaps the file, so repeated loads hold no descriptors."""
+        path = tmp_path / "baseline.scrfp"
+        fingerprint.save(path)
+        open_fds = len(list(Path("/proc/self/fd").iterdir()))
+
+        for _ in range(20):
+            with RepositoryFingerprint.load(path) as loaded:
+                first = loaded.artifacts[0]
+            path.write_bytes(path.read_bytes()[:-1])
+            with pytest.raises(FingerprintingError):
+                RepositoryFingerprint.load(path)
+            fingerprint.save(path)
+
+        assert len(list(Path("/proc/self/fd").iterdir())) == open_fds
+        artifacts = loaded.artifacts
+        assert isinstance(artifacts, SnapshotArtifacts) and artifacts.closed
+        assert artifacts[0] is first
+        with pytest.raises(ValueError):
+            artifacts[1]
+
+    def test_empty_fingerprint(self, tmp_path: Path) -> None:
+        """Test a repository without artifacts round-trips."""
+        (tmp_path / "repo").mkdir()
+        fingerprint = Fingerprinter(tmp_path / "repo").fingerprint()
+        fingerprint.save(tmp_path / "empty.scrfp")
+        assert RepositoryFingerprint.load(tmp_path / "empty.scrfp") == fingerprint
+
+    def test_corrupt_snapshot_raises(
+        self, fingerprint: RepositoryFingerprint, tmp_path: Path
+    ) -> None:
+        """Test truncated, tampered and foreign files raise FingerprintingError."""
+        path = tmp_path / "baseline.scrfp"
+        fingerprint.save(path)
+        data = path.read_bytes()
+
+        path.write_bytes(data[:-10])
+        with pytest.raises(FingerprintingError, match="Corrupt fingerprint snapshot"):
+            RepositoryFingerprint.load(path)
+
+        tampered = bytearray(data)
+        tampered[len(data) // 2] ^= 0xFF
+        path.write_bytes(bytes(tampered))
+        with pytest.raises(FingerprintingError, match="checksum mismatch"):
+            RepositoryFingerprint.load(path)
+
+        path.write_text('{"schema_version": 1}' * 10)
+        with pytest.raises(FingerprintingError, match="not a fingerprint snapshot"):
+            RepositoryFingerprint.load(path)
+
+        with pytest.raises(FingerprintingError, match="Failed to read"):
+            RepositoryFingerprint.load(tmp_path / "missing.scrfp")
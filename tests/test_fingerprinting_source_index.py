@@ -0,0 +1,49 @@
+"""Tests for the fingerprinting source line-offset index."""
+
+from pathlib import Path
+
+from secure_code_reasoner.fingerprinting import Fingerprinter
+from secure_code_reasoner.fingerprinting.source_index import SourceIndex
+
+
+class TestSourceIndex:
+    """Tests for SourceIndex."""
+
+    def test_compute_offsets(self) -> None:
+        """Test offsets mark every line start plus end of file."""
+        assert list(SourceIndex.compute_offsets(b"a\nbc\n")) == [0, 2, 5]
+        assert list(SourceIndex.compute_offsets(b"a\nbc")) == [0, 2, 4]
+        assert list(SourceIndex.compute_offsets(b"")) == [0]
+
+    def test_snippet_slices_exact_lines(self, tmp_path: Path) -> None:
+        """Test snippets match the requested inclusive line range."""
+        data = b"line1\nline2\r\nline3\nline4"
+        (tmp_path / "a.py").write_bytes(data)
+        index = SourceIndex(tmp_path)
+        index.add(Path("a.py"), data)
+
+        assert index.line_count(Path("a.py")) == 4
+        assert index.snippet(Path("a.py"), 2, 3) == "line2\r\nline3"
+        assert index.snippet(Path("a.py"), 4, 4) == "line4"
+        assert index.snippet(Path("a.py"), 3, 100) == "line3\nline4"
+
+    def test_snippet_unavailable(self, tmp_path: Path) -> None:
+        """Test missing, empty-range and stale snippets return None."""
+        data = b"x = 1\n"
+        (tmp_path / "a.py").write_bytes(data)
+        index = SourceIndex(tmp_path)
+        index.add(Path("a.py"), data)
+
+        assert index.snippet(Path("missing.py"), 1, 1) is None
+        assert index.snippet(Path("a.py"), 2, 3) is None
+
+        (tmp_path / "a.py").write_bytes(b"x = 1\ny = 2\n")
+        assert index.snippet(Path("a.py"), 1, 1) is None
+
+    def test_fingerprint_carries_index(self, tmp_path: Path) -> None:
+        """Test the fingerprinter indexes files without changing serialized output."""
+        (tmp_path / "mod.py").write_text("def f():\n    return 1\n")
+        fingerprint = Fingerprinter(tmp_path).fingerprint()
+
+        assert fingerprint.source_snippet(Path("mod.py"), 2, 2) == "    return 1"
+        assert "source_index" not in fingerprint.to_dict()
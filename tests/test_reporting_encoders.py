@@ -0,0 +1,78 @@
+"""Unit tests for pluggable JSON encoder backends."""
+
+import io
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from secure_code_reasoner.exceptions import ReportingError
+from secure_code_reasoner.reporting.encoders import (
+    StdlibBackend,
+    available_backends,
+    canonicalize,
+    get_backend,
+)
+from secure_code_reasoner.reporting.json_stream import write_json
+
+SAMPLES: list[Any] = [
+    {},
+    [],
+    {"name": 'café \U0001f600 \x7f \x00 "q" \\ \n', "tab": "\t"},
+    {"floats": [0.1, 1e16, 1.5e-7, 0.00001, -0.0, 123456789.123, 2.5e300], "ints": [0, -1]},
+    {"nested": {"list": [1, None, True, False], "empty": {}, "tuple": (1, "a")}},
+    {"path": Path("/tmp/x"), "big": 2**70},
+    {1: "int key", "text": "value"},
+    [{"file_path": "src/app.py", "line": 3, "metadata": {"e": 1e-5}}] * 3,
+]
+
+
+@pytest.mark.parametrize("name", available_backends())
+class TestBackends:
+    """Tests every installed backend against the stdlib encoder."""
+
+    @pytest.mark.parametrize("indent", [None, 2])
+    @pytest.mark.parametrize("value", SAMPLES)
+    def test_matches_stdlib(self, name: str, indent: int | None, value: Any) -> None:
+        """Test output is byte-identical to the stdlib encoder."""
+        assert get_backend(name).encode(value, indent) == StdlibBackend().encode(value, indent)
+
+    def test_other_indent_uses_stdlib(self, name: str) -> None:
+        """Test indents the native encoder lacks still match."""
+        value = {"a": [1, {"b": 2}]}
+        assert get_backend(name).encode(value, 4) == StdlibBackend().encode(value, 4)
+
+    def test_streams_identically(self, name: str) -> None:
+        """Test write_json output does not depend on the backend."""
+        value = {"artifacts": SAMPLES, "count": len(SAMPLES)}
+        expected = io.StringIO()
+        write_json(value, expected)
+        actual = io.StringIO()
+        write_json(value, actual, backend=get_backend(name))
+        assert actual.getvalue() == expected.getvalue()
+
+
+class TestCanonicalize:
+    """Tests for canonicalize."""
+
+    def test_escapes_non_ascii_and_del(self) -> None:
+        """Test characters ensure_ascii escapes are escaped, astral ones as pairs."""
+        assert canonicalize('"é\x7f\U0001f600"') == '"\\u00e9\\u007f\\ud83d\\ude00"'
+
+    def test_rewrites_floats_in_repr_form(self) -> None:
+        """Test exponent floats are rewritten while strings and integers are kept."""
+        text = '{"1e5":1e16,"n":1.5e-07,"s":"0.00001","i":100000}'
+        assert canonicalize(text) == '{"1e5":1e+16,"n":1.5e-07,"s":"0.00001","i":100000}'
+
+
+class TestGetBackend:
+    """Tests for get_backend."""
+
+    def test_default_is_fastest_available(self) -> None:
+        """Test the default backend is the first available one."""
+        assert get_backend().name == available_backends()[0]
+
+    def test_unknown_backend_raises(self) -> None:
+        """Test an unknown backend name raises ReportingError."""
+        with pytest.raises(ReportingError, match="Unknown JSON backend"):
+            get_backend("yaml")
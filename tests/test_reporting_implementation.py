@@ -97,6 +97,36 @@ class TestJSONFormatter:
         assert "script_path" in data
         assert "events" in data
 
+    def test_output_matches_json_dumps(
+        self,
+        sample_fingerprint: RepositoryFingerprint,
+        sample_agent_report: AgentReport,
+        sample_trace: ExecutionTrace,
+    ) -> None:
+        """Test streamed output is identical to json.dumps of to_dict()."""
+        import json
+
+        formatter = JSONFormatter()
+        assert formatter.format_fingerprint(sample_fingerprint) == json.dumps(
+            sample_fingerprint.to_dict(), indent=2, default=str
+        )
+        assert formatter.format_agent_report(sample_agent_report) == json.dumps(
+            sample_agent_report.to_dict(), indent=2, default=str
+        )
+        assert formatter.format_trace(sample_trace) == json.dumps(
+            sample_trace.to_dict(), indent=2, default=str
+        )
+
+    def test_compact_output(self, sample_fingerprint: RepositoryFingerprint) -> None:
+        """Test compact mode writes the same data without whitespace."""
+        import json
+
+        output = JSONFormatter(compact=True).format_fingerprint(sample_fingerprint)
+        assert "\n" not in output
+        assert json.loads(output) == json.loads(
+            JSONFormatter().format_fingerprint(sample_fingerprint)
+        )
+
 
 class TestTextFormatter:
     """Tests for TextFormatter."""
@@ -170,3 +200,30 @@ class TestReporter:
 
         reporter.report_fingerprint(sample_fingerprint, output_path)
         assert output_path.exists()
+
+    def test_write_to_path_and_stream(
+        self, sample_agent_report: AgentReport, tmp_path: Path
+    ) -> None:
+        """Test streamed reports to a path or stream match the formatted report."""
+        import io
+
+        reporter = Reporter(JSONFormatter())
+        output_path = tmp_path / "nested" / "agents.json"
+        stream = io.StringIO()
+
+        reporter.write_agent_findings(sample_agent_report, output_path)
+        reporter.write_agent_findings(sample_agent_report, stream)
+
+        expected = reporter.report_agent_findings(sample_agent_report)
+        assert output_path.read_text(encoding="utf-8") == expected
+        assert stream.getvalue() == expected
+
+    def test_open_report_wraps_write_errors(self, tmp_path: Path) -> None:
+        """Test failures to create the report file raise ReportingError."""
+        from secure_code_reasoner.exceptions import ReportingError
+
+        blocker = tmp_path / "file"
+        blocker.write_text("x")
+        with pytest.raises(ReportingError):
+            with Reporter(TextFormatter()).open_report(blocker / "report.txt"):
+                pass
@@ -0,0 +1,88 @@
+"""Unit tests for incremental JSON encoding."""
+
+import io
+import json
+import math
+from enum import Enum
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from secure_code_reasoner.reporting.json_stream import iter_json, write_json
+
+
+class _Color(str, Enum):
+    RED = "red"
+
+
+SAMPLES: list[Any] = [
+    {},
+    [],
+    'text with "quotes", é and a\nnewline',
+    42,
+    [[[]], {}, [{}]],
+    {
+        "nested": {"list": [1, 2.5, None, True], "empty": {}, "tuple": (1, "a")},
+        1: "int key",
+        2.5: "float key",
+        None: "null key",
+        False: "bool key",
+        _Color.RED: _Color.RED,
+        "path": Path("/tmp/x"),
+        "floats": [math.nan, math.inf, -math.inf, -0.0, 1e300],
+        "set": frozenset(),
+    },
+]
+
+
+class TestWriteJSON:
+    """Tests for write_json."""
+
+    @pytest.mark.parametrize("value", SAMPLES)
+    @pytest.mark.parametrize("indent", [2, 4])
+    def test_matches_json_dumps(self, value: Any, indent: int) -> None:
+        """Test output is identical to json.dumps with indent and default=str."""
+        stream = io.StringIO()
+        write_json(value, stream, indent=indent)
+        assert stream.getvalue() == json.dumps(value, indent=indent, default=str)
+
+    @pytest.mark.parametrize("value", SAMPLES)
+    def test_compact_matches_json_dumps(self, value: Any) -> None:
+        """Test compact output is identical to json.dumps without whitespace."""
+        stream = io.StringIO()
+        write_json(value, stream, indent=None)
+        assert stream.getvalue() == json.dumps(value, separators=(",", ":"), default=str)
+
+    def test_iterators_are_streamed_as_arrays(self) -> None:
+        """Test iterators are consumed lazily and encoded as arrays."""
+        consumed = []
+
+        def items() -> Any:
+            for i in range(3):
+                consumed.append(i)
+                yield {"i": i}
+
+        pieces = iter_json({"items": items(), "empty": iter(())})
+        text = next(pieces)
+        assert consumed == []
+        text += "".join(pieces)
+        assert consumed == [0, 1, 2]
+        assert json.loads(text) == {"items": [{"i": 0}, {"i": 1}, {"i": 2}], "empty": []}
+
+    @pytest.mark.parametrize("indent", [None, 2])
+    def test_nested_iterators_are_streamed(self, indent: int | None) -> None:
+        """Test iterators inside array elements are walked, not encoded whole."""
+        value = {"runs": [{"tool": {"name": "x"}, "results": iter([{"a": 1}, [2]])}, iter([3])]}
+        expected = {"runs": [{"tool": {"name": "x"}, "results": [{"a": 1}, [2]]}, [3]]}
+        stream = io.StringIO()
+        write_json(value, stream, indent=indent)
+        if indent is None:
+            assert stream.getvalue() == json.dumps(expected, separators=(",", ":"))
+        else:
+            assert stream.getvalue() == json.dumps(expected, indent=indent)
+
+    def test_unsupported_key_raises(self) -> None:
+        """Test keys json cannot encode raise TypeError."""
+        with pytest.raises(TypeError, match="keys must be"):
+            write_json({(1, 2): "x"}, io.StringIO())
@@ -0,0 +1,190 @@
+"""Tests for the SARIF formatter."""
+
+import io
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from secure_code_reasoner.agents import AgentCoordinator
+from secure_code_reasoner.agents.models import (
+    AgentFinding,
+    AgentReport,
+    PatchSuggestion,
+    Severity,
+)
+from secure_code_reasoner.agents.registry import load_agents
+from secure_code_reasoner.exceptions import ReportingError
+from secure_code_reasoner.fingerprinting import (
+    Fingerprinter,
+    RepositoryFingerprint,
+    fingerprint_diff,
+)
+from secure_code_reasoner.reporting import Reporter, SARIFFormatter
+from secure_code_reasoner.tracing.models import ExecutionTrace
+
+
+@pytest.fixture
+def fingerprint(tmp_path: Path) -> RepositoryFingerprint:
+    """Fingerprint a repository with two modules."""
+    repo = tmp_path / "repo"
+    (repo / "pkg").mkdir(parents=True)
+    (repo / "pkg" / "app.py").write_text("def run(x):\n    return eval(x)\n")
+    (repo / "main.py").write_text("print('hello')\n")
+    return Fingerprinter(repo).fingerprint()
+
+
+def _finding(title: str, line: int | None = 2, severity: Severity = Severity.HIGH) -> AgentFinding:
+    """Create a finding in pkg/app.py."""
+    return AgentFinding(
+        agent_name="TestAgent",
+        severity=severity,
+        title=title,
+        description=f"{title} at line {line}",
+        file_path=Path("pkg/app.py"),
+        line_number=line,
+        recommendation="Fix it",
+    )
+
+
+def _patch(line_start: int, line_end: int, description: str = "Use a parser") -> PatchSuggestion:
+    """Create a patch for pkg/app.py."""
+    return PatchSuggestion(
+        file_path=Path("pkg/app.py"),
+        original_code="return eval(x)",
+        suggested_code="return json.loads(x)",
+        description=description,
+        line_start=line_start,
+        line_end=line_end,
+    )
+
+
+@pytest.fixture
+def report() -> AgentReport:
+    """Create a report with repeated titles and matched and unmatched patches."""
+    return AgentReport(
+        agent_name="TestAgent",
+        findings=[
+            _finding("Dynamic code execution", 2, Severity.CRITICAL),
+            _finding("Dynamic code execution", 1, Severity.CRITICAL),
+            _finding("Long function", None, Severity.LOW),
+        ],
+        patch_suggestions=[_patch(2, 2), _patch(5, 6, "Split the function")],
+    )
+
+
+def _run(text: str) -> dict[str, Any]:
+    """Parse a SARIF log and return its only run."""
+    log = json.loads(text)
+    assert log["version"] == "2.1.0"
+    assert len(log["runs"]) == 1
+    return log["runs"][0]
+
+
+class TestSARIFFormatter:
+    """Tests for SARIFFormatter."""
+
+    def test_rules_are_deduplicated_by_title(self, report: AgentReport) -> None:
+        """Test each title yields one rule that its results reference."""
+        run = _run(SARIFFormatter().format_agent_report(report))
+        rules = run["tool"]["driver"]["rules"]
+        assert [rule["name"] for rule in rules] == [
+            "Dynamic code execution",
+            "Long function",
+            "Suggested patch",
+        ]
+        assert rules[0]["id"] == "scr/dynamic-code-execution"
+        for result in run["results"]:
+            assert rules[result["ruleIndex"]]["id"] == result["ruleId"]
+
+    def test_findings_map_to_results_with_fixes(self, report: AgentReport) -> None:
+        """Test findings become results and covering patches become their fixes."""
+        results = _run(SARIFFormatter().format_agent_report(report))["results"]
+        assert [r["level"] for r in results] == ["error", "error", "note", "note"]
+
+        first, second, no_line, unmatched = results
+        region = first["locations"][0]["physicalLocation"]["region"]
+        assert region == {"startLine": 1}
+        assert "fixes" not in first
+        assert "region" not in no_line["locations"][0]["physicalLocation"]
+
+        (fix,) = second["fixes"]
+        change = fix["artifactChanges"][0]
+        assert change["artifactLocation"] == {"uri": "pkg/app.py", "uriBaseId": "SRCROOT"}
+        assert change["replacements"] == [
+            {
+                "deletedRegion": {"startLine": 2, "endLine": 2},
+                "insertedContent": {"text": "return json.loads(x)"},
+            }
+        ]
+        assert unmatched["ruleId"] == "scr/suggested-patch"
+        assert unmatched["message"]["text"] == "Split the function"
+
+    def test_agent_patches_attach_to_their_findings(self, tmp_path: Path) -> None:
+        """Test real agent patches become fixes of the findings they were made for.
+
+        PatchAdvisor replaces the call line while findings point at the artifact's
+        first line, so the two are linked by the patch's artifact_line and signal.
+        """
+        repo = tmp_path / "repo"
+        repo.mkdir()
+        (repo / "app.py").write_text(
+            "import pickle\n\n\ndef load(data):\n    return pickle.loads(data)\n\n\n"
+            "def run(expression):\n    return eval(expression)\n"
+        )
+        report = AgentCoordinator(load_agents(None)).review(Fingerprinter(repo).fingerprint())
+        results = _run(SARIFFormatter().format_agent_report(report))["results"]
+
+        assert not [r for r in results if r["ruleId"] == "scr/suggested-patch"]
+        fixed = {
+            r["properties"]["metadata"]["signal"]: r
+            for r in results
+            if "fixes" in r and "signal" in r["properties"].get("metadata", {})
+        }
+        assert set(fixed) == {"deserialization", "dynamic_code_execution"}
+        for signal, line in (("deserialization", 5), ("dynamic_code_execution", 9)):
+            (change,) = fixed[signal]["fixes"][0]["artifactChanges"]
+            deleted = change["replacements"][0]["deletedRegion"]
+            assert deleted == {"startLine": line, "endLine": line}
+
+    def test_file_artifacts_map_to_artifacts(self, fingerprint: RepositoryFingerprint) -> None:
+        """Test file artifacts become run artifacts relative to the source root."""
+        run = _run(SARIFFormatter().format_fingerprint(fingerprint))
+        root = run["originalUriBaseIds"]["SRCROOT"]["uri"]
+        assert root.startswith("file://") and root.endswith("/")
+        assert [a["location"]["uri"] for a in run["artifacts"]] == ["main.py", "pkg/app.py"]
+        assert run["artifacts"][1]["sourceLanguage"] == "python"
+        assert "dynamic_code_execution" in run["artifacts"][1]["properties"]["riskSignals"]
+        assert run["results"] == []
+
+    def test_analysis_is_one_run(
+        self, fingerprint: RepositoryFingerprint, report: AgentReport
+    ) -> None:
+        """Test write_analysis streams artifacts and results in a single run."""
+        stream = io.StringIO()
+        SARIFFormatter(compact=True).write_analysis(fingerprint, report, stream)
+        assert "\n" not in stream.getvalue()
+        run = _run(stream.getvalue())
+        assert len(run["artifacts"]) == 2
+        assert len(run["results"]) == 4
+
+    def test_output_is_deterministic(self, report: AgentReport) -> None:
+        """Test the same report always formats identically."""
+        reordered = AgentReport(
+            agent_name=report.agent_name,
+            findings=list(report.findings)[::-1],
+            patch_suggestions=list(report.patch_suggestions)[::-1],
+        )
+        formatter = SARIFFormatter()
+        assert formatter.format_agent_report(reordered) == formatter.format_agent_report(report)
+
+    def test_traces_and_diffs_raise(
+        self, fingerprint: RepositoryFingerprint, tmp_path: Path
+    ) -> None:
+        """Test traces and diffs cannot be formatted as SARIF."""
+        trace = ExecutionTrace(script_path=tmp_path / "x.py", exit_code=0, execution_time=0.0)
+        with pytest.raises(ReportingError, match="cannot format execution traces"):
+            Reporter(SARIFFormatter()).report_trace(trace)
+        with pytest.raises(ReportingError, match="cannot format fingerprint diffs"):
+            SARIFFormatter().format_diff(fingerprint_diff(fingerprint, fingerprint))
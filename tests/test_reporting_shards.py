@@ -0,0 +1,187 @@
+"""Tests for sharded NDJSON report output."""
+
+import gzip
+import json
+from pathlib import Path
+
+import pytest
+
+from secure_code_reasoner.agents import AgentCoordinator
+from secure_code_reasoner.agents.models import AgentReport
+from secure_code_reasoner.agents.registry import load_agents
+from secure_code_reasoner.exceptions import ContractViolationError, ReportingError
+from secure_code_reasoner.fingerprinting import Fingerprinter, RepositoryFingerprint
+from secure_code_reasoner.reporting import shards
+from secure_code_reasoner.reporting.encoders import get_backend
+from secure_code_reasoner.reporting.shards import (
+    ShardManifest,
+    iter_shard,
+    read_manifest,
+    validate_shards,
+    write_shards,
+)
+
+RISKY = "import pickle\n\n\ndef load(data):\n    return eval(pickle.loads(data))\n"
+
+
+@pytest.fixture
+def analysis(tmp_path: Path) -> tuple[RepositoryFingerprint, AgentReport]:
+    """Fingerprint and review a repository with two top-level directories."""
+    repo = tmp_path / "repo"
+    for package in ("api", "core"):
+        (repo / package).mkdir(parents=True)
+        for module in ("a", "b", "c"):
+            (repo / package / f"{module}.py").write_text(RISKY)
+    (repo / "setup.py").write_text("print('setup')\n")
+    fingerprint = Fingerprinter(repo).fingerprint()
+    return fingerprint, AgentCoordinator(load_agents(None)).review(fingerprint)
+
+
+def _records(directory: Path, manifest: ShardManifest, kind: str) -> list[dict]:
+    """Read every record of one kind, shard by shard."""
+    return [record for shard in manifest.shards_of(kind) for record in iter_shard(directory, shard)]
+
+
+class TestWriteShards:
+    """Tests for write_shards and the reading helpers."""
+
+    def test_shards_by_directory(self, analysis: tuple, tmp_path: Path) -> None:
+        """Test records are grouped by top-level directory and split at shard_size."""
+        fingerprint, report = analysis
+        out = tmp_path / "shards"
+        manifest = write_shards(fingerprint, report, out, shard_size=4)
+
+        assert read_manifest(out) == manifest
+        artifact_shards = manifest.shards_of("artifacts")
+        assert {shard.key for shard in artifact_shards} == {".", "api", "core"}
+        assert all(shard.records <= 4 for shard in manifest.shards)
+        assert sorted(r["path"] for r in _records(out, manifest, "artifacts")) == sorted(
+            r["path"] for r in fingerprint.to_dict()["artifacts"]
+        )
+        api = [r for s in manifest.shards_of("findings", "api") for r in iter_shard(out, s)]
+        assert api and all(r["file_path"].startswith("api") for r in api)
+        assert len(_records(out, manifest, "findings")) == len(report.findings)
+        assert len(_records(out, manifest, "patch_suggestions")) == len(report.patch_suggestions)
+
+        edges = {r["source"]: r["targets"] for r in _records(out, manifest, "edges")}
+        assert edges == fingerprint.dependency_graph.to_dict()["edges"]
+        assert "artifacts" not in manifest.fingerprint
+        assert manifest.fingerprint["fingerprint_hash"] == fingerprint.fingerprint_hash
+        assert "findings" not in manifest.agent_report
+
+    def test_shards_by_count(self, analysis: tuple, tmp_path: Path) -> None:
+        """Test count sharding keeps report order in full shards."""
+        fingerprint, report = analysis
+        out = tmp_path / "shards"
+        manifest = write_shards(fingerprint, report, out, shard_by="count", shard_size=5)
+
+        shards = manifest.shards_of("artifacts")
+        assert [shard.key for shard in shards] == [None] * len(shards)
+        assert [shard.records for shard in shards[:-1]] == [5] * (len(shards) - 1)
+        assert _records(out, manifest, "artifacts") == json.loads(
+            json.dumps(fingerprint.to_dict()["artifacts"], default=str)
+        )
+
+    def test_output_is_deterministic(self, analysis: tuple, tmp_path: Path) -> None:
+        """Test writing the same report twice gives identical shards."""
+        first = write_shards(*analysis, tmp_path / "first", shard_size=3)
+        second = write_shards(*analysis, tmp_path / "second", shard_size=3)
+        assert first.shards == second.shards
+
+    def test_zstd_round_trip(self, analysis: tuple, tmp_path: Path) -> None:
+        """Test zstd shards read back like gzip ones."""
+        pytest.importorskip("zstandard")
+        out = tmp_path / "shards"
+        manifest = write_shards(*analysis, out, compression="zstd")
+        assert all(shard.path.endswith(".ndjson.zst") for shard in manifest.shards)
+        gzip_out = tmp_path / "gzip"
+        gzip_manifest = write_shards(*analysis, gzip_out)
+        assert _records(out, manifest, "findings") == _records(gzip_out, gzip_manifest, "findings")
+
+    def test_tampered_shard_fails_verification(self, analysis: tuple, tmp_path: Path) -> None:
+        """Test a shard that no longer matches its manifest entry raises."""
+        out = tmp_path / "shards"
+        shard = write_shards(*analysis, out).shards[0]
+        (out / shard.path).write_bytes(b"garbage")
+        with pytest.raises(ReportingError, match="does not match its manifest"):
+            list(iter_shard(out, shard))
+        with pytest.raises(ReportingError, match="Failed to decompress"):
+            list(iter_shard(out, shard, verify=False))
+
+    def test_validate_shards(self, analysis: tuple, tmp_path: Path) -> None:
+        """Test every shard record is validated and counted, and bad records raise."""
+        fingerprint, report = analysis
+        out = tmp_path / "shards"
+        manifest = write_shards(fingerprint, report, out, shard_size=4)
+        counts = validate_shards(out)
+        assert counts["artifacts"] == len(fingerprint.artifacts)
+        assert counts["findings"] == len(report.findings)
+
+        shard = manifest.shards_of("findings")[0]
+        (out / shard.path).write_bytes(gzip.compress(b'{"severity": "high"}\n'))
+        with pytest.raises(ContractViolationError, match=rf"\[{shard.path} finding 1\]"):
+            validate_shards(out, verify=False)
+
+    def test_open_shards_are_capped(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test at most the cap of shards is open, reopened keys starting new shards."""
+        repo = tmp_path / "repo"
+        for package in ("a", "b", "c", "d", "e"):
+            (repo / package).mkdir(parents=True)
+            (repo / package / "m.py").write_text(RISKY)
+        fingerprint = Fingerprinter(repo).fingerprint()
+        report = AgentCoordinator(load_agents(None)).review(fingerprint)
+
+        open_writers: list[str] = []
+        most_open = 0
+
+        class CountingWriter(shards._ShardWriter):
+            def __init__(self, directory: Path, name: str, compression: str) -> None:
+                nonlocal most_open
+                super().__init__(directory, name, compression)
+                open_writers.append(name)
+                most_open = max(most_open, len(open_writers))
+
+            def close(self, kind: str, key: str | None) -> shards.Shard:
+                open_writers.remove(self.name)
+                return super().close(kind, key)
+
+        monkeypatch.setattr(shards, "_ShardWriter", CountingWriter)
+        monkeypatch.setattr(shards, "_MAX_OPEN_WRITERS", 2)
+        out = tmp_path / "shards"
+        manifest = write_shards(fingerprint, report, out)
+
+        assert most_open <= 2 and not open_writers
+        findings = manifest.shards_of("findings")
+        assert len(findings) > len({shard.key for shard in findings})
+        assert len(_records(out, manifest, "findings")) == len(report.findings)
+        assert [shard.key for shard in manifest.shards_of("artifacts")] == list("abcde")
+        assert validate_shards(out)["findings"] == len(report.findings)
+
+    def test_failure_removes_partial_shards(
+        self, analysis: tuple, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test a failed write leaves no shard files behind."""
+        backend = get_backend(None)
+
+        class FailingBackend:
+            def encode(self, record: dict, indent: int | None) -> str:
+                if "severity" in record:
+                    raise OSError("No space left on device")
+                return backend.encode(record, indent)
+
+        monkeypatch.setattr(shards, "get_backend", lambda name: FailingBackend())
+        out = tmp_path / "shards"
+        with pytest.raises(ReportingError, match="No space left on device"):
+            write_shards(*analysis, out, shard_size=2)
+        assert list(out.iterdir()) == []
+
+    def test_invalid_options_raise(self, analysis: tuple, tmp_path: Path) -> None:
+        """Test unknown groupings, compressions and sizes raise ReportingError."""
+        with pytest.raises(ReportingError, match="Unknown shard grouping"):
+            write_shards(*analysis, tmp_path, shard_by="file")
+        with pytest.raises(ReportingError, match="Unknown compression"):
+            write_shards(*analysis, tmp_path, compression="bz2")
+        with pytest.raises(ReportingError, match="shard_size"):
+            write_shards(*analysis, tmp_path, shard_size=0)
+        with pytest.raises(ReportingError, match="Failed to read shard manifest"):
+            read_manifest(tmp_path / "missing")
@@ -0,0 +1,123 @@
+"""Tests for filtered and incremental text rendering of agent reports."""
+
+import io
+from pathlib import Path
+
+import pytest
+
+from secure_code_reasoner.agents.models import (
+    AgentFinding,
+    AgentReport,
+    PatchSuggestion,
+    Severity,
+)
+from secure_code_reasoner.exceptions import ReportingError
+from secure_code_reasoner.reporting import TextFormatter
+
+
+def _finding(
+    title: str, severity: Severity, path: str | None, agent: str = "SecurityReviewer"
+) -> AgentFinding:
+    """Create a finding."""
+    return AgentFinding(
+        agent_name=agent,
+        severity=severity,
+        title=title,
+        description=f"{title} description",
+        file_path=Path(path) if path else None,
+        line_number=1 if path else None,
+    )
+
+
+@pytest.fixture
+def report() -> AgentReport:
+    """Create a report spread over severities, paths and agents."""
+    return AgentReport(
+        agent_name="Coordinator",
+        findings=[
+            _finding("Eval call", Severity.CRITICAL, "src/app.py"),
+            _finding("Pickle load", Severity.HIGH, "src/io.py"),
+            _finding("Long function", Severity.LOW, "tests/test_app.py", agent="CodeAnalyst"),
+            _finding("Repository note", Severity.INFO, None, agent="CodeAnalyst"),
+        ],
+        patch_suggestions=[
+            PatchSuggestion(
+                file_path=Path(path),
+                original_code="old",
+                suggested_code="new",
+                description=f"Patch {path}",
+                line_start=1,
+                line_end=1,
+            )
+            for path in ("src/app.py", "tests/test_app.py")
+        ],
+    )
+
+
+class TestTextFilters:
+    """Tests for TextFormatter agent report filters."""
+
+    def test_unfiltered_report_shows_everything(self, report: AgentReport) -> None:
+        """Test the default formatter renders every finding, most severe first."""
+        output = TextFormatter().format_agent_report(report)
+        assert "Findings (4):" in output
+        assert "Patch Suggestions (2):" in output
+        assert output.index("Eval call") < output.index("Pickle load") < output.index("Long")
+
+    def test_min_severity(self, report: AgentReport) -> None:
+        """Test findings below the minimum severity are dropped."""
+        output = TextFormatter(min_severity=Severity.HIGH).format_agent_report(report)
+        assert "Findings (2 of 4):" in output
+        assert "Long function" not in output
+        assert "Repository note" not in output
+
+    def test_path_patterns(self, report: AgentReport) -> None:
+        """Test findings and patches are kept only for matching files."""
+        output = TextFormatter(paths=["src/*"]).format_agent_report(report)
+        assert "Findings (2 of 4):" in output
+        assert "Patch Suggestions (1 of 2):" in output
+        assert "tests/test_app.py" not in output
+
+    def test_agents(self, report: AgentReport) -> None:
+        """Test findings are kept only for the named agents."""
+        output = TextFormatter(agents=["CodeAnalyst"]).format_agent_report(report)
+        assert "Long function" in output
+        assert "Eval call" not in output
+
+    def test_limit_keeps_most_severe(self, report: AgentReport) -> None:
+        """Test the limit keeps the most severe findings."""
+        output = TextFormatter(limit=1).format_agent_report(report)
+        assert "Findings (1 of 4):" in output
+        assert "Eval call" in output
+        assert "Pickle load" not in output
+        assert "Patch Suggestions (1 of 2):" in output
+
+    def test_summary_only(self, report: AgentReport) -> None:
+        """Test summary-only mode renders counts instead of findings."""
+        output = TextFormatter(summary_only=True).format_agent_report(report)
+        assert "  CRITICAL: 1" in output
+        assert "  CodeAnalyst: 2" in output
+        assert "Patch Suggestions: 2" in output
+        assert "Eval call" not in output
+
+    def test_negative_limit_raises(self) -> None:
+        """Test a negative limit is rejected."""
+        with pytest.raises(ReportingError, match="limit must be >= 0"):
+            TextFormatter(limit=-1)
+
+
+class TestIncrementalRendering:
+    """Tests for iter_agent_report and write_agent_report."""
+
+    def test_write_matches_format(self, report: AgentReport) -> None:
+        """Test streamed output equals the formatted string."""
+        formatter = TextFormatter(min_severity=Severity.LOW)
+        stream = io.StringIO()
+        formatter.write_agent_report(report, stream)
+        assert stream.getvalue() == formatter.format_agent_report(report)
+
+    def test_lines_are_yielded_lazily(self, report: AgentReport) -> None:
+        """Test the header is available before the findings are rendered."""
+        lines = TextFormatter().iter_agent_report(report)
+        assert next(lines) == "=" * 80
+        assert next(lines) == "Agent Report: Coordinator"
@@ -0,0 +1,196 @@
+"""Tests for the audit-hook tracing backend."""
+
+import os
+import socket
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from secure_code_reasoner.exceptions import TracingError
+from secure_code_reasoner.tracing import ExecutionTracer, TraceEventType
+from secure_code_reasoner.tracing.audit_hooks import (
+    AUDIT_HANDLERS,
+    build_dispatch,
+    make_audit_hook,
+)
+
+INET_SOCKET = SimpleNamespace(family=socket.AF_INET)
+UNIX_SOCKET = SimpleNamespace(family=socket.AF_UNIX)
+
+
+class TestAuditDispatch:
+    """Tests for audit event mapping (hooks are never installed in the test process)."""
+
+    def test_open_modes(self) -> None:
+        """Test open events map to reads or writes from mode or flags."""
+        handler = AUDIT_HANDLERS["open"][0]
+        assert handler(("a.txt", "r", os.O_RDONLY)) == ("file_read", {"file_path": "a.txt"})
+        assert handler(("a.txt", "r+", os.O_RDWR))[0] == "file_write"
+        assert handler((b"a.txt", None, os.O_WRONLY | os.O_CREAT))[0] == "file_write"
+        assert handler((3, "r", 0)) is None
+
+    def test_dispatch_filtered_by_event_type(self) -> None:
+        """Test only handlers producing traced or enforced types are dispatched."""
+        dispatch = build_dispatch(frozenset({"process_spawn"}), frozenset())
+        assert "subprocess.Popen" in dispatch
+        assert "open" not in dispatch
+        enforced = build_dispatch(frozenset({"process_spawn"}), frozenset({"file_write"}))
+        assert "open" in enforced
+        assert set(build_dispatch(None, frozenset())) == set(AUDIT_HANDLERS)
+
+
+class TestAuditNetworkSandbox:
+    """Tests for the socket events the audit hook blocks without network access."""
+
+    @pytest.mark.parametrize(
+        ("event", "args", "expected"),
+        [
+            (
+                "socket.__new__",
+                (None, socket.AF_INET, socket.SOCK_DGRAM, 0),
+                ("network_connect", {"operation": "socket"}),
+            ),
+            (
+                "socket.bind",
+                (INET_SOCKET, ("127.0.0.1", 9)),
+                (
+                    "network_connect",
+                    {"network_address": "127.0.0.1", "network_port": 9, "operation": "bind"},
+                ),
+            ),
+            (
+                "socket.sendmsg",
+                (INET_SOCKET, ("127.0.0.1", 9)),
+                ("network_send", {"network_address": "127.0.0.1", "network_port": 9}),
+            ),
+            ("socket.sendmsg", (INET_SOCKET, None), ("network_send", {})),
+        ],
+    )
+    def test_blocks_and_records(self, event: str, args: tuple, expected: tuple) -> None:
+        """Test each socket event raises and records a blocked event without network."""
+        emitted: list[tuple[str, dict[str, Any]]] = []
+        hook = make_audit_hook(
+            lambda event_type, **fields: emitted.append((event_type, fields)), no_network=True
+        )
+        with pytest.raises(PermissionError, match="Network access blocked by sandbox"):
+            hook(event, args)
+        event_type, fields = expected
+        assert emitted == [(event_type, {**fields, "blocked": True})]
+
+    def test_unix_sockets_and_allowed_network(self) -> None:
+        """Test Unix domain sockets stay allowed and socket creation is only enforced."""
+        emitted: list[str] = []
+        blocked = make_audit_hook(
+            lambda event_type, **_: emitted.append(event_type), no_network=True
+        )
+        blocked("socket.__new__", (None, socket.AF_UNIX, socket.SOCK_STREAM, 0))
+        blocked("socket.bind", (UNIX_SOCKET, "/tmp/scr.sock"))
+        blocked("socket.sendmsg", (UNIX_SOCKET, None))
+        assert emitted == []
+
+        allowed = make_audit_hook(lambda event_type, **_: emitted.append(event_type))
+        allowed("socket.__new__", (None, socket.AF_INET, socket.SOCK_DGRAM, 0))
+        allowed("socket.bind", (INET_SOCKET, ("127.0.0.1", 0)))
+        allowed("socket.sendmsg", (INET_SOCKET, ("127.0.0.1", 9)))
+        assert emitted == ["network_connect", "network_send"]
+
+    def test_bind_and_sendmsg_script_blocked(self, tmp_path: Path) -> None:
+        """Test a script binding a socket and calling sendmsg fails and is scored."""
+        script = tmp_path / "net.py"
+        script.write_text(
+            "import socket\n"
+            "sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)\n"
+            "sock.bind(('127.0.0.1', 0))\n"
+            "sock.sendmsg([b'x'], [], 0, ('127.0.0.1', 9))\n"
+        )
+
+        trace = ExecutionTracer(timeout=5.0).trace(script)
+
+        assert trace.exit_code != 0
+        assert "Network access blocked by sandbox" in trace.stderr
+        blocked = [e for e in trace.events if e.metadata.get("blocked")]
+        assert [e.event_type for e in blocked] == [TraceEventType.NETWORK_CONNECT]
+        assert "unauthorized_network_access" in trace.risk_score.factors
+
+
+class TestAuditBackend:
+    """End-to-end tests of the audit backend in a traced process."""
+
+    def test_covers_os_level_operations(self, tmp_path: Path) -> None:
+        """Test os.open, os.remove, os.system and imports are traced."""
+        target = tmp_path / "victim.txt"
+        target.write_text("x")
+        script = tmp_path / "ops.py"
+        script.write_text(
+            "import os\n"
+            f"os.close(os.open(r'{target}', os.O_RDONLY))\n"
+            f"os.remove(r'{target}')\n"
+            "os.system('true')\n"
+            "import csv\n"
+            "import csv\n"
+        )
+
+        trace = ExecutionTracer(timeout=5.0, allow_file_write=True).trace(script)
+
+        assert trace.exit_code == 0
+        by_type: dict[TraceEventType, list] = {}
+        for event in trace.events:
+            by_type.setdefault(event.event_type, []).append(event)
+        assert any(e.file_path == target for e in by_type[TraceEventType.FILE_READ])
+        assert [e.file_path for e in by_type[TraceEventType.FILE_DELETE]] == [target]
+        assert [e.command for e, _ in trace.events.spawns()] == ["true"]
+        assert [e.module_name for e in by_type[TraceEventType.MODULE_IMPORT]].count("csv") == 1
+        assert trace.metadata["backend"] == "audit"
+
+    def test_reports_import_of_socket(self, tmp_path: Path) -> None:
+        """Test the bootstrap does not preload socket, so the script's import is traced."""
+        script = tmp_path / "net_import.py"
+        script.write_text("import socket\n")
+
+        trace = ExecutionTracer(timeout=5.0).trace(script)
+
+        assert trace.exit_code == 0
+        modules = [
+            e.module_name for e in trace.events if e.event_type == TraceEventType.MODULE_IMPORT
+        ]
+        assert "socket" in modules
+
+    def test_delete_blocked_without_file_write(self, tmp_path: Path) -> None:
+        """Test deletions are blocked and recorded when file writes are not allowed."""
+        target = tmp_path / "keep.txt"
+        target.write_text("x")
+        script = tmp_path / "rm.py"
+        script.write_text(f"import os\nos.remove(r'{target}')\n")
+
+        trace = ExecutionTracer(timeout=5.0).trace(script)
+
+        assert target.exists()
+        assert "blocked by sandbox" in trace.stderr
+        deletes = [e for e in trace.events if e.event_type == TraceEventType.FILE_DELETE]
+        assert deletes and deletes[0].metadata == {"blocked": True}
+
+    def test_filter_and_sampling(self, tmp_path: Path) -> None:
+        """Test event type filtering and deterministic 1-in-N sampling."""
+        script = tmp_path / "reads.py"
+        script.write_text("for _ in range(10):\n    open(__file__).close()\nimport csv\n")
+
+        tracer = ExecutionTracer(
+            timeout=5.0,
+            event_types=[TraceEventType.FILE_READ],
+            sample_rates={TraceEventType.FILE_READ: 5},
+        )
+        trace = tracer.trace(script)
+
+        # The wrapper's own read of the script is occurrence 0; then 5 and 10 are kept
+        assert len(trace.events) == 3
+        assert all(e.event_type == TraceEventType.FILE_READ for e in trace.events)
+        assert all(e.metadata["sample_rate"] == 5 for e in trace.events)
+
+    def test_invalid_backend_and_rates(self) -> None:
+        """Test invalid backend and sample rates are rejected."""
+        with pytest.raises(TracingError, match="backend must be one of"):
+            ExecutionTracer(backend="ptrace")
+        with pytest.raises(TracingError, match="sample rates must be >= 1"):
+            ExecutionTracer(sample_rates={TraceEventType.FILE_READ: 0})
@@ -0,0 +1,192 @@
+"""Unit tests for the columnar trace event store."""
+
+from pathlib import Path
+
+import pytest
+
+from secure_code_reasoner.exceptions import TracingError
+from secure_code_reasoner.tracing.event_store import EventStore
+from secure_code_reasoner.tracing.models import ExecutionTrace, TraceEvent, TraceEventType
+
+
+def _events() -> list[TraceEvent]:
+    """Create a mix of events exercising every column."""
+    return [
+        TraceEvent(
+            event_type=TraceEventType.FILE_READ,
+            timestamp=2.0,
+            file_path=Path("/tmp/data.txt"),
+            metadata={"mode": "r"},
+        ),
+        TraceEvent(
+            event_type=TraceEventType.NETWORK_CONNECT,
+            timestamp=1.0,
+            network_address="127.0.0.1",
+            network_port=8080,
+        ),
+        TraceEvent(
+            event_type=TraceEventType.PROCESS_SPAWN,
+            timestamp=3.0,
+            process_id=42,
+            command="ls -la",
+            metadata={"observed_by": "proc", "parent_pid": 1},
+        ),
+        TraceEvent(event_type=TraceEventType.MODULE_IMPORT, timestamp=0.5, module_name="json"),
+    ]
+
+
+class TestEventStore:
+    """Tests for EventStore."""
+
+    def test_materializes_equal_events(self) -> None:
+        """Test stored events read back equal to the originals."""
+        events = _events()
+        store = EventStore(events)
+        assert len(store) == 4
+        assert list(store) == events
+        assert store[-1] == events[-1]
+        assert store == frozenset(events)
+
+    def test_interns_repeated_strings(self) -> None:
+        """Test a repeated path and metadata value are stored once."""
+        store = EventStore(
+            TraceEvent(
+                event_type=TraceEventType.FILE_READ,
+                timestamp=float(i),
+                file_path=Path("/tmp/data.txt"),
+                metadata={"mode": "r"},
+            )
+            for i in range(1000)
+        )
+        assert len(store) == 1000
+        assert repr(store) == "EventStore(1000 events, 2 strings)"
+
+    def test_count_and_select(self) -> None:
+        """Test counting and selecting by type and metadata."""
+        store = EventStore(_events())
+        assert store.count() == 4
+        assert store.count(TraceEventType.FILE_READ) == 1
+        assert store.count(TraceEventType.FILE_WRITE) == 0
+        assert store.count(TraceEventType.PROCESS_SPAWN, observed_by="proc") == 1
+        assert store.count(observed_by="hook") == 0
+        selected = list(store.select(TraceEventType.NETWORK_CONNECT))
+        assert [e.network_port for e in selected] == [8080]
+
+    def test_spawns_deduplicated_by_pid(self) -> None:
+        """Test /proc observations of a child a hook already reported are dropped."""
+        store = EventStore()
+        store.add(TraceEventType.PROCESS_SPAWN, 1.0, command="true", process_id=10)
+        store.add(
+            TraceEventType.PROCESS_SPAWN,
+            1.1,
+            command="sh -c true",
+            process_id=11,
+            metadata={"observed_by": "proc", "parent_pid": 10},
+        )
+        store.add(
+            TraceEventType.PROCESS_SPAWN,
+            1.2,
+            command="sleep 1",
+            process_id=12,
+            metadata={"observed_by": "proc", "parent_pid": 11},
+        )
+        assert [(e.process_id, count) for e, count in store.spawns()] == [(10, 1), (12, 1)]
+
+    def test_to_dicts_matches_trace_event(self) -> None:
+        """Test serialization matches TraceEvent.to_dict in timestamp order."""
+        events = _events()
+        store = EventStore(events)
+        expected = [e.to_dict() for e in sorted(events, key=lambda e: e.timestamp)]
+        assert store.to_dicts() == expected
+
+    def test_add_validates_fields(self) -> None:
+        """Test invalid fields are rejected like TraceEvent."""
+        store = EventStore()
+        with pytest.raises(ValueError, match="timestamp"):
+            store.add(TraceEventType.FILE_READ, -1.0)
+        with pytest.raises(ValueError, match="network_port"):
+            store.add(TraceEventType.NETWORK_CONNECT, 1.0, network_port=70000)
+        assert len(store) == 0
+
+    def test_binary_round_trip(self) -> None:
+        """Test the binary form round-trips."""
+        store = EventStore(_events())
+        loaded = EventStore.from_bytes(store.to_bytes())
+        assert loaded.to_dicts() == store.to_dicts()
+
+    def test_corrupt_binary_raises(self) -> None:
+        """Test truncated or foreign data raises TracingError."""
+        data = EventStore(_events()).to_bytes()
+        with pytest.raises(TracingError, match="Corrupt event store"):
+            EventStore.from_bytes(data[:-3])
+        with pytest.raises(TracingError, match="Corrupt event store"):
+            EventStore.from_bytes(b"not an event store")
+
+    @pytest.mark.parametrize("name", ["events.bin", "events.ndjson.gz"])
+    def test_save_and_load(self, tmp_path: Path, name: str) -> None:
+        """Test saving and loading in binary and gzipped NDJSON form."""
+        store = EventStore(_events())
+        store.save(tmp_path / name)
+        assert EventStore.load(tmp_path / name).to_dicts() == store.to_dicts()
+
+    def test_execution_trace_keeps_store(self) -> None:
+        """Test an ExecutionTrace keeps a store and serializes it like a frozenset."""
+        events = _events()
+        store = EventStore(events)
+        trace = ExecutionTrace(script_path=Path("s.py"), events=store)
+        assert trace.events is store
+        assert trace.count_events(TraceEventType.MODULE_IMPORT) == 1
+        frozen = ExecutionTrace(script_path=Path("s.py"), events=events)
+        assert trace.to_dict() == frozen.to_dict()
+        assert frozen.count_events(TraceEventType.MODULE_IMPORT) == 1
+
+
+class TestAggregatedEventStore:
+    """Tests for EventStore aggregation mode."""
+
+    def _reads(self, store: EventStore, count: int) -> None:
+        """Add count reads of one file, one second apart."""
+        for i in range(count):
+            store.add(TraceEventType.FILE_READ, float(i + 1), file_path="/etc/app.conf")
+
+    def test_collapses_events_differing_only_in_timestamp(self) -> None:
+        """Test repeated events share one row with count and first/last timestamps."""
+        store = EventStore(aggregate=True, max_raw_events=3)
+        self._reads(store, 100)
+        store.add(TraceEventType.FILE_READ, 50.0, file_path="/etc/other.conf")
+
+        assert len(store) == 2
+        assert store.count() == 101
+        assert store.count(TraceEventType.FILE_READ) == 101
+        record = store.to_dicts()[0]
+        assert (record["timestamp"], record["last_timestamp"], record["count"]) == (1.0, 100.0, 100)
+        assert len(store.raw) == 3
+        assert [count for _, count in store.counted()] == [100, 1]
+
+    def test_metadata_distinguishes_aggregates(self) -> None:
+        """Test events with different metadata are counted separately."""
+        store = EventStore(aggregate=True)
+        store.add(TraceEventType.PROCESS_SPAWN, 1.0, command="ls")
+        store.add(TraceEventType.PROCESS_SPAWN, 2.0, command="ls", metadata={"observed_by": "proc"})
+        store.add(TraceEventType.PROCESS_SPAWN, 3.0, command="ls", metadata={"observed_by": "proc"})
+        assert len(store) == 2
+        assert store.count(TraceEventType.PROCESS_SPAWN, observed_by="proc") == 2
+
+    def test_counts_rejected_without_aggregation(self) -> None:
+        """Test pre-aggregated records need an aggregated store."""
+        with pytest.raises(ValueError, match="aggregated store"):
+            EventStore().add(TraceEventType.FILE_READ, 1.0, count=2)
+
+    @pytest.mark.parametrize("name", ["events.bin", "events.ndjson.gz"])
+    def test_aggregates_round_trip(self, tmp_path: Path, name: str) -> None:
+        """Test aggregated stores reload as aggregated and keep accumulating."""
+        store = EventStore(aggregate=True)
+        self._reads(store, 5)
+        store.save(tmp_path / name)
+
+        loaded = EventStore.load(tmp_path / name)
+        assert loaded.aggregate
+        assert loaded.to_dicts() == store.to_dicts()
+        self._reads(loaded, 2)
+        assert len(loaded) == 1
+        assert loaded.count() == 7
@@ -0,0 +1,84 @@
+"""Tests for tracing through the pre-warmed fork server."""
+
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from secure_code_reasoner.exceptions import SandboxError
+from secure_code_reasoner.tracing import ExecutionTracer, ForkServer
+from secure_code_reasoner.tracing.models import TraceEventType
+
+
+@pytest.fixture(scope="module")
+def fork_server() -> Iterator[ForkServer]:
+    """Start one fork server shared by the tests in this module."""
+    with ForkServer() as server:
+        yield server
+
+
+def test_forked_trace_matches_fresh_interpreter(fork_server: ForkServer, tmp_path: Path) -> None:
+    """Test that a forked child sees the same argv, cwd, sandbox and exit status."""
+    script = tmp_path / "script.py"
+    script.write_text(
+        """import os, sys
+print(sys.argv, os.getcwd(), os.environ["SCR_NO_FILE_WRITE"])
+with open("data.txt", "w") as f:
+    f.write("x")
+"""
+    )
+    fresh = ExecutionTracer(timeout=10.0).trace(script, ["arg"])
+    forked = ExecutionTracer(timeout=10.0, fork_server=fork_server).trace(script, ["arg"])
+
+    assert forked.stdout == fresh.stdout
+    assert str(tmp_path.resolve()) in forked.stdout
+    assert forked.exit_code == fresh.exit_code == 1
+    assert "File write blocked by sandbox" in forked.stderr
+    blocked = [e for e in forked.events if e.event_type == TraceEventType.FILE_WRITE]
+    assert blocked and blocked[0].metadata.get("blocked") is True
+
+
+def test_forked_trace_exit_code_and_timeout(fork_server: ForkServer, tmp_path: Path) -> None:
+    """Test that exit codes propagate and runaway children are killed at the timeout."""
+    exiting = tmp_path / "exiting.py"
+    exiting.write_text("import sys\nsys.exit(7)\n")
+    looping = tmp_path / "looping.py"
+    looping.write_text("while True:\n    pass\n")
+
+    tracer = ExecutionTracer(timeout=1.0, fork_server=fork_server)
+    assert tracer.trace(exiting).exit_code == 7
+    timed_out = tracer.trace(looping)
+    assert timed_out.exit_code == -1
+    assert "timed out" in timed_out.stderr
+
+
+def test_forked_trace_many(fork_server: ForkServer, tmp_path: Path) -> None:
+    """Test that concurrent traces can share one fork server."""
+    scripts = []
+    for i in range(6):
+        script = tmp_path / f"script_{i}.py"
+        script.write_text(f"print({i})\n")
+        scripts.append(script)
+
+    tracer = ExecutionTracer(timeout=10.0, fork_server=fork_server)
+    traces = {t.script_path.name: t for t in tracer.trace_many(scripts, max_workers=3)}
+
+    assert {name: t.stdout.strip() for name, t in traces.items()} == {
+        f"script_{i}.py": str(i) for i in range(6)
+    }
+
+
+def test_fork_server_restarts_after_close(tmp_path: Path) -> None:
+    """Test that a closed server is restarted on next use and reports its state."""
+    server = ForkServer(preload=())
+    with pytest.raises(SandboxError, match="not running"):
+        server.socket_path
+    script = tmp_path / "script.py"
+    script.write_text("print('ok')\n")
+    tracer = ExecutionTracer(timeout=10.0, fork_server=server)
+    try:
+        assert tracer.trace(script).stdout.strip() == "ok"
+        server.close()
+        assert tracer.trace(script).stdout.strip() == "ok"
+    finally:
+        server.close()
@@ -1,13 +1,14 @@
 """Unit tests for tracing subsystem implementation."""
 
+import asyncio
 import time
 from pathlib import Path
 
 import pytest
 
 from secure_code_reasoner.exceptions import TracingError
-from secure_code_reasoner.tracing import ExecutionTracer
-from secure_code_reasoner.tracing.models import ExecutionTrace, TraceEventType
+from secure_code_reasoner.tracing import ExecutionTracer, TraceResourceLimits
+from secure_code_reasoner.tracing.models import ExecutionTrace, TraceEvent, TraceEventType
 
 
 @pytest.fixture
@@ -80,6 +81,15 @@ print(result.stdout.decode())
     return script
 
 
+def _is_running(pid: int) -> bool:
+    """Check whether a process exists and is not a zombie awaiting reaping by init."""
+    try:
+        stat = Path(f"/proc/{pid}/stat").read_text()
+    except OSError:
+        return False
+    return stat.rsplit(")", 1)[1].split()[0] != "Z"
+
+
 class TestExecutionTracerInitialization:
     """Tests for ExecutionTracer initialization."""
 
@@ -254,6 +264,194 @@ class TestProcessExecution:
         if trace.risk_score:
             assert "process_execution" in trace.risk_score.factors or trace.exit_code != 0
 
+    def test_descendants_reported_and_killed(self, tmp_path: Path) -> None:
+        """Test that the process tree is reported with parent links and killed on exit."""
+        script = tmp_path / "tree.py"
+        script.write_text(
+            """import subprocess, time
+subprocess.Popen(["sh", "-c", "sleep 30 & wait"])
+time.sleep(0.5)
+"""
+        )
+        trace = ExecutionTracer(timeout=10.0).trace(script)
+
+        observed = {
+            e.process_id: e
+            for e in trace.events
+            if e.event_type == TraceEventType.PROCESS_SPAWN
+            and e.metadata.get("observed_by") == "proc"
+        }
+        sleeper = next(e for e in observed.values() if e.command == "sleep 30")
+        shell = observed[sleeper.metadata["parent_pid"]]
+        assert shell.command is not None and shell.command.startswith("sh -c")
+        assert trace.risk_score is not None
+        assert trace.risk_score.factors["process_execution"] == 30.0
+
+        deadline = time.time() + 5
+        while time.time() < deadline and _is_running(sleeper.process_id):
+            time.sleep(0.05)
+        assert not _is_running(sleeper.process_id)
+
+    def test_timeout_kills_descendants(self, tmp_path: Path) -> None:
+        """Test that a timeout kills grandchildren, not only the traced script."""
+        script = tmp_path / "hang.py"
+        script.write_text(
+            """import subprocess, sys
+child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"])
+child.wait()
+"""
+        )
+        trace = ExecutionTracer(timeout=1.0).trace(script)
+
+        assert trace.exit_code == -1
+        children = [
+            e.process_id
+            for e in trace.events
+            if e.event_type == TraceEventType.PROCESS_SPAWN
+            and e.metadata.get("observed_by") == "proc"
+        ]
+        assert children
+        time.sleep(0.2)
+        assert not any(_is_running(pid) for pid in children)
+
+
+class TestEventChannel:
+    """Tests for the dedicated trace event pipe."""
+
+    def test_script_output_is_not_parsed_as_events(self, tmp_path: Path) -> None:
+        """Test that trace-like lines printed by the script do not become events."""
+        script = tmp_path / "forged.py"
+        script.write_text('print("SCR_TRACE:file_write|file=/etc/passwd")')
+
+        tracer = ExecutionTracer(timeout=5.0)
+        trace = tracer.trace(script)
+
+        assert trace.exit_code == 0
+        assert not [e for e in trace.events if e.event_type == TraceEventType.FILE_WRITE]
+
+    def test_events_survive_output_truncation(self, process_script: Path) -> None:
+        """Test that events are captured even when output is truncated away."""
+        tracer = ExecutionTracer(timeout=5.0, max_output_size=1)
+        start = time.time()
+        trace = tracer.trace(process_script)
+
+        process_events = [e for e in trace.events if e.event_type == TraceEventType.PROCESS_SPAWN]
+        assert process_events
+        # Timestamps are taken when the traced process emits the event
+        assert all(start <= e.timestamp <= start + trace.execution_time for e in process_events)
+
+
+class TestBatchTracing:
+    """Tests for concurrent batch tracing."""
+
+    def test_trace_many_runs_concurrently(self, tmp_path: Path) -> None:
+        """Test that scripts run in parallel and yield one trace each."""
+        scripts = []
+        for i in range(4):
+            script = tmp_path / f"sleep_{i}.py"
+            script.write_text("import time\ntime.sleep(0.5)\n")
+            scripts.append(script)
+
+        tracer = ExecutionTracer(timeout=5.0)
+        start = time.time()
+        traces = list(tracer.trace_many(scripts, max_workers=4))
+        elapsed = time.time() - start
+
+        assert sorted(t.script_path for t in traces) == sorted(s.resolve() for s in scripts)
+        assert all(t.exit_code == 0 for t in traces)
+        assert elapsed < 4 * 0.5
+
+    def test_trace_many_keeps_per_trace_timeout(
+        self, sample_script: Path, slow_script: Path
+    ) -> None:
+        """Test that a slow script times out without affecting the others."""
+        tracer = ExecutionTracer(timeout=1.0)
+        traces = {t.script_path: t for t in tracer.trace_many([slow_script, sample_script], 2)}
+
+        assert traces[slow_script.resolve()].exit_code == -1
+        assert traces[sample_script.resolve()].exit_code == 0
+
+    def test_trace_many_validates_paths_first(self, sample_script: Path, tmp_path: Path) -> None:
+        """Test that an invalid path fails the batch before anything runs."""
+        tracer = ExecutionTracer(timeout=5.0)
+        with pytest.raises(TracingError, match="does not exist"):
+            list(tracer.trace_many([sample_script, tmp_path / "missing.py"]))
+        with pytest.raises(TracingError, match="max_workers"):
+            list(tracer.trace_many([sample_script], max_workers=0))
+
+
+class TestAsyncTracing:
+    """Tests for the asyncio tracing API."""
+
+    def test_atrace_matches_trace(self, file_operation_script: Path) -> None:
+        """Test that atrace produces the same outcome as trace."""
+        tracer = ExecutionTracer(timeout=10.0)
+        sync_trace = tracer.trace(file_operation_script)
+        async_trace = asyncio.run(tracer.atrace(file_operation_script))
+
+        assert async_trace.exit_code == sync_trace.exit_code
+        assert async_trace.stderr == sync_trace.stderr
+        assert {e.event_type for e in async_trace.events} == {
+            e.event_type for e in sync_trace.events
+        }
+
+    def test_atrace_timeout_and_concurrency(self, sample_script: Path, slow_script: Path) -> None:
+        """Test that concurrent atrace calls keep their own timeouts."""
+        tracer = ExecutionTracer(timeout=1.0)
+
+        async def run() -> list[ExecutionTrace]:
+            return await asyncio.gather(tracer.atrace(slow_script), tracer.atrace(sample_script))
+
+        slow, sample = asyncio.run(run())
+        assert slow.exit_code == -1
+        assert "timed out" in slow.stderr
+        assert sample.exit_code == 0
+        assert "Hello, World!" in sample.stdout
+
+    def test_astream_yields_events(self, tmp_path: Path) -> None:
+        """Test that astream yields events as the script emits them."""
+        script = tmp_path / "reader.py"
+        script.write_text("open(__file__).read()\nimport time\ntime.sleep(10)\n")
+        tracer = ExecutionTracer(timeout=1.0)
+
+        async def run() -> list[TraceEvent]:
+            return [event async for event in tracer.astream(script)]
+
+        events = asyncio.run(run())
+        assert any(
+            e.event_type == TraceEventType.FILE_READ and e.file_path == script.resolve()
+            for e in events
+        )
+        assert events[-1].metadata.get("error") == "timeout"
+
+    def test_cancelled_atrace_kills_process_group(self, tmp_path: Path) -> None:
+        """Test that cancelling atrace kills the script and its children."""
+        marker = tmp_path / "child.pid"
+        script = tmp_path / "spawner.py"
+        script.write_text(
+            f"""import subprocess, sys, time
+child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+print(child.pid, file=open({str(marker)!r}, "w"))
+time.sleep(30)
+"""
+        )
+        tracer = ExecutionTracer(timeout=30.0, allow_file_write=True)
+
+        async def run() -> None:
+            task = asyncio.create_task(tracer.atrace(script))
+            while not marker.exists() or not marker.read_text().strip():
+                await asyncio.sleep(0.05)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(run())
+        child_pid = int(marker.read_text())
+        deadline = time.time() + 5
+        while time.time() < deadline and _is_running(child_pid):
+            time.sleep(0.05)
+        assert not _is_running(child_pid)
+
 
 class TestRiskScoring:
     """Tests for risk score calculation."""
@@ -386,3 +584,105 @@ class TestResourceLimits:
 
         assert elapsed < 1.0
         assert trace.exit_code == -1
+
+    def test_resource_usage_recorded(self, tmp_path: Path) -> None:
+        """Test that CPU, peak RSS and I/O of the traced process are recorded."""
+        script = tmp_path / "allocate.py"
+        script.write_text('data = bytearray(64 * 1024 * 1024)\nprint("x" * 10000)\n')
+        trace = ExecutionTracer(timeout=10.0).trace(script)
+
+        usage = trace.resource_usage
+        assert usage is not None
+        assert usage.peak_rss_bytes is not None and usage.peak_rss_bytes >= 64 * 1024 * 1024
+        assert usage.cpu_time is not None and usage.cpu_time > 0
+        if usage.write_bytes is not None:
+            assert usage.write_bytes >= 10000
+
+    def test_kernel_enforced_limits(self, tmp_path: Path) -> None:
+        """Test that rlimits stop a runaway script before the wall-clock timeout."""
+        spinner = tmp_path / "spin.py"
+        spinner.write_text("while True:\n    pass\n")
+        limits = TraceResourceLimits(cpu_seconds=1, max_memory_bytes=512 * 1024 * 1024)
+        tracer = ExecutionTracer(timeout=20.0, resource_limits=limits)
+
+        start = time.time()
+        trace = tracer.trace(spinner)
+        assert time.time() - start < 10.0
+        assert trace.exit_code is not None and trace.exit_code < 0
+        assert trace.metadata["resource_limits"]["cpu_seconds"] == 1
+
+        allocator = tmp_path / "allocate.py"
+        allocator.write_text("data = bytearray(1024 * 1024 * 1024)\n")
+        trace = tracer.trace(allocator)
+        assert trace.exit_code == 1
+        assert "MemoryError" in trace.stderr
+
+    def test_limits_applied_without_preexec_fn(self, tmp_path: Path) -> None:
+        """Test concurrent and async traces apply limits in the child's own bootstrap."""
+        scripts = []
+        for index in range(4):
+            script = tmp_path / f"limits_{index}.py"
+            script.write_text(
+                "import resource\nprint(resource.getrlimit(resource.RLIMIT_NOFILE)[0])\n"
+            )
+            scripts.append(script)
+        tracer = ExecutionTracer(
+            timeout=10.0, resource_limits=TraceResourceLimits(max_open_files=64)
+        )
+
+        traces = list(tracer.trace_many(scripts, max_workers=4))
+        traces.append(asyncio.run(tracer.atrace(scripts[0])))
+
+        assert [trace.stdout.strip() for trace in traces] == ["64"] * 5
+
+    def test_invalid_limits_rejected(self) -> None:
+        """Test that non-positive limits are rejected."""
+        with pytest.raises(ValueError, match="max_open_files must be >= 1"):
+            TraceResourceLimits(max_open_files=0)
+
+
+class TestEventAggregation:
+    """Tests for aggregate_events mode."""
+
+    def test_repeated_reads_are_aggregated(self, tmp_path: Path) -> None:
+        """Test repeated reads collapse into one counted record and raw events are capped."""
+        config = tmp_path / "app.conf"
+        config.write_text("x")
+        script = tmp_path / "reader.py"
+        script.write_text(f"for _ in range(500):\n    open(r'{config}').read()\n")
+
+        tracer = ExecutionTracer(timeout=10.0, aggregate_events=True, max_raw_events=10)
+        trace = tracer.trace(script)
+
+        assert trace.exit_code == 0
+        reads = [
+            (event, count)
+            for event, count in trace.counted_events()
+            if event.event_type == TraceEventType.FILE_READ and event.file_path == config
+        ]
+        assert len(reads) == 1 and reads[0][1] == 500
+        data = trace.to_dict()
+        assert len(data["raw_events"]) == 10
+        assert data["metadata"]["event_aggregation"]["total_events"] == trace.count_events()
+
+    def test_risk_score_uses_aggregate_counts(self, tmp_path: Path) -> None:
+        """Test the risk score matches unaggregated tracing."""
+        script = tmp_path / "writer.py"
+        script.write_text(
+            "for _ in range(3):\n"
+            "    try:\n"
+            f"        open(r'{tmp_path / 'out.txt'}', 'w')\n"
+            "    except PermissionError:\n"
+            "        pass\n"
+        )
+
+        plain = ExecutionTracer(timeout=10.0).trace(script)
+        aggregated = ExecutionTracer(timeout=10.0, aggregate_events=True).trace(script)
+
+        assert aggregated.risk_score == plain.risk_score
+        assert aggregated.count_events(TraceEventType.FILE_WRITE) == 3
+
+    def test_invalid_raw_event_cap(self) -> None:
+        """Test a negative raw event cap is rejected."""
+        with pytest.raises(TracingError, match="max_raw_events"):
+            ExecutionTracer(max_raw_events=-1)
@@ -5,8 +5,10 @@ from pathlib import Path
 import pytest
 
 from secure_code_reasoner.tracing.models import (
+    ResourceUsage,
     ExecutionTrace,
     RiskScore,
+    TraceBatchSummary,
     TraceEvent,
     TraceEventType,
 )
@@ -280,3 +282,55 @@ class TestExecutionTrace:
         assert result["risk_score"]["score"] == 75.0
         assert result["stdout"] == "output"
         assert result["stderr"] == "errors"
+
+
+class TestResourceUsage:
+    """Tests for ResourceUsage."""
+
+    def test_cpu_time_and_serialization(self) -> None:
+        """Test total CPU time and that traces serialize their usage."""
+        usage = ResourceUsage(cpu_user_time=0.5, cpu_system_time=0.25, peak_rss_bytes=1024)
+        assert usage.cpu_time == pytest.approx(0.75)
+        assert ResourceUsage().cpu_time is None
+
+        trace = ExecutionTrace(script_path=Path("a.py"), resource_usage=usage)
+        result = trace.to_dict()
+        assert result["resource_usage"]["peak_rss_bytes"] == 1024
+        assert result["resource_usage"]["read_bytes"] is None
+        assert "resource_usage" in result["_non_deterministic_fields"]
+        assert ExecutionTrace(script_path=Path("a.py")).to_dict()["resource_usage"] is None
+
+    def test_negative_values_rejected(self) -> None:
+        """Test that negative measurements are rejected."""
+        with pytest.raises(ValueError, match="peak_rss_bytes must be >= 0"):
+            ResourceUsage(peak_rss_bytes=-1)
+
+
+class TestTraceBatchSummary:
+    """Tests for TraceBatchSummary."""
+
+    def test_add_accumulates(self) -> None:
+        """Test summary counts outcomes and risk across traces."""
+        timeout_event = TraceEvent(
+            event_type=TraceEventType.SYSTEM_CALL, timestamp=1.0, metadata={"error": "timeout"}
+        )
+        traces = [
+            ExecutionTrace(script_path=Path("a.py"), exit_code=0, risk_score=RiskScore(score=10.0)),
+            ExecutionTrace(script_path=Path("b.py"), exit_code=2, risk_score=RiskScore(score=30.0)),
+            ExecutionTrace(
+                script_path=Path("c.py"), exit_code=-1, events=frozenset({timeout_event})
+            ),
+        ]
+        summary = TraceBatchSummary()
+        for trace in traces:
+            summary = summary.add(trace)
+
+        result = summary.to_dict()
+        assert (result["total"], result["succeeded"], result["failed"]) == (3, 1, 1)
+        assert result["timed_out"] == 1
+        assert result["max_risk_score"] == 30.0
+        assert result["mean_risk_score"] == pytest.approx(40.0 / 3)
+
+    def test_empty_summary(self) -> None:
+        """Test an empty batch has zero mean risk."""
+        assert TraceBatchSummary().to_dict()["mean_risk_score"] == 0.0
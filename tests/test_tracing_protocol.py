@@ -0,0 +1,49 @@
+"""Tests for the trace event wire protocol."""
+
+import pytest
+
+from secure_code_reasoner.exceptions import TracingError
+from secure_code_reasoner.tracing.protocol import (
+    RECORD_HEADER,
+    RecordDecoder,
+    TraceRecord,
+    encode_record,
+)
+
+
+class TestRecordProtocol:
+    """Tests for encode_record and RecordDecoder."""
+
+    def test_round_trip(self) -> None:
+        """Test encoded records decode to the same event."""
+        data = encode_record("file_read", 12.5, {"file_path": "/tmp/x"})
+        records = RecordDecoder().feed(data)
+        assert records == [TraceRecord("file_read", 12.5, {"file_path": "/tmp/x"})]
+
+    def test_records_split_across_reads(self) -> None:
+        """Test records split at arbitrary byte boundaries are reassembled."""
+        data = encode_record("file_read", 1.0, {"file_path": "a"}) + encode_record(
+            "process_spawn", 2.0, {"command": "ls", "process_id": 7}
+        )
+        decoder = RecordDecoder()
+        records = []
+        for i in range(len(data)):
+            records.extend(decoder.feed(data[i : i + 1]))
+        assert [r.event_type for r in records] == ["file_read", "process_spawn"]
+        assert records[1].fields == {"command": "ls", "process_id": 7}
+        assert decoder.pending == 0
+
+    def test_incomplete_record_is_pending(self) -> None:
+        """Test a partial record is buffered, not returned."""
+        data = encode_record("file_read", 1.0, {})
+        decoder = RecordDecoder()
+        assert decoder.feed(data[:-1]) == []
+        assert decoder.pending == len(data) - 1
+
+    def test_corrupt_stream_rejected(self) -> None:
+        """Test malformed payloads raise TracingError."""
+        bad = RECORD_HEADER.pack(3, 1.0) + b"{x}"
+        with pytest.raises(TracingError, match="Corrupt trace stream"):
+            RecordDecoder().feed(bad)
+        with pytest.raises(TracingError, match="record length"):
+            RecordDecoder().feed(RECORD_HEADER.pack(2**31, 1.0))
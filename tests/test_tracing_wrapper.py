@@ -0,0 +1,132 @@
+"""Tests for buffered event emission in the trace wrapper."""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import secure_code_reasoner
+from secure_code_reasoner.tracing.protocol import OVERFLOW_RECORD, RecordDecoder
+from secure_code_reasoner.tracing.trace_wrapper import EventBuffer, TraceConfig
+
+
+def _read_available(fd: int) -> bytes:
+    """Read everything currently buffered in a non-blocking pipe."""
+    data = bytearray()
+    while True:
+        try:
+            chunk = os.read(fd, 65536)
+        except BlockingIOError:
+            return bytes(data)
+        if not chunk:
+            return bytes(data)
+        data += chunk
+
+
+class TestBootstrap:
+    """Tests for what the traced child imports before the script starts."""
+
+    def test_bootstrap_does_not_preload_script_modules(self) -> None:
+        """Test importing trace_wrapper loads none of the tracer's heavy dependencies.
+
+        Anything loaded here would already be in sys.modules when the script
+        imports it, so the script's import would go unreported.
+        """
+        src = Path(secure_code_reasoner.__file__).parent.parent
+        code = (
+            f"import sys; sys.path.insert(0, {str(src)!r}); import json as j\n"
+            "from secure_code_reasoner.tracing.trace_wrapper import install_trace_hooks\n"
+            "print(j.dumps(sorted(sys.modules)))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        loaded = set(json.loads(result.stdout))
+        heavy = {"asyncio", "concurrent.futures", "gzip", "socket", "ssl"}
+        assert loaded & heavy == set()
+        assert "secure_code_reasoner.tracing.tracer" not in loaded
+
+
+class TestTraceConfig:
+    """Tests for TraceConfig."""
+
+    def test_from_environ(self) -> None:
+        """Test config is parsed from SCR_* variables."""
+        config = TraceConfig.from_environ(
+            {
+                "SCR_TRACE_MODE": "1",
+                "SCR_TRACE_FD": "7",
+                "SCR_NO_NETWORK": "1",
+                "SCR_TRACE_BATCH_SIZE": "16",
+            }
+        )
+        assert config.enabled
+        assert config.trace_fd == 7
+        assert config.no_network
+        assert not config.no_file_write
+        assert config.batch_size == 16
+
+    def test_malformed_values_use_defaults(self) -> None:
+        """Test malformed numbers fall back to defaults instead of failing the script."""
+        config = TraceConfig.from_environ(
+            {"SCR_TRACE_FD": "x", "SCR_TRACE_BUFFER_SIZE": "-3", "SCR_TRACE_FLUSH_INTERVAL": "?"}
+        )
+        assert config.trace_fd is None
+        assert config.buffer_size == TraceConfig().buffer_size
+        assert config.flush_interval == TraceConfig().flush_interval
+
+
+class TestEventBuffer:
+    """Tests for EventBuffer."""
+
+    def test_events_are_batched(self) -> None:
+        """Test events are written only when a batch fills or on close."""
+        read_fd, write_fd = os.pipe()
+        os.set_blocking(read_fd, False)
+        try:
+            buffer = EventBuffer(write_fd, buffer_size=100, batch_size=3, flush_interval=60.0)
+            buffer.emit("file_read", {"file_path": "a"})
+            buffer.emit("file_read", {"file_path": "b"})
+            assert _read_available(read_fd) == b""
+
+            buffer.emit("file_read", {"file_path": "c"})
+            decoder = RecordDecoder()
+            assert len(decoder.feed(_read_available(read_fd))) == 3
+
+            buffer.emit("file_write", {"file_path": "d"})
+            buffer.close()
+            records = decoder.feed(_read_available(read_fd))
+            assert [r.fields["file_path"] for r in records] == ["d"]
+        finally:
+            os.close(read_fd)
+            os.close(write_fd)
+
+    def test_overflow_is_counted_when_pipe_is_full(self) -> None:
+        """Test a full pipe never blocks emit and overwritten events are reported."""
+        read_fd, write_fd = os.pipe()
+        os.set_blocking(read_fd, False)
+        os.set_blocking(write_fd, False)
+        try:
+            for size in (65536, 1):
+                while True:
+                    try:
+                        os.write(write_fd, b"\0" * size)
+                    except BlockingIOError:
+                        break
+
+            buffer = EventBuffer(write_fd, buffer_size=4, batch_size=4, flush_interval=60.0)
+            for i in range(10):
+                buffer.emit("file_read", {"file_path": str(i)})
+            assert buffer.dropped == 2
+
+            _read_available(read_fd)
+            buffer.close()
+            records = RecordDecoder().feed(_read_available(read_fd))
+            overflow = [r for r in records if r.event_type == OVERFLOW_RECORD]
+            assert overflow and overflow[0].fields == {"dropped_events": 2}
+            paths = [r.fields["file_path"] for r in records if r.event_type == "file_read"]
+            assert paths == ["0", "1", "2", "3", "6", "7", "8", "9"]
+        finally:
+            os.close(read_fd)
+            os.close(write_fd)
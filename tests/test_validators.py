@@ -0,0 +1,163 @@
+"""Tests for the compiled schema validators."""
+
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from secure_code_reasoner.agents import AgentCoordinator
+from secure_code_reasoner.agents.registry import load_agents
+from secure_code_reasoner.exceptions import ContractViolationError
+from secure_code_reasoner.fingerprinting import Fingerprinter
+from secure_code_reasoner.reporting import JSONFormatter
+from secure_code_reasoner.validators import (
+    compile_validator,
+    validate_documents,
+    validate_ndjson,
+    validate_records,
+)
+
+
+@pytest.fixture
+def documents(tmp_path: Path) -> tuple[dict[str, Any], dict[str, Any]]:
+    """Serialize the fingerprint and agent report of a small risky repository."""
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "app.py").write_text(
+        "import pickle\n\n\nclass Loader:\n    async def load(self, data):\n"
+        "        return eval(pickle.loads(data))\n"
+    )
+    fingerprint = Fingerprinter(tmp_path).fingerprint()
+    report = AgentCoordinator(load_agents(None)).review(fingerprint)
+    formatter = JSONFormatter()
+    return (
+        json.loads(formatter.format_fingerprint(fingerprint)),
+        json.loads(formatter.format_agent_report(report)),
+    )
+
+
+class TestCompileValidator:
+    """Tests for compile_validator."""
+
+    def test_accepts_serialized_reports(self, documents: tuple) -> None:
+        """Test real fingerprint and agent report output validates."""
+        fingerprint, report = documents
+        assert report["findings"]
+        compile_validator("fingerprint")(fingerprint, "fingerprint")
+        compile_validator("agent_report")(report, "agent_report")
+
+    def test_validators_are_cached(self) -> None:
+        """Test a schema is compiled once."""
+        assert compile_validator("finding", 1) is compile_validator("finding", 1)
+
+    def test_unknown_schema_raises(self) -> None:
+        """Test asking for a missing kind or version raises."""
+        with pytest.raises(ContractViolationError, match="no schema for finding version 2"):
+            compile_validator("finding", 2)
+
+    @pytest.mark.parametrize(
+        ("change", "message"),
+        [
+            ({"schema_version": 2}, "schema_version must be 1"),
+            ({"surprise": 1}, "Unknown fields not allowed"),
+            ({"total_files": "3"}, "total_files must be int"),
+            ({"total_files": True}, "total_files must be int, got bool"),
+            ({"fingerprint_status": "DONE"}, "fingerprint_status must be one of"),
+        ],
+    )
+    def test_rejects_invalid_fingerprint(
+        self, documents: tuple, change: dict[str, Any], message: str
+    ) -> None:
+        """Test versions, unknown fields, exact types and enums are enforced."""
+        with pytest.raises(ContractViolationError, match=message):
+            compile_validator("fingerprint")({**documents[0], **change}, "fingerprint")
+
+    def test_rejects_missing_fields(self, documents: tuple) -> None:
+        """Test a document without a required field raises."""
+        report = dict(documents[1])
+        del report["patch_suggestions"]
+        with pytest.raises(
+            ContractViolationError, match=r"missing fields: \['patch_suggestions'\]"
+        ):
+            compile_validator("agent_report")(report, "agent_report")
+
+    @pytest.mark.parametrize(
+        ("obligations", "message"),
+        [
+            ({"invalid_if_ignored": False}, "must be True"),
+            ({"findings_invalid_if_failed": 1}, "must be bool"),
+            ({"findings_are_correct": True}, "unknown keys"),
+        ],
+    )
+    def test_enforces_proof_obligations(
+        self, documents: tuple, obligations: dict[str, Any], message: str
+    ) -> None:
+        """Test structural, computed and unknown proof obligations."""
+        report = documents[1]
+        report = {**report, "proof_obligations": {**report["proof_obligations"], **obligations}}
+        with pytest.raises(ContractViolationError, match=message):
+            compile_validator("agent_report")(report, "agent_report")
+
+    def test_requires_execution_status(self, documents: tuple) -> None:
+        """Test the agent report metadata must carry a known execution status."""
+        report = {**documents[1], "metadata": {}}
+        with pytest.raises(ContractViolationError, match="metadata missing execution_status"):
+            compile_validator("agent_report")(report, "agent_report")
+
+    def test_nested_records_are_validated(self, documents: tuple) -> None:
+        """Test errors in list elements name the element."""
+        fingerprint = documents[0]
+        artifacts = [dict(a) for a in fingerprint["artifacts"]]
+        function = next(a for a in artifacts if a["artifact_type"] == "function")
+        function["is_async"] = "yes"
+        index = artifacts.index(function)
+        with pytest.raises(
+            ContractViolationError, match=rf"\[fp\.artifacts\[{index}\]\]: is_async must be bool"
+        ):
+            compile_validator("fingerprint")({**fingerprint, "artifacts": artifacts}, "fp")
+
+    def test_artifact_variants(self, documents: tuple) -> None:
+        """Test artifact fields depend on the artifact type."""
+        validate = compile_validator("artifact")
+        file_artifact = next(a for a in documents[0]["artifacts"] if a["artifact_type"] == "file")
+        with pytest.raises(ContractViolationError, match="Unknown fields not allowed"):
+            validate({**file_artifact, "methods": []}, "artifact")
+        with pytest.raises(ContractViolationError, match="artifact_type must be one of"):
+            validate({**file_artifact, "artifact_type": "module"}, "artifact")
+
+
+class TestStreams:
+    """Tests for validating record streams and concatenated documents."""
+
+    def test_validate_records_counts(self, documents: tuple) -> None:
+        """Test records of an iterable are validated lazily and counted."""
+        findings = documents[1]["findings"]
+        assert validate_records(iter(findings), "finding") == len(findings)
+        with pytest.raises(ContractViolationError, match=r"\[finding 2\]"):
+            validate_records([findings[0], {}], "finding")
+
+    def test_validate_ndjson_reports_line(self, documents: tuple) -> None:
+        """Test NDJSON lines are parsed and errors give the line number."""
+        lines = [json.dumps(finding) for finding in documents[1]["findings"]]
+        assert validate_ndjson([*lines, ""], "finding") == len(lines)
+        assert validate_ndjson([line.encode() for line in lines], "finding") == len(lines)
+        with pytest.raises(ContractViolationError, match=r"\[out finding line 2\]: invalid JSON"):
+            validate_ndjson([lines[0], "{"], "finding", source="out")
+
+    def test_validate_documents(self, documents: tuple) -> None:
+        """Test concatenated documents are detected and counted by kind."""
+        text = "\n\n".join(json.dumps(document, indent=2) for document in documents)
+        assert validate_documents(text) == {"fingerprint": 1, "agent_report": 1}
+        with pytest.raises(ContractViolationError, match="neither a fingerprint nor"):
+            validate_documents('{"trace": []}')
+        with pytest.raises(ContractViolationError, match="must be valid JSON"):
+            validate_documents(text + "\n{")
+
+    @pytest.mark.parametrize("version", [[1], True, "1"])
+    def test_validate_documents_rejects_bad_version(self, documents: tuple, version: Any) -> None:
+        """Test a non-int schema_version is a contract violation rather than a TypeError."""
+        text = json.dumps({**documents[0], "schema_version": version})
+        with pytest.raises(
+            ContractViolationError, match=r"\[fingerprint 1\]: schema_version must be int"
+        ):
+            validate_documents(text)